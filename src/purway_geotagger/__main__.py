@@ -0,0 +1,4 @@
+"""`python -m purway_geotagger` runs the headless CLI (the GUI is purway_geotagger.app)."""
+from purway_geotagger.cli import main
+
+raise SystemExit(main())
@@ -3,6 +3,8 @@
 Run in development:
     python -m purway_geotagger.app
 
+Add `--profile-startup` to print import/construct times per component.
+
 In packaged form (PyInstaller), this becomes the main script.
 """
 
@@ -10,25 +12,38 @@ from __future__ import annotations
 
 import sys
 import os
-from PySide6.QtWidgets import QApplication
 
-from purway_geotagger.gui.main_window import MainWindow
-from purway_geotagger.gui.theme import apply_theme
-from purway_geotagger.core.settings import AppSettings
-from purway_geotagger.util.platform import configure_macos_app_identity
+from purway_geotagger.core.startup_profile import PROFILE_FLAG, startup_profiler
 
 
 def main() -> int:
+    profiler = startup_profiler()
+    with profiler.measure("PySide6.QtWidgets", "import"):
+        from PySide6.QtCore import QTimer
+        from PySide6.QtWidgets import QApplication
+    from purway_geotagger.core.settings import AppSettings
+    from purway_geotagger.util.platform import configure_macos_app_identity
+
     configure_macos_app_identity()
 
-    app = QApplication(sys.argv)
+    with profiler.measure("QApplication", "construct"):
+        app = QApplication([a for a in sys.argv if a != PROFILE_FLAG])
 
     settings = AppSettings.load()
-    apply_theme(app, settings.ui_theme)
+    with profiler.measure("purway_geotagger.gui.theme", "import"):
+        from purway_geotagger.gui.theme import apply_theme
+    with profiler.measure("theme", "construct"):
+        apply_theme(app, settings.ui_theme)
     if settings.exiftool_path:
         os.environ["PURWAY_EXIFTOOL_PATH"] = settings.exiftool_path
-    win = MainWindow(settings=settings)
-    win.show()
+    with profiler.measure("purway_geotagger.gui.main_window", "import"):
+        from purway_geotagger.gui.main_window import MainWindow
+    with profiler.measure("MainWindow", "construct"):
+        win = MainWindow(settings=settings)
+    with profiler.measure("MainWindow", "show"):
+        win.show()
+    if profiler.enabled:
+        QTimer.singleShot(0, lambda: print(profiler.report(), file=sys.stderr, flush=True))
 
     code = app.exec()
     settings.save()
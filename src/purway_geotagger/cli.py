@@ -0,0 +1,476 @@
+"""Headless command-line entry point (no Qt).
+
+Run:
+    python -m purway_geotagger methane /path/to/flight --threshold 1000
+    python -m purway_geotagger encroachment A B --per-input --jobs 2 --json
+    python -m purway_geotagger resume /path/to/PurwayGeotagger_20250101_120000
+    python -m purway_geotagger serve --port 8765   (see purway_geotagger.server)
+
+Only argparse and the standard library are imported up front; each subcommand
+imports the pipeline modules it needs, so `--help` and argument errors return
+immediately and PySide6 is never loaded.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import uuid
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from purway_geotagger.core.job import Job
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_CANCELLED = 130
+
+_JOB_COMMANDS = ("methane", "encroachment", "combined")
+
+
+class _Reporter:
+    """Prints events as text lines or as JSON objects (one per line)."""
+
+    def __init__(self, json_lines: bool, stream: IO[str] | None = None) -> None:
+        self.json_lines = json_lines
+        self.stream = stream or sys.stdout
+        self._last_progress: dict[str, tuple[int, str]] = {}
+
+    def emit(self, event: str, text: str, **fields: Any) -> None:
+        if self.json_lines:
+            line = json.dumps({"event": event, **fields}, default=str)
+        else:
+            line = text
+        print(line, file=self.stream, flush=True)
+
+    def progress(self, name: str, job_id: str, pct: int, message: str) -> None:
+        if self._last_progress.get(job_id) == (pct, message):
+            return
+        self._last_progress[job_id] = (pct, message)
+        self.emit("progress", f"[{name}] {pct:3d}% {message}", job=job_id, name=name, percent=pct, message=message)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--json", action="store_true", help="Print JSON lines instead of text.")
+
+    jobs = argparse.ArgumentParser(add_help=False)
+    jobs.add_argument("inputs", nargs="+", type=Path, help="Input folders or files (Raw Data roots).")
+    jobs.add_argument("--dry-run", action="store_true", help="Do everything except write metadata.")
+    jobs.add_argument("--no-xmp", action="store_true", help="Write EXIF GPS tags only.")
+    overlap = jobs.add_mutually_exclusive_group()
+    overlap.add_argument("--pipelined", action="store_true", help="Overlap copy, match and write (default: settings).")
+    overlap.add_argument("--sequential", action="store_true", help="Do not overlap copy, match and write.")
+    jobs.add_argument("--max-join-delta", type=int, metavar="SECONDS", help="Max timestamp join delta.")
+    jobs.add_argument("--log-jsonl", action="store_true", help="Also write run_log.jsonl.")
+    jobs.add_argument("--per-input", action="store_true", help="Run one job per input root, in parallel.")
+    jobs.add_argument("--jobs", type=int, metavar="N", help="Max jobs running at once (default: settings/auto).")
+
+    methane = argparse.ArgumentParser(add_help=False)
+    methane.add_argument("--threshold", type=int, default=1000, help="PPM threshold (default 1000).")
+    methane.add_argument("--no-kmz", action="store_true", help="Skip KMZ generation.")
+    methane.add_argument("--log-dir", type=Path, help="Methane run log base folder (default: input parent).")
+    methane.add_argument("--export", action="append", default=None, metavar="FORMAT",
+                         help="Extra geo export (geojson, geojsonl, gpkg, geoparquet); repeatable.")
+    methane.add_argument("--hotspots", action="store_true", help="Also cluster detections into hotspots.")
+    methane.add_argument("--hotspot-radius", type=float, metavar="METERS", help="Hotspot clustering radius.")
+
+    encroachment = argparse.ArgumentParser(add_help=False)
+    encroachment.add_argument("--out", type=Path, help="Encroachment output folder (default: next to inputs).")
+    rename = encroachment.add_mutually_exclusive_group()
+    rename.add_argument("--template", metavar="ID", help="Rename with a saved template.")
+    rename.add_argument("--client", metavar="ABBR", help="Rename as <ABBR>_<index>.")
+    encroachment.add_argument("--start-index", type=int, default=1, help="First rename index (default 1).")
+
+    parser = argparse.ArgumentParser(prog="purway-geotagger", description="Purway Geotagger (headless).")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("methane", parents=[common, jobs, methane], help="Methane run (in place).")
+    sub.add_parser("encroachment", parents=[common, jobs, encroachment], help="Encroachment run (copies).")
+    sub.add_parser("combined", parents=[common, jobs, methane, encroachment], help="Methane + encroachment.")
+
+    preview = sub.add_parser("preview", parents=[common], help="Show how photos match CSV rows.")
+    preview.add_argument("inputs", nargs="+", type=Path)
+    preview.add_argument("--max-rows", type=int, default=50, help="Rows to match (0 = all photos).")
+    preview.add_argument("--max-join-delta", type=int, metavar="SECONDS")
+
+    wind = sub.add_parser("wind", parents=[common], help="Generate a Wind Data DOCX report.")
+    wind.add_argument("--client", required=True)
+    wind.add_argument("--system", default="")
+    wind.add_argument("--region", default="")
+    wind.add_argument("--date", required=True, help="Report date, e.g. 2025-06-01.")
+    wind.add_argument("--timezone", default=None)
+    wind.add_argument("--start", required=True, metavar="TIME,DIR,MPH,GUST,TEMP", help='e.g. "10:00,SW,5,10,75"')
+    wind.add_argument("--end", required=True, metavar="TIME,DIR,MPH,GUST,TEMP")
+    wind.add_argument("--out", type=Path, required=True, help="Output folder.")
+
+    resume = sub.add_parser("resume", parents=[common], help="Finish interrupted runs from their checkpoints.")
+    resume.add_argument("run_folders", nargs="+", type=Path)
+    resume.add_argument("--jobs", type=int, metavar="N")
+
+    serve = sub.add_parser("serve", help="Run the local job server (HTTP + Server-Sent Events).")
+    where = serve.add_mutually_exclusive_group()
+    where.add_argument("--port", type=int, default=8765, help="TCP port on --host (default 8765).")
+    where.add_argument("--unix", type=Path, metavar="PATH", help="Listen on a Unix socket instead of TCP.")
+    serve.add_argument("--host", default="127.0.0.1", help="Bind address (default 127.0.0.1).")
+    serve.add_argument("--jobs", type=int, metavar="N")
+    serve.add_argument("--token-file", type=Path, metavar="PATH", help="Where to write the access token (default: config dir).")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "serve":
+        return _cmd_serve(args)
+    out = _Reporter(args.json)
+    if args.command in _JOB_COMMANDS:
+        return _cmd_job(args, out)
+    if args.command == "preview":
+        return _cmd_preview(args, out)
+    if args.command == "wind":
+        return _cmd_wind(args, out)
+    return _cmd_resume(args, out)
+
+
+def _load_settings():
+    from purway_geotagger.core.settings import AppSettings
+
+    settings = AppSettings.load()
+    if settings.exiftool_path and not os.environ.get("PURWAY_EXIFTOOL_PATH"):
+        os.environ["PURWAY_EXIFTOOL_PATH"] = settings.exiftool_path
+    return settings
+
+
+def _cmd_job(args: argparse.Namespace, out: _Reporter) -> int:
+    settings = _load_settings()
+    request = {
+        "dry_run": args.dry_run,
+        "write_xmp": False if args.no_xmp else None,
+        "pipelined": True if args.pipelined else (False if args.sequential else None),
+        "max_join_delta_seconds": args.max_join_delta,
+        "log_jsonl": args.log_jsonl,
+        "methane_threshold": getattr(args, "threshold", 1000),
+        "methane_generate_kmz": not getattr(args, "no_kmz", False),
+        "methane_log_base": getattr(args, "log_dir", None),
+        "methane_export_formats": getattr(args, "export", None),
+        "methane_hotspots": True if getattr(args, "hotspots", False) else None,
+        "methane_hotspot_radius_m": getattr(args, "hotspot_radius", None),
+        "encroachment_output_base": getattr(args, "out", None),
+        "rename_template_id": getattr(args, "template", None),
+        "client_abbr": getattr(args, "client", None),
+        "start_index": getattr(args, "start_index", 1),
+    }
+    groups = [[p] for p in args.inputs] if args.per_input else [list(args.inputs)]
+    jobs = []
+    for inputs in groups:
+        try:
+            jobs.append(build_job(args.command, inputs, request, settings, claim=False))
+        except ValueError as exc:
+            return _usage_error(out, str(exc))
+    # Every input validated; only now create the run folders.
+    for job in jobs:
+        claim_run_folder(job)
+    return _run_jobs([(job, False) for job in jobs], args.jobs, settings, out)
+
+
+def build_job(mode: str, inputs: list[Path], request: dict[str, Any], settings, claim: bool = True) -> Job:
+    """Build a queued methane/encroachment/combined job from request fields.
+
+    Shared by the CLI and the job server. `request` keys are optional and
+    named after the JobOptions/ModeState fields they set (see README); None
+    means "use the saved setting". `settings` is not modified. The run folder
+    is created so the next job cannot claim the same name; with `claim=False`
+    it is left for claim_run_folder. Raises ValueError with a user-facing
+    message for invalid requests.
+    """
+    from dataclasses import replace
+
+    from purway_geotagger.core.job import Job
+    from purway_geotagger.core.modes import RunMode
+    from purway_geotagger.core.mode_state import ModeState, build_job_options, first_issue, validate_mode_state
+    from purway_geotagger.ops.geo_exports import GEO_EXPORT_FORMATS
+
+    if mode not in _JOB_COMMANDS:
+        raise ValueError(f"Unknown mode: {mode} (expected one of {', '.join(_JOB_COMMANDS)}).")
+    if not inputs:
+        raise ValueError("No inputs given.")
+    missing = [str(p) for p in inputs if not p.exists()]
+    if missing:
+        raise ValueError(f"Input not found: {', '.join(missing)}")
+
+    def _opt(key: str, default: Any = None) -> Any:
+        value = request.get(key)
+        return default if value is None else value
+
+    settings = replace(settings)
+    settings.dry_run_default = settings.dry_run_default or bool(request.get("dry_run"))
+    settings.write_xmp_default = bool(_opt("write_xmp", settings.write_xmp_default))
+    settings.pipelined_execution = bool(_opt("pipelined", settings.pipelined_execution))
+    settings.max_join_delta_seconds = int(_opt("max_join_delta_seconds", settings.max_join_delta_seconds))
+    formats = request.get("methane_export_formats")
+    if formats:
+        unknown = [f for f in formats if f not in GEO_EXPORT_FORMATS]
+        if unknown:
+            raise ValueError(f"Unknown export format(s): {', '.join(map(str, unknown))}.")
+        settings.methane_export_formats = list(formats)
+    settings.methane_hotspots = bool(_opt("methane_hotspots", settings.methane_hotspots))
+    settings.methane_hotspot_radius_m = float(_opt("methane_hotspot_radius_m", settings.methane_hotspot_radius_m))
+
+    templates = {}
+    template_id = request.get("rename_template_id")
+    if template_id:
+        from purway_geotagger.templates.template_manager import TemplateManager
+
+        templates = TemplateManager().templates
+        if template_id not in templates:
+            raise ValueError(f"Unknown rename template: {template_id}")
+
+    client = request.get("client_abbr") or ""
+    log_base = request.get("methane_log_base")
+    out_base = request.get("encroachment_output_base")
+    state = ModeState(
+        mode=RunMode(mode),
+        inputs=list(inputs),
+        methane_threshold=int(_opt("methane_threshold", 1000)),
+        methane_generate_kmz=bool(_opt("methane_generate_kmz", True)),
+        methane_log_base=Path(log_base) if log_base else None,
+        encroachment_output_base=Path(out_base) if out_base else None,
+        encroachment_rename_enabled=bool(template_id or client),
+        encroachment_template_id=template_id,
+        encroachment_client_abbr=client,
+        encroachment_start_index=int(_opt("start_index", 1)),
+    ).resolved()
+    issue = first_issue(validate_mode_state(state))
+    if issue:
+        raise ValueError(issue.message)
+    opts = replace(build_job_options(state, settings, templates), log_jsonl=bool(request.get("log_jsonl")))
+    name = request.get("name") or (inputs[0].name if len(inputs) == 1 else f"{mode} ({len(inputs)} inputs)")
+    job = Job(id=str(uuid.uuid4()), name=str(name), inputs=list(inputs), options=opts)
+    job.run_folder = opts.output_root
+    if claim:
+        claim_run_folder(job)
+    return job
+
+
+def claim_run_folder(job: Job) -> None:
+    """Create the job's run folder, renaming it if another job took the name since."""
+    from purway_geotagger.core.settings import AppSettings
+
+    folder = AppSettings.new_run_folder(job.options.output_root.parent)
+    folder.mkdir(parents=True, exist_ok=True)
+    job.options.output_root = folder
+    job.run_folder = folder
+
+
+def _cmd_resume(args: argparse.Namespace, out: _Reporter) -> int:
+    from purway_geotagger.core.pipeline import load_run_config
+
+    settings = _load_settings()
+    entries = []
+    status = EXIT_OK
+    for folder in args.run_folders:
+        try:
+            job = load_run_config(folder)
+        except (OSError, ValueError, TypeError) as exc:
+            out.emit("failed", f"[{folder.name}] cannot resume: {exc}", run_folder=str(folder), error=str(exc))
+            status = EXIT_FAILED
+            continue
+        job.name = folder.name
+        entries.append((job, True))
+    if entries:
+        status = max(status, _run_jobs(entries, args.jobs, settings, out))
+    return status
+
+
+def _run_jobs(entries: list, max_jobs: int | None, settings, out: _Reporter) -> int:
+    """Run jobs through the resource-aware scheduler; returns the process exit code."""
+    from purway_geotagger.core.pipeline import run_job
+    from purway_geotagger.core.scheduler import JobScheduler, ResourceLimits, default_max_jobs
+    from purway_geotagger.exif.exiftool_writer import set_max_exiftool_processes
+    from purway_geotagger.util.errors import UserCancelledError
+
+    limits = ResourceLimits(
+        max_jobs=max(1, max_jobs or settings.max_concurrent_jobs or default_max_jobs()),
+        max_exiftool_processes=settings.max_exiftool_processes,
+        io_jobs_per_device=settings.io_jobs_per_device,
+    )
+    set_max_exiftool_processes(limits.max_exiftool_processes)
+    scheduler = JobScheduler(limits)
+    resume = {job.id: is_resume for job, is_resume in entries}
+    for job, _ in entries:
+        scheduler.submit(job)
+
+    events: queue.Queue = queue.Queue()
+    cancel = threading.Event()
+
+    def _work(job) -> None:
+        try:
+            run_job(
+                job,
+                progress_cb=lambda pct, msg: events.put(("progress", job, int(pct), msg)),
+                cancel_cb=cancel.is_set,
+                resume=resume[job.id],
+            )
+            events.put(("done", job, ""))
+        except UserCancelledError:
+            events.put(("cancelled", job, "Cancelled by user."))
+        except Exception as exc:
+            events.put(("failed", job, str(exc) or type(exc).__name__))
+
+    def _dispatch() -> None:
+        if cancel.is_set():
+            return
+        for job in scheduler.next_ready():
+            out.emit("started", f"[{job.name}] started -> {job.run_folder}",
+                     job=job.id, name=job.name, run_folder=str(job.run_folder))
+            threading.Thread(target=_work, args=(job,), name=f"cli-job-{job.name}", daemon=True).start()
+
+    pending = len(entries)
+    failed = 0
+    _dispatch()
+    while pending:
+        try:
+            kind, job, *rest = events.get(timeout=0.5)
+        except queue.Empty:
+            continue
+        except KeyboardInterrupt:
+            cancel.set()
+            for queued in scheduler.queued:
+                scheduler.remove(queued)
+                pending -= 1
+                out.emit("cancelled", f"[{queued.name}] cancelled before start", job=queued.id, name=queued.name)
+            continue
+        if kind == "progress":
+            out.progress(job.name, job.id, rest[0], rest[1])
+            continue
+        pending -= 1
+        scheduler.finish(job)
+        s = job.state
+        if kind == "done":
+            out.emit(
+                "done",
+                f"[{job.name}] done: {s.success} written, {s.failed} failed -> {job.run_folder}",
+                job=job.id, name=job.name, run_folder=str(job.run_folder),
+                scanned=s.scanned_photos, matched=s.matched, success=s.success, failed=s.failed,
+            )
+        else:
+            failed += 1
+            out.emit(kind, f"[{job.name}] {kind}: {rest[0]}", job=job.id, name=job.name,
+                     run_folder=str(job.run_folder), error=rest[0])
+        _dispatch()
+    if cancel.is_set():
+        return EXIT_CANCELLED
+    return EXIT_FAILED if failed else EXIT_OK
+
+
+def _cmd_serve(args: argparse.Namespace) -> int:
+    from purway_geotagger.server import serve
+
+    serve(
+        host=args.host,
+        port=args.port,
+        unix_path=args.unix,
+        max_jobs=args.jobs,
+        settings=_load_settings(),
+        token_path=args.token_file,
+    )
+    return EXIT_OK
+
+
+def _cmd_preview(args: argparse.Namespace, out: _Reporter) -> int:
+    from purway_geotagger.core.preview import build_preview
+
+    delta = args.max_join_delta
+    if delta is None:
+        delta = _load_settings().max_join_delta_seconds
+    shown = matched = 0
+
+    def _emit_rows(batch) -> None:
+        nonlocal shown, matched
+        for r in batch:
+            out.emit(
+                "preview_row",
+                "\t".join([r.status, r.join_method, r.ppm, r.lat, r.lon, r.photo_path, r.reason]).rstrip(),
+                photo=r.photo_path, status=r.status, join_method=r.join_method, csv=r.csv_path,
+                lat=r.lat, lon=r.lon, ppm=r.ppm, datetime_original=r.datetime_original, reason=r.reason,
+            )
+            shown += 1
+            matched += r.status == "MATCHED"
+
+    result = build_preview(args.inputs, args.max_rows or None, delta, on_batch=_emit_rows)
+    out.emit(
+        "preview",
+        f"{result.scanned_photos} photos, {result.scanned_csvs} CSVs; {matched}/{shown} shown rows matched.",
+        photos=result.scanned_photos, csvs=result.scanned_csvs, rows=shown, matched=matched,
+    )
+    return EXIT_OK
+
+
+def _cmd_wind(args: argparse.Namespace, out: _Reporter) -> int:
+    from purway_geotagger.core.wind_docx import (
+        DEFAULT_TIMEZONE,
+        WindInputValidationError,
+        WindReportMetadataRaw,
+        build_wind_template_payload,
+    )
+    from purway_geotagger.core.wind_docx_writer import WindDocxWriterError, generate_wind_docx_report
+    from purway_geotagger.core.wind_template_contract import required_placeholders_for_profile
+    from purway_geotagger.core.wind_template_selector import WindTemplateSelectionError, select_wind_template
+
+    try:
+        report = build_wind_template_payload(
+            WindReportMetadataRaw(
+                client_name=args.client,
+                system_name=args.system,
+                report_date=args.date,
+                timezone=args.timezone or DEFAULT_TIMEZONE,
+                region_id=args.region,
+            ),
+            _wind_row(args.start, "--start"),
+            _wind_row(args.end, "--end"),
+        )
+        selection = select_wind_template(system_name=args.system, region_id=args.region)
+    except (WindInputValidationError, WindTemplateSelectionError) as exc:
+        return _usage_error(out, str(exc))
+    try:
+        render = generate_wind_docx_report(
+            template_path=selection.template_path,
+            output_dir=args.out,
+            report=report,
+            required_placeholders=required_placeholders_for_profile(selection.profile),
+        )
+    except WindDocxWriterError as exc:
+        out.emit("failed", f"Wind DOCX generation failed: {exc}", error=str(exc))
+        return EXIT_FAILED
+    out.emit(
+        "done",
+        f"Generated {render.output_docx_path} and {render.debug_json_path.name}",
+        docx=str(render.output_docx_path), debug_json=str(render.debug_json_path),
+    )
+    return EXIT_OK
+
+
+def _wind_row(value: str, option: str):
+    from purway_geotagger.core.wind_docx import WindInputValidationError, WindRowRaw
+
+    parts = [p.strip() for p in value.split(",")]
+    if len(parts) != 5:
+        raise WindInputValidationError(f"{option} must be TIME,DIRECTION,SPEED,GUST,TEMP (e.g. 10:00,SW,5,10,75).")
+    time_value, direction, speed, gust, temp = parts
+    return WindRowRaw(time_value=time_value, wind_direction=direction, wind_speed_mph=speed, gust_mph=gust, temp_f=temp)
+
+
+def _usage_error(out: _Reporter, message: str) -> int:
+    if out.json_lines:
+        out.emit("error", message, error=message)
+    else:
+        print(f"purway-geotagger: error: {message}", file=sys.stderr)
+    return EXIT_USAGE
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,234 @@
+"""Append-only checkpoint journal (checkpoint.jsonl) used to resume interrupted runs."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+import json
+import os
+import threading
+from typing import IO, Any, Iterable, Iterator
+
+from purway_geotagger.core.photo_task import MATCH_DEFAULTS, MATCH_FIELDS, PhotoTask
+from purway_geotagger.parsers.purway_csv import PhotoMatch
+from purway_geotagger.ops.methane_outputs import MethaneCsvResult
+from purway_geotagger.util.errors import ResumeError
+
+CHECKPOINT_NAME = "checkpoint.jsonl"
+
+# Stages that rename, move or copy finished photos; a run interrupted inside
+# one of these cannot be resumed because task output paths are no longer known.
+FINALIZE_STAGES = ("ENCROACHMENT_COPY", "RENAME", "SORT", "FLATTEN")
+
+_PATH_FIELDS = ("src_path", "work_path", "output_path")
+_TASK_FIELDS = tuple(f.name for f in fields(PhotoTask) if f.name != "match")
+_METHANE_PATH_FIELDS = ("source_csv", "cleaned_csv", "kmz", "hotspot_csv", "hotspot_json")
+
+
+class CheckpointJournal:
+    """Writer for checkpoint.jsonl, one JSON record per line.
+
+    Records stage start/completion, each photo once its copy (or backup) is in
+    place ("prepared"), and each photo that reached a terminal state ("done").
+    Every record is flushed as it is written so an interrupted run loses at
+    most the line in flight; stage records are also fsynced. Safe to call from
+    the pipelined worker threads.
+    """
+
+    def __init__(self, path: Path, append: bool = False) -> None:
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._f: IO[str] | None = self.path.open("a" if append else "w", encoding="utf-8")
+
+    def stage_started(self, stage: str) -> None:
+        self._write([{"type": "stage", "stage": stage, "event": "start"}], sync=True)
+
+    def stage_done(self, stage: str) -> None:
+        self._write([{"type": "stage", "stage": stage, "event": "done"}], sync=True)
+
+    def methane_outputs(self, results: Iterable[MethaneCsvResult]) -> None:
+        self._write([{"type": "methane", "results": [_methane_record(r) for r in results]}], sync=True)
+
+    def track_prepared(self, targets: Iterable[tuple[Path, Path]]) -> Iterator[tuple[Path, Path]]:
+        """Pass (source, target) pairs through, recording each as prepared."""
+        for src, tgt in targets:
+            self._write([{"type": "prepared", "src": str(src), "target": str(tgt), "size": _size(src)}])
+            yield src, tgt
+
+    def photos_done(self, tasks: Iterable[PhotoTask]) -> None:
+        """Record tasks that will not be retried: written, or unmatched in the CSVs.
+
+        Photos that failed inside ExifTool are left out so a resume retries them.
+        """
+        records = [
+            {"type": "done", "task": task_record(t), "size": _size(t.output_path)}
+            for t in tasks
+            if t.status == "SUCCESS" or (t.status == "FAILED" and not t.matched)
+        ]
+        if records:
+            self._write(records)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._f is None:
+                return
+            self._f.close()
+            self._f = None
+
+    def _write(self, records: list[dict[str, Any]], sync: bool = False) -> None:
+        data = "".join(json.dumps(r) + "\n" for r in records)
+        with self._lock:
+            if self._f is None:
+                return
+            self._f.write(data)
+            self._f.flush()
+            if sync:
+                os.fsync(self._f.fileno())
+
+
+@dataclass
+class ResumePlan:
+    """How the photos of a resumed run split up.
+
+    - restored: finished tasks rebuilt from the journal (their outputs verified)
+    - reusable: (source, target) pairs whose copy/backup is intact but not yet written
+    - remaining: photos that still need to be copied or backed up
+    """
+    restored: list[PhotoTask] = field(default_factory=list)
+    reusable: list[tuple[Path, Path]] = field(default_factory=list)
+    remaining: list[Path] = field(default_factory=list)
+
+
+@dataclass
+class CheckpointState:
+    """Everything a previous run recorded in its journal."""
+    started: set[str] = field(default_factory=set)
+    completed: set[str] = field(default_factory=set)
+    prepared: dict[str, dict[str, Any]] = field(default_factory=dict)  # source -> record
+    done: dict[str, dict[str, Any]] = field(default_factory=dict)  # source -> record
+    methane: list[dict[str, Any]] | None = None
+
+    def ensure_resumable(self) -> None:
+        if "FLATTEN" in self.completed:
+            raise ResumeError("This run already finished; there is nothing to resume.")
+        moved = [s for s in FINALIZE_STAGES if s in self.started]
+        if moved:
+            raise ResumeError(
+                f"This run was interrupted during {moved[-1]} after photos were renamed or moved; "
+                "start a new run instead."
+            )
+
+    def methane_results(self) -> list[MethaneCsvResult] | None:
+        """Methane outputs of the previous run, or None if any must be regenerated."""
+        if self.methane is None:
+            return None
+        results = [_methane_from_record(r) for r in self.methane]
+        for r in results:
+            if r.cleaned_status == "failed" or r.kmz_status == "failed" or r.hotspot_status == "failed":
+                return None
+            if r.export_errors:
+                return None
+            produced = [r.cleaned_csv, r.kmz, r.hotspot_csv, r.hotspot_json, *r.exports.values()]
+            if any(p is not None and not p.exists() for p in produced):
+                return None
+        return results
+
+    def plan(self, photos: Iterable[Path], copies: bool) -> ResumePlan:
+        """Split `photos` into restored, reusable and remaining work.
+
+        An output is trusted only if it exists with the size recorded in the
+        journal. When `copies` is True (targets are copies, not the originals),
+        damaged partial copies are deleted so the photo is copied again under
+        the same name.
+        """
+        plan = ResumePlan()
+        for p in photos:
+            key = str(p)
+            rec = self.done.get(key)
+            if rec is not None:
+                task = task_from_record(rec["task"])
+                if _size(task.output_path) == rec["size"]:
+                    plan.restored.append(task)
+                    continue
+                if copies:
+                    _discard(task.output_path, p)
+            rec = self.prepared.get(key)
+            if rec is not None:
+                target = Path(rec["target"])
+                intact = _size(target) == rec["size"] if copies else target.exists()
+                if intact:
+                    plan.reusable.append((p, target))
+                    continue
+                if copies:
+                    _discard(target, p)
+            plan.remaining.append(p)
+        return plan
+
+
+def load_checkpoint(path: Path) -> CheckpointState:
+    """Read a checkpoint journal; a truncated final line (crash mid-write) is ignored."""
+    if not path.exists():
+        raise ResumeError(f"No checkpoint journal found at {path}.")
+    state = CheckpointState()
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            kind = rec.get("type")
+            if kind == "stage":
+                (state.completed if rec.get("event") == "done" else state.started).add(rec["stage"])
+            elif kind == "prepared":
+                state.prepared[rec["src"]] = rec
+            elif kind == "done":
+                state.done[rec["task"]["src_path"]] = rec
+            elif kind == "methane":
+                state.methane = rec["results"]
+    return state
+
+
+def task_record(t: PhotoTask) -> dict[str, Any]:
+    """Flat JSON record of a task, its match metadata inlined."""
+    rec = {name: getattr(t, name) for name in (*_TASK_FIELDS, *MATCH_FIELDS)}
+    for name in _PATH_FIELDS:
+        rec[name] = str(rec[name])
+    return rec
+
+
+def task_from_record(rec: dict[str, Any]) -> PhotoTask:
+    values = {k: v for k, v in rec.items() if k in _TASK_FIELDS}
+    for name in _PATH_FIELDS:
+        values[name] = Path(values[name])
+    meta = {k: v for k, v in rec.items() if k in MATCH_DEFAULTS}
+    if values.get("matched") or any(v != MATCH_DEFAULTS[k] for k, v in meta.items()):
+        values["match"] = PhotoMatch(**{**MATCH_DEFAULTS, **meta})
+    return PhotoTask(**values)
+
+
+def _methane_record(r: MethaneCsvResult) -> dict[str, Any]:
+    rec = {f.name: getattr(r, f.name) for f in fields(MethaneCsvResult)}
+    for name in _METHANE_PATH_FIELDS:
+        rec[name] = None if rec[name] is None else str(rec[name])
+    rec["exports"] = {fmt: str(p) for fmt, p in r.exports.items()}
+    return rec
+
+
+def _methane_from_record(rec: dict[str, Any]) -> MethaneCsvResult:
+    values = dict(rec)
+    for name in _METHANE_PATH_FIELDS:
+        values[name] = None if values.get(name) is None else Path(values[name])
+    values["exports"] = {fmt: Path(p) for fmt, p in values.get("exports", {}).items()}
+    return MethaneCsvResult(**values)
+
+
+def _size(path: Path) -> int | None:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return None
+
+
+def _discard(target: Path, source: Path) -> None:
+    if target != source:
+        target.unlink(missing_ok=True)
@@ -30,7 +30,12 @@ class JobOptions:
     run_mode: RunMode | None = None
     methane_threshold: int = 1000
     methane_generate_kmz: bool = True
+    methane_export_formats: list[str] = field(default_factory=list)  # see ops.geo_exports
+    methane_hotspots: bool = False  # opt-in; see ops.methane_hotspots
+    methane_hotspot_radius_m: float = 25.0
     methane_log_base: Path | None = None
+    pipelined: bool = False  # overlap copy, match and EXIF write (see core.pipelined)
+    log_jsonl: bool = False  # also write run_log.jsonl (structured, one object per message)
     encroachment_output_base: Path | None = None
     output_photos_root: Path | None = None
 
@@ -0,0 +1,113 @@
+"""Chunked, append-aware reader for run_log.txt (Qt-free; backs the log viewer)."""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import BinaryIO
+
+CHUNK_BYTES = 1 << 20
+
+
+class LogReader:
+    """Line-addressable view of a growing text file without loading it.
+
+    refresh() scans only bytes appended since the last call and records where
+    each complete line starts (8 bytes per line), so any range of lines can
+    be read with one seek. A trailing line without its newline is held back
+    until it is finished. If the file shrinks it is indexed again from the
+    start.
+    """
+
+    def __init__(self, path: Path, chunk_bytes: int = CHUNK_BYTES) -> None:
+        self.path = path
+        self.chunk_bytes = chunk_bytes
+        self._starts = array("q", [0])  # byte offset of each line, plus the end of the last one
+        self._scanned = 0  # bytes examined for newlines
+
+    @property
+    def line_count(self) -> int:
+        return len(self._starts) - 1
+
+    @property
+    def indexed_bytes(self) -> int:
+        return self._starts[-1]
+
+    def refresh(self) -> int:
+        """Index newly appended complete lines; returns how many were added."""
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            return 0
+        if size < self._scanned:
+            self._starts = array("q", [0])
+            self._scanned = 0
+        if size == self._scanned:
+            return 0
+        before = self.line_count
+        with self.path.open("rb") as f:
+            f.seek(self._scanned)
+            pos = self._scanned
+            while pos < size:
+                chunk = f.read(min(self.chunk_bytes, size - pos))
+                if not chunk:
+                    break
+                i = chunk.find(b"\n")
+                while i != -1:
+                    self._starts.append(pos + i + 1)
+                    i = chunk.find(b"\n", i + 1)
+                pos += len(chunk)
+            self._scanned = pos
+        return self.line_count - before
+
+    def read_lines(self, start: int, end: int) -> list[str]:
+        """Lines [start, end) without their line endings ("\n" or "\r\n")."""
+        start = max(0, start)
+        end = min(end, self.line_count)
+        if start >= end:
+            return []
+        with self.path.open("rb") as f:
+            text = self._read_text(f, start, end)
+        # Only "\n" ends a line (as in refresh()); str.splitlines() would also split on \r, \x0c, \u2028...
+        return [line.removesuffix("\r") for line in text.split("\n")[:-1]]
+
+    def line_at(self, offset: int) -> int:
+        """Index of the line containing byte `offset`."""
+        return max(0, bisect_right(self._starts, offset) - 1)
+
+    def search(self, text: str, from_line: int = 0, backward: bool = False) -> int | None:
+        """First line at/after (or at/before, if `backward`) `from_line` containing
+        `text`, case-insensitively (Unicode casefold); None if there is none.
+
+        Reads blocks of whole lines of about `chunk_bytes`, decoded before
+        folding, so no match is split across reads.
+        """
+        needle = text.casefold()
+        if not needle or self.line_count == 0:
+            return None
+        from_line = min(max(0, from_line), self.line_count - 1)
+        with self.path.open("rb") as f:
+            if not backward:
+                start = from_line
+                while start < self.line_count:
+                    end = bisect_right(self._starts, self._starts[start] + self.chunk_bytes) - 1
+                    end = min(self.line_count, max(start + 1, end))
+                    folded = self._read_text(f, start, end).casefold()
+                    hit = folded.find(needle)
+                    if hit != -1:
+                        return start + folded.count("\n", 0, hit)
+                    start = end
+                return None
+            end = from_line + 1
+            while end > 0:
+                start = min(end - 1, bisect_left(self._starts, self._starts[end] - self.chunk_bytes))
+                folded = self._read_text(f, start, end).casefold()
+                hit = folded.rfind(needle)
+                if hit != -1:
+                    return start + folded.count("\n", 0, hit)
+                end = start
+        return None
+
+    def _read_text(self, f: BinaryIO, start: int, end: int) -> str:
+        f.seek(self._starts[start])
+        return f.read(self._starts[end] - self._starts[start]).decode("utf-8", errors="replace")
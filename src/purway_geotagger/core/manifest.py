@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
+from operator import attrgetter
 from pathlib import Path
 import csv
+import os
+import time
+from typing import IO, Iterable, Mapping
 
-@dataclass
+@dataclass(slots=True)
 class ManifestRow:
     source_path: str
     output_path: str
@@ -31,23 +35,83 @@ class ManifestRow:
     camera_zoom: str = ""
     capture_time: str = ""
 
+MANIFEST_FIELDS: tuple[str, ...] = tuple(f.name for f in fields(ManifestRow))
+_row_values = attrgetter(*MANIFEST_FIELDS)
+
 class ManifestWriter:
-    def __init__(self, path: Path) -> None:
+    """Append-only manifest.csv writer.
+
+    The header is written on open and each row is written as soon as it is
+    added, so memory use is constant and a crash leaves every row added so far
+    on disk. The file is flushed every `flush_every` rows or `flush_interval_s`
+    seconds, whichever comes first.
+    """
+
+    def __init__(self, path: Path, flush_every: int = 500, flush_interval_s: float = 2.0) -> None:
         self.path = path
-        self._rows: list[ManifestRow] = []
+        self.rows_written = 0
+        self._flush_every = max(1, flush_every)
+        self._flush_interval_s = flush_interval_s
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f: IO[str] | None = self.path.open("w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._f)
+        self._writer.writerow(MANIFEST_FIELDS)
+        self._f.flush()
 
     def add(self, row: ManifestRow) -> None:
-        self._rows.append(row)
+        if self._f is None:
+            raise ValueError("ManifestWriter is closed.")
+        self._writer.writerow(_row_values(row))
+        self.rows_written += 1
+        self._unflushed += 1
+        if self._unflushed >= self._flush_every:
+            self.flush()
+        elif time.monotonic() - self._last_flush >= self._flush_interval_s:
+            self.flush()
 
-    def write(self) -> None:
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        with self.path.open("w", newline="", encoding="utf-8") as f:
-            w = csv.DictWriter(f, fieldnames=list(asdict(self._rows[0]).keys()) if self._rows else [
-                "source_path","output_path","status","reason","lat","lon","ppm","csv_path","join_method","exif_written",
-                "altitude", "relative_altitude", "light_intensity", "pac", 
-                "uav_pitch", "uav_roll", "uav_yaw", "gimbal_pitch", "gimbal_roll", "gimbal_yaw",
-                "camera_focal_length", "camera_zoom", "capture_time"
-            ])
-            w.writeheader()
-            for r in self._rows:
-                w.writerow(asdict(r))
+    def add_many(self, rows: Iterable[ManifestRow]) -> None:
+        for row in rows:
+            self.add(row)
+
+    def flush(self) -> None:
+        if self._f is None:
+            return
+        self._f.flush()
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        if self._f is None:
+            return
+        self._f.close()
+        self._f = None
+
+    def __enter__(self) -> "ManifestWriter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def update_output_paths(path: Path, moves: Mapping[str, str]) -> None:
+    """Rewrite the output_path of manifest rows, keyed by source_path.
+
+    Applied once finished photos were renamed or moved. The new file replaces
+    the old one atomically, so a crash leaves one manifest or the other.
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    with path.open("r", newline="", encoding="utf-8") as src, tmp.open("w", newline="", encoding="utf-8") as dst:
+        reader = csv.reader(src)
+        writer = csv.writer(dst)
+        header = next(reader, list(MANIFEST_FIELDS))
+        writer.writerow(header)
+        source_col = header.index("source_path")
+        output_col = header.index("output_path")
+        for row in reader:
+            new = moves.get(row[source_col])
+            if new is not None:
+                row[output_col] = new
+            writer.writerow(row)
+    os.replace(tmp, path)
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Iterable, Mapping
+
+from purway_geotagger.core.job import JobOptions
+from purway_geotagger.core.modes import (
+    RunMode,
+    default_encroachment_base,
+    default_methane_log_base,
+    encroachment_run_base,
+)
+from purway_geotagger.core.settings import AppSettings
+from purway_geotagger.templates.models import RenameTemplate
+
+
+@dataclass(frozen=True)
+class ValidationIssue:
+    field_id: str
+    message: str
+
+
+@dataclass
+class ModeState:
+    mode: RunMode = RunMode.METHANE
+    inputs: list[Path] = field(default_factory=list)
+
+    methane_threshold: int = 1000
+    methane_generate_kmz: bool = True
+    methane_log_base: Path | None = None
+
+    encroachment_output_base: Path | None = None
+    encroachment_rename_enabled: bool = False
+    encroachment_template_id: str | None = None
+    encroachment_client_abbr: str = ""
+    encroachment_start_index: int = 1
+
+    def resolved(self) -> "ModeState":
+        base = default_methane_log_base(self.inputs) if self.methane_log_base is None else self.methane_log_base
+        enc_base = (
+            default_encroachment_base(self.inputs)
+            if self.encroachment_output_base is None
+            else self.encroachment_output_base
+        )
+        return replace(
+            self,
+            methane_log_base=base,
+            encroachment_output_base=enc_base,
+        )
+
+
+def validate_mode_state(state: ModeState) -> list[ValidationIssue]:
+    issues: list[ValidationIssue] = []
+
+    if not state.inputs:
+        issues.append(ValidationIssue("inputs", "Input folder(s) required."))
+
+    if state.methane_threshold < 1:
+        issues.append(ValidationIssue("methane_threshold", "PPM threshold must be 1 or greater."))
+
+    if state.mode in (RunMode.ENCROACHMENT, RunMode.COMBINED):
+        if not state.encroachment_output_base:
+            issues.append(ValidationIssue("encroachment_output_base", "Output folder required."))
+
+        if state.encroachment_rename_enabled:
+            if state.encroachment_template_id:
+                pass
+            else:
+                if not state.encroachment_client_abbr.strip():
+                    issues.append(ValidationIssue("encroachment_client_abbr", "Client Abbreviation required."))
+            if state.encroachment_start_index < 1:
+                issues.append(ValidationIssue("encroachment_start_index", "Start Index must be 1 or greater."))
+
+    return issues
+
+
+def first_issue(issues: Iterable[ValidationIssue]) -> ValidationIssue | None:
+    for issue in issues:
+        return issue
+    return None
+
+
+def build_job_options(
+    state: ModeState,
+    settings: AppSettings,
+    templates: Mapping[str, RenameTemplate],
+) -> JobOptions:
+    """Map a mode selection onto JobOptions (shared by the GUI controller and the CLI).
+
+    Mode-specific behaviour (overwrite/flatten/sort) is forced here; everything
+    else comes from the user's settings.
+    """
+    resolved = state.resolved()
+    output_photos_root: Path | None = None
+    if state.mode == RunMode.METHANE:
+        output_base = resolved.methane_log_base
+    elif state.mode == RunMode.ENCROACHMENT:
+        output_photos_root = resolved.encroachment_output_base
+        output_base = encroachment_run_base(output_photos_root) if output_photos_root else None
+    else:
+        output_photos_root = resolved.encroachment_output_base
+        output_base = encroachment_run_base(output_photos_root) if output_photos_root else None
+    output_base = output_base or Path.home()
+    run_folder = AppSettings.new_run_folder(output_base)
+
+    rename_template = None
+    if state.encroachment_template_id:
+        rename_template = templates.get(state.encroachment_template_id)
+    elif state.encroachment_rename_enabled and state.encroachment_client_abbr.strip():
+        rename_template = RenameTemplate(
+            id="manual",
+            name="Manual",
+            client=state.encroachment_client_abbr.strip(),
+            pattern="{client}_{index:04d}",
+            description="Manual client abbreviation",
+            start_index=max(1, int(state.encroachment_start_index)),
+        )
+
+    overwrite_originals = settings.overwrite_originals_default
+    flatten = settings.flatten_default
+    cleanup_empty_dirs = settings.cleanup_empty_dirs_default
+    sort_by_ppm = settings.sort_by_ppm_default
+    enable_renaming = state.encroachment_rename_enabled
+
+    if state.mode == RunMode.METHANE:
+        overwrite_originals = True
+        flatten = False
+        cleanup_empty_dirs = False
+        sort_by_ppm = False
+        enable_renaming = False
+    elif state.mode == RunMode.ENCROACHMENT:
+        overwrite_originals = False
+        flatten = False
+        cleanup_empty_dirs = False
+        sort_by_ppm = False
+    elif state.mode == RunMode.COMBINED:
+        overwrite_originals = True
+        flatten = False
+        cleanup_empty_dirs = False
+        sort_by_ppm = False
+
+    return JobOptions(
+        output_root=run_folder,
+        overwrite_originals=overwrite_originals,
+        create_backup_on_overwrite=settings.create_backup_on_overwrite,
+        flatten=flatten,
+        cleanup_empty_dirs=cleanup_empty_dirs,
+        sort_by_ppm=sort_by_ppm,
+        ppm_bin_edges=settings.ppm_bin_edges,
+        write_xmp=settings.write_xmp_default,
+        dry_run=settings.dry_run_default,
+        max_join_delta_seconds=settings.max_join_delta_seconds,
+        purway_payload="",
+        enable_renaming=enable_renaming,
+        rename_template=rename_template,
+        start_index=max(1, int(state.encroachment_start_index)),
+        run_mode=state.mode,
+        methane_threshold=state.methane_threshold,
+        methane_generate_kmz=state.methane_generate_kmz,
+        methane_export_formats=list(settings.methane_export_formats),
+        methane_hotspots=settings.methane_hotspots,
+        methane_hotspot_radius_m=settings.methane_hotspot_radius_m,
+        methane_log_base=resolved.methane_log_base,
+        encroachment_output_base=resolved.encroachment_output_base,
+        output_photos_root=output_photos_root,
+        pipelined=settings.pipelined_execution,
+    )
@@ -1,15 +1,43 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields, replace
 from pathlib import Path
+from typing import Any
 
-@dataclass
+from purway_geotagger.parsers.purway_csv import PhotoMatch
+
+# Values reported for CSV metadata while a task has no match record.
+MATCH_DEFAULTS: dict[str, Any] = {
+    f.name: ("" if f.name in ("csv_path", "image_description") else None) for f in fields(PhotoMatch)
+}
+MATCH_DEFAULTS["join_method"] = "NONE"
+MATCH_FIELDS = tuple(MATCH_DEFAULTS)
+
+
+def _match_field(name: str) -> property:
+    default = MATCH_DEFAULTS[name]
+
+    def _get(self: PhotoTask) -> Any:
+        return default if self.match is None else getattr(self.match, name)
+
+    def _set(self: PhotoTask, value: Any) -> None:
+        base = self.match if self.match is not None else PhotoMatch(**MATCH_DEFAULTS)
+        self.match = replace(base, **{name: value})
+
+    return property(_get, _set, doc=f"{name} from the shared match record.")
+
+
+@dataclass(slots=True)
 class PhotoTask:
     """Represents one photo through the processing pipeline.
 
     - src_path: original discovered photo path
     - work_path: current path being modified (either original or a copied version)
     - output_path: final output path after rename/flatten (starts as work_path)
+    - match: CSV metadata (frozen); shared, not copied, by clones of the task
+
+    The metadata fields (lat, ppm, join_method, ...) read through to `match`;
+    assigning one replaces this task's record with an updated copy.
     """
     src_path: Path
     work_path: Path
@@ -17,32 +45,47 @@ class PhotoTask:
 
     # Match / metadata
     matched: bool = False
-    join_method: str = "NONE"  # FILENAME|TIMESTAMP|NONE
-    csv_path: str = ""
-    lat: float | None = None
-    lon: float | None = None
-    ppm: float | None = None
-    datetime_original: str | None = None
-    image_description: str = ""
-
-    # Extended metadata from CSV
-    altitude: float | None = None
-    relative_altitude: float | None = None
-    light_intensity: float | None = None
-    uav_pitch: float | None = None
-    uav_roll: float | None = None
-    uav_yaw: float | None = None
-    gimbal_pitch: float | None = None
-    gimbal_roll: float | None = None
-    gimbal_yaw: float | None = None
-    camera_focal_length: float | None = None
-    camera_zoom: float | None = None
-    timestamp_raw: str | None = None
-
-    # Derived fields
-    pac: float | None = None  # Path Average Concentration: ppm / relative_altitude
+    match: PhotoMatch | None = None
 
     # Results
     status: str = "PENDING"  # SUCCESS|FAILED|SKIPPED|PENDING
     reason: str = ""
     exif_written: bool = False
+
+    join_method = _match_field("join_method")  # FILENAME|TIMESTAMP|NONE
+    csv_path = _match_field("csv_path")
+    lat = _match_field("lat")
+    lon = _match_field("lon")
+    ppm = _match_field("ppm")
+    datetime_original = _match_field("datetime_original")
+    image_description = _match_field("image_description")
+
+    # Extended metadata from CSV
+    altitude = _match_field("altitude")
+    relative_altitude = _match_field("relative_altitude")
+    light_intensity = _match_field("light_intensity")
+    uav_pitch = _match_field("uav_pitch")
+    uav_roll = _match_field("uav_roll")
+    uav_yaw = _match_field("uav_yaw")
+    gimbal_pitch = _match_field("gimbal_pitch")
+    gimbal_roll = _match_field("gimbal_roll")
+    gimbal_yaw = _match_field("gimbal_yaw")
+    camera_focal_length = _match_field("camera_focal_length")
+    camera_zoom = _match_field("camera_zoom")
+    timestamp_raw = _match_field("timestamp_raw")
+
+    # Derived fields
+    pac = _match_field("pac")  # Path Average Concentration: ppm / relative_altitude
+
+    def clone_to(self, path: Path) -> PhotoTask:
+        """A task for a copy of this photo at `path`, sharing the match record."""
+        return PhotoTask(
+            src_path=self.src_path,
+            work_path=path,
+            output_path=path,
+            matched=self.matched,
+            match=self.match,
+            status=self.status,
+            reason=self.reason,
+            exif_written=self.exif_written,
+        )
@@ -2,50 +2,101 @@ from __future__ import annotations
 
 from pathlib import Path
 from typing import Callable
+import itertools
 import json
 import time
-from dataclasses import asdict, is_dataclass
+from dataclasses import asdict, fields, is_dataclass
 
+from purway_geotagger.core.checkpoint import CHECKPOINT_NAME, CheckpointJournal, CheckpointState, load_checkpoint
 from purway_geotagger.core.job import Job, JobOptions
 from purway_geotagger.core.modes import RunMode, common_parent
-from purway_geotagger.core.run_summary import RunSummary, ExifSummary, MethaneOutputSummary, write_run_summary
+from purway_geotagger.core.run_summary import (
+    RunSummary,
+    ExifSummary,
+    MethaneOutputSummary,
+    PerformanceSummary,
+    StagePerformance,
+    write_run_summary,
+)
 from purway_geotagger.core.scanner import scan_inputs, ScanResult
 from purway_geotagger.core.photo_task import PhotoTask
-from purway_geotagger.core.manifest import ManifestRow, ManifestWriter
+from purway_geotagger.core.pipelined import apply_write_results, fail_unwritten, match_task, run_copy_match_write
+from purway_geotagger.core.manifest import ManifestRow, ManifestWriter, update_output_paths
+from purway_geotagger.core.run_db import RunDatabase, run_db_path
 from purway_geotagger.core.run_logger import RunLogger
-from purway_geotagger.parsers.purway_csv import PurwayCSVIndex
-from purway_geotagger.exif.exiftool_writer import ExifToolWriter
-from purway_geotagger.ops.copier import ensure_target_photos
+from purway_geotagger.core.stage_profiler import StageProfiler
+from purway_geotagger.parsers.purway_csv import CSVIndexCache, PurwayCSVIndex
+from purway_geotagger.exif.exiftool_writer import ExifToolSession, ExifToolWriter
+from purway_geotagger.ops.copier import ensure_target_photos, iter_target_photos
 from purway_geotagger.ops.sorter import sort_into_ppm_bins
 from purway_geotagger.ops.renamer import maybe_rename
 from purway_geotagger.ops.flattener import maybe_flatten
-from purway_geotagger.ops.methane_outputs import generate_methane_outputs, MethaneCsvResult
-from purway_geotagger.util.errors import UserCancelledError, CorrelationError, ExifToolError
+from purway_geotagger.ops.methane_outputs import (
+    build_photo_name_index,
+    generate_methane_outputs,
+    MethaneCsvResult,
+)
+from purway_geotagger.templates.models import RenameTemplate
+from purway_geotagger.templates.template_manager import compile_template
+from purway_geotagger.util.errors import UserCancelledError, ExifToolError
 
 ProgressCb = Callable[[int, str], None]  # percent, message
 CancelCb = Callable[[], bool]  # returns True if cancelled
 
-def run_job(job: Job, progress_cb: ProgressCb, cancel_cb: CancelCb) -> None:
+_FINAL_STATUSES = ("SUCCESS", "FAILED")
+
+def run_job(
+    job: Job,
+    progress_cb: ProgressCb,
+    cancel_cb: CancelCb,
+    resume: bool = False,
+    exiftool_session: ExifToolSession | None = None,
+    csv_cache: CSVIndexCache | None = None,
+) -> None:
     """Run a single job end-to-end (worker-thread safe).
 
     Outputs (must exist at end of run, even if failures occurred):
       - run_config.json
       - run_log.txt
       - manifest.csv
+      - run.sqlite
       - run_summary.json
+      - checkpoint.jsonl
+
+    With `resume=True` the run folder's checkpoint journal is replayed first:
+    verified photos and methane outputs from the earlier attempt are kept and
+    only the remaining work is done (see resume_job).
+
+    A long-lived caller (the job server) may pass a warm `exiftool_session`
+    and a `csv_cache` shared across jobs.
     """
     opts = job.options
     run_folder = opts.output_root
     job.run_folder = run_folder
     run_folder.mkdir(parents=True, exist_ok=True)
 
-    logger = RunLogger(run_folder / "run_log.txt")
-    logger.log("Job started.")
+    checkpoint = load_checkpoint(run_folder / CHECKPOINT_NAME) if resume else CheckpointState()
+    checkpoint.ensure_resumable()
+
+    logger = RunLogger(
+        run_folder / "run_log.txt",
+        jsonl_path=run_folder / "run_log.jsonl" if opts.log_jsonl else None,
+    )
+    logger.log("Job resumed from checkpoint." if resume else "Job started.", job_id=job.id)
     logger.log(f"Inputs: {[str(p) for p in job.inputs]}")
     _log_run_settings(logger, opts)
 
     _write_run_config(job, run_folder)
 
+    # Rows are appended as photos reach a terminal state (as each write batch
+    # finishes), so a crash keeps a manifest of every photo finished so far.
+    # Later renames/moves are applied to those rows when the run ends.
+    manifest = ManifestWriter(run_folder / "manifest.csv")
+    run_db = RunDatabase(run_db_path(run_folder))
+    journal = CheckpointJournal(run_folder / CHECKPOINT_NAME, append=resume)
+    manifest_emitted: dict[int, str] = {}  # id(task) -> output_path in its row
+    stages = _StageTracker(job, logger, run_db, journal)
+
     scan: ScanResult = ScanResult(photos=[], csvs=[])
     tasks: list[PhotoTask] = []
     tasks_for_manifest: list[PhotoTask] = []
@@ -55,31 +106,63 @@ def run_job(job: Job, progress_cb: ProgressCb, cancel_cb: CancelCb) -> None:
     cancelled = False
 
     try:
-        job.state.stage = "SCAN"
+        if opts.enable_renaming and opts.rename_template:
+            # Fail fast on malformed rename patterns before any photo is touched.
+            compile_template(opts.rename_template)
+
+        stages.enter("SCAN")
         progress_cb(0, "Scanning inputs...")
         scan = scan_inputs(job.inputs)
+        stages.items(len(scan.photos) + len(scan.csvs))
         job.state.scanned_photos = len(scan.photos)
         job.state.scanned_csvs = len(scan.csvs)
-        logger.log(f"Scanned photos: {job.state.scanned_photos}, CSVs: {job.state.scanned_csvs}")
+        logger.log(
+            f"Scanned photos: {job.state.scanned_photos}, CSVs: {job.state.scanned_csvs}",
+            photos=job.state.scanned_photos,
+            csvs=job.state.scanned_csvs,
+        )
 
         if cancel_cb():
             raise UserCancelledError()
 
-        job.state.stage = "PARSE"
+        stages.enter("PARSE")
         progress_cb(5, "Parsing CSV files...")
         logger.log("Parsing CSV files...")
-        csv_index = PurwayCSVIndex.from_csv_files(scan.csvs)
+        if csv_cache is not None:
+            csv_index = csv_cache.get(scan.csvs)
+        else:
+            csv_index = PurwayCSVIndex.from_csv_files(scan.csvs)
+        stages.items(len(scan.csvs))
 
         methane_failure_count = 0
         if opts.run_mode in (RunMode.METHANE, RunMode.COMBINED):
-            job.state.stage = "METHANE_OUTPUTS"
-            progress_cb(8, "Generating cleaned methane CSVs...")
-            logger.log("Generating cleaned methane CSVs...")
-            methane_results = generate_methane_outputs(
-                csv_paths=scan.csvs,
-                threshold=opts.methane_threshold,
-                generate_kmz=opts.methane_generate_kmz,
-            )
+            stages.enter("METHANE_OUTPUTS")
+            stages.items(len(scan.csvs))
+            restored_methane = checkpoint.methane_results()
+            if restored_methane is not None:
+                methane_results = restored_methane
+                logger.log("Methane outputs already complete; reusing them from the checkpoint.")
+            else:
+                progress_cb(8, "Generating cleaned methane CSVs...")
+                logger.log("Generating cleaned methane CSVs...")
+                methane_results = generate_methane_outputs(
+                    csv_paths=scan.csvs,
+                    threshold=opts.methane_threshold,
+                    generate_kmz=opts.methane_generate_kmz,
+                    ppm_bin_edges=opts.ppm_bin_edges,
+                    export_formats=opts.methane_export_formats,
+                    hotspot_radius_m=opts.methane_hotspot_radius_m if opts.methane_hotspots else None,
+                    photo_index=build_photo_name_index(
+                        scan.photos,
+                        folders=[c.parent for c in scan.csvs],
+                        roots=[p.expanduser().resolve() for p in job.inputs if p.is_dir()],
+                    ),
+                    progress_cb=lambda done, total: progress_cb(
+                        8 + int(2 * (done / max(1, total))),
+                        f"Methane outputs {done}/{total} CSVs...",
+                    ),
+                )
+                journal.methane_outputs(methane_results)
             methane_failure_count = _log_methane_results(
                 logger,
                 methane_results,
@@ -97,124 +180,121 @@ def run_job(job: Job, progress_cb: ProgressCb, cancel_cb: CancelCb) -> None:
         elif opts.run_mode == RunMode.COMBINED:
             overwrite = True
 
-        job.state.stage = "COPY" if not overwrite else "PREPARE"
-        progress_cb(10, "Preparing target photos...")
-        logger.log("Preparing target photos (copy/backup as needed)...")
+        copy_stage = "COPY" if not overwrite else "PREPARE"
         copy_root = opts.output_photos_root if opts.run_mode == RunMode.ENCROACHMENT else None
-        backup_root = run_folder / "BACKUPS"
-        backup_rel_base = common_parent(job.inputs)
-        target_map = ensure_target_photos(
-            photos=scan.photos,
+        plan = checkpoint.plan(scan.photos, copies=not overwrite)
+        if resume:
+            logger.log(
+                f"Checkpoint: {len(plan.restored)} photos done, {len(plan.reusable)} prepared, "
+                f"{len(plan.remaining)} remaining.",
+                restored=len(plan.restored),
+                reusable=len(plan.reusable),
+                remaining=len(plan.remaining),
+            )
+        tasks = list(plan.restored)
+        _count_restored(job, plan.restored)
+
+        def _batch_done(batch: list[PhotoTask]) -> None:
+            journal.photos_done(batch)
+            if opts.run_mode != RunMode.COMBINED:
+                # COMBINED lists the encroachment copies instead, which exist only later.
+                _emit_manifest_rows(manifest, run_db, batch, manifest_emitted, statuses=_FINAL_STATUSES)
+
+        if opts.run_mode != RunMode.COMBINED:
+            _emit_manifest_rows(manifest, run_db, plan.restored, manifest_emitted, statuses=_FINAL_STATUSES)
+        pending = len(plan.reusable) + len(plan.remaining)
+        targets = itertools.chain(plan.reusable, journal.track_prepared(iter_target_photos(
+            photos=plan.remaining,
             run_folder=run_folder,
             overwrite=overwrite,
             create_backup_on_overwrite=opts.create_backup_on_overwrite,
             copy_root=copy_root,
             use_subdir=(copy_root is None),
-            backup_root=backup_root,
-            backup_rel_base=backup_rel_base,
-        )
+            backup_root=run_folder / "BACKUPS",
+            backup_rel_base=common_parent(job.inputs),
+        )))
+        writer = ExifToolWriter(write_xmp=opts.write_xmp, dry_run=opts.dry_run, session=exiftool_session)
+
+        if opts.pipelined:
+            stages.enter(f"{copy_stage}+MATCH+WRITE")
+            stages.items(pending)
+            progress_cb(10, "Preparing, matching and writing photos...")
+            logger.log("Preparing, matching and writing photos (pipelined)...")
+            exif_error = run_copy_match_write(
+                job=job,
+                targets=targets,
+                total=pending,
+                csv_index=csv_index,
+                writer=writer,
+                work_dir=run_folder,
+                tasks=tasks,
+                progress_cb=progress_cb,
+                cancel_cb=cancel_cb,
+                on_batch_done=_batch_done,
+                on_worker_cpu=stages.profiler.add_cpu,
+            )
+            if exif_error:
+                error_message = exif_error
+                logger.log(f"EXIF write failed: {error_message}")
+        else:
+            stages.enter(copy_stage)
+            progress_cb(10, "Preparing target photos...")
+            logger.log("Preparing target photos (copy/backup as needed)...")
+            new_tasks = [
+                PhotoTask(src_path=src, work_path=tgt, output_path=tgt)
+                for src, tgt in targets
+            ]
+            tasks.extend(new_tasks)
+            stages.items(len(new_tasks))
 
-        tasks = [
-            PhotoTask(src_path=src, work_path=tgt, output_path=tgt)
-            for src, tgt in target_map.items()
-        ]
+            if cancel_cb():
+                raise UserCancelledError()
 
-        if cancel_cb():
-            raise UserCancelledError()
+            stages.enter("MATCH")
+            stages.items(len(new_tasks))
+            progress_cb(20, "Matching photos to CSV rows...")
+            logger.log("Matching photos to CSV rows...")
+            last_update = time.monotonic()
+            for i, t in enumerate(new_tasks):
+                if cancel_cb():
+                    raise UserCancelledError()
+
+                if match_task(t, csv_index, opts):
+                    job.state.matched += 1
+                else:
+                    job.state.failed += 1
+
+                now = time.monotonic()
+                if i % 25 == 0 or (now - last_update) >= 1.0:
+                    pct = 20 + int(30 * (i / max(1, len(new_tasks))))
+                    progress_cb(pct, f"Matched {i}/{len(new_tasks)} photos...")
+                    last_update = now
 
-        job.state.stage = "MATCH"
-        progress_cb(20, "Matching photos to CSV rows...")
-        logger.log("Matching photos to CSV rows...")
-        last_update = time.monotonic()
-        for i, t in enumerate(tasks):
             if cancel_cb():
                 raise UserCancelledError()
 
+            stages.enter("WRITE")
+            stages.items(len(new_tasks))
+            progress_cb(55, "Writing EXIF/XMP via ExifTool...")
+            logger.log("Writing EXIF/XMP via ExifTool...")
             try:
-                match = csv_index.match_photo(
-                    photo_path=t.src_path,
-                    max_join_delta_seconds=opts.max_join_delta_seconds,
+                results = writer.write_tasks(
+                    tasks=new_tasks,
+                    work_dir=run_folder,
+                    progress_cb=lambda done, total: progress_cb(
+                        55 + int(25 * (done / max(1, total))),
+                        f"Writing metadata {done}/{total}..."
+                    ),
+                    cancel_cb=cancel_cb,
                 )
-                t.matched = True
-                t.join_method = match.join_method
-                t.csv_path = match.csv_path
-                t.lat = match.lat
-                t.lon = match.lon
-                t.ppm = match.ppm
-                t.datetime_original = match.datetime_original
-                t.image_description = match.image_description
-                
-                # Extended fields
-                t.altitude = match.altitude
-                t.relative_altitude = match.relative_altitude
-                t.light_intensity = match.light_intensity
-                t.uav_pitch = match.uav_pitch
-                t.uav_roll = match.uav_roll
-                t.uav_yaw = match.uav_yaw
-                t.gimbal_pitch = match.gimbal_pitch
-                t.gimbal_roll = match.gimbal_roll
-                t.gimbal_yaw = match.gimbal_yaw
-                t.camera_focal_length = match.camera_focal_length
-                t.camera_zoom = match.camera_zoom
-                t.timestamp_raw = match.timestamp_raw
-                t.pac = match.pac
-
-                if opts.purway_payload:
-                    if t.image_description:
-                        t.image_description = f"{t.image_description}; purway_payload={opts.purway_payload}"
-                    else:
-                        t.image_description = f"purway_payload={opts.purway_payload}"
-                job.state.matched += 1
-            except CorrelationError as e:
-                t.status = "FAILED"
-                t.reason = str(e)
-                job.state.failed += 1
-
-            now = time.monotonic()
-            if i % 25 == 0 or (now - last_update) >= 1.0:
-                pct = 20 + int(30 * (i / max(1, len(tasks))))
-                progress_cb(pct, f"Matched {i}/{len(tasks)} photos...")
-                last_update = now
-
-        if cancel_cb():
-            raise UserCancelledError()
-
-        job.state.stage = "WRITE"
-        progress_cb(55, "Writing EXIF/XMP via ExifTool...")
-        logger.log("Writing EXIF/XMP via ExifTool...")
-        writer = ExifToolWriter(write_xmp=opts.write_xmp, dry_run=opts.dry_run)
-        try:
-            results = writer.write_tasks(
-                tasks=tasks,
-                work_dir=run_folder,
-                progress_cb=lambda done, total: progress_cb(
-                    55 + int(25 * (done / max(1, total))),
-                    f"Writing metadata {done}/{total}..."
-                ),
-                cancel_cb=cancel_cb,
-            )
-
-            for t in tasks:
-                if t.status == "FAILED" or not t.matched:
-                    continue
-                res = results.get(t.output_path)
-                if res and res.success:
-                    t.status = "SUCCESS"
-                    t.exif_written = (not opts.dry_run)
-                    job.state.success += 1
-                else:
-                    t.status = "FAILED"
-                    t.reason = (res.error if res else "unknown exiftool error")
-                    job.state.failed += 1
-        except ExifToolError as exc:
-            error_message = str(exc)
-            logger.log(f"EXIF write failed: {error_message}")
-            for t in tasks:
-                if not t.matched or t.status == "FAILED":
-                    continue
-                t.status = "FAILED"
-                t.reason = error_message
-                job.state.failed += 1
+                success, failed = apply_write_results(new_tasks, results, opts.dry_run)
+                job.state.success += success
+                job.state.failed += failed
+            except ExifToolError as exc:
+                error_message = str(exc)
+                logger.log(f"EXIF write failed: {error_message}")
+                job.state.failed += fail_unwritten(new_tasks, error_message)
+            _batch_done(new_tasks)
 
         exif_summary = _summarize_exif(tasks)
         logger.log(f"EXIF injected: {exif_summary.success}/{exif_summary.total} photos.")
@@ -224,7 +304,7 @@ def run_job(job: Job, progress_cb: ProgressCb, cancel_cb: CancelCb) -> None:
 
         post_tasks = tasks
         if opts.run_mode == RunMode.COMBINED:
-            job.state.stage = "ENCROACHMENT_COPY"
+            stages.enter("ENCROACHMENT_COPY")
             progress_cb(78, "Preparing encroachment copies...")
             logger.log("Preparing encroachment copies...")
             copy_root = opts.output_photos_root or opts.encroachment_output_base or run_folder
@@ -239,10 +319,15 @@ def run_job(job: Job, progress_cb: ProgressCb, cancel_cb: CancelCb) -> None:
                 backup_rel_base=None,
             )
             post_tasks = _clone_tasks_for_copy(tasks, copy_map)
+            stages.items(len(copy_map))
 
         tasks_for_manifest = post_tasks
+        # Statuses are final after WRITE; later stages only rename or move SUCCESS photos.
+        _emit_manifest_rows(manifest, run_db, post_tasks, manifest_emitted, statuses=_FINAL_STATUSES)
+        manifest.flush()
 
-        job.state.stage = "RENAME"
+        stages.enter("RENAME")
+        stages.items(len(post_tasks))
         progress_cb(82, "Renaming (if enabled)...")
         logger.log("Renaming (if enabled)...")
         maybe_rename(job, post_tasks)
@@ -250,7 +335,8 @@ def run_job(job: Job, progress_cb: ProgressCb, cancel_cb: CancelCb) -> None:
         if cancel_cb():
             raise UserCancelledError()
 
-        job.state.stage = "SORT"
+        stages.enter("SORT")
+        stages.items(len(post_tasks))
         progress_cb(88, "Sorting by PPM (if enabled)...")
         logger.log("Sorting by PPM (if enabled)...")
         if opts.sort_by_ppm:
@@ -259,7 +345,8 @@ def run_job(job: Job, progress_cb: ProgressCb, cancel_cb: CancelCb) -> None:
         if cancel_cb():
             raise UserCancelledError()
 
-        job.state.stage = "FLATTEN"
+        stages.enter("FLATTEN")
+        stages.items(len(post_tasks))
         progress_cb(94, "Flattening/moving JPGs (if enabled)...")
         logger.log("Flattening/moving JPGs (if enabled)...")
         maybe_flatten(job, post_tasks)
@@ -270,6 +357,7 @@ def run_job(job: Job, progress_cb: ProgressCb, cancel_cb: CancelCb) -> None:
         if error_message:
             raise RuntimeError(error_message)
 
+        stages.end()
         job.state.stage = "DONE"
         logger.log("Job finished.")
         progress_cb(100, "Done.")
@@ -283,19 +371,38 @@ def run_job(job: Job, progress_cb: ProgressCb, cancel_cb: CancelCb) -> None:
         logger.log(f"Job failed: {error_message}")
         raise
     finally:
+        stages.end(completed=False)
+        journal.close()
         logger.log("Writing manifest...")
         manifest_tasks = tasks_for_manifest or tasks
-        _write_manifest(
-            run_folder,
+        _finish_manifest(
+            manifest,
+            run_db,
             manifest_tasks,
+            manifest_emitted,
             scan.photos,
             error_message if (cancelled or error_message) else "",
         )
         try:
-            summary = _build_run_summary(job, exif_summary, methane_results)
+            summary = _build_run_summary(job, exif_summary, methane_results, stages.profiler.summary())
             write_run_summary(run_folder / "run_summary.json", summary)
+            run_db.add_methane_outputs(summary.methane_outputs)
         except Exception as exc:  # pragma: no cover - do not crash on summary failures
             logger.log(f"Run summary failed: {exc}")
+        finally:
+            run_db.close()
+            logger.close()
+
+def resume_job(run_folder: Path, progress_cb: ProgressCb, cancel_cb: CancelCb) -> Job:
+    """Finish a cancelled or interrupted run in place.
+
+    The job is rebuilt from run_config.json and re-run with the checkpoint
+    journal, so photos already written (and verified on disk) are not copied,
+    matched or written again. Raises ResumeError if the run cannot be resumed.
+    """
+    job = load_run_config(run_folder)
+    run_job(job, progress_cb, cancel_cb, resume=True)
+    return job
 
 def _log_run_settings(logger: RunLogger, opts: JobOptions) -> None:
     mode = opts.run_mode.value if isinstance(opts.run_mode, RunMode) else "custom"
@@ -303,6 +410,10 @@ def _log_run_settings(logger: RunLogger, opts: JobOptions) -> None:
     if opts.run_mode in (RunMode.METHANE, RunMode.COMBINED):
         logger.log(f"Methane threshold: {opts.methane_threshold}")
         logger.log(f"KMZ enabled: {'Yes' if opts.methane_generate_kmz else 'No'}")
+        if opts.methane_export_formats:
+            logger.log(f"Geo exports: {', '.join(opts.methane_export_formats)}")
+        if opts.methane_hotspots:
+            logger.log(f"Hotspot radius: {opts.methane_hotspot_radius_m:g} m")
     if opts.run_mode in (RunMode.ENCROACHMENT, RunMode.COMBINED):
         if opts.output_photos_root:
             logger.log(f"Encroachment output: {opts.output_photos_root}")
@@ -319,6 +430,11 @@ def _log_methane_results(
     results: list[MethaneCsvResult],
     kmz_enabled: bool,
 ) -> int:
+    """Log per-CSV methane output results; returns how many CSVs failed.
+
+    Hotspot clustering is a derived, optional analysis: its failures are
+    logged as warnings (and kept in the run summary) but do not fail the job.
+    """
     if not results:
         logger.log("No methane CSVs found for cleaned outputs.")
         return 0
@@ -356,8 +472,24 @@ def _log_methane_results(
             )
         if r.kmz_status == "failed":
             logger.log(f"KMZ failed for {r.source_csv}: {r.kmz_error}")
-
-    return cleaned_failed + kmz_failed
+        for fmt, reason in r.export_skipped.items():
+            logger.log(f"{fmt} export skipped for {r.source_csv}: {reason}")
+        for fmt, reason in r.export_errors.items():
+            logger.log(f"{fmt} export failed for {r.source_csv}: {reason}")
+        if r.hotspot_status == "success":
+            logger.log(f"{r.source_csv}: {r.hotspot_count} hotspots.")
+        elif r.hotspot_error:
+            if r.hotspot_status == "failed":
+                logger.log(f"Warning: hotspots failed for {r.source_csv}: {r.hotspot_error}")
+            else:
+                logger.log(f"Hotspots skipped for {r.source_csv}: {r.hotspot_error}")
+
+    if any(r.exports or r.export_errors for r in results):
+        written = sum(len(r.exports) for r in results)
+        failed = sum(len(r.export_errors) for r in results)
+        logger.log(f"Geo exports: {written} written, {failed} failed.")
+    export_failed = sum(1 for r in results if r.export_errors)
+    return cleaned_failed + kmz_failed + export_failed
 
 
 def _summarize_exif(tasks: list[PhotoTask]) -> ExifSummary:
@@ -367,6 +499,17 @@ def _summarize_exif(tasks: list[PhotoTask]) -> ExifSummary:
     return ExifSummary(total=total, success=success, failed=failed)
 
 
+def _count_restored(job: Job, tasks: list[PhotoTask]) -> None:
+    """Add tasks finished by an earlier attempt to the job counters."""
+    for t in tasks:
+        if t.matched:
+            job.state.matched += 1
+        if t.status == "SUCCESS":
+            job.state.success += 1
+        else:
+            job.state.failed += 1
+
+
 def _clone_tasks_for_copy(
     source_tasks: list[PhotoTask],
     copy_map: dict[Path, Path],
@@ -375,35 +518,10 @@ def _clone_tasks_for_copy(
     clones: list[PhotoTask] = []
     for src, dest in copy_map.items():
         base = by_src.get(src)
-        clone = PhotoTask(src_path=src, work_path=dest, output_path=dest)
         if base:
-            clone.matched = base.matched
-            clone.join_method = base.join_method
-            clone.csv_path = base.csv_path
-            clone.lat = base.lat
-            clone.lon = base.lon
-            clone.ppm = base.ppm
-            clone.datetime_original = base.datetime_original
-            clone.image_description = base.image_description
-            clone.status = base.status
-            clone.reason = base.reason
-            clone.exif_written = base.exif_written
-            
-            # Extended fields
-            clone.altitude = base.altitude
-            clone.relative_altitude = base.relative_altitude
-            clone.light_intensity = base.light_intensity
-            clone.uav_pitch = base.uav_pitch
-            clone.uav_roll = base.uav_roll
-            clone.uav_yaw = base.uav_yaw
-            clone.gimbal_pitch = base.gimbal_pitch
-            clone.gimbal_roll = base.gimbal_roll
-            clone.gimbal_yaw = base.gimbal_yaw
-            clone.camera_focal_length = base.camera_focal_length
-            clone.camera_zoom = base.camera_zoom
-            clone.timestamp_raw = base.timestamp_raw
-            clone.pac = base.pac
-        clones.append(clone)
+            clones.append(base.clone_to(dest))
+        else:
+            clones.append(PhotoTask(src_path=src, work_path=dest, output_path=dest))
     return clones
 
 
@@ -411,6 +529,7 @@ def _build_run_summary(
     job: Job,
     exif_summary: ExifSummary,
     methane_results: list[MethaneCsvResult],
+    performance: PerformanceSummary | None = None,
 ) -> RunSummary:
     outputs: list[MethaneOutputSummary] = []
     for r in methane_results:
@@ -427,6 +546,13 @@ def _build_run_summary(
             kmz_status=r.kmz_status,
             kmz_rows=r.kmz_rows,
             kmz_error=r.kmz_error,
+            exports={fmt: str(p) for fmt, p in r.exports.items()},
+            export_errors=dict(r.export_errors),
+            hotspot_status=r.hotspot_status,
+            hotspot_count=r.hotspot_count,
+            hotspot_csv=str(r.hotspot_csv) if r.hotspot_csv else None,
+            hotspot_json=str(r.hotspot_json) if r.hotspot_json else None,
+            hotspot_error=r.hotspot_error,
         ))
 
     opts = job.options
@@ -434,6 +560,9 @@ def _build_run_summary(
     settings = {
         "methane_threshold": opts.methane_threshold,
         "methane_generate_kmz": opts.methane_generate_kmz,
+        "methane_export_formats": list(opts.methane_export_formats),
+        "methane_hotspots": opts.methane_hotspots,
+        "methane_hotspot_radius_m": opts.methane_hotspot_radius_m,
         "enable_renaming": opts.enable_renaming,
         "start_index": opts.start_index,
         "dry_run": opts.dry_run,
@@ -449,6 +578,7 @@ def _build_run_summary(
         settings=settings,
         exif=exif_summary,
         methane_outputs=outputs,
+        performance=performance,
     )
 
 def _write_run_config(job: Job, run_folder: Path) -> None:
@@ -463,6 +593,29 @@ def _write_run_config(job: Job, run_folder: Path) -> None:
     }
     path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
 
+def load_run_config(run_folder: Path) -> Job:
+    """Rebuild the Job recorded in a run folder's run_config.json."""
+    payload = json.loads((run_folder / "run_config.json").read_text(encoding="utf-8"))
+    known = {f.name for f in fields(JobOptions)}
+    options = {k: v for k, v in payload.get("options", {}).items() if k in known}
+    for key in ("methane_log_base", "encroachment_output_base", "output_photos_root"):
+        if options.get(key):
+            options[key] = Path(options[key])
+    if options.get("run_mode"):
+        options["run_mode"] = RunMode(options["run_mode"])
+    if options.get("rename_template"):
+        options["rename_template"] = RenameTemplate(**options["rename_template"])
+    options["output_root"] = run_folder
+    job_info = payload.get("job", {})
+    job = Job(
+        id=job_info.get("id", run_folder.name),
+        name=job_info.get("name", run_folder.name),
+        inputs=[Path(p) for p in job_info.get("inputs", [])],
+        options=JobOptions(**options),
+    )
+    job.run_folder = run_folder
+    return job
+
 def _jsonify(obj):
     """Recursively convert dataclass/asdict output into JSON-safe types."""
     if isinstance(obj, dict):
@@ -473,63 +626,131 @@ def _jsonify(obj):
         return str(obj)
     return obj
 
-def _write_manifest(
-    run_folder: Path,
+class _StageTracker:
+    """Moves the job between stages: flushes the log and records stage performance."""
+
+    def __init__(self, job: Job, logger: RunLogger, run_db: RunDatabase, journal: CheckpointJournal) -> None:
+        self.job = job
+        self.logger = logger
+        self.run_db = run_db
+        self.journal = journal
+        self.profiler = StageProfiler()
+
+    def enter(self, stage: str) -> None:
+        self._record(self.profiler.enter(stage), completed=True)
+        self.journal.stage_started(stage)
+        self.logger.set_stage(stage)
+        self.job.state.stage = stage
+
+    def items(self, count: int) -> None:
+        self.profiler.set_items(count)
+
+    def end(self, completed: bool = True) -> None:
+        """Close the current stage; only `completed` stages are checkpointed as done."""
+        self._record(self.profiler.end(), completed)
+
+    def _record(self, perf: StagePerformance | None, completed: bool) -> None:
+        if perf is None:
+            return
+        if completed:
+            self.journal.stage_done(perf.stage)
+        items = f", {perf.items} items ({perf.items_per_second}/s)" if perf.items is not None else ""
+        self.logger.log(
+            f"Stage {perf.stage}: {perf.wall_seconds:.2f}s wall, {perf.cpu_seconds:.2f}s job CPU{items}",
+            **asdict(perf),
+        )
+        self.run_db.add_stage(perf)
+
+
+def _emit_manifest_rows(
+    manifest: ManifestWriter,
+    run_db: RunDatabase,
+    tasks: list[PhotoTask],
+    emitted: dict[int, str],
+    default_reason: str = "",
+    statuses: tuple[str, ...] | None = None,
+) -> None:
+    """Append manifest/run.sqlite rows for tasks not yet written (optionally only some statuses)."""
+    for t in tasks:
+        if id(t) in emitted or (statuses is not None and t.status not in statuses):
+            continue
+        row = _manifest_row(t, default_reason)
+        manifest.add(row)
+        run_db.add_task(row)
+        emitted[id(t)] = row.output_path
+
+
+def _finish_manifest(
+    manifest: ManifestWriter,
+    run_db: RunDatabase,
     tasks: list[PhotoTask],
+    emitted: dict[int, str],
     scanned_photos: list[Path],
     default_reason: str,
 ) -> None:
-    """Write manifest.csv for all discovered photos.
+    """Write the remaining task rows, close manifest.csv and apply renames/moves.
 
-    Ensures a manifest is written even if the job failed or was cancelled.
+    Ensures every discovered photo has a row even if the job failed or was
+    cancelled. Rows written before RENAME/FLATTEN get their final output path.
     """
-    manifest = ManifestWriter(run_folder / "manifest.csv")
-
-    if tasks:
-        for t in tasks:
-            status = t.status
-            if status == "PENDING":
-                status = "FAILED" if default_reason else ("FAILED" if not t.matched else "PENDING")
-            reason = t.reason or default_reason
-            manifest.add(ManifestRow(
-                source_path=str(t.src_path),
-                output_path=str(t.output_path),
-                status=status,
-                reason=reason,
-                lat="" if t.lat is None else str(t.lat),
-                lon="" if t.lon is None else str(t.lon),
-                ppm="" if t.ppm is None else str(t.ppm),
-                csv_path=t.csv_path,
-                join_method=t.join_method,
-                exif_written="YES" if t.exif_written else "NO",
-                # Extended fields
-                altitude="" if t.altitude is None else str(t.altitude),
-                relative_altitude="" if t.relative_altitude is None else str(t.relative_altitude),
-                light_intensity="" if t.light_intensity is None else str(t.light_intensity),
-                pac="" if t.pac is None else str(t.pac),
-                uav_pitch="" if t.uav_pitch is None else str(t.uav_pitch),
-                uav_roll="" if t.uav_roll is None else str(t.uav_roll),
-                uav_yaw="" if t.uav_yaw is None else str(t.uav_yaw),
-                gimbal_pitch="" if t.gimbal_pitch is None else str(t.gimbal_pitch),
-                gimbal_roll="" if t.gimbal_roll is None else str(t.gimbal_roll),
-                gimbal_yaw="" if t.gimbal_yaw is None else str(t.gimbal_yaw),
-                camera_focal_length="" if t.camera_focal_length is None else str(t.camera_focal_length),
-                camera_zoom="" if t.camera_zoom is None else str(t.camera_zoom),
-                capture_time=t.timestamp_raw or "",
-            ))
-    else:
-        for p in scanned_photos:
-            manifest.add(ManifestRow(
-                source_path=str(p),
-                output_path="",
-                status="FAILED" if default_reason else "PENDING",
-                reason=default_reason,
-                lat="",
-                lon="",
-                ppm="",
-                csv_path="",
-                join_method="NONE",
-                exif_written="NO",
-            ))
-
-    manifest.write()
+    try:
+        if tasks:
+            _emit_manifest_rows(manifest, run_db, tasks, emitted, default_reason)
+        else:
+            for p in scanned_photos:
+                row = ManifestRow(
+                    source_path=str(p),
+                    output_path="",
+                    status="FAILED" if default_reason else "PENDING",
+                    reason=default_reason,
+                    lat="",
+                    lon="",
+                    ppm="",
+                    csv_path="",
+                    join_method="NONE",
+                    exif_written="NO",
+                )
+                manifest.add(row)
+                run_db.add_task(row)
+    finally:
+        manifest.close()
+    moves = {
+        str(t.src_path): str(t.output_path)
+        for t in tasks
+        if id(t) in emitted and emitted[id(t)] != str(t.output_path)
+    }
+    if moves:
+        update_output_paths(manifest.path, moves)
+        run_db.update_output_paths(moves)
+
+
+def _manifest_row(t: PhotoTask, default_reason: str) -> ManifestRow:
+    status = t.status
+    if status == "PENDING":
+        status = "FAILED" if default_reason else ("FAILED" if not t.matched else "PENDING")
+    return ManifestRow(
+        source_path=str(t.src_path),
+        output_path=str(t.output_path),
+        status=status,
+        reason=t.reason or default_reason,
+        lat="" if t.lat is None else str(t.lat),
+        lon="" if t.lon is None else str(t.lon),
+        ppm="" if t.ppm is None else str(t.ppm),
+        csv_path=t.csv_path,
+        join_method=t.join_method,
+        exif_written="YES" if t.exif_written else "NO",
+        # Extended fields
+        altitude="" if t.altitude is None else str(t.altitude),
+        relative_altitude="" if t.relative_altitude is None else str(t.relative_altitude),
+        light_intensity="" if t.light_intensity is None else str(t.light_intensity),
+        pac="" if t.pac is None else str(t.pac),
+        uav_pitch="" if t.uav_pitch is None else str(t.uav_pitch),
+        uav_roll="" if t.uav_roll is None else str(t.uav_roll),
+        uav_yaw="" if t.uav_yaw is None else str(t.uav_yaw),
+        gimbal_pitch="" if t.gimbal_pitch is None else str(t.gimbal_pitch),
+        gimbal_roll="" if t.gimbal_roll is None else str(t.gimbal_roll),
+        gimbal_yaw="" if t.gimbal_yaw is None else str(t.gimbal_yaw),
+        camera_focal_length="" if t.camera_focal_length is None else str(t.camera_focal_length),
+        camera_zoom="" if t.camera_zoom is None else str(t.camera_zoom),
+        capture_time=t.timestamp_raw or "",
+    )
@@ -0,0 +1,229 @@
+"""Per-photo match/write helpers and the overlapped copy -> match -> write mode."""
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+import queue
+import threading
+import time
+from typing import Callable, Iterable
+
+from purway_geotagger.core.job import Job, JobOptions
+from purway_geotagger.core.photo_task import PhotoTask
+from purway_geotagger.exif.exiftool_writer import ExifToolWriter, ExifWriteResult
+from purway_geotagger.parsers.purway_csv import PurwayCSVIndex
+from purway_geotagger.util.errors import CorrelationError, ExifToolError, UserCancelledError
+
+WRITE_BATCH_SIZE = 250  # photos per ExifTool invocation in pipelined mode
+MATCH_QUEUE_SIZE = 512  # copied photos waiting to be matched
+WRITE_QUEUE_SIZE = 2  # matched batches waiting for ExifTool
+_POLL_SECONDS = 0.1
+_DONE = object()
+
+
+def match_task(task: PhotoTask, csv_index: PurwayCSVIndex, opts: JobOptions) -> bool:
+    """Correlate one photo with its CSV row and attach the (immutable) match record.
+
+    Returns True when matched; otherwise marks the task FAILED with the reason.
+    """
+    try:
+        match = csv_index.match_photo(
+            photo_path=task.src_path,
+            max_join_delta_seconds=opts.max_join_delta_seconds,
+        )
+    except CorrelationError as e:
+        task.status = "FAILED"
+        task.reason = str(e)
+        return False
+
+    if opts.purway_payload:
+        if match.image_description:
+            desc = f"{match.image_description}; purway_payload={opts.purway_payload}"
+        else:
+            desc = f"purway_payload={opts.purway_payload}"
+        match = replace(match, image_description=desc)
+
+    task.matched = True
+    task.match = match
+    return True
+
+
+def apply_write_results(
+    tasks: Iterable[PhotoTask],
+    results: dict[Path, ExifWriteResult],
+    dry_run: bool,
+) -> tuple[int, int]:
+    """Set SUCCESS/FAILED on matched tasks from ExifTool results; returns (success, failed)."""
+    success = failed = 0
+    for t in tasks:
+        if t.status == "FAILED" or not t.matched:
+            continue
+        res = results.get(t.output_path)
+        if res and res.success:
+            t.status = "SUCCESS"
+            t.exif_written = not dry_run
+            success += 1
+        else:
+            t.status = "FAILED"
+            t.reason = res.error if res else "unknown exiftool error"
+            failed += 1
+    return success, failed
+
+
+def fail_unwritten(tasks: Iterable[PhotoTask], error: str) -> int:
+    """Mark matched tasks that were not written as FAILED; returns how many."""
+    failed = 0
+    for t in tasks:
+        if not t.matched or t.status == "FAILED":
+            continue
+        t.status = "FAILED"
+        t.reason = error
+        failed += 1
+    return failed
+
+
+def run_copy_match_write(
+    job: Job,
+    targets: Iterable[tuple[Path, Path]],
+    total: int,
+    csv_index: PurwayCSVIndex,
+    writer: ExifToolWriter,
+    work_dir: Path,
+    tasks: list[PhotoTask],
+    progress_cb: Callable[[int, str], None],
+    cancel_cb: Callable[[], bool],
+    batch_size: int | None = None,
+    on_batch_done: Callable[[list[PhotoTask]], None] | None = None,
+    on_worker_cpu: Callable[[float], None] | None = None,
+) -> str:
+    """Copy, match and write photos as overlapping producer/consumer stages.
+
+    A copier thread walks `targets` (see ops.copier.iter_target_photos) and
+    appends each new task to `tasks`, a matcher thread correlates them and
+    groups them into batches, and the calling thread runs ExifTool on each
+    batch. Bounded queues between the stages provide backpressure. Task
+    statuses, reasons and job counters end up exactly as in the sequential
+    stages. `on_batch_done` is called with each batch once its statuses are
+    final. `on_worker_cpu` receives the CPU seconds the copier and matcher
+    threads used, once they have stopped. Returns the first ExifTool error
+    ("" if none); after such an error the remaining matched photos are failed
+    without invoking ExifTool.
+    """
+    opts = job.options
+    batch_size = batch_size or WRITE_BATCH_SIZE
+    stop = threading.Event()
+    errors: list[BaseException] = []
+    worker_cpu: list[float] = []
+    to_match: queue.Queue = queue.Queue(maxsize=MATCH_QUEUE_SIZE)
+    to_write: queue.Queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+
+    def _put(q: queue.Queue, item: object) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _guard(fn: Callable[[], None], out: queue.Queue) -> Callable[[], None]:
+        def run() -> None:
+            try:
+                fn()
+            except BaseException as exc:  # surfaced on the calling thread
+                errors.append(exc)
+                stop.set()
+            finally:
+                worker_cpu.append(time.thread_time())
+                _put(out, _DONE)
+        return run
+
+    def _copy() -> None:
+        for src, tgt in targets:
+            if stop.is_set() or cancel_cb():
+                stop.set()
+                return
+            task = PhotoTask(src_path=src, work_path=tgt, output_path=tgt)
+            tasks.append(task)
+            if not _put(to_match, task):
+                return
+
+    def _match() -> None:
+        batch: list[PhotoTask] = []
+        while not stop.is_set():
+            try:
+                item = to_match.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+            if item is _DONE:
+                break
+            match_task(item, csv_index, opts)
+            batch.append(item)
+            if len(batch) >= batch_size:
+                if not _put(to_write, batch):
+                    return
+                batch = []
+        if batch:
+            _put(to_write, batch)
+
+    threads = [
+        threading.Thread(target=_guard(_copy, to_match), name="pipeline-copy", daemon=True),
+        threading.Thread(target=_guard(_match, to_write), name="pipeline-match", daemon=True),
+    ]
+    for t in threads:
+        t.start()
+
+    exif_error = ""
+    done = 0
+    try:
+        while True:
+            if cancel_cb():
+                raise UserCancelledError()
+            if errors:
+                raise errors[0]
+            try:
+                batch = to_write.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+            if batch is _DONE:
+                break
+
+            for t in batch:
+                if t.matched:
+                    job.state.matched += 1
+                elif t.status == "FAILED":
+                    job.state.failed += 1
+            if exif_error:
+                job.state.failed += fail_unwritten(batch, exif_error)
+            else:
+                try:
+                    results = writer.write_tasks(
+                        tasks=batch,
+                        work_dir=work_dir,
+                        progress_cb=lambda _done, _total: None,
+                        cancel_cb=cancel_cb,
+                    )
+                except ExifToolError as exc:
+                    exif_error = str(exc)
+                    job.state.failed += fail_unwritten(batch, exif_error)
+                else:
+                    success, failed = apply_write_results(batch, results, opts.dry_run)
+                    job.state.success += success
+                    job.state.failed += failed
+            if on_batch_done is not None:
+                on_batch_done(batch)
+
+            done += len(batch)
+            progress_cb(
+                10 + int(70 * (done / max(1, total))),
+                f"Geotagged {done}/{total} photos (copy, match and write overlapped)...",
+            )
+        if errors:
+            raise errors[0]
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+        if on_worker_cpu is not None:
+            on_worker_cpu(sum(worker_cpu))
+    return exif_error
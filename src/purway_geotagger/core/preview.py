@@ -1,12 +1,22 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
+import math
 from pathlib import Path
+from typing import Callable, Iterator
 
 from purway_geotagger.core.scanner import scan_inputs, ScanResult
-from purway_geotagger.parsers.purway_csv import PurwayCSVIndex, inspect_csv_schema, CSVSchema
+from purway_geotagger.parsers.purway_csv import PhotoMatch, PurwayCSVIndex, inspect_csv_schema, CSVSchema
 from purway_geotagger.util.errors import CorrelationError
 
+PREVIEW_BATCH_ROWS = 500  # rows handed to on_batch at a time when streaming
+
+PREVIEW_FIELDS = (
+    "status", "join_method", "photo_path", "csv_path", "lat", "lon", "ppm", "datetime_original", "reason",
+)
+STATUSES = ("MATCHED", "FAILED")
+
 
 @dataclass
 class PreviewRow:
@@ -21,58 +31,196 @@ class PreviewRow:
     reason: str
 
 
+def _fmt_float(value: float) -> str:
+    return "" if math.isnan(value) else str(value)
+
+
+class PreviewStore:
+    """Column-oriented preview rows.
+
+    Status, join method and CSV path are stored as small codes into shared
+    tables and coordinates as doubles, so tens of thousands of rows stay
+    compact. Indexing returns a PreviewRow built on demand; value() and
+    sort_rows() read single fields without building one.
+    """
+
+    def __init__(self) -> None:
+        self._photo: list[str] = []
+        self._status = array("B")
+        self._join = array("B")
+        self._csv = array("I")
+        self._lat = array("d")
+        self._lon = array("d")
+        self._ppm = array("d")
+        self._datetime: list[str] = []
+        self._reason: list[str] = []
+        self._joins: list[str] = ["NONE"]
+        self._csvs: list[str] = [""]
+        self._join_codes: dict[str, int] = {"NONE": 0}
+        self._csv_codes: dict[str, int] = {"": 0}
+
+    def __len__(self) -> int:
+        return len(self._photo)
+
+    def __getitem__(self, i: int) -> PreviewRow:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return PreviewRow(**{name: self.value(i, name) for name in PREVIEW_FIELDS})
+
+    def __iter__(self) -> Iterator[PreviewRow]:
+        return (self[i] for i in range(len(self)))
+
+    def add_match(self, photo_path: Path, match: PhotoMatch) -> None:
+        self._append(
+            str(photo_path), 0, self._code(self._joins, self._join_codes, match.join_method),
+            self._code(self._csvs, self._csv_codes, match.csv_path),
+            match.lat, match.lon, match.ppm, match.datetime_original or "", "",
+        )
+
+    def add_failure(self, photo_path: Path, reason: str) -> None:
+        nan = math.nan
+        self._append(str(photo_path), 1, 0, 0, nan, nan, nan, "", reason)
+
+    def extend(self, other: PreviewStore) -> None:
+        """Append all rows of `other` (re-coding its shared tables)."""
+        joins = [self._code(self._joins, self._join_codes, j) for j in other._joins]
+        csvs = [self._code(self._csvs, self._csv_codes, c) for c in other._csvs]
+        self._photo.extend(other._photo)
+        self._status.extend(other._status)
+        self._join.extend(joins[c] for c in other._join)
+        self._csv.extend(csvs[c] for c in other._csv)
+        self._lat.extend(other._lat)
+        self._lon.extend(other._lon)
+        self._ppm.extend(other._ppm)
+        self._datetime.extend(other._datetime)
+        self._reason.extend(other._reason)
+
+    def value(self, i: int, name: str) -> str:
+        """Field `name` (one of PREVIEW_FIELDS) of row `i`, formatted as in PreviewRow."""
+        if name == "status":
+            return STATUSES[self._status[i]]
+        if name == "join_method":
+            return self._joins[self._join[i]]
+        if name == "photo_path":
+            return self._photo[i]
+        if name == "csv_path":
+            return self._csvs[self._csv[i]]
+        if name in ("lat", "lon", "ppm"):
+            return _fmt_float(getattr(self, f"_{name}")[i])
+        if name == "datetime_original":
+            return self._datetime[i]
+        if name == "reason":
+            return self._reason[i]
+        raise KeyError(name)
+
+    def sort_rows(self, rows: list[int], name: str, descending: bool = False) -> list[int]:
+        """`rows` (row numbers) ordered by field `name`; numbers sort numerically, blanks last."""
+        if name in ("lat", "lon", "ppm"):
+            col = getattr(self, f"_{name}")
+            blank = [i for i in rows if math.isnan(col[i])]
+            filled = sorted((i for i in rows if not math.isnan(col[i])), key=col.__getitem__, reverse=descending)
+            return filled + blank
+        if name == "status":
+            key = self._status.__getitem__
+        elif name == "join_method":
+            joins, codes = self._joins, self._join
+            key = lambda i: joins[codes[i]]
+        elif name == "csv_path":
+            csvs, codes = self._csvs, self._csv
+            key = lambda i: csvs[codes[i]]
+        else:
+            key = {"photo_path": self._photo, "datetime_original": self._datetime, "reason": self._reason}[name].__getitem__
+        return sorted(rows, key=key, reverse=descending)
+
+    def rows_where(self, status: str | None = None, join_method: str | None = None) -> list[int]:
+        """Row numbers matching the given status and/or join method (None = any)."""
+        rows: range | list[int] = range(len(self))
+        if status is not None:
+            code = STATUSES.index(status)
+            col = self._status
+            rows = [i for i in rows if col[i] == code]
+        if join_method is not None:
+            jcode = self._join_codes.get(join_method)
+            col = self._join
+            rows = [i for i in rows if col[i] == jcode]
+        return list(rows)
+
+    @staticmethod
+    def _code(table: list[str], codes: dict[str, int], value: str) -> int:
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(table)
+            table.append(value)
+        return code
+
+    def _append(
+        self, photo: str, status: int, join: int, csv: int,
+        lat: float, lon: float, ppm: float, dt: str, reason: str,
+    ) -> None:
+        self._photo.append(photo)
+        self._status.append(status)
+        self._join.append(join)
+        self._csv.append(csv)
+        self._lat.append(lat)
+        self._lon.append(lon)
+        self._ppm.append(ppm)
+        self._datetime.append(dt)
+        self._reason.append(reason)
+
+
 @dataclass
 class PreviewResult:
     scanned_photos: int
     scanned_csvs: int
-    rows: list[PreviewRow]
+    rows: PreviewStore
     schemas: list[CSVSchema]
 
 
 def build_preview(
     inputs: list[Path],
-    max_rows: int,
+    max_rows: int | None,
     max_join_delta_seconds: int,
+    on_batch: Callable[[PreviewStore], None] | None = None,
+    on_scanned: Callable[[PreviewResult], None] | None = None,
+    cancel_cb: Callable[[], bool] | None = None,
+    batch_size: int = PREVIEW_BATCH_ROWS,
 ) -> PreviewResult:
+    """Match up to `max_rows` photos (None = all) against the scanned CSVs.
+
+    Without `on_batch` every row is kept in the result. With it, rows are
+    handed over in batches of `batch_size` as they are matched and the
+    result's `rows` stays empty; `on_scanned` then receives the (row-less)
+    result once scanning is done, so counts and schemas can be shown before
+    the first batch. Stops early when `cancel_cb` returns True.
+    """
     scan: ScanResult = scan_inputs(inputs)
     schemas = [inspect_csv_schema(p) for p in scan.csvs]
-    index = PurwayCSVIndex.from_csv_files(scan.csvs)
-
-    rows: list[PreviewRow] = []
-    for p in scan.photos[:max_rows]:
-        try:
-            match = index.match_photo(photo_path=p, max_join_delta_seconds=max_join_delta_seconds)
-            rows.append(
-                PreviewRow(
-                    photo_path=str(p),
-                    status="MATCHED",
-                    join_method=match.join_method,
-                    csv_path=match.csv_path,
-                    lat=str(match.lat),
-                    lon=str(match.lon),
-                    ppm=str(match.ppm),
-                    datetime_original=match.datetime_original or "",
-                    reason="",
-                )
-            )
-        except CorrelationError as e:
-            rows.append(
-                PreviewRow(
-                    photo_path=str(p),
-                    status="FAILED",
-                    join_method="NONE",
-                    csv_path="",
-                    lat="",
-                    lon="",
-                    ppm="",
-                    datetime_original="",
-                    reason=str(e),
-                )
-            )
-
-    return PreviewResult(
+    result = PreviewResult(
         scanned_photos=len(scan.photos),
         scanned_csvs=len(scan.csvs),
-        rows=rows,
+        rows=PreviewStore(),
         schemas=schemas,
     )
+    if on_scanned is not None:
+        on_scanned(result)
+    photos = scan.photos if max_rows is None else scan.photos[:max_rows]
+    if not photos:
+        return result
+    index = PurwayCSVIndex.from_csv_files(scan.csvs)
+
+    batch = result.rows if on_batch is None else PreviewStore()
+    for p in photos:
+        if cancel_cb is not None and cancel_cb():
+            break
+        try:
+            batch.add_match(p, index.match_photo(photo_path=p, max_join_delta_seconds=max_join_delta_seconds))
+        except CorrelationError as e:
+            batch.add_failure(p, str(e))
+        if on_batch is not None and len(batch) >= batch_size:
+            on_batch(batch)
+            batch = PreviewStore()
+    if on_batch is not None and len(batch):
+        on_batch(batch)
+    return result
@@ -0,0 +1,84 @@
+"""Rate-limited, structured progress reporting for running jobs (Qt-free)."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import threading
+import time
+from typing import Callable
+
+from purway_geotagger.core.job import Job
+
+PROGRESS_INTERVAL_S = 0.1  # at most ~10 progress events per job per second
+
+
+@dataclass(frozen=True, slots=True)
+class ProgressEvent:
+    """A snapshot of a job's progress, safe to hand to another thread."""
+    percent: int
+    message: str
+    stage: str
+    scanned_photos: int = 0
+    matched: int = 0
+    success: int = 0
+    failed: int = 0
+
+
+class ProgressAggregator:
+    """Throttle a job's progress callbacks into ProgressEvents.
+
+    Use an instance as run_job's `progress_cb`. A call is forwarded to `emit`
+    at once when the job enters a new stage, reaches 100% or the interval has
+    passed since the last event; otherwise it is held, and a newer call
+    replaces it. Call flush() when the run ends to deliver a held event.
+    """
+
+    def __init__(
+        self,
+        job: Job,
+        emit: Callable[[ProgressEvent], None],
+        interval_s: float = PROGRESS_INTERVAL_S,
+    ) -> None:
+        self.job = job
+        self.emit = emit
+        self.interval_s = interval_s
+        self._lock = threading.Lock()
+        self._last_time = float("-inf")
+        self._last_stage: str | None = None
+        self._pending: ProgressEvent | None = None
+
+    def __call__(self, percent: int, message: str) -> None:
+        event = self._snapshot(int(percent), message)
+        now = time.monotonic()
+        with self._lock:
+            due = (
+                event.stage != self._last_stage
+                or event.percent >= 100
+                or now - self._last_time >= self.interval_s
+            )
+            if not due:
+                self._pending = event
+                return
+            self._pending = None
+            self._last_time = now
+            self._last_stage = event.stage
+        self.emit(event)
+
+    def flush(self) -> None:
+        with self._lock:
+            event, self._pending = self._pending, None
+            if event is not None:
+                self._last_time = time.monotonic()
+        if event is not None:
+            self.emit(event)
+
+    def _snapshot(self, percent: int, message: str) -> ProgressEvent:
+        st = self.job.state
+        return ProgressEvent(
+            percent=percent,
+            message=message,
+            stage=st.stage,
+            scanned_photos=st.scanned_photos,
+            matched=st.matched,
+            success=st.success,
+            failed=st.failed,
+        )
@@ -0,0 +1,162 @@
+"""Indexed per-run SQLite database (run.sqlite) written alongside manifest.csv."""
+from __future__ import annotations
+
+from contextlib import closing
+from dataclasses import asdict
+from pathlib import Path
+import json
+import sqlite3
+import time
+from typing import Iterable, Mapping
+
+from purway_geotagger.core.manifest import MANIFEST_FIELDS, ManifestRow
+from purway_geotagger.core.run_summary import MethaneOutputSummary, StagePerformance
+
+RUN_DB_NAME = "run.sqlite"
+
+_TASK_COLUMNS = ", ".join(f"{name} TEXT NOT NULL DEFAULT ''" for name in MANIFEST_FIELDS)
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS tasks (id INTEGER PRIMARY KEY, {_TASK_COLUMNS});
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+CREATE INDEX IF NOT EXISTS idx_tasks_source_path ON tasks(source_path);
+CREATE TABLE IF NOT EXISTS methane_outputs (
+    id INTEGER PRIMARY KEY,
+    source_csv TEXT NOT NULL,
+    cleaned_csv TEXT,
+    cleaned_status TEXT NOT NULL,
+    cleaned_rows INTEGER NOT NULL DEFAULT 0,
+    kmz TEXT,
+    kmz_status TEXT NOT NULL DEFAULT 'skipped',
+    hotspot_count INTEGER NOT NULL DEFAULT 0,
+    detail TEXT NOT NULL  -- full MethaneOutputSummary as JSON
+);
+CREATE TABLE IF NOT EXISTS stage_timings (
+    id INTEGER PRIMARY KEY,
+    stage TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    cpu_seconds REAL NOT NULL,
+    items INTEGER,
+    peak_rss_mb REAL
+);
+"""
+_INSERT_TASK = (
+    f"INSERT INTO tasks ({', '.join(MANIFEST_FIELDS)}) "
+    f"VALUES ({', '.join('?' for _ in MANIFEST_FIELDS)})"
+)
+
+
+class RunDatabase:
+    """Writer for run.sqlite; use from a single (worker) thread.
+
+    Task rows mirror manifest.csv and are committed on the same row/time
+    cadence as ManifestWriter. The default rollback journal (DELETE) is used
+    rather than WAL, which is unsafe on SMB/NAS shares where run folders often
+    live; with one writer per run, readers (the GUI querying a run in progress)
+    only wait out the short batched commits.
+    """
+
+    def __init__(self, path: Path, commit_every: int = 500, commit_interval_s: float = 2.0) -> None:
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.unlink(missing_ok=True)
+        self._conn: sqlite3.Connection | None = sqlite3.connect(str(path))
+        self._conn.execute("PRAGMA journal_mode=DELETE")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._commit_every = max(1, commit_every)
+        self._commit_interval_s = commit_interval_s
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+
+    def add_task(self, row: ManifestRow) -> None:
+        conn = self._require_conn()
+        conn.execute(_INSERT_TASK, [getattr(row, name) for name in MANIFEST_FIELDS])
+        self._uncommitted += 1
+        if self._uncommitted >= self._commit_every or time.monotonic() - self._last_commit >= self._commit_interval_s:
+            self.commit()
+
+    def update_output_paths(self, moves: Mapping[str, str]) -> None:
+        """Point task rows (by source path) at photos that were renamed or moved."""
+        conn = self._require_conn()
+        conn.executemany(
+            "UPDATE tasks SET output_path = ? WHERE source_path = ?",
+            [(new, source) for source, new in moves.items()],
+        )
+        self.commit()
+
+    def add_methane_outputs(self, outputs: Iterable[MethaneOutputSummary]) -> None:
+        conn = self._require_conn()
+        conn.executemany(
+            "INSERT INTO methane_outputs "
+            "(source_csv, cleaned_csv, cleaned_status, cleaned_rows, kmz, kmz_status, hotspot_count, detail) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    o.source_csv,
+                    o.cleaned_csv,
+                    o.cleaned_status,
+                    o.cleaned_rows,
+                    o.kmz,
+                    o.kmz_status,
+                    o.hotspot_count,
+                    json.dumps(asdict(o)),
+                )
+                for o in outputs
+            ],
+        )
+        self.commit()
+
+    def add_stage(self, perf: StagePerformance) -> None:
+        conn = self._require_conn()
+        conn.execute(
+            "INSERT INTO stage_timings (stage, seconds, cpu_seconds, items, peak_rss_mb) VALUES (?, ?, ?, ?, ?)",
+            (perf.stage, perf.wall_seconds, perf.cpu_seconds, perf.items, perf.peak_rss_mb),
+        )
+        self.commit()
+
+    def commit(self) -> None:
+        if self._conn is None:
+            return
+        self._conn.commit()
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+
+    def close(self) -> None:
+        if self._conn is None:
+            return
+        self.commit()
+        self._conn.close()
+        self._conn = None
+
+    def _require_conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            raise ValueError("RunDatabase is closed.")
+        return self._conn
+
+
+def run_db_path(run_folder: Path) -> Path:
+    return run_folder / RUN_DB_NAME
+
+
+def query_tasks(
+    db_path: Path,
+    status: str | None,
+    columns: Iterable[str] = MANIFEST_FIELDS,
+) -> list[dict[str, str]]:
+    """Return task rows with the given status (uses the status index); None returns all rows."""
+    cols = [c for c in columns if c in MANIFEST_FIELDS]
+    with closing(sqlite3.connect(str(db_path))) as conn:
+        if status is None:
+            cur = conn.execute(f"SELECT {', '.join(cols)} FROM tasks ORDER BY id")
+        else:
+            cur = conn.execute(
+                f"SELECT {', '.join(cols)} FROM tasks WHERE status = ? ORDER BY id",
+                (status.upper(),),
+            )
+        return [dict(zip(cols, row)) for row in cur]
+
+
+def query_stage_timings(db_path: Path) -> list[tuple[str, float]]:
+    with closing(sqlite3.connect(str(db_path))) as conn:
+        return list(conn.execute("SELECT stage, seconds FROM stage_timings ORDER BY id"))
+
@@ -1,15 +1,131 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+import json
+import queue
+import threading
+import time
+from typing import Any, IO
+
+_BATCH_MAX = 256
+FLUSH_TIMEOUT_SECONDS = 30.0  # flush()/close() never wait longer than this on the writer
+_ERRORS = "backslashreplace"  # surrogate-escaped paths must not stop the writer
+_STOP = object()
+
 
-@dataclass
 class RunLogger:
-    path: Path
+    """Append-only run_log.txt writer backed by a queue and a writer thread.
+
+    `log()` only enqueues; the writer thread keeps the file open and writes
+    whatever has queued up in one batch. `flush()` blocks until everything
+    logged so far is on disk, and `close()` drains the queue and stops the
+    thread; neither waits forever if the writer is stuck or gone. When
+    `jsonl_path` is given, each message is also written there as
+    a JSON object with its timestamp, current stage and any extra fields.
+    """
 
-    def log(self, message: str) -> None:
+    def __init__(self, path: Path, jsonl_path: Path | None = None) -> None:
+        self.path = path
+        self.jsonl_path = jsonl_path
+        self.stage = ""
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        with self.path.open("a", encoding="utf-8") as f:
-            f.write(f"[{ts}] {message}\n")
+        self._f: IO[str] = self.path.open("a", encoding="utf-8", errors=_ERRORS)
+        self._jsonl: IO[str] | None = None
+        if jsonl_path is not None:
+            jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+            self._jsonl = jsonl_path.open("a", encoding="utf-8", errors=_ERRORS)
+        self._thread = threading.Thread(target=self._run, name="run-logger", daemon=True)
+        self._thread.start()
+
+    def log(self, message: str, **fields: Any) -> None:
+        record = (datetime.now(), self.stage, message, fields)
+        with self._lock:
+            if not self._closed:
+                self._queue.put(record)
+                return
+        # Late messages after close() are appended synchronously.
+        try:
+            self._write_batch([record], self.path.open("a", encoding="utf-8", errors=_ERRORS), None, close=True)
+        except Exception:
+            pass
+
+    def set_stage(self, stage: str) -> None:
+        """Flush at a stage boundary and tag later structured records with `stage`."""
+        self.flush()
+        self.stage = stage
+
+    def flush(self) -> None:
+        """Wait until everything logged so far is written (bounded, see FLUSH_TIMEOUT_SECONDS)."""
+        if self._closed:
+            return
+        q = self._queue
+        deadline = time.monotonic() + FLUSH_TIMEOUT_SECONDS
+        with q.all_tasks_done:
+            while q.unfinished_tasks and self._thread.is_alive():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                q.all_tasks_done.wait(min(remaining, 0.5))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(FLUSH_TIMEOUT_SECONDS)
+        self._f.close()
+        if self._jsonl is not None:
+            self._jsonl.close()
+
+    def __enter__(self) -> "RunLogger":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < _BATCH_MAX:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is _STOP
+            records = [r for r in batch if r is not _STOP]
+            try:
+                self._write_batch(records, self._f, self._jsonl)
+            except Exception:
+                pass  # never stop the writer (and block flush()) on a failing log target
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    @staticmethod
+    def _write_batch(records: list, f: IO[str], jsonl: IO[str] | None, close: bool = False) -> None:
+        try:
+            f.write("".join(
+                f"[{ts.strftime('%Y-%m-%d %H:%M:%S')}] {message}\n" for ts, _stage, message, _fields in records
+            ))
+            f.flush()
+            if jsonl is not None:
+                jsonl.write("".join(
+                    json.dumps({
+                        "ts": ts.isoformat(timespec="milliseconds"),
+                        "stage": stage,
+                        "message": message,
+                        **fields,
+                    }, default=str) + "\n"
+                    for ts, stage, message, fields in records
+                ))
+                jsonl.flush()
+        finally:
+            if close:
+                f.close()
@@ -27,6 +27,32 @@ class MethaneOutputSummary:
     kmz_status: str = "skipped"
     kmz_rows: int = 0
     kmz_error: str = ""
+    exports: dict[str, str] = field(default_factory=dict)
+    export_errors: dict[str, str] = field(default_factory=dict)
+    hotspot_status: str = "skipped"
+    hotspot_count: int = 0
+    hotspot_csv: str | None = None
+    hotspot_json: str | None = None
+    hotspot_error: str = ""
+
+
+@dataclass
+class StagePerformance:
+    stage: str
+    wall_seconds: float
+    cpu_seconds: float  # this job's threads only (not other jobs in the process)
+    items: int | None = None
+    items_per_second: float | None = None
+    peak_rss_mb: float | None = None  # whole process peak so far, all jobs (resource.getrusage)
+    traced_peak_mb: float | None = None  # only when tracemalloc is tracing
+
+
+@dataclass
+class PerformanceSummary:
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_mb: float | None = None
+    stages: list[StagePerformance] = field(default_factory=list)
 
 
 @dataclass
@@ -37,6 +63,7 @@ class RunSummary:
     settings: dict[str, Any]
     exif: ExifSummary
     methane_outputs: list[MethaneOutputSummary]
+    performance: PerformanceSummary | None = None
 
 
 def write_run_summary(path: Path, summary: RunSummary) -> None:
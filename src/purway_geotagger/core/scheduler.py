@@ -0,0 +1,134 @@
+"""Resource-aware scheduling of queued jobs (Qt-free; driven by the GUI controller)."""
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+import itertools
+import os
+from pathlib import Path
+
+from purway_geotagger.core.job import Job
+
+DEFAULT_MAX_BYPASS = 3
+
+
+def default_max_jobs() -> int:
+    """Concurrent jobs when the setting is "auto": half the CPUs, between 1 and 4.
+
+    Each job already runs its copier/matcher threads and ExifTool processes.
+    """
+    return max(1, min(4, (os.cpu_count() or 2) // 2))
+
+
+@dataclass(frozen=True)
+class ResourceLimits:
+    max_jobs: int = field(default_factory=default_max_jobs)
+    max_exiftool_processes: int = 2
+    io_jobs_per_device: int = 1  # concurrent jobs reading or writing the same disk
+
+
+def device_id(path: Path) -> int:
+    """st_dev of `path`, or of its nearest existing ancestor (outputs may not exist yet)."""
+    p = path.expanduser().absolute()
+    for candidate in (p, *p.parents):
+        try:
+            return candidate.stat().st_dev
+        except OSError:
+            continue
+    return -1
+
+
+def job_devices(job: Job) -> frozenset[int]:
+    """Devices a job reads from or writes to."""
+    opts = job.options
+    paths = [*job.inputs, opts.output_root]
+    for extra in (opts.output_photos_root, opts.encroachment_output_base):
+        if extra is not None:
+            paths.append(extra)
+    return frozenset(device_id(p) for p in paths)
+
+
+@dataclass
+class _Entry:
+    job: Job
+    priority: int
+    seq: int
+    devices: frozenset[int]
+    bypassed: int = 0
+
+
+class JobScheduler:
+    """Decide which queued jobs may start under the configured limits.
+
+    Jobs run in priority order (higher first), FIFO within a priority. A job
+    whose disks are busy does not hold up jobs behind it that use other disks,
+    but once it has been overtaken `max_bypass` times nothing behind it may
+    start until it has run, so no job waits forever.
+
+    Not thread-safe: the owner calls it from one thread (the GUI thread).
+    """
+
+    def __init__(self, limits: ResourceLimits, max_bypass: int = DEFAULT_MAX_BYPASS) -> None:
+        self.limits = limits
+        self.max_bypass = max_bypass
+        self._queued: list[_Entry] = []
+        self._running: dict[str, _Entry] = {}
+        self._io = Counter()
+        self._seq = itertools.count()
+
+    @property
+    def queued(self) -> list[Job]:
+        return [e.job for e in sorted(self._queued, key=_order)]
+
+    @property
+    def running(self) -> list[Job]:
+        return [e.job for e in self._running.values()]
+
+    def submit(self, job: Job, priority: int = 0) -> None:
+        self._queued.append(_Entry(job, priority, next(self._seq), job_devices(job)))
+
+    def remove(self, job: Job) -> bool:
+        """Drop a job that has not started; returns False if it was not queued."""
+        for i, e in enumerate(self._queued):
+            if e.job is job:
+                del self._queued[i]
+                return True
+        return False
+
+    def set_priority(self, job: Job, priority: int) -> None:
+        for e in self._queued:
+            if e.job is job:
+                e.priority = priority
+
+    def next_ready(self) -> list[Job]:
+        """Mark and return the queued jobs that can start now."""
+        started: list[Job] = []
+        waiting: list[_Entry] = []
+        for entry in sorted(self._queued, key=_order):
+            if len(self._running) >= self.limits.max_jobs:
+                break
+            if not self._fits(entry):
+                waiting.append(entry)
+                if entry.bypassed >= self.max_bypass:
+                    break
+                continue
+            self._queued.remove(entry)
+            self._running[entry.job.id] = entry
+            self._io.update(entry.devices)
+            started.append(entry.job)
+            for w in waiting:
+                w.bypassed += 1
+        return started
+
+    def finish(self, job: Job) -> None:
+        entry = self._running.pop(job.id, None)
+        if entry is not None:
+            self._io.subtract(entry.devices)
+
+    def _fits(self, entry: _Entry) -> bool:
+        limit = max(1, self.limits.io_jobs_per_device)
+        return all(self._io[d] < limit for d in entry.devices)
+
+
+def _order(entry: _Entry) -> tuple[int, int]:
+    return (-entry.priority, entry.seq)
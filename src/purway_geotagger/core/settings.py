@@ -27,8 +27,15 @@ class AppSettings:
     cleanup_empty_dirs_default: bool = False
     sort_by_ppm_default: bool = True
     ppm_bin_edges: list[int] = field(default_factory=lambda: DEFAULT_BIN_EDGES.copy())
+    methane_export_formats: list[str] = field(default_factory=list)
+    methane_hotspots: bool = False  # opt-in; matches JobOptions.methane_hotspots
+    methane_hotspot_radius_m: float = 25.0
     max_join_delta_seconds: int = DEFAULT_MAX_JOIN_DELTA_SECONDS
     write_xmp_default: bool = True
+    pipelined_execution: bool = False  # opt-in; matches JobOptions.pipelined
+    max_concurrent_jobs: int = 0  # 0 = auto (see core.scheduler.default_max_jobs)
+    max_exiftool_processes: int = 2
+    io_jobs_per_device: int = 1
     dry_run_default: bool = False
     exiftool_path: str = ""
     ui_theme: str = "light"
@@ -56,4 +63,10 @@ class AppSettings:
     @staticmethod
     def new_run_folder(output_root: Path) -> Path:
         stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        return output_root / f"PurwayGeotagger_{stamp}"
+        folder = output_root / f"PurwayGeotagger_{stamp}"
+        # Jobs started in the same second (parallel CLI runs, queued GUI jobs) get a suffix.
+        i = 2
+        while folder.exists():
+            folder = output_root / f"PurwayGeotagger_{stamp}_{i}"
+            i += 1
+        return folder
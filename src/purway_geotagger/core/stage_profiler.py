@@ -0,0 +1,93 @@
+"""Lightweight per-stage wall/CPU/memory instrumentation for run_job."""
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+
+from purway_geotagger.core.run_summary import PerformanceSummary, StagePerformance
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+
+class StageProfiler:
+    """Record wall time, CPU time, throughput and peak memory per pipeline stage.
+
+    Use it from the job's own thread: CPU time is that thread's
+    (time.thread_time), so jobs running side by side in one process do not
+    count each other's work; CPU of helper threads is added with add_cpu().
+    Peak RSS can only be had for the whole process. Only clocks and
+    getrusage are sampled at stage boundaries, so the overhead is a few
+    syscalls per stage. Python heap peaks are reported only if tracemalloc is
+    already tracing (e.g. `-X tracemalloc`).
+    """
+
+    def __init__(self) -> None:
+        self.stages: list[StagePerformance] = []
+        self._start_wall = time.monotonic()
+        self._start_cpu = time.thread_time()
+        self._extra_cpu = 0.0  # helper-thread CPU added to the whole run
+        self._stage_extra_cpu = 0.0
+        self._current: tuple[str, float, float] | None = None
+        self._items: int | None = None
+
+    def enter(self, stage: str) -> StagePerformance | None:
+        """Finish the current stage (returning its record) and start `stage`."""
+        done = self.end()
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        self._current = (stage, time.monotonic(), time.thread_time())
+        return done
+
+    def set_items(self, items: int) -> None:
+        """Number of items (photos, CSVs, ...) the current stage processed."""
+        self._items = items
+
+    def add_cpu(self, seconds: float) -> None:
+        """Charge CPU time spent by helper threads to the current stage."""
+        self._stage_extra_cpu += seconds
+        self._extra_cpu += seconds
+
+    def end(self) -> StagePerformance | None:
+        if self._current is None:
+            return None
+        stage, wall_start, cpu_start = self._current
+        wall = time.monotonic() - wall_start
+        items = self._items
+        cpu = time.thread_time() - cpu_start + self._stage_extra_cpu
+        self._current = None
+        self._items = None
+        self._stage_extra_cpu = 0.0
+        record = StagePerformance(
+            stage=stage,
+            wall_seconds=round(wall, 3),
+            cpu_seconds=round(cpu, 3),
+            items=items,
+            items_per_second=round(items / wall, 1) if items is not None and wall > 0 else None,
+            peak_rss_mb=peak_rss_mb(),
+            traced_peak_mb=(
+                round(tracemalloc.get_traced_memory()[1] / 2**20, 1) if tracemalloc.is_tracing() else None
+            ),
+        )
+        self.stages.append(record)
+        return record
+
+    def summary(self) -> PerformanceSummary:
+        return PerformanceSummary(
+            wall_seconds=round(time.monotonic() - self._start_wall, 3),
+            cpu_seconds=round(time.thread_time() - self._start_cpu + self._extra_cpu, 3),
+            peak_rss_mb=peak_rss_mb(),
+            stages=list(self.stages),
+        )
+
+
+def peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux.
+    divisor = 2**20 if sys.platform == "darwin" else 2**10
+    return round(peak / divisor, 1)
@@ -0,0 +1,70 @@
+"""Opt-in import/construct timing for GUI startup (Qt-free).
+
+Enable with `python -m purway_geotagger.app --profile-startup` or by setting
+PURWAY_PROFILE_STARTUP=1; the report is printed to stderr once the window
+has been shown.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+import os
+import sys
+import time
+from typing import Iterator
+
+PROFILE_ENV = "PURWAY_PROFILE_STARTUP"
+PROFILE_FLAG = "--profile-startup"
+
+
+@dataclass(frozen=True, slots=True)
+class StartupTiming:
+    component: str
+    kind: str  # import|construct|show
+    seconds: float
+    at_seconds: float  # since the profiler was created
+
+
+class StartupProfiler:
+    """Collect wall time per startup component.
+
+    When disabled, measure() adds no timing calls, so the profiler can stay
+    wired into the startup path permanently. Imports are timed by wrapping
+    plain import statements (which PyInstaller can still see) in measure().
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.timings: list[StartupTiming] = []
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def measure(self, component: str, kind: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            t1 = time.perf_counter()
+            self.timings.append(StartupTiming(component, kind, t1 - t0, t1 - self._start))
+
+    def report(self) -> str:
+        lines = [f"{'component':<56} {'kind':<10} {'ms':>9} {'at ms':>9}"]
+        for t in self.timings:
+            lines.append(f"{t.component:<56} {t.kind:<10} {t.seconds * 1000:9.1f} {t.at_seconds * 1000:9.1f}")
+        lines.append(f"{'total':<56} {'':<10} {(time.perf_counter() - self._start) * 1000:9.1f}")
+        return "\n".join(lines)
+
+
+_profiler: StartupProfiler | None = None
+
+
+def startup_profiler(argv: list[str] | None = None) -> StartupProfiler:
+    """The process-wide profiler; the first call decides whether it is enabled."""
+    global _profiler
+    if _profiler is None:
+        args = sys.argv if argv is None else argv
+        _profiler = StartupProfiler(PROFILE_FLAG in args or os.environ.get(PROFILE_ENV, "") not in ("", "0"))
+    return _profiler
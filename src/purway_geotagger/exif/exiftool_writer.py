@@ -3,26 +3,150 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 import csv
+import itertools
 import os
+import queue
 import shutil
 import subprocess
 import sys
-from typing import Callable
+import threading
+from typing import IO, Callable
 
 from purway_geotagger.core.photo_task import PhotoTask
 from purway_geotagger.util.errors import ExifToolError, UserCancelledError
 from purway_geotagger.core.utils import resource_path
 
+DEFAULT_MAX_EXIFTOOL_PROCESSES = 2
+
+# Process-wide cap on concurrent ExifTool invocations (shared by all running jobs).
+_process_slots = threading.BoundedSemaphore(DEFAULT_MAX_EXIFTOOL_PROCESSES)
+_process_limit = DEFAULT_MAX_EXIFTOOL_PROCESSES
+
+
+def set_max_exiftool_processes(limit: int) -> None:
+    """Change how many ExifTool write batches may run at once across all jobs.
+
+    Batches already waiting on the previous limit finish under it.
+    """
+    global _process_slots, _process_limit
+    limit = max(1, int(limit))
+    if limit != _process_limit:
+        _process_slots = threading.BoundedSemaphore(limit)
+        _process_limit = limit
+
+
 @dataclass
 class ExifWriteResult:
     success: bool
     error: str = ""
 
+class ExifToolSession:
+    """A long-running `exiftool -stay_open` process shared by write batches.
+
+    Starting ExifTool (a Perl interpreter) costs more than writing a small
+    batch; a session pays it once. Commands are serialized, and a process that
+    exits is restarted by the next command. Used by the job server.
+    """
+
+    def __init__(self, exiftool_path: str | None = None) -> None:
+        self.exiftool_path = exiftool_path or _resolve_exiftool_path()
+        self._lock = threading.Lock()
+        self._seq = itertools.count(1)
+        self._proc: subprocess.Popen[str] | None = None
+        self._stderr: queue.Queue[str] = queue.Queue()
+
+    def execute(self, args: list[str]) -> subprocess.CompletedProcess[str]:
+        """Run one ExifTool command; returncode is 1 if ExifTool reported an error."""
+        with self._lock:
+            proc = self._ensure_started()
+            assert proc.stdin is not None and proc.stdout is not None
+            n = next(self._seq)
+            marker = f"{{ready{n}}}"
+            try:
+                proc.stdin.write("\n".join([*args, "-echo4", marker, f"-execute{n}"]) + "\n")
+                proc.stdin.flush()
+                stdout = _read_until(proc.stdout.readline, marker)
+                stderr = _read_until(self._stderr.get, marker)
+            except (OSError, EOFError) as e:
+                self._stop(kill=True)
+                raise ExifToolError(f"ExifTool session stopped unexpectedly: {e or 'end of output'}") from e
+        failed = any(line.startswith("Error") for line in stderr.splitlines())
+        return subprocess.CompletedProcess([self.exiftool_path, *args], 1 if failed else 0, stdout, stderr)
+
+    def close(self) -> None:
+        with self._lock:
+            self._stop(kill=False)
+
+    def __enter__(self) -> "ExifToolSession":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def _ensure_started(self) -> subprocess.Popen[str]:
+        if self._proc is not None and self._proc.poll() is None:
+            return self._proc
+        cmd = [self.exiftool_path, *_config_args(), "-stay_open", "True", "-@", "-"]
+        try:
+            proc = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+            )
+        except FileNotFoundError as e:
+            raise ExifToolError(_exiftool_missing_message()) from e
+        self._stderr = queue.Queue()
+        threading.Thread(
+            target=_pump_lines, args=(proc.stderr, self._stderr), name="exiftool-stderr", daemon=True
+        ).start()
+        self._proc = proc
+        return proc
+
+    def _stop(self, kill: bool) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None or proc.poll() is not None:
+            return
+        if not kill:
+            try:
+                assert proc.stdin is not None
+                proc.stdin.write("-stay_open\nFalse\n")
+                proc.stdin.flush()
+                proc.wait(timeout=5)
+                return
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+        proc.kill()
+        proc.wait()
+
+
+def _pump_lines(stream: IO[str] | None, out: queue.Queue[str]) -> None:
+    if stream is not None:
+        for line in stream:
+            out.put(line)
+    out.put("")  # EOF
+
+
+def _read_until(readline: Callable[[], str], marker: str) -> str:
+    lines: list[str] = []
+    while True:
+        line = readline()
+        if not line:
+            raise EOFError()
+        if line.rstrip("\r\n") == marker:
+            return "".join(lines)
+        lines.append(line)
+
+
 class ExifToolWriter:
-    def __init__(self, write_xmp: bool, dry_run: bool) -> None:
+    def __init__(self, write_xmp: bool, dry_run: bool, session: ExifToolSession | None = None) -> None:
         self.write_xmp = write_xmp
         self.dry_run = dry_run
         self.exiftool_path = _resolve_exiftool_path()
+        self.session = session
 
     def write_tasks(
         self,
@@ -56,35 +180,18 @@ class ExifToolWriter:
         self._write_import_csv(import_csv, matched)
 
         files = [str(t.output_path.expanduser().resolve()) for t in matched]
-        
-        # Get path to ExifTool config for custom XMP namespace
-        config_path = resource_path("config/exiftool_config.txt")
-        config_args = []
-        if config_path and config_path.exists():
-            config_args = [f"-config", str(config_path)]
-        
-        cmd = [
-            self.exiftool_path,
-            *config_args,
+        args = [
             "-overwrite_original",
             f"-csv={import_csv}",
             *files,
         ]
 
-        try:
-            proc = subprocess.run(
-                cmd,
-                cwd=str(work_dir),
-                capture_output=True,
-                text=True,
-            )
-        except FileNotFoundError as e:
-            raise ExifToolError(_exiftool_missing_message()) from e
-
-        if proc.returncode != 0:
-            raise ExifToolError(proc.stderr.strip() or "ExifTool returned non-zero exit code.")
+        with _process_slots:
+            proc = self._run(args, work_dir, config=True)
+            if proc.returncode != 0:
+                raise ExifToolError(proc.stderr.strip() or "ExifTool returned non-zero exit code.")
 
-        results = self._verify_written(matched, work_dir)
+            results = self._verify_written(matched, work_dir)
         for i, t in enumerate(matched, start=1):
             if cancel_cb():
                 raise UserCancelledError()
@@ -173,8 +280,7 @@ class ExifToolWriter:
         Uses ExifTool to read back GPSLatitude/GPSLongitude/GPSLatitudeRef/GPSLongitudeRef.
         """
         files = [str(t.output_path.expanduser().resolve()) for t in tasks]
-        cmd = [
-            self.exiftool_path,
+        args = [
             "-csv",
             "-GPSLatitude",
             "-GPSLongitude",
@@ -183,16 +289,7 @@ class ExifToolWriter:
             *files,
         ]
 
-        try:
-            proc = subprocess.run(
-                cmd,
-                cwd=str(work_dir),
-                capture_output=True,
-                text=True,
-            )
-        except FileNotFoundError as e:
-            raise ExifToolError(_exiftool_missing_message()) from e
-
+        proc = self._run(args, work_dir)
         if proc.returncode != 0:
             raise ExifToolError(proc.stderr.strip() or "ExifTool verification failed.")
 
@@ -231,6 +328,30 @@ class ExifToolWriter:
 
         return results
 
+    def _run(self, args: list[str], work_dir: Path, config: bool = False) -> subprocess.CompletedProcess[str]:
+        """Run ExifTool with `args`, in the warm session when there is one."""
+        if self.session is not None:
+            return self.session.execute(args)
+        # The config (custom XMP namespace) must come first on the command line.
+        cmd = [self.exiftool_path, *(_config_args() if config else []), *args]
+        try:
+            return subprocess.run(
+                cmd,
+                cwd=str(work_dir),
+                capture_output=True,
+                text=True,
+            )
+        except FileNotFoundError as e:
+            raise ExifToolError(_exiftool_missing_message()) from e
+
+
+def _config_args() -> list[str]:
+    """ExifTool config for the custom XMP-ArchAerial namespace, if bundled."""
+    config_path = resource_path("config/exiftool_config.txt")
+    if config_path and config_path.exists():
+        return ["-config", str(config_path)]
+    return []
+
 
 def _gps_lat_ref(lat: float | None) -> str:
     if lat is None:
@@ -1,22 +1,30 @@
 from __future__ import annotations
 
+import sqlite3
 import uuid
 from pathlib import Path
 
-from PySide6.QtCore import QObject, Signal
+from PySide6.QtCore import QObject, QTimer, Signal
 from PySide6.QtWidgets import QProgressBar
 
 from purway_geotagger.core.settings import AppSettings
 from purway_geotagger.core.job import Job, JobOptions
-from purway_geotagger.core.modes import RunMode, encroachment_run_base
+from purway_geotagger.core.progress import ProgressEvent
+from purway_geotagger.core.run_db import query_tasks, run_db_path
+from purway_geotagger.core.scheduler import JobScheduler, ResourceLimits, default_max_jobs
+from purway_geotagger.exif.exiftool_writer import set_max_exiftool_processes
 from purway_geotagger.gui.workers import JobWorker
-from purway_geotagger.gui.mode_state import ModeState
+from purway_geotagger.core.mode_state import ModeState, build_job_options
 from purway_geotagger.templates.template_manager import TemplateManager
-from purway_geotagger.templates.models import RenameTemplate
 from purway_geotagger.util.platform import open_in_finder
 
+UPDATE_INTERVAL_MS = 100  # progress notifications are coalesced to ~10 Hz
+
+
 class JobController(QObject):
     jobs_changed = Signal()
+    job_added = Signal(object)  # Job appended to self.jobs
+    job_updated = Signal(object)  # Job whose state changed
 
     def __init__(self, settings: AppSettings) -> None:
         super().__init__()
@@ -25,9 +33,13 @@ class JobController(QObject):
         self.jobs: list[Job] = []
         self.template_manager = TemplateManager()
         self._workers: dict[str, JobWorker] = {}
-        self._queue: list[Job] = []
-        self._active_job_id: str | None = None
+        self.scheduler = JobScheduler(self._resource_limits())
         self._progress_bars: dict[str, QProgressBar] = {}
+        self._dirty_jobs: dict[str, Job] = {}
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(UPDATE_INTERVAL_MS)
+        self._update_timer.timeout.connect(self._flush_job_updates)
 
     def add_inputs(self, paths: list[Path]) -> None:
         for p in paths:
@@ -63,6 +75,7 @@ class JobController(QObject):
         purway_payload: str,
         progress_bar: QProgressBar,
         inputs_override: list[Path] | None = None,
+        priority: int = 0,
     ) -> Job:
         # Create run folder immediately
         run_folder = AppSettings.new_run_folder(output_root)
@@ -84,18 +97,30 @@ class JobController(QObject):
             enable_renaming=enable_renaming,
             rename_template=rename_template,
             start_index=start_index,
+            pipelined=self.settings.pipelined_execution,
         )
 
         inputs = inputs_override if inputs_override is not None else self.inputs.copy()
-        return self._enqueue_job(opts, inputs, progress_bar)
+        return self._enqueue_job(opts, inputs, progress_bar, priority)
 
-    def start_job_from_mode_state(self, state: ModeState, progress_bar: QProgressBar) -> Job | None:
+    def start_job_from_mode_state(
+        self,
+        state: ModeState,
+        progress_bar: QProgressBar,
+        priority: int = 0,
+    ) -> Job | None:
         if not state.inputs:
             return None
         opts = self.build_job_options_from_mode_state(state)
-        return self._enqueue_job(opts, state.inputs.copy(), progress_bar)
+        return self._enqueue_job(opts, state.inputs.copy(), progress_bar, priority)
 
-    def _enqueue_job(self, options: JobOptions, inputs: list[Path], progress_bar: QProgressBar) -> Job:
+    def _enqueue_job(
+        self,
+        options: JobOptions,
+        inputs: list[Path],
+        progress_bar: QProgressBar,
+        priority: int = 0,
+    ) -> Job:
         job = Job(
             id=str(uuid.uuid4()),
             name=f"Job {len(self.jobs)+1}",
@@ -103,91 +128,25 @@ class JobController(QObject):
             options=options,
         )
         job.run_folder = options.output_root
+        # Claim the run folder now so jobs queued in the same second get distinct names.
+        options.output_root.mkdir(parents=True, exist_ok=True)
         self.jobs.append(job)
         self._progress_bars[job.id] = progress_bar
+        job.state.stage = "QUEUED"
+        job.state.message = "Queued"
+        self.scheduler.submit(job, priority)
+        self.job_added.emit(job)
         self.jobs_changed.emit()
-
-        if self._active_job_id is None:
-            self._start_worker(job)
-        else:
-            job.state.stage = "QUEUED"
-            job.state.message = "Queued"
-            self._queue.append(job)
-            self.jobs_changed.emit()
+        self._dispatch()
         return job
 
+    def set_job_priority(self, job: Job, priority: int) -> None:
+        """Reprioritize a queued job (higher runs first)."""
+        self.scheduler.set_priority(job, priority)
+        self._dispatch()
+
     def build_job_options_from_mode_state(self, state: ModeState) -> JobOptions:
-        resolved = state.resolved()
-        output_photos_root: Path | None = None
-        if state.mode == RunMode.METHANE:
-            output_base = resolved.methane_log_base
-        elif state.mode == RunMode.ENCROACHMENT:
-            output_photos_root = resolved.encroachment_output_base
-            output_base = encroachment_run_base(output_photos_root) if output_photos_root else None
-        else:
-            output_photos_root = resolved.encroachment_output_base
-            output_base = encroachment_run_base(output_photos_root) if output_photos_root else None
-        output_base = output_base or Path.home()
-        run_folder = AppSettings.new_run_folder(output_base)
-
-        rename_template = None
-        if state.encroachment_template_id:
-            rename_template = self.template_manager.templates.get(state.encroachment_template_id)
-        elif state.encroachment_rename_enabled and state.encroachment_client_abbr.strip():
-            rename_template = RenameTemplate(
-                id="manual",
-                name="Manual",
-                client=state.encroachment_client_abbr.strip(),
-                pattern="{client}_{index:04d}",
-                description="Manual client abbreviation",
-                start_index=max(1, int(state.encroachment_start_index)),
-            )
-
-        overwrite_originals = self.settings.overwrite_originals_default
-        flatten = self.settings.flatten_default
-        cleanup_empty_dirs = self.settings.cleanup_empty_dirs_default
-        sort_by_ppm = self.settings.sort_by_ppm_default
-        enable_renaming = state.encroachment_rename_enabled
-
-        if state.mode == RunMode.METHANE:
-            overwrite_originals = True
-            flatten = False
-            cleanup_empty_dirs = False
-            sort_by_ppm = False
-            enable_renaming = False
-        elif state.mode == RunMode.ENCROACHMENT:
-            overwrite_originals = False
-            flatten = False
-            cleanup_empty_dirs = False
-            sort_by_ppm = False
-        elif state.mode == RunMode.COMBINED:
-            overwrite_originals = True
-            flatten = False
-            cleanup_empty_dirs = False
-            sort_by_ppm = False
-
-        return JobOptions(
-            output_root=run_folder,
-            overwrite_originals=overwrite_originals,
-            create_backup_on_overwrite=self.settings.create_backup_on_overwrite,
-            flatten=flatten,
-            cleanup_empty_dirs=cleanup_empty_dirs,
-            sort_by_ppm=sort_by_ppm,
-            ppm_bin_edges=self.settings.ppm_bin_edges,
-            write_xmp=self.settings.write_xmp_default,
-            dry_run=self.settings.dry_run_default,
-            max_join_delta_seconds=self.settings.max_join_delta_seconds,
-            purway_payload="",
-            enable_renaming=enable_renaming,
-            rename_template=rename_template,
-            start_index=max(1, int(state.encroachment_start_index)),
-            run_mode=state.mode,
-            methane_threshold=state.methane_threshold,
-            methane_generate_kmz=state.methane_generate_kmz,
-            methane_log_base=resolved.methane_log_base,
-            encroachment_output_base=resolved.encroachment_output_base,
-            output_photos_root=output_photos_root,
-        )
+        return build_job_options(state, self.settings, self.template_manager.templates)
 
     def cancel_job(self, job: Job) -> None:
         if job.id in self._workers:
@@ -195,11 +154,10 @@ class JobController(QObject):
             if w:
                 w.cancel()
             return
-        if job in self._queue:
-            self._queue.remove(job)
+        if self.scheduler.remove(job):
             job.state.stage = "CANCELLED"
             job.state.message = "Cancelled before start."
-            self.jobs_changed.emit()
+            self._job_changed(job, immediate=True)
 
     def open_output_folder(self, job: Job) -> None:
         if job.run_folder:
@@ -215,7 +173,7 @@ class JobController(QObject):
         manifest_path = self.export_manifest_path(job)
         if not manifest_path:
             return None
-        failed_paths = _failed_paths_from_manifest(manifest_path)
+        failed_paths = _failed_paths_for_run(job.run_folder, manifest_path)
         if not failed_paths:
             return None
         output_root = job.run_folder.parent if job.run_folder else Path.home()
@@ -236,71 +194,112 @@ class JobController(QObject):
             inputs_override=failed_paths,
         )
 
-    def _on_progress(self, job: Job, pct: int, msg: str, bar: QProgressBar) -> None:
-        job.state.progress = pct
-        job.state.message = msg
+    def _on_progress(self, job: Job, event: ProgressEvent, bar: QProgressBar) -> None:
+        job.state.progress = event.percent
+        job.state.message = event.message
         if bar:
-            bar.setProperty("status", "running")
-            bar.style().unpolish(bar)
-            bar.style().polish(bar)
-            bar.setValue(pct)
-            bar.setFormat(f"{pct}% — {msg}")
-        self.jobs_changed.emit()
+            _set_bar_status(bar, "running")
+            bar.setValue(event.percent)
+            bar.setFormat(f"{event.percent}% — {event.message}")
+        self._job_changed(job)
 
     def _on_finished(self, job: Job) -> None:
         bar = self._progress_bars.get(job.id)
         if bar:
-            bar.setProperty("status", "success")
-            bar.style().unpolish(bar)
-            bar.style().polish(bar)
+            _set_bar_status(bar, "success")
             bar.setValue(100)
             bar.setFormat("100% — Done.")
         self._workers.pop(job.id, None)
-        self._active_job_id = None
-        self.jobs_changed.emit()
-        self._start_next_queued()
+        self.scheduler.finish(job)
+        self._job_changed(job, immediate=True)
+        self._dispatch()
 
     def _on_failed(self, job: Job, err: str) -> None:
         job.state.stage = "FAILED"
         job.state.message = err
         bar = self._progress_bars.get(job.id)
         if bar:
-            bar.setProperty("status", "error")
-            bar.style().unpolish(bar)
-            bar.style().polish(bar)
+            _set_bar_status(bar, "error")
             msg = err.strip() if err else "Failed."
             if len(msg) > 120:
                 msg = msg[:117] + "..."
             bar.setValue(job.state.progress or 0)
             bar.setFormat(f"Failed — {msg}")
         self._workers.pop(job.id, None)
-        self._active_job_id = None
-        self.jobs_changed.emit()
-        self._start_next_queued()
+        self.scheduler.finish(job)
+        self._job_changed(job, immediate=True)
+        self._dispatch()
 
     def _start_worker(self, job: Job) -> None:
         bar = self._progress_bars.get(job.id)
         if bar:
-            bar.setProperty("status", "starting")
-            bar.style().unpolish(bar)
-            bar.style().polish(bar)
+            _set_bar_status(bar, "starting")
             bar.setValue(0)
             bar.setFormat("0% — Starting...")
         worker = JobWorker(job=job)
         self._workers[job.id] = worker
-        self._active_job_id = job.id
-        worker.progress.connect(lambda pct, msg: self._on_progress(job, pct, msg, bar))
+        worker.progress.connect(lambda event: self._on_progress(job, event, bar))
         worker.finished.connect(lambda: self._on_finished(job))
         worker.failed.connect(lambda err: self._on_failed(job, err))
         worker.start()
 
-    def _start_next_queued(self) -> None:
-        if not self._queue:
-            return
-        next_job = self._queue.pop(0)
-        next_job.state.stage = "PENDING"
-        next_job.state.message = "Starting..."
-        self._start_worker(next_job)
+    def _job_changed(self, job: Job, immediate: bool = False) -> None:
+        """Queue a job_updated notification; progress ticks are batched per UPDATE_INTERVAL_MS."""
+        self._dirty_jobs[job.id] = job
+        if immediate:
+            self._flush_job_updates()
+        elif not self._update_timer.isActive():
+            self._update_timer.start()
+
+    def _flush_job_updates(self) -> None:
+        self._update_timer.stop()
+        dirty = list(self._dirty_jobs.values())
+        self._dirty_jobs.clear()
+        for job in dirty:
+            self.job_updated.emit(job)
+        if dirty:
+            self.jobs_changed.emit()
+
+    def _resource_limits(self) -> ResourceLimits:
+        s = self.settings
+        return ResourceLimits(
+            max_jobs=s.max_concurrent_jobs or default_max_jobs(),
+            max_exiftool_processes=s.max_exiftool_processes,
+            io_jobs_per_device=s.io_jobs_per_device,
+        )
+
+    def _dispatch(self) -> None:
+        """Start every queued job the scheduler allows (settings are re-read each time)."""
+        limits = self._resource_limits()
+        self.scheduler.limits = limits
+        set_max_exiftool_processes(limits.max_exiftool_processes)
+        for next_job in self.scheduler.next_ready():
+            next_job.state.stage = "PENDING"
+            next_job.state.message = "Starting..."
+            self._start_worker(next_job)
+            self._job_changed(next_job)
+
+
+def _set_bar_status(bar: QProgressBar, status: str) -> None:
+    """Set the bar's QSS status property, re-polishing only when it changes."""
+    if bar.property("status") == status:
+        return
+    bar.setProperty("status", status)
+    bar.style().unpolish(bar)
+    bar.style().polish(bar)
+
+
+def _failed_paths_for_run(run_folder: Path, manifest_path: Path) -> list[Path]:
+    """Failed source photos that still exist, read from run.sqlite when available."""
+    db = run_db_path(run_folder)
+    if db.exists():
+        try:
+            rows = query_tasks(db, "FAILED", ("source_path",))
+        except sqlite3.Error:
+            pass
+        else:
+            return [p for p in (Path(r["source_path"]) for r in rows if r["source_path"]) if p.exists()]
+    return _failed_paths_from_manifest(manifest_path)
 
 
 def _failed_paths_from_manifest(path: Path) -> list[Path]:
@@ -24,23 +24,18 @@ from purway_geotagger.gui.widgets.drop_zone import DropZone
 from purway_geotagger.gui.models.job_table_model import JobTableModel
 from purway_geotagger.gui.models.jobs_filter_proxy_model import JobsFilterProxyModel
 from purway_geotagger.gui.controllers import JobController
-from purway_geotagger.gui.mode_state import ModeState
+from purway_geotagger.core.mode_state import ModeState
+from purway_geotagger.core.startup_profile import startup_profiler
 from purway_geotagger.gui.pages.home_page import HomePage
-from purway_geotagger.gui.pages.methane_page import MethanePage
-from purway_geotagger.gui.pages.encroachment_page import EncroachmentPage
-from purway_geotagger.gui.pages.combined_wizard import CombinedWizard
-from purway_geotagger.gui.pages.wind_data_page import WindDataPage
-from purway_geotagger.gui.pages.help_page import HelpPage
-from purway_geotagger.gui.widgets.template_editor import TemplateEditorDialog
 from purway_geotagger.gui.widgets.theme_toggle import ThemeToggle
-from purway_geotagger.gui.widgets.settings_dialog import SettingsDialog
-from purway_geotagger.gui.widgets.preview_dialog import PreviewDialog
-from purway_geotagger.gui.widgets.schema_dialog import SchemaDialog
-from purway_geotagger.gui.widgets.run_report_view import RunReportDialog
-from purway_geotagger.gui.workers import PreviewWorker
 from purway_geotagger.gui.theme import apply_theme
 from purway_geotagger.exif.exiftool_writer import is_exiftool_available
 
+# Mode pages, the Wind Data / Help tabs and dialogs are imported and built on
+# first use; only the Home page, Jobs and Templates tabs exist at startup.
+WIND_TAB_INDEX = 3
+HELP_TAB_INDEX = 4
+
 class MainWindow(QMainWindow):
     def __init__(self, settings: AppSettings) -> None:
         super().__init__()
@@ -170,28 +165,7 @@ class MainWindow(QMainWindow):
         self.home_page.mode_selected.connect(self._on_mode_selected)
         self.home_page.wind_data_selected.connect(self._open_wind_data_tab)
 
-        self.methane_page = MethanePage(self._mode_states[RunMode.METHANE], self.controller)
-        self.encroachment_page = EncroachmentPage(self._mode_states[RunMode.ENCROACHMENT], self.controller)
-        self.combined_page = CombinedWizard(self._mode_states[RunMode.COMBINED], self.controller)
-
-        self.methane_page.back_requested.connect(self._show_home)
-        self.methane_page.home_requested.connect(self._show_home)
-        self.methane_page.run_another_requested.connect(self._reset_all_modes_and_home)
-        self.encroachment_page.back_requested.connect(self._show_home)
-        self.encroachment_page.home_requested.connect(self._show_home)
-        self.encroachment_page.run_another_requested.connect(self._reset_all_modes_and_home)
-        self.combined_page.home_requested.connect(self._show_home)
-        self.combined_page.run_another_requested.connect(self._reset_all_modes_and_home)
-
         self.run_stack.addWidget(self.home_page)
-        self.run_stack.addWidget(self.methane_page)
-        self.run_stack.addWidget(self.encroachment_page)
-        self.run_stack.addWidget(self.combined_page)
-        self._mode_pages = {
-            RunMode.METHANE: self.methane_page,
-            RunMode.ENCROACHMENT: self.encroachment_page,
-            RunMode.COMBINED: self.combined_page,
-        }
 
         self.run_stack.setCurrentWidget(self.home_page)
 
@@ -404,20 +378,19 @@ class MainWindow(QMainWindow):
         tmpl_btn_row.addWidget(self.template_refresh_btn)
         templates_layout.addLayout(tmpl_btn_row)
 
-        # ----- Tab 4: Wind Data -----
-        self.wind_data_page = WindDataPage(self.settings)
-        self.main_stack.addWidget(self.wind_data_page)
-
-        # ----- Tab 5: Help -----
-        self.help_page = HelpPage()
-        
-        # Link action buttons inside Help Page if we add them, 
-        # but for now it's just content. 
-        # If we wanted to keep the "Start Now" buttons we could add them to HelpPage
-        # or wrapping widget here. For now, the clean doc is better.
-        
-        self.main_stack.addWidget(self.help_page)
-
+        # ----- Tab 4: Wind Data / Tab 5: Help (built on first visit) -----
+        self.wind_data_page = None
+        self.help_page = None
+        self._lazy_tabs = {
+            WIND_TAB_INDEX: self._build_wind_data_page,
+            HELP_TAB_INDEX: self._build_help_page,
+        }
+        for _index in sorted(self._lazy_tabs):
+            holder = QWidget()
+            holder_layout = QVBoxLayout(holder)
+            holder_layout.setContentsMargins(0, 0, 0, 0)
+            self.main_stack.addWidget(holder)
+        self.main_stack.currentChanged.connect(self._ensure_tab)
 
         self._refresh_templates()
         self._update_jobs_empty_state()
@@ -428,7 +401,7 @@ class MainWindow(QMainWindow):
         self._show_mode(mode)
 
     def _show_mode(self, mode: RunMode) -> None:
-        page = self._mode_pages.get(mode)
+        page = self._mode_page(mode)
         if not page:
             return
         self._set_last_mode(mode)
@@ -437,18 +410,67 @@ class MainWindow(QMainWindow):
             refresh()
         self.run_stack.setCurrentWidget(page)
 
+    def _mode_page(self, mode: RunMode) -> QWidget | None:
+        page = self._mode_pages.get(mode)
+        if page is not None or mode not in self._mode_states:
+            return page
+        profiler = startup_profiler()
+        if mode == RunMode.METHANE:
+            with profiler.measure("purway_geotagger.gui.pages.methane_page", "import"):
+                from purway_geotagger.gui.pages.methane_page import MethanePage as page_cls
+        elif mode == RunMode.ENCROACHMENT:
+            with profiler.measure("purway_geotagger.gui.pages.encroachment_page", "import"):
+                from purway_geotagger.gui.pages.encroachment_page import EncroachmentPage as page_cls
+        else:
+            with profiler.measure("purway_geotagger.gui.pages.combined_wizard", "import"):
+                from purway_geotagger.gui.pages.combined_wizard import CombinedWizard as page_cls
+        with profiler.measure(page_cls.__name__, "construct"):
+            page = page_cls(self._mode_states[mode], self.controller)
+        if hasattr(page, "back_requested"):
+            page.back_requested.connect(self._show_home)
+        page.home_requested.connect(self._show_home)
+        page.run_another_requested.connect(self._reset_all_modes_and_home)
+        self.run_stack.addWidget(page)
+        self._mode_pages[mode] = page
+        return page
+
+    @Slot(int)
+    def _ensure_tab(self, index: int) -> None:
+        build = self._lazy_tabs.pop(index, None)
+        if build is None:
+            return
+        page = build()
+        self.main_stack.widget(index).layout().addWidget(page)
+        if not self._lazy_tabs:
+            self.main_stack.currentChanged.disconnect(self._ensure_tab)
+
+    def _build_wind_data_page(self) -> QWidget:
+        profiler = startup_profiler()
+        with profiler.measure("purway_geotagger.gui.pages.wind_data_page", "import"):
+            from purway_geotagger.gui.pages.wind_data_page import WindDataPage
+        with profiler.measure("WindDataPage", "construct"):
+            self.wind_data_page = WindDataPage(self.settings)
+        return self.wind_data_page
+
+    def _build_help_page(self) -> QWidget:
+        profiler = startup_profiler()
+        with profiler.measure("purway_geotagger.gui.pages.help_page", "import"):
+            from purway_geotagger.gui.pages.help_page import HelpPage
+        with profiler.measure("HelpPage", "construct"):
+            self.help_page = HelpPage()
+        return self.help_page
+
     def _show_home(self) -> None:
         self.run_stack.setCurrentWidget(self.home_page)
         self.home_page.set_last_mode(self._last_mode)
 
     def _open_wind_data_tab(self) -> None:
-        self.main_stack.setCurrentWidget(self.wind_data_page)
+        self.main_stack.setCurrentIndex(WIND_TAB_INDEX)
         self.btn_wind.setChecked(True)
 
     def _reset_all_modes_and_home(self) -> None:
-        self.methane_page.reset_for_new_run()
-        self.encroachment_page.reset_for_new_run()
-        self.combined_page.reset_for_new_run()
+        for page in self._mode_pages.values():
+            page.reset_for_new_run()
         self.progress.setVisible(False)
         self.progress.setValue(0)
         self._show_home()
@@ -558,13 +580,13 @@ class MainWindow(QMainWindow):
 
     @Slot()
     def _on_jobs_changed(self) -> None:
-        self.model.layoutChanged.emit()
-        if hasattr(self, "jobs_proxy"):
-            self.jobs_proxy.invalidate()
+        # The table model follows job_added/job_updated itself (row-level updates).
         self._update_action_buttons()
         self._update_jobs_empty_state()
 
     def _open_settings(self) -> None:
+        from purway_geotagger.gui.widgets.settings_dialog import SettingsDialog
+
         dlg = SettingsDialog(self.settings, parent=self)
         if dlg.exec():
             if hasattr(self, "cleanup_chk"):
@@ -582,6 +604,8 @@ class MainWindow(QMainWindow):
                 self.theme_toggle.set_theme(self.settings.ui_theme)
 
     def _open_template_editor(self) -> None:
+        from purway_geotagger.gui.widgets.template_editor import TemplateEditorDialog
+
         dlg = TemplateEditorDialog(self.controller.template_manager, parent=self)
         if dlg.exec():
             self._refresh_templates()
@@ -684,11 +708,10 @@ class MainWindow(QMainWindow):
             return
         if job is None:
             self.jobs_detail_status_badge.setText("No selection")
-            self.jobs_detail_status_badge.setProperty("status", "idle")
+            self._set_jobs_badge_status("idle")
             self.jobs_detail_hint.setVisible(True)
             for value in self.jobs_detail_values.values():
                 value.setText("—")
-            self._refresh_jobs_badge_style()
             return
 
         st = job.state
@@ -701,7 +724,7 @@ class MainWindow(QMainWindow):
             "PENDING": ("Pending", "queued"),
         }.get(stage, (st.stage.title() if st.stage else "Running", "running"))
         self.jobs_detail_status_badge.setText(stage_text)
-        self.jobs_detail_status_badge.setProperty("status", stage_key)
+        self._set_jobs_badge_status(stage_key)
         self.jobs_detail_hint.setVisible(False)
 
         self.jobs_detail_values["name"].setText(job.name)
@@ -715,6 +738,12 @@ class MainWindow(QMainWindow):
         self.jobs_detail_values["failed"].setText(str(st.failed))
         self.jobs_detail_values["output"].setText(str(job.run_folder or ""))
         self.jobs_detail_values["message"].setText(st.message or "—")
+
+    def _set_jobs_badge_status(self, status: str) -> None:
+        # Re-polishing is the expensive part of a badge update; skip it while the status holds.
+        if self.jobs_detail_status_badge.property("status") == status:
+            return
+        self.jobs_detail_status_badge.setProperty("status", status)
         self._refresh_jobs_badge_style()
 
     def _refresh_jobs_badge_style(self) -> None:
@@ -747,6 +776,8 @@ class MainWindow(QMainWindow):
         return dt.strftime("%Y-%m-%d %H:%M:%S")
 
     def _view_selected_report(self) -> None:
+        from purway_geotagger.gui.widgets.run_report_view import RunReportDialog
+
         job = self._selected_job()
         if not job or not job.run_folder:
             QMessageBox.information(self, "Run report not available", "Run report is not available yet.")
@@ -755,33 +786,42 @@ class MainWindow(QMainWindow):
         dlg.exec()
 
     def _preview_matches(self) -> None:
+        from purway_geotagger.gui.widgets.preview_dialog import PreviewDialog
+        from purway_geotagger.gui.workers import PreviewWorker
+
         if not self.controller.inputs:
             QMessageBox.information(self, "No inputs", "Drop folders/files to preview.")
             return
         self.preview_btn.setEnabled(False)
         worker = PreviewWorker(
             inputs=self.controller.inputs.copy(),
-            max_rows=20,
+            max_rows=None,
             max_join_delta_seconds=self.settings.max_join_delta_seconds,
+            stream=True,
         )
-        worker.finished.connect(lambda result: self._show_preview_result(worker, result))
-        worker.failed.connect(lambda err: self._show_preview_error(worker, err))
+        dlg = PreviewDialog(parent=self)
+        errors: list[str] = []
+        worker.scanned.connect(dlg.set_scanned)
+        worker.rows_ready.connect(dlg.add_rows)
+        worker.finished.connect(lambda _result: dlg.set_finished())
+        worker.failed.connect(lambda err: (errors.append(err), dlg.reject()))
         worker.start()
-
-    def _show_preview_result(self, worker: PreviewWorker, result) -> None:
-        dlg = PreviewDialog(result, parent=self)
         dlg.exec()
-        self.preview_btn.setEnabled(True)
-        worker.quit()
+        worker.cancel()
         worker.wait()
+        self.preview_btn.setEnabled(True)
+        if errors:
+            QMessageBox.warning(self, "Preview failed", errors[0])
 
-    def _show_preview_error(self, worker: PreviewWorker, err: str) -> None:
+    def _show_preview_error(self, worker, err: str) -> None:
         QMessageBox.warning(self, "Preview failed", err)
         self.preview_btn.setEnabled(True)
         worker.quit()
         worker.wait()
 
     def _show_schema(self) -> None:
+        from purway_geotagger.gui.workers import PreviewWorker
+
         if not self.controller.inputs:
             QMessageBox.information(self, "No inputs", "Drop folders/files to inspect.")
             return
@@ -794,7 +834,9 @@ class MainWindow(QMainWindow):
         worker.failed.connect(lambda err: self._show_preview_error(worker, err))
         worker.start()
 
-    def _show_schema_result(self, worker: PreviewWorker, result) -> None:
+    def _show_schema_result(self, worker, result) -> None:
+        from purway_geotagger.gui.widgets.schema_dialog import SchemaDialog
+
         dlg = SchemaDialog(result.schemas, parent=self)
         dlg.exec()
         worker.quit()
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, Slot
 
+from purway_geotagger.core.job import Job
 from purway_geotagger.gui.controllers import JobController
 
 HEADERS = [
@@ -21,14 +22,27 @@ HEADERS = [
     "Failed",
     "Message",
 ]
+STATE_COLUMNS = (3, len(HEADERS) - 1)  # Status .. Message change while a job runs
 
 class JobTableModel(QAbstractTableModel):
+    """Table over controller.jobs, updated row by row from the controller's signals.
+
+    Rows are only ever appended; the model announces them with
+    beginInsertRows and refreshes a job's state cells with dataChanged, so
+    views and the filter proxy never re-sort or re-filter the whole history.
+    """
+
     def __init__(self, controller: JobController) -> None:
         super().__init__()
         self.controller = controller
+        self._rows: dict[str, int] = {job.id: i for i, job in enumerate(controller.jobs)}
+        controller.job_added.connect(self._on_job_added)
+        controller.job_updated.connect(self._on_job_updated)
 
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
-        return len(self.controller.jobs)
+        if parent.isValid():
+            return 0
+        return len(self._rows)
 
     def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
         return len(HEADERS)
@@ -41,7 +55,7 @@ class JobTableModel(QAbstractTableModel):
         return str(section)
 
     def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
-        if role != Qt.DisplayRole:
+        if role != Qt.DisplayRole or not index.isValid() or index.row() >= len(self._rows):
             return None
         job = self.controller.jobs[index.row()]
         st = job.state
@@ -74,6 +88,28 @@ class JobTableModel(QAbstractTableModel):
             return st.message
         return None
 
+    def row_for_job(self, job: Job) -> int | None:
+        return self._rows.get(job.id)
+
+    @Slot(object)
+    def _on_job_added(self, _job: Job) -> None:
+        jobs = self.controller.jobs
+        first = len(self._rows)
+        if first >= len(jobs):
+            return
+        self.beginInsertRows(QModelIndex(), first, len(jobs) - 1)
+        for row in range(first, len(jobs)):
+            self._rows[jobs[row].id] = row
+        self.endInsertRows()
+
+    @Slot(object)
+    def _on_job_updated(self, job: Job) -> None:
+        row = self._rows.get(job.id)
+        if row is None:
+            return
+        first, last = STATE_COLUMNS
+        self.dataChanged.emit(self.index(row, first), self.index(row, last), [Qt.DisplayRole])
+
 
 def _format_started(job) -> str:
     if not job.run_folder:
@@ -11,6 +11,20 @@ class JobsFilterProxyModel(QSortFilterProxyModel):
         self._show_all_history = False
         self._recent_limit = 20
 
+    def setSourceModel(self, model) -> None:
+        previous = self.sourceModel()
+        if previous is not None:
+            previous.rowsInserted.disconnect(self._on_source_rows_inserted)
+        super().setSourceModel(model)
+        if model is not None:
+            model.rowsInserted.connect(self._on_source_rows_inserted)
+
+    def _on_source_rows_inserted(self, *_args) -> None:
+        # New rows are filtered incrementally, but they can also push older
+        # rows out of the "recent" window, which only a full re-filter catches.
+        if not self._show_all_history and self.sourceModel().rowCount() > self._recent_limit:
+            self.invalidateFilter()
+
     def set_status_filter(self, value: str) -> None:
         text = (value or "all").strip().lower()
         if text not in {"all", "running", "failed", "completed"}:
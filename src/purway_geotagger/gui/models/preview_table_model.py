@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from purway_geotagger.core.preview import PREVIEW_FIELDS, PreviewStore
+
+HEADERS = ["Status", "Join", "Photo", "CSV", "Lat", "Lon", "PPM", "DateTime", "Reason"]
+NUMERIC_COLUMNS = {4, 5, 6}
+
+
+class PreviewTableModel(QAbstractTableModel):
+    """Table over a PreviewStore that grows while the preview is running.
+
+    Sorting and the status / join-method filters only rearrange `_view`, a
+    list of store row numbers; cells are formatted from the store's columns
+    when the view asks for them, so no per-row objects are kept.
+    """
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.store = PreviewStore()
+        self._view: list[int] = []
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
+        self._status_filter: str | None = None
+        self._join_filter: str | None = None
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._view)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return len(HEADERS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return str(section + 1)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._view):
+            return None
+        if role == Qt.DisplayRole:
+            return self.store.value(self._view[index.row()], PREVIEW_FIELDS[index.column()])
+        if role == Qt.TextAlignmentRole and index.column() in NUMERIC_COLUMNS:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def append_rows(self, batch: PreviewStore) -> None:
+        """Add a batch from the preview worker; it is copied into this model's store."""
+        if not len(batch):
+            return
+        start = len(self.store)
+        self.store.extend(batch)
+        new_rows = [i for i in range(start, len(self.store)) if self._accepts(i)]
+        if not new_rows:
+            return
+        if self._sort_column < 0:
+            first = len(self._view)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_rows) - 1)
+            self._view.extend(new_rows)
+            self.endInsertRows()
+            return
+        self._relayout(self._sorted(self._view + new_rows))
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.AscendingOrder) -> None:
+        self._sort_column = column
+        self._sort_order = order
+        if column < 0:
+            self._relayout(sorted(self._view))
+        else:
+            self._relayout(self._sorted(self._view))
+
+    def set_filters(self, status: str | None = None, join_method: str | None = None) -> None:
+        """Show only rows with this status and/or join method (None = any)."""
+        if (status, join_method) == (self._status_filter, self._join_filter):
+            return
+        self._status_filter = status
+        self._join_filter = join_method
+        self.beginResetModel()
+        self._view = self._sorted(self.store.rows_where(status, join_method))
+        self.endResetModel()
+
+    def _accepts(self, i: int) -> bool:
+        if self._status_filter is not None and self.store.value(i, "status") != self._status_filter:
+            return False
+        if self._join_filter is not None and self.store.value(i, "join_method") != self._join_filter:
+            return False
+        return True
+
+    def _sorted(self, rows: list[int]) -> list[int]:
+        if self._sort_column < 0:
+            return rows
+        return self.store.sort_rows(
+            rows, PREVIEW_FIELDS[self._sort_column], descending=self._sort_order == Qt.DescendingOrder,
+        )
+
+    def _relayout(self, view: list[int]) -> None:
+        """Swap in a reordered `_view`, keeping selections on the same store rows."""
+        self.layoutAboutToBeChanged.emit()
+        old = self.persistentIndexList()
+        old_rows = [self._view[idx.row()] for idx in old]
+        self._view = view
+        position = {store_row: row for row, store_row in enumerate(view)} if old else {}
+        self.changePersistentIndexList(
+            old,
+            [self.index(position[r], idx.column()) if r in position else QModelIndex() for idx, r in zip(old, old_rows)],
+        )
+        self.layoutChanged.emit()
@@ -1,15 +1,23 @@
-from .home_page import HomePage
-from .methane_page import MethanePage
-from .encroachment_page import EncroachmentPage
-from .combined_wizard import CombinedWizard
-from .wind_data_page import WindDataPage
-from .help_page import HelpPage
-
-__all__ = [
-    "HomePage",
-    "MethanePage",
-    "EncroachmentPage",
-    "CombinedWizard",
-    "WindDataPage",
-    "HelpPage",
-]
+# Pages are imported on first use (see MainWindow) so that importing one page
+# module does not pull in the others and their dependencies.
+from __future__ import annotations
+
+from importlib import import_module
+
+_PAGES = {
+    "HomePage": ".home_page",
+    "MethanePage": ".methane_page",
+    "EncroachmentPage": ".encroachment_page",
+    "CombinedWizard": ".combined_wizard",
+    "WindDataPage": ".wind_data_page",
+    "HelpPage": ".help_page",
+}
+
+__all__ = list(_PAGES)
+
+
+def __getattr__(name: str):
+    module = _PAGES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(module, __name__), name)
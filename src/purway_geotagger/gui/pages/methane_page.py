@@ -25,7 +25,7 @@ from PySide6.QtWidgets import (
 from purway_geotagger.core.modes import common_parent, default_methane_log_base
 from purway_geotagger.exif.exiftool_writer import is_exiftool_available
 from purway_geotagger.gui.controllers import JobController
-from purway_geotagger.gui.mode_state import ModeState
+from purway_geotagger.core.mode_state import ModeState
 from purway_geotagger.gui.widgets.run_report_view import RunReportDialog
 from purway_geotagger.gui.widgets.settings_dialog import SettingsDialog
 from purway_geotagger.gui.widgets.drop_zone import DropZone
@@ -1,29 +1,160 @@
 from __future__ import annotations
 
-from PySide6.QtGui import QPalette
-from PySide6.QtWidgets import QApplication
+import hashlib
+from pathlib import Path
+import re
 
+from appdirs import user_cache_dir
+from PySide6.QtCore import QTimer, Qt
+from PySide6.QtWidgets import QApplication, QWidget
+
+from purway_geotagger import __version__
+from purway_geotagger.core.utils import resource_path
+from purway_geotagger.gui import style_sheet
 from purway_geotagger.gui.style_sheet import get_stylesheet, get_palette
 
+THEMES = ("light", "dark")
+THEME_PROPERTY = "theme"  # set on every window; the stylesheet rules are scoped by it
+REPOLISH_CHUNK = 150  # hidden widgets repolished per event-loop pass after a switch
 
-def apply_theme(app: QApplication, theme: str) -> None:
+_RULE = re.compile(r"([^{}]+)\{([^{}]*)\}")
+_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_pending: list[QWidget] = []
+
+
+def normalize_theme(theme: str) -> str:
     mode = (theme or "light").strip().lower()
-    if mode not in ("light", "dark"):
-        mode = "light"
-
-    # We rely on the QSS for almost everything now.
-    # However, sometimes we still need to set the general palette 
-    # for certain unstyled controls or macOS defaults.
-    
-    # Force a general palette update to guide OS-level things
-    # but the heavy lifting is in setStyleSheet
-    app.setPalette(get_palette(mode))
-    
-    # Load and inject QSS
-    qss = get_stylesheet(mode)
-    app.setStyleSheet(qss)
-    
-    # We don't rely on Fusion palette injection as much anymore
-    # but setting property can help custom widgets know the mode
-    app.setProperty("darkMode", mode == "dark")
+    return mode if mode in THEMES else "light"
+
+
+def apply_theme(app: QApplication, theme: str) -> None:
+    """Switch the application to `theme` ('light' or 'dark').
+
+    The stylesheet holds both themes (see themed_stylesheet()) and is set
+    once; a switch only flips each window's `theme` property, updates the
+    palette and re-polishes the affected widgets — visible ones at once,
+    hidden ones over the next event-loop passes. Calling it again with the
+    current theme only tags windows created since the last call.
+    """
+    mode = normalize_theme(theme)
+    if not app.property("themedStyleSheet"):
+        app.setStyleSheet(themed_stylesheet())
+        app.setProperty("themedStyleSheet", True)
+    if app.property(THEME_PROPERTY) != mode:
+        # The palette guides OS-level and unstyled controls; QSS does the rest.
+        app.setPalette(get_palette(mode))
+        app.setProperty(THEME_PROPERTY, mode)
+        # Custom widgets read this to pick light/dark assets.
+        app.setProperty("darkMode", mode == "dark")
+
+    hidden: list[QWidget] = []
+    for window in app.topLevelWidgets():
+        if window.property(THEME_PROPERTY) == mode:
+            continue
+        window.setProperty(THEME_PROPERTY, mode)
+        for widget in [window, *window.findChildren(QWidget)]:
+            if not widget.testAttribute(Qt.WA_WState_Polished):
+                continue  # polished with the new rules when first shown
+            if widget.isVisible():
+                repolish(widget)
+            else:
+                hidden.append(widget)
+    if hidden:
+        if not _pending:
+            QTimer.singleShot(0, _repolish_pending)
+        _pending.extend(hidden)
+
+
+def repolish(widget: QWidget) -> None:
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    QWidget.update(widget)  # item views overload update(index)
+
+
+def _repolish_pending() -> None:
+    batch = _pending[:REPOLISH_CHUNK]
+    del _pending[:REPOLISH_CHUNK]
+    for widget in batch:
+        try:
+            repolish(widget)
+        except RuntimeError:
+            pass  # deleted (e.g. a closed dialog) before its turn
+    if _pending:
+        QTimer.singleShot(0, _repolish_pending)
+
+
+def scope_stylesheet(qss: str, theme: str) -> str:
+    """Restrict every rule of `qss` to windows whose `theme` property is `theme`.
+
+    Each selector S becomes `*[theme="x"] S` (inside a tagged window) plus S
+    with the attribute on its subject (the tagged window itself).
+    """
+    attr = f'[{THEME_PROPERTY}="{theme}"]'
+    rules = []
+    for m in _RULE.finditer(_COMMENT.sub("", qss)):
+        selectors = [s.strip() for s in m.group(1).split(",") if s.strip()]
+        if not selectors:
+            continue
+        scoped = []
+        for sel in selectors:
+            scoped.append(f"*{attr} {sel}")
+            scoped.append(_with_subject_attr(sel, attr))
+        rules.append(",\n".join(scoped) + " {" + m.group(2) + "}")
+    return "\n".join(rules)
+
+
+def _with_subject_attr(selector: str, attr: str) -> str:
+    # The subject is the last compound; the attribute goes before its first
+    # pseudo-state or sub-control (":" outside [...]).
+    depth = 0
+    start = 0
+    for i, ch in enumerate(selector):
+        if ch == "[":
+            depth += 1
+        elif ch == "]":
+            depth -= 1
+        elif depth == 0 and ch in " >":
+            start = i + 1
+    depth = 0
+    for i in range(start, len(selector)):
+        ch = selector[i]
+        if ch == "[":
+            depth += 1
+        elif ch == "]":
+            depth -= 1
+        elif depth == 0 and ch == ":":
+            return selector[:i] + attr + selector[i:]
+    return selector + attr
+
+
+def themed_stylesheet() -> str:
+    """Scoped rules for all themes, read from the on-disk cache when it is current."""
+    path = stylesheet_cache_path()
+    try:
+        return path.read_text(encoding="utf-8")
+    except OSError:
+        pass
+    qss = "\n".join(scope_stylesheet(get_stylesheet(t), t) for t in THEMES)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        for stale in path.parent.glob("stylesheet-*.qss"):
+            stale.unlink(missing_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(qss, encoding="utf-8")
+        tmp.replace(path)
+    except OSError:
+        pass  # read-only cache dir: just regenerate next launch
+    return qss
+
 
+def stylesheet_cache_path() -> Path:
+    """Cache file keyed by app version, resource location (icon URLs) and generator."""
+    stamp = ""
+    try:
+        stamp = str(Path(style_sheet.__file__).stat().st_mtime_ns)
+    except (OSError, TypeError):
+        pass  # frozen build: the version is the key
+    key = hashlib.sha1(f"{resource_path('assets')}|{stamp}".encode("utf-8")).hexdigest()[:12]
+    cache_dir = Path(user_cache_dir(appname="PurwayGeotagger", appauthor=False))
+    return cache_dir / f"stylesheet-{__version__}-{key}.qss"
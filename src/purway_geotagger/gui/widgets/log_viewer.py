@@ -2,10 +2,190 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from PySide6.QtWidgets import QDialog, QVBoxLayout, QLabel, QTextEdit, QDialogButtonBox, QPushButton
+from PySide6.QtCore import QFileSystemWatcher, QTimer
+from PySide6.QtGui import QTextCursor
+from PySide6.QtWidgets import (
+    QCheckBox,
+    QDialog,
+    QDialogButtonBox,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QPlainTextEdit,
+    QPushButton,
+    QVBoxLayout,
+    QWidget,
+)
 
+from purway_geotagger.core.log_reader import LogReader
 from purway_geotagger.util.platform import open_in_finder
 
+TAIL_LINES = 2000  # shown when the log is opened
+PAGE_LINES = 2000  # loaded each time the view is scrolled to the top
+POLL_INTERVAL_MS = 1000  # fallback for file watchers that miss appends
+
+
+class LogTailView(QWidget):
+    """Read-only log view that loads the tail first and pages in older lines.
+
+    Lines come from a LogReader, so only the loaded window is held in
+    memory. New lines are appended as the file grows (file watcher plus a
+    slow poll); with "Follow" checked the view stays at the bottom.
+    """
+
+    def __init__(self, log_path: Path, parent=None) -> None:
+        super().__init__(parent)
+        self.log_path = log_path
+        self.reader = LogReader(log_path)
+        self._first_line = 0  # first file line shown in the editor
+        self._last_line = 0  # one past the last file line shown
+        self._loaded = False
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        bar = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search log…")
+        self.search_edit.returnPressed.connect(lambda: self.find(backward=False))
+        bar.addWidget(self.search_edit, 1)
+        prev_btn = QPushButton("Previous")
+        prev_btn.clicked.connect(lambda: self.find(backward=True))
+        bar.addWidget(prev_btn)
+        next_btn = QPushButton("Next")
+        next_btn.clicked.connect(lambda: self.find(backward=False))
+        bar.addWidget(next_btn)
+        self.follow_chk = QCheckBox("Follow")
+        self.follow_chk.setChecked(True)
+        bar.addWidget(self.follow_chk)
+        layout.addLayout(bar)
+
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.text.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+        layout.addWidget(self.text, 1)
+
+        self.status_label = QLabel("")
+        self.status_label.setProperty("cssClass", "muted")
+        layout.addWidget(self.status_label)
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._poll = QTimer(self)
+        self._poll.setInterval(POLL_INTERVAL_MS)
+        self._poll.timeout.connect(self._on_file_changed)
+        self._poll.start()
+
+        self._load_tail()
+
+    @property
+    def first_line(self) -> int:
+        return self._first_line
+
+    def _load_tail(self) -> None:
+        if not self.log_path.exists():
+            self.text.setPlainText("run_log.txt not available yet.")
+            self._update_status()
+            return
+        self._watcher.addPath(str(self.log_path))
+        try:
+            self.reader.refresh()
+        except OSError as exc:
+            self.text.setPlainText(f"Unable to read log: {exc}")
+            return
+        self._loaded = True
+        self._last_line = self.reader.line_count
+        self._first_line = max(0, self._last_line - TAIL_LINES)
+        self.text.setPlainText("\n".join(self.reader.read_lines(self._first_line, self._last_line)))
+        self._scroll_to_bottom()
+        self._update_status()
+
+    def load_earlier(self, count: int = PAGE_LINES) -> int:
+        """Prepend up to `count` older lines, keeping the visible text in place."""
+        start = max(0, self._first_line - count)
+        lines = self.reader.read_lines(start, self._first_line)
+        if not lines:
+            return 0
+        bar = self.text.verticalScrollBar()
+        keep = bar.maximum() - bar.value()
+        cursor = QTextCursor(self.text.document())
+        cursor.movePosition(QTextCursor.Start)
+        cursor.insertText("\n".join(lines) + "\n")
+        self._first_line = start
+        bar.setValue(bar.maximum() - keep)
+        self._update_status()
+        return len(lines)
+
+    def _on_scrolled(self, value: int) -> None:
+        if value == self.text.verticalScrollBar().minimum() and self._first_line > 0:
+            self.load_earlier()
+
+    def _on_file_changed(self, *_args) -> None:
+        if not self.log_path.exists():
+            return
+        if str(self.log_path) not in self._watcher.files():
+            self._watcher.addPath(str(self.log_path))  # re-arm after replace/rotation
+        if not self._loaded:
+            self._load_tail()
+            return
+        try:
+            added = self.reader.refresh()
+        except OSError:
+            return
+        if self.reader.line_count < self._last_line:  # truncated: start over
+            self._load_tail()
+            return
+        if not added:
+            return
+        bar = self.text.verticalScrollBar()
+        at_bottom = bar.value() >= bar.maximum() - 2
+        lines = self.reader.read_lines(self._last_line, self.reader.line_count)
+        self._last_line = self.reader.line_count
+        self.text.appendPlainText("\n".join(lines))
+        if self.follow_chk.isChecked() and at_bottom:
+            self._scroll_to_bottom()
+        self._update_status()
+
+    def find(self, backward: bool = False) -> int | None:
+        """Select the next (or previous) match of the search text; returns its file line."""
+        needle = self.search_edit.text()
+        if not needle:
+            return None
+        cursor = self.text.textCursor()
+        current = self._first_line + cursor.blockNumber()
+        start = current - 1 if backward else current + (1 if cursor.hasSelection() else 0)
+        line = self.reader.search(needle, start, backward=backward) if start >= 0 else None
+        if line is None or line >= self._last_line:
+            self.status_label.setText(f'No more matches for "{needle}".')
+            return None
+        if line < self._first_line:
+            self.load_earlier(self._first_line - line + PAGE_LINES // 2)
+        block = self.text.document().findBlockByNumber(line - self._first_line)
+        found = self.text.document().find(needle, block.position())
+        if found.isNull() or found.blockNumber() != block.blockNumber():
+            found = QTextCursor(block)
+        self.follow_chk.setChecked(False)
+        self.text.setTextCursor(found)
+        self.text.centerCursor()
+        self._update_status()
+        return line
+
+    def _scroll_to_bottom(self) -> None:
+        self.text.moveCursor(QTextCursor.End)
+        bar = self.text.verticalScrollBar()
+        bar.setValue(bar.maximum())
+
+    def _update_status(self) -> None:
+        total = self.reader.line_count
+        if total == 0:
+            self.status_label.setText("")
+            return
+        self.status_label.setText(
+            f"Showing lines {self._first_line + 1:,}–{self._last_line:,} of {total:,}"
+            + ("" if self._first_line == 0 else " (scroll up for earlier lines)")
+        )
+
 
 class LogViewerDialog(QDialog):
     def __init__(self, log_path: Path, parent=None) -> None:
@@ -18,10 +198,8 @@ class LogViewerDialog(QDialog):
         path_label = QLabel(str(log_path))
         layout.addWidget(path_label)
 
-        self.text = QTextEdit()
-        self.text.setReadOnly(True)
-        self.text.setPlainText(_read_log(log_path))
-        layout.addWidget(self.text, 1)
+        self.view = LogTailView(log_path)
+        layout.addWidget(self.view, 1)
 
         buttons = QDialogButtonBox(QDialogButtonBox.Close)
         open_btn = QPushButton("Open in Finder")
@@ -33,10 +211,3 @@ class LogViewerDialog(QDialog):
 
     def _open_in_finder(self) -> None:
         open_in_finder(self.log_path)
-
-
-def _read_log(path: Path) -> str:
-    try:
-        return path.read_text(encoding="utf-8", errors="replace")
-    except Exception as exc:
-        return f"Unable to read log: {exc}"
@@ -1,46 +1,106 @@
 from __future__ import annotations
 
+from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
+    QComboBox,
     QDialog,
-    QVBoxLayout,
-    QTableWidget,
-    QTableWidgetItem,
+    QHBoxLayout,
+    QHeaderView,
     QLabel,
+    QTableView,
+    QVBoxLayout,
 )
 
-from purway_geotagger.core.preview import PreviewResult
+from purway_geotagger.core.preview import PreviewResult, PreviewStore
+from purway_geotagger.gui.models.preview_table_model import PreviewTableModel
+
+JOIN_FILTERS = ("FILENAME", "TIMESTAMP", "NONE")
 
 
 class PreviewDialog(QDialog):
-    def __init__(self, result: PreviewResult, parent=None) -> None:
+    """Validation preview; rows can be given up front or streamed in with add_rows()."""
+
+    def __init__(self, result: PreviewResult | None = None, parent=None) -> None:
         super().__init__(parent)
         self.setWindowTitle("Validation Preview")
         self.resize(900, 400)
+        self._scanned: PreviewResult | None = None
+        self._running = result is None
+        self._matched = 0
 
         layout = QVBoxLayout(self)
-        summary = QLabel(f"Scanned photos: {result.scanned_photos}, CSVs: {result.scanned_csvs}. Showing {len(result.rows)} rows.")
-        layout.addWidget(summary)
-
-        table = QTableWidget()
-        headers = ["Status", "Join", "Photo", "CSV", "Lat", "Lon", "PPM", "DateTime", "Reason"]
-        table.setProperty("cssClass", "outputs_table")
-        table.setColumnCount(len(headers))
-        table.setHorizontalHeaderLabels(headers)
-        table.setRowCount(len(result.rows))
-        table.setAlternatingRowColors(True)
-        table.setEditTriggers(QTableWidget.NoEditTriggers)
-        table.verticalHeader().setVisible(False)
-
-        for i, r in enumerate(result.rows):
-            table.setItem(i, 0, QTableWidgetItem(r.status))
-            table.setItem(i, 1, QTableWidgetItem(r.join_method))
-            table.setItem(i, 2, QTableWidgetItem(r.photo_path))
-            table.setItem(i, 3, QTableWidgetItem(r.csv_path))
-            table.setItem(i, 4, QTableWidgetItem(r.lat))
-            table.setItem(i, 5, QTableWidgetItem(r.lon))
-            table.setItem(i, 6, QTableWidgetItem(r.ppm))
-            table.setItem(i, 7, QTableWidgetItem(r.datetime_original))
-            table.setItem(i, 8, QTableWidgetItem(r.reason))
-
-        table.resizeColumnsToContents()
-        layout.addWidget(table)
+        self.summary = QLabel("Scanning inputs…")
+        layout.addWidget(self.summary)
+
+        filters = QHBoxLayout()
+        filters.addWidget(QLabel("Status"))
+        self.status_filter = QComboBox()
+        self.status_filter.addItem("All", None)
+        self.status_filter.addItem("Matched", "MATCHED")
+        self.status_filter.addItem("Failed", "FAILED")
+        self.status_filter.currentIndexChanged.connect(self._apply_filters)
+        filters.addWidget(self.status_filter)
+        filters.addWidget(QLabel("Join"))
+        self.join_filter = QComboBox()
+        self.join_filter.addItem("All", None)
+        for method in JOIN_FILTERS:
+            self.join_filter.addItem(method.title(), method)
+        self.join_filter.currentIndexChanged.connect(self._apply_filters)
+        filters.addWidget(self.join_filter)
+        filters.addStretch(1)
+        layout.addLayout(filters)
+
+        self.model = PreviewTableModel(self)
+        self.table = QTableView()
+        self.table.setProperty("cssClass", "outputs_table")
+        self.table.setModel(self.model)
+        self.table.setAlternatingRowColors(True)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)  # arrival order
+        self.table.setSortingEnabled(True)
+        self.table.verticalHeader().setVisible(False)
+        # Fixed row heights and interactive columns keep the view from
+        # measuring every row as batches arrive.
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+
+        if result is not None:
+            self.set_scanned(result)
+            self.add_rows(result.rows)
+            self.set_finished()
+
+    def set_scanned(self, result: PreviewResult) -> None:
+        self._scanned = result
+        self._update_summary()
+
+    def add_rows(self, batch: PreviewStore) -> None:
+        first_batch = len(self.model.store) == 0
+        self.model.append_rows(batch)
+        self._matched += len(batch.rows_where(status="MATCHED"))
+        if first_batch:
+            self.table.resizeColumnsToContents()
+        self._update_summary()
+
+    def set_finished(self) -> None:
+        self._running = False
+        self._update_summary()
+
+    def _apply_filters(self) -> None:
+        self.model.set_filters(self.status_filter.currentData(), self.join_filter.currentData())
+        self._update_summary()
+
+    def _update_summary(self) -> None:
+        if self._scanned is None:
+            return
+        total = len(self.model.store)
+        text = (
+            f"Scanned photos: {self._scanned.scanned_photos}, CSVs: {self._scanned.scanned_csvs}. "
+            f"Matched {self._matched} of {total} previewed rows"
+        )
+        if self.model.rowCount() != total:
+            text += f" ({self.model.rowCount()} shown)"
+        text += " — matching…" if self._running else "."
+        self.summary.setText(text)
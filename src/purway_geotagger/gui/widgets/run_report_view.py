@@ -3,14 +3,20 @@ from __future__ import annotations
 from pathlib import Path
 import csv
 import json
+import sqlite3
 
 from PySide6.QtCore import Qt, QUrl, Signal
 from PySide6.QtGui import QDesktopServices
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QLabel, QGroupBox, QTableWidget, QTableWidgetItem,
-    QTextEdit, QPushButton, QHBoxLayout, QWidget, QHeaderView
+    QPushButton, QHBoxLayout, QWidget, QHeaderView
 )
 
+from purway_geotagger.core.run_db import query_tasks, run_db_path
+from purway_geotagger.gui.widgets.log_viewer import LogTailView
+
+_FAILURE_COLUMNS = ("source_path", "output_path", "reason", "csv_path", "join_method")
+
 
 def parse_manifest_failures(path: Path) -> list[dict[str, str]]:
     if not path.exists():
@@ -30,6 +36,29 @@ def parse_manifest_failures(path: Path) -> list[dict[str, str]]:
     return failures
 
 
+def load_run_failures(run_folder: Path) -> list[dict[str, str]]:
+    """Failed task rows from run.sqlite, falling back to manifest.csv for older runs."""
+    db = run_db_path(run_folder)
+    if db.exists():
+        try:
+            return query_tasks(db, "FAILED", _FAILURE_COLUMNS)
+        except sqlite3.Error:
+            pass
+    return parse_manifest_failures(run_folder / "manifest.csv")
+
+
+def load_run_outputs(run_folder: Path) -> list[Path]:
+    """Successful output paths from run.sqlite, falling back to manifest.csv."""
+    db = run_db_path(run_folder)
+    if db.exists():
+        try:
+            rows = query_tasks(db, "SUCCESS", ("output_path",))
+            return [Path(p) for p in (r["output_path"].strip() for r in rows) if p]
+        except sqlite3.Error:
+            pass
+    return parse_manifest_outputs(run_folder / "manifest.csv")
+
+
 def load_run_summary(path: Path) -> dict | None:
     if not path.exists():
         return None
@@ -79,6 +108,39 @@ def format_run_summary(summary: dict | None) -> str:
     return "<br/>".join(lines)
 
 
+# CPU is the job's own threads; peak RSS is the whole process (all running jobs).
+PERFORMANCE_HEADERS = ["Stage", "Wall (s)", "Job CPU (s)", "Items", "Items/s", "Process peak RSS (MB)"]
+
+
+def performance_rows(summary: dict | None) -> list[list[str]]:
+    """Table rows for the run_summary.json `performance` block (empty if absent)."""
+    perf = (summary or {}).get("performance") or {}
+
+    def _fmt(value, spec: str) -> str:
+        return "" if value is None else format(value, spec)
+
+    rows: list[list[str]] = []
+    for stage in perf.get("stages", []):
+        rows.append([
+            stage.get("stage", ""),
+            _fmt(stage.get("wall_seconds"), ".2f"),
+            _fmt(stage.get("cpu_seconds"), ".2f"),
+            _fmt(stage.get("items"), "d"),
+            _fmt(stage.get("items_per_second"), ".1f"),
+            _fmt(stage.get("peak_rss_mb"), ".1f"),
+        ])
+    if rows:
+        rows.append([
+            "Total",
+            _fmt(perf.get("wall_seconds"), ".2f"),
+            _fmt(perf.get("cpu_seconds"), ".2f"),
+            "",
+            "",
+            _fmt(perf.get("peak_rss_mb"), ".1f"),
+        ])
+    return rows
+
+
 def parse_manifest_outputs(path: Path) -> list[Path]:
     if not path.exists():
         return []
@@ -137,7 +199,7 @@ def collect_output_files(summary: dict | None, run_folder: Path) -> list[dict[st
     if run_mode in ("encroachment", "combined"):
         enc_base = settings.get("encroachment_output_base") or settings.get("output_photos_root")
         enc_base_path = Path(enc_base) if enc_base else None
-        for out_path in parse_manifest_outputs(run_folder / "manifest.csv"):
+        for out_path in load_run_outputs(run_folder):
             if _under_base(out_path, enc_base_path):
                 if out_path.exists():
                     _add("Photo", out_path)
@@ -237,9 +299,35 @@ class RunReportDialog(QDialog):
             outputs_layout.addWidget(table)
         layout.addWidget(outputs_group)
 
+        perf_rows = performance_rows(summary)
+        if perf_rows:
+            perf_group = QGroupBox("Performance")
+            perf_group.setCheckable(True)
+            perf_group.setChecked(False)
+            perf_layout = QVBoxLayout(perf_group)
+            perf_table = QTableWidget(len(perf_rows), len(PERFORMANCE_HEADERS))
+            perf_table.setHorizontalHeaderLabels(PERFORMANCE_HEADERS)
+            perf_table.setProperty("cssClass", "outputs_table")
+            perf_table.setEditTriggers(QTableWidget.NoEditTriggers)
+            perf_table.setSelectionMode(QTableWidget.NoSelection)
+            perf_table.setAlternatingRowColors(True)
+            perf_table.verticalHeader().setVisible(False)
+            for row_idx, row in enumerate(perf_rows):
+                for col_idx, value in enumerate(row):
+                    item = QTableWidgetItem(value)
+                    if col_idx:
+                        item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                    perf_table.setItem(row_idx, col_idx, item)
+            perf_table.resizeColumnsToContents()
+            perf_table.horizontalHeader().setStretchLastSection(True)
+            perf_table.setVisible(False)
+            perf_layout.addWidget(perf_table)
+            perf_group.toggled.connect(perf_table.setVisible)
+            layout.addWidget(perf_group)
+
         failure_group = QGroupBox("Failures")
         failure_layout = QVBoxLayout(failure_group)
-        failures = parse_manifest_failures(self.run_folder / "manifest.csv")
+        failures = load_run_failures(self.run_folder)
         if not failures:
             failure_layout.addWidget(QLabel("No failures recorded."))
         else:
@@ -270,13 +358,8 @@ class RunReportDialog(QDialog):
         log_group = QGroupBox("Raw Log")
         log_group.setCheckable(True)
         log_group.setChecked(False)
-        log_layout = QVBoxLayout(log_group)
-        self.log_view = QTextEdit()
-        self.log_view.setReadOnly(True)
-        log_text = self._load_log_text()
-        self.log_view.setText(log_text)
-        self.log_view.setVisible(False)
-        log_layout.addWidget(self.log_view)
+        self._log_layout = QVBoxLayout(log_group)
+        self.log_view: LogTailView | None = None  # built on first expand
         log_group.toggled.connect(self._toggle_log)
         layout.addWidget(log_group)
 
@@ -287,17 +370,12 @@ class RunReportDialog(QDialog):
         btn_row.addWidget(close_btn)
         layout.addLayout(btn_row)
 
-    def _load_log_text(self) -> str:
-        path = self.run_folder / "run_log.txt"
-        if not path.exists():
-            return "run_log.txt not available yet."
-        try:
-            return path.read_text(encoding="utf-8")
-        except Exception:
-            return "Unable to read run_log.txt."
-
     def _toggle_log(self, checked: bool) -> None:
-        self.log_view.setVisible(checked)
+        if checked and self.log_view is None:
+            self.log_view = LogTailView(self.run_folder / "run_log.txt")
+            self._log_layout.addWidget(self.log_view)
+        if self.log_view is not None:
+            self.log_view.setVisible(checked)
 
     def _open_path(self, path: Path) -> None:
         if not path.exists():
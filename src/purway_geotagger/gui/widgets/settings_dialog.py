@@ -25,6 +25,7 @@ from PySide6.QtWidgets import (
 
 from purway_geotagger.core.settings import AppSettings
 from purway_geotagger.gui.widgets.mac_stepper import MacStepper
+from purway_geotagger.ops.geo_exports import GEO_EXPORT_FORMATS, GEO_EXPORT_LABELS, geoparquet_available
 
 
 class SettingsDialog(QDialog):
@@ -112,7 +113,9 @@ class SettingsDialog(QDialog):
 
         self.write_xmp_chk = QCheckBox("Write XMP tags by default")
         self.backup_chk = QCheckBox("Create .bak before overwrite")
-        self._style_settings_checkboxes(self.write_xmp_chk, self.backup_chk)
+        self.pipelined_chk = QCheckBox("Overlap copying, matching and metadata writing")
+        self.pipelined_chk.setToolTip("Start writing EXIF for matched photos while later photos are still being copied.")
+        self._style_settings_checkboxes(self.write_xmp_chk, self.backup_chk, self.pipelined_chk)
         self.join_delta_spin = QSpinBox()
         self.join_delta_spin.setRange(1, 3600)
         self.join_delta_spin.setSuffix(" s")
@@ -124,8 +127,17 @@ class SettingsDialog(QDialog):
         self.ppm_edges_edit = QLineEdit()
         self.ppm_edges_edit.setPlaceholderText("0, 1000")
 
+        self.max_jobs_spin = self._count_spin(0, 16, "Jobs that may run at the same time (Auto uses half the CPU cores, up to 4).")
+        self.max_jobs_spin.setSpecialValueText("Auto")
+        self.exiftool_procs_spin = self._count_spin(1, 16, "ExifTool processes shared by all running jobs.")
+        self.io_per_device_spin = self._count_spin(1, 8, "Jobs that may read or write the same disk at once.")
+
         layout.addRow(self.write_xmp_chk)
         layout.addRow(self.backup_chk)
+        layout.addRow(self.pipelined_chk)
+        layout.addRow("Concurrent jobs", self._with_stepper(self.max_jobs_spin))
+        layout.addRow("ExifTool processes", self._with_stepper(self.exiftool_procs_spin))
+        layout.addRow("Jobs per disk", self._with_stepper(self.io_per_device_spin))
         layout.addRow("Max join delta", self.join_delta_field)
         layout.addRow("PPM bin edges", self.ppm_edges_edit)
 
@@ -133,6 +145,28 @@ class SettingsDialog(QDialog):
         ppm_help.setProperty("cssClass", "subtitle")
         ppm_help.setWordWrap(True)
         layout.addRow("", ppm_help)
+
+        self.export_format_chks: dict[str, QCheckBox] = {}
+        for fmt in GEO_EXPORT_FORMATS:
+            label = f"Also export cleaned methane CSVs as {GEO_EXPORT_LABELS[fmt]}"
+            chk = QCheckBox(label)
+            if fmt == "geoparquet" and not geoparquet_available():
+                chk.setText(f"{label} (requires pyarrow)")
+            self._style_settings_checkboxes(chk)
+            self.export_format_chks[fmt] = chk
+            layout.addRow(chk)
+
+        self.hotspots_chk = QCheckBox("Cluster methane detections into hotspots")
+        self._style_settings_checkboxes(self.hotspots_chk)
+        self.hotspot_radius_spin = QSpinBox()
+        self.hotspot_radius_spin.setRange(1, 1000)
+        self.hotspot_radius_spin.setSuffix(" m")
+        self.hotspot_radius_spin.setButtonSymbols(QAbstractSpinBox.NoButtons)
+        self.hotspot_radius_spin.setFixedWidth(92)
+        self.hotspot_radius_spin.setToolTip("Detections closer than this distance share a hotspot.")
+        self.hotspots_chk.toggled.connect(self.hotspot_radius_spin.setEnabled)
+        layout.addRow(self.hotspots_chk)
+        layout.addRow("Hotspot radius", self._with_stepper(self.hotspot_radius_spin))
         return group
 
     def _build_confirmation_group(self) -> QGroupBox:
@@ -193,8 +227,17 @@ class SettingsDialog(QDialog):
 
         self.write_xmp_chk.setChecked(source.write_xmp_default)
         self.backup_chk.setChecked(source.create_backup_on_overwrite)
+        self.pipelined_chk.setChecked(source.pipelined_execution)
+        self.max_jobs_spin.setValue(int(source.max_concurrent_jobs))
+        self.exiftool_procs_spin.setValue(int(source.max_exiftool_processes))
+        self.io_per_device_spin.setValue(int(source.io_jobs_per_device))
         self.join_delta_spin.setValue(int(source.max_join_delta_seconds))
         self.ppm_edges_edit.setText(", ".join(str(x) for x in source.ppm_bin_edges))
+        for fmt, chk in self.export_format_chks.items():
+            chk.setChecked(fmt in source.methane_export_formats)
+        self.hotspots_chk.setChecked(source.methane_hotspots)
+        self.hotspot_radius_spin.setValue(int(round(source.methane_hotspot_radius_m)))
+        self.hotspot_radius_spin.setEnabled(source.methane_hotspots)
 
         self.confirm_methane_chk.setChecked(source.confirm_methane)
         self.confirm_encroachment_chk.setChecked(source.confirm_encroachment)
@@ -224,8 +267,17 @@ class SettingsDialog(QDialog):
 
         self.settings.write_xmp_default = self.write_xmp_chk.isChecked()
         self.settings.create_backup_on_overwrite = self.backup_chk.isChecked()
+        self.settings.pipelined_execution = self.pipelined_chk.isChecked()
+        self.settings.max_concurrent_jobs = int(self.max_jobs_spin.value())
+        self.settings.max_exiftool_processes = int(self.exiftool_procs_spin.value())
+        self.settings.io_jobs_per_device = int(self.io_per_device_spin.value())
         self.settings.max_join_delta_seconds = int(self.join_delta_spin.value())
         self.settings.ppm_bin_edges = edges
+        self.settings.methane_export_formats = [
+            fmt for fmt, chk in self.export_format_chks.items() if chk.isChecked()
+        ]
+        self.settings.methane_hotspots = self.hotspots_chk.isChecked()
+        self.settings.methane_hotspot_radius_m = float(self.hotspot_radius_spin.value())
 
         self.settings.confirm_methane = self.confirm_methane_chk.isChecked()
         self.settings.confirm_encroachment = self.confirm_encroachment_chk.isChecked()
@@ -246,6 +298,15 @@ class SettingsDialog(QDialog):
         for widget in widgets:
             widget.setProperty("cssClass", "settings_checkbox")
 
+    @staticmethod
+    def _count_spin(minimum: int, maximum: int, tooltip: str) -> QSpinBox:
+        spin = QSpinBox()
+        spin.setRange(minimum, maximum)
+        spin.setButtonSymbols(QAbstractSpinBox.NoButtons)
+        spin.setFixedWidth(92)
+        spin.setToolTip(tooltip)
+        return spin
+
     def _with_stepper(self, editor: QAbstractSpinBox) -> QWidget:
         container = QWidget()
         layout = QHBoxLayout(container)
@@ -2,19 +2,20 @@ from __future__ import annotations
 
 from PySide6.QtCore import QThread, Signal
 from pathlib import Path
-
-from purway_geotagger.core.preview import build_preview, PreviewResult
-from purway_geotagger.core.wind_weather_autofill import (
-    WindAutofillRequest,
-    WindWeatherAutofillService,
-)
+from typing import TYPE_CHECKING
 
 from purway_geotagger.core.job import Job
-from purway_geotagger.core.pipeline import run_job
+from purway_geotagger.core.progress import ProgressAggregator
 from purway_geotagger.util.errors import UserCancelledError
 
+if TYPE_CHECKING:
+    from purway_geotagger.core.wind_weather_autofill import WindAutofillRequest
+
+# The pipeline (numpy, methane outputs), preview and weather (SSL) modules are
+# imported inside run() so that building the main window does not load them.
+
 class JobWorker(QThread):
-    progress = Signal(int, str)  # percent, message
+    progress = Signal(object)  # ProgressEvent, throttled per job
     finished = Signal()
     failed = Signal(str)
 
@@ -27,12 +28,16 @@ class JobWorker(QThread):
         self._cancelled = True
 
     def run(self) -> None:
+        from purway_geotagger.core.pipeline import run_job
+
+        progress = ProgressAggregator(self.job, self.progress.emit)
         try:
             run_job(
                 job=self.job,
-                progress_cb=lambda pct, msg: self.progress.emit(int(pct), msg),
+                progress_cb=progress,
                 cancel_cb=lambda: self._cancelled,
             )
+            progress.flush()
             self.finished.emit()
         except UserCancelledError:
             self.failed.emit("Cancelled by user.")
@@ -43,16 +48,41 @@ class JobWorker(QThread):
 class PreviewWorker(QThread):
     finished = Signal(object)
     failed = Signal(str)
-
-    def __init__(self, inputs: list[Path], max_rows: int, max_join_delta_seconds: int) -> None:
+    scanned = Signal(object)  # PreviewResult without rows (streaming only)
+    rows_ready = Signal(object)  # PreviewStore batch (streaming only)
+
+    def __init__(
+        self,
+        inputs: list[Path],
+        max_rows: int | None,
+        max_join_delta_seconds: int,
+        stream: bool = False,
+    ) -> None:
         super().__init__()
         self.inputs = inputs
         self.max_rows = max_rows
         self.max_join_delta_seconds = max_join_delta_seconds
+        self.stream = stream
+        self._cancelled = False
+
+    def cancel(self) -> None:
+        self._cancelled = True
 
     def run(self) -> None:
+        from purway_geotagger.core.preview import build_preview
+
         try:
-            result = build_preview(self.inputs, self.max_rows, self.max_join_delta_seconds)
+            if self.stream:
+                result = build_preview(
+                    self.inputs,
+                    self.max_rows,
+                    self.max_join_delta_seconds,
+                    on_batch=self.rows_ready.emit,
+                    on_scanned=self.scanned.emit,
+                    cancel_cb=lambda: self._cancelled,
+                )
+            else:
+                result = build_preview(self.inputs, self.max_rows, self.max_join_delta_seconds)
             self.finished.emit(result)
         except Exception as e:
             self.failed.emit(str(e))
@@ -68,6 +98,8 @@ class WindLocationSearchWorker(QThread):
         self.limit = limit
 
     def run(self) -> None:
+        from purway_geotagger.core.wind_weather_autofill import WindWeatherAutofillService
+
         try:
             service = WindWeatherAutofillService()
             results = service.search_locations(self.query, limit=self.limit)
@@ -85,6 +117,8 @@ class WindAutofillWorker(QThread):
         self.request = request
 
     def run(self) -> None:
+        from purway_geotagger.core.wind_weather_autofill import WindWeatherAutofillService
+
         try:
             service = WindWeatherAutofillService()
             result = service.build_autofill(self.request)
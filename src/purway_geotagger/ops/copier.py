@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 from pathlib import Path
+import os
 import shutil
-from typing import Iterable
+from typing import Iterable, Iterator
 
 from purway_geotagger.util.paths import ensure_dir
 
@@ -22,9 +23,32 @@ def ensure_target_photos(
     - overwrite=True: target is source (in-place). Optionally create .bak copy.
     - overwrite=False: copy photos into <run_folder>/GEOTAGGED/ preserving relative names only (flattened copy),
       then target is the copy path.
+    Copies and backups are written under a temporary name and renamed into
+    place, so an interrupted run never leaves a truncated file at a target path.
     """
-    out: dict[Path, Path] = {}
+    return dict(iter_target_photos(
+        photos,
+        run_folder,
+        overwrite,
+        create_backup_on_overwrite,
+        copy_root=copy_root,
+        use_subdir=use_subdir,
+        backup_root=backup_root,
+        backup_rel_base=backup_rel_base,
+    ))
 
+
+def iter_target_photos(
+    photos: Iterable[Path],
+    run_folder: Path,
+    overwrite: bool,
+    create_backup_on_overwrite: bool,
+    copy_root: Path | None = None,
+    use_subdir: bool = True,
+    backup_root: Path | None = None,
+    backup_rel_base: Path | None = None,
+) -> Iterator[tuple[Path, Path]]:
+    """Like ensure_target_photos, but yields (source, target) as each photo is ready."""
     if overwrite:
         backup_dir = backup_root or (run_folder / "BACKUPS")
         for p in photos:
@@ -32,9 +56,9 @@ def ensure_target_photos(
                 bak = _backup_target(p, backup_dir, backup_rel_base)
                 if not bak.exists():
                     bak.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(p, bak)
-            out[p] = p
-        return out
+                    _copy_atomic(p, bak)
+            yield p, p
+        return
 
     root = copy_root or run_folder
     geotagged_dir = ensure_dir(root / "GEOTAGGED") if use_subdir else ensure_dir(root)
@@ -42,10 +66,19 @@ def ensure_target_photos(
         # Default copy behavior: keep original filename, collision-safe
         tgt = geotagged_dir / p.name
         tgt = _collision_safe(tgt)
-        shutil.copy2(p, tgt)
-        out[p] = tgt
+        _copy_atomic(p, tgt)
+        yield p, tgt
+
 
-    return out
+def _copy_atomic(src: Path, dst: Path) -> None:
+    """Copy `src` to `dst` via a hidden `.part` file in the same folder."""
+    tmp = dst.with_name(f".{dst.name}.part")
+    try:
+        shutil.copy2(src, tmp)
+        os.replace(tmp, dst)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
 
 def _collision_safe(path: Path) -> Path:
     if not path.exists():
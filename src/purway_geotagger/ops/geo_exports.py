@@ -0,0 +1,351 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+import csv
+import json
+import math
+import os
+import sqlite3
+import struct
+from typing import Callable, Iterable, Iterator
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+GEO_EXPORT_FORMATS = ("geojson", "geojsonl", "gpkg", "geoparquet")
+GEO_EXPORT_LABELS = {
+    "geojson": "GeoJSON",
+    "geojsonl": "GeoJSON Lines",
+    "gpkg": "GeoPackage",
+    "geoparquet": "GeoParquet",
+}
+_SUFFIXES = {
+    "geojson": ".geojson",
+    "geojsonl": ".geojsonl",
+    "gpkg": ".gpkg",
+    "geoparquet": ".parquet",
+}
+_BATCH_ROWS = 10_000
+_WGS84_WKT = (
+    'GEOGCS["WGS 84",DATUM["WGS_1984",SPHEROID["WGS 84",6378137,298.257223563,'
+    'AUTHORITY["EPSG","7030"]],AUTHORITY["EPSG","6326"]],PRIMEM["Greenwich",0,'
+    'AUTHORITY["EPSG","8901"]],UNIT["degree",0.0174532925199433,AUTHORITY["EPSG","9122"]],'
+    'AUTHORITY["EPSG","4326"]]'
+)
+
+Row = tuple[float, float, list[object]]  # lon, lat, typed property values
+
+
+@dataclass
+class GeoExportResult:
+    outputs: dict[str, Path] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)  # format -> failure message
+    skipped: dict[str, str] = field(default_factory=dict)  # format -> why it was not written
+
+
+class GeoExportUnavailable(Exception):
+    """Raised when an export format needs an optional dependency that is missing."""
+
+
+def geo_export_path(cleaned_csv: Path, fmt: str) -> Path:
+    """Output path for a geo export, named after the cleaned CSV."""
+    return cleaned_csv.with_suffix(_SUFFIXES[fmt])
+
+
+def geoparquet_available() -> bool:
+    return pa is not None
+
+
+def write_geo_exports(
+    cleaned_csv: Path,
+    lat_col: str,
+    lon_col: str,
+    formats: Iterable[str],
+) -> GeoExportResult:
+    """Write the requested geospatial exports for one cleaned methane CSV.
+
+    Property columns are typed as numbers when every non-blank value parses as
+    a float, otherwise text. Each writer streams rows from the CSV; files are
+    moved into place only once complete.
+    """
+    result = GeoExportResult()
+    requested = set(formats)
+    wanted = [f for f in GEO_EXPORT_FORMATS if f in requested]
+    if not wanted:
+        return result
+
+    columns, numeric = _infer_columns(cleaned_csv, exclude=(lat_col, lon_col))
+    writers = {
+        "geojson": _write_geojson,
+        "geojsonl": _write_geojsonl,
+        "gpkg": _write_gpkg,
+        "geoparquet": _write_geoparquet,
+    }
+
+    def rows() -> Iterator[Row]:
+        return _iter_rows(cleaned_csv, lat_col, lon_col, columns, numeric)
+
+    for fmt in wanted:
+        target = geo_export_path(cleaned_csv, fmt)
+        tmp = target.with_name(target.name + ".partial")
+        try:
+            writers[fmt](tmp, rows, columns, numeric)
+            os.replace(tmp, target)
+            result.outputs[fmt] = target
+        except GeoExportUnavailable as exc:
+            result.skipped[fmt] = str(exc)
+        except Exception as exc:
+            result.errors[fmt] = str(exc)
+        finally:
+            tmp.unlink(missing_ok=True)
+    return result
+
+
+def _infer_columns(path: Path, exclude: tuple[str, ...]) -> tuple[list[str], list[bool]]:
+    with path.open("r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        keep = [i for i, name in enumerate(header) if name not in exclude]
+        numeric = [True] * len(keep)
+        for row in reader:
+            for j, i in enumerate(keep):
+                if not numeric[j] or i >= len(row):
+                    continue
+                value = row[i].strip()
+                if value and _to_float(value) is None:
+                    numeric[j] = False
+            if not any(numeric):
+                break
+    return [header[i] for i in keep], numeric
+
+
+def _iter_rows(
+    path: Path,
+    lat_col: str,
+    lon_col: str,
+    columns: list[str],
+    numeric: list[bool],
+) -> Iterator[Row]:
+    with path.open("r", encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            lat = _to_float(row.get(lat_col))
+            lon = _to_float(row.get(lon_col))
+            if lat is None or lon is None:
+                continue
+            values: list[object] = []
+            for name, is_num in zip(columns, numeric):
+                raw = (row.get(name) or "").strip()
+                if is_num:
+                    values.append(_to_float(raw) if raw else None)
+                else:
+                    values.append(raw)
+            yield lon, lat, values
+
+
+def _feature_json(lon: float, lat: float, columns: list[str], values: list[object]) -> str:
+    return json.dumps(
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lon, lat]},
+            "properties": dict(zip(columns, values)),
+        },
+        separators=(",", ":"),
+        allow_nan=False,
+    )
+
+
+def _write_geojson(path: Path, rows: Callable[[], Iterator[Row]], columns: list[str], numeric: list[bool]) -> None:
+    with path.open("w", encoding="utf-8") as out:
+        out.write('{"type":"FeatureCollection","features":[\n')
+        first = True
+        for lon, lat, values in rows():
+            if not first:
+                out.write(",\n")
+            out.write(_feature_json(lon, lat, columns, values))
+            first = False
+        out.write("\n]}\n")
+
+
+def _write_geojsonl(path: Path, rows: Callable[[], Iterator[Row]], columns: list[str], numeric: list[bool]) -> None:
+    """Newline-delimited GeoJSON: one Feature per line, readable incrementally."""
+    with path.open("w", encoding="utf-8") as out:
+        for lon, lat, values in rows():
+            out.write(_feature_json(lon, lat, columns, values))
+            out.write("\n")
+
+
+def _wkb_point(lon: float, lat: float) -> bytes:
+    return struct.pack("<BIdd", 1, 1, lon, lat)
+
+
+def _gpkg_point(lon: float, lat: float) -> bytes:
+    # GeoPackage binary header: magic, version 0, flags (little-endian, no envelope), srs_id.
+    return b"GP" + struct.pack("<BBi", 0, 0b00000001, 4326) + _wkb_point(lon, lat)
+
+
+def _write_gpkg(path: Path, rows: Callable[[], Iterator[Row]], columns: list[str], numeric: list[bool]) -> None:
+    """GeoPackage 1.3 point layer with an R-tree spatial index (stdlib sqlite3)."""
+    path.unlink(missing_ok=True)
+    table = "detections"
+    names = _unique_columns(columns, reserved={"fid", "geom"})
+    conn = sqlite3.connect(str(path))
+    try:
+        conn.execute("PRAGMA application_id = 1196444487")  # 'GPKG'
+        conn.execute("PRAGMA user_version = 10300")
+        conn.executescript(
+            """
+            CREATE TABLE gpkg_spatial_ref_sys (
+                srs_name TEXT NOT NULL, srs_id INTEGER NOT NULL PRIMARY KEY,
+                organization TEXT NOT NULL, organization_coordsys_id INTEGER NOT NULL,
+                definition TEXT NOT NULL, description TEXT);
+            CREATE TABLE gpkg_contents (
+                table_name TEXT NOT NULL PRIMARY KEY, data_type TEXT NOT NULL,
+                identifier TEXT UNIQUE, description TEXT DEFAULT '',
+                last_change DATETIME NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ','now')),
+                min_x DOUBLE, min_y DOUBLE, max_x DOUBLE, max_y DOUBLE,
+                srs_id INTEGER, CONSTRAINT fk_gc_r_srs_id FOREIGN KEY (srs_id)
+                REFERENCES gpkg_spatial_ref_sys(srs_id));
+            CREATE TABLE gpkg_geometry_columns (
+                table_name TEXT NOT NULL, column_name TEXT NOT NULL,
+                geometry_type_name TEXT NOT NULL, srs_id INTEGER NOT NULL,
+                z TINYINT NOT NULL, m TINYINT NOT NULL,
+                CONSTRAINT pk_geom_cols PRIMARY KEY (table_name, column_name));
+            CREATE TABLE gpkg_extensions (
+                table_name TEXT, column_name TEXT, extension_name TEXT NOT NULL,
+                definition TEXT NOT NULL, scope TEXT NOT NULL,
+                CONSTRAINT ge_tce UNIQUE (table_name, column_name, extension_name));
+            """
+        )
+        conn.executemany(
+            "INSERT INTO gpkg_spatial_ref_sys VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                ("Undefined cartesian SRS", -1, "NONE", -1, "undefined", None),
+                ("Undefined geographic SRS", 0, "NONE", 0, "undefined", None),
+                ("WGS 84 geodetic", 4326, "EPSG", 4326, _WGS84_WKT, "longitude/latitude coordinates in decimal degrees on the WGS 84 spheroid"),
+            ],
+        )
+        col_defs = ", ".join(
+            f"{_quote(n)} {'DOUBLE' if is_num else 'TEXT'}" for n, is_num in zip(names, numeric)
+        )
+        conn.execute(
+            f"CREATE TABLE {_quote(table)} (fid INTEGER PRIMARY KEY AUTOINCREMENT, geom POINT"
+            + (f", {col_defs}" if col_defs else "")
+            + ")"
+        )
+        placeholders = ", ".join("?" for _ in range(len(names) + 1))
+        insert = (
+            f"INSERT INTO {_quote(table)} (geom{''.join(', ' + _quote(n) for n in names)}) "
+            f"VALUES ({placeholders})"
+        )
+
+        bounds = [math.inf, math.inf, -math.inf, -math.inf]
+        batch: list[tuple] = []
+        for lon, lat, values in rows():
+            bounds[0] = min(bounds[0], lon)
+            bounds[1] = min(bounds[1], lat)
+            bounds[2] = max(bounds[2], lon)
+            bounds[3] = max(bounds[3], lat)
+            batch.append((_gpkg_point(lon, lat), *values))
+            if len(batch) >= _BATCH_ROWS:
+                conn.executemany(insert, batch)
+                batch.clear()
+        if batch:
+            conn.executemany(insert, batch)
+        has_rows = bounds[0] != math.inf
+
+        conn.execute(
+            "INSERT INTO gpkg_contents (table_name, data_type, identifier, min_x, min_y, max_x, max_y, srs_id) "
+            "VALUES (?, 'features', ?, ?, ?, ?, ?, 4326)",
+            # `path` is the ".partial" temp file; identify the layer by the final stem.
+            (table, path.stem.removesuffix(".gpkg"), *(bounds if has_rows else (None,) * 4)),
+        )
+        conn.execute(
+            "INSERT INTO gpkg_geometry_columns VALUES (?, 'geom', 'POINT', 4326, 0, 0)",
+            (table,),
+        )
+
+        # Points have zero-size envelopes, so the index is filled straight from
+        # the coordinates kept in each row's WKB. The file is write-once, so the
+        # spec's maintenance triggers (which need ST_* SQL functions) are omitted.
+        rtree = f"rtree_{table}_geom"
+        conn.execute(f"CREATE VIRTUAL TABLE {_quote(rtree)} USING rtree(id, minx, maxx, miny, maxy)")
+        cursor = conn.execute(f"SELECT fid, geom FROM {_quote(table)}")
+        while True:
+            chunk = cursor.fetchmany(_BATCH_ROWS)
+            if not chunk:
+                break
+            entries = []
+            for fid, blob in chunk:
+                lon, lat = struct.unpack_from("<dd", blob, 8 + 5)
+                entries.append((fid, lon, lon, lat, lat))
+            conn.executemany(f"INSERT INTO {_quote(rtree)} VALUES (?, ?, ?, ?, ?)", entries)
+        conn.execute(
+            "INSERT INTO gpkg_extensions VALUES (?, 'geom', 'gpkg_rtree_index', "
+            "'http://www.geopackage.org/spec120/#extension_rtree', 'write-only')",
+            (table,),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _write_geoparquet(path: Path, rows: Callable[[], Iterator[Row]], columns: list[str], numeric: list[bool]) -> None:
+    """GeoParquet 1.0 with WKB point geometry, written in row-group batches."""
+    if pa is None:
+        raise GeoExportUnavailable("GeoParquet export requires pyarrow, which is not installed.")
+    names = _unique_columns(columns, reserved={"geometry"})
+    fields = [pa.field(n, pa.float64() if is_num else pa.string()) for n, is_num in zip(names, numeric)]
+    fields.append(pa.field("geometry", pa.binary()))
+    geo = {
+        "version": "1.0.0",
+        "primary_column": "geometry",
+        "columns": {"geometry": {"encoding": "WKB", "geometry_types": ["Point"]}},
+    }
+    schema = pa.schema(fields, metadata={b"geo": json.dumps(geo).encode("utf-8")})
+    all_names = [*names, "geometry"]
+
+    with pq.ParquetWriter(str(path), schema) as writer:
+        cols: list[list[object]] = [[] for _ in all_names]
+        for lon, lat, values in rows():
+            for j, v in enumerate(values):
+                cols[j].append(v)
+            cols[-1].append(_wkb_point(lon, lat))
+            if len(cols[-1]) >= _BATCH_ROWS:
+                writer.write_table(pa.Table.from_pydict(dict(zip(all_names, cols)), schema=schema))
+                cols = [[] for _ in all_names]
+        if cols[-1]:
+            writer.write_table(pa.Table.from_pydict(dict(zip(all_names, cols)), schema=schema))
+
+
+def _unique_columns(columns: list[str], reserved: set[str]) -> list[str]:
+    seen = {r.lower() for r in reserved}
+    out: list[str] = []
+    for name in columns:
+        base = name.strip() or "column"
+        cand = base
+        i = 2
+        while cand.lower() in seen:
+            cand = f"{base}_{i}"
+            i += 1
+        seen.add(cand.lower())
+        out.append(cand)
+    return out
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _to_float(value: object) -> float | None:
+    if value is None:
+        return None
+    try:
+        f = float(str(value).strip())
+    except ValueError:
+        return None
+    return f if math.isfinite(f) else None
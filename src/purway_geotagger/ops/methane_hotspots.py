@@ -0,0 +1,300 @@
+"""Methane hotspot clustering and per-hotspot summary statistics."""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+import csv
+import json
+
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    np = None
+
+DEFAULT_HOTSPOT_RADIUS_M = 25.0
+EARTH_RADIUS_M = 6_371_008.8
+HOTSPOT_CSV_FIELDS = [
+    "hotspot_id",
+    "latitude",
+    "longitude",
+    "peak_latitude",
+    "peak_longitude",
+    "detections",
+    "max_ppm",
+    "mean_ppm",
+    "max_pac",
+    "mean_pac",
+    "radius_m",
+]
+
+
+@dataclass(slots=True)
+class Hotspot:
+    hotspot_id: int  # 1 = highest max_ppm
+    latitude: float  # PPM-weighted centroid
+    longitude: float
+    peak_latitude: float  # location of the max_ppm detection
+    peak_longitude: float
+    detections: int
+    max_ppm: float
+    mean_ppm: float
+    max_pac: float | None
+    mean_pac: float | None
+    radius_m: float  # farthest detection from the centroid (haversine)
+
+
+@dataclass
+class HotspotSummary:
+    """Per-flight (per cleaned CSV) statistics plus its hotspots."""
+    source_csv: Path
+    radius_m: float
+    detections: int
+    max_ppm: float | None = None
+    mean_ppm: float | None = None
+    max_pac: float | None = None
+    mean_pac: float | None = None
+    hotspots: list[Hotspot] = field(default_factory=list)
+
+
+class HotspotsUnavailable(Exception):
+    """Raised when NumPy is not installed."""
+
+
+def hotspots_available() -> bool:
+    return np is not None
+
+
+def hotspot_csv_path(cleaned_csv: Path) -> Path:
+    return cleaned_csv.with_name(f"{cleaned_csv.stem}_Hotspots.csv")
+
+
+def hotspot_json_path(cleaned_csv: Path) -> Path:
+    return cleaned_csv.with_name(f"{cleaned_csv.stem}_Hotspots.json")
+
+
+def analyze_hotspots(
+    cleaned_csv: Path,
+    lat_col: str,
+    lon_col: str,
+    ppm_col: str,
+    rel_alt_col: str | None = None,
+    radius_m: float = DEFAULT_HOTSPOT_RADIUS_M,
+) -> HotspotSummary:
+    """Cluster the detections in a cleaned CSV and write the summary CSV/JSON."""
+    if np is None:
+        raise HotspotsUnavailable("Hotspot clustering requires numpy, which is not installed.")
+    lat, lon, ppm, rel_alt = load_detections(cleaned_csv, lat_col, lon_col, ppm_col, rel_alt_col)
+    summary = HotspotSummary(
+        source_csv=cleaned_csv,
+        radius_m=radius_m,
+        detections=int(lat.size),
+        hotspots=cluster_detections(lat, lon, ppm, rel_alt, radius_m),
+    )
+    if lat.size:
+        pac = _pac(ppm, rel_alt)
+        summary.max_ppm = float(ppm.max())
+        summary.mean_ppm = round(float(ppm.mean()), 2)
+        if not np.isnan(pac).all():
+            summary.max_pac = float(np.nanmax(pac))
+            summary.mean_pac = round(float(np.nanmean(pac)), 2)
+    write_hotspot_summary(summary, hotspot_csv_path(cleaned_csv), hotspot_json_path(cleaned_csv))
+    return summary
+
+
+def load_detections(
+    path: Path,
+    lat_col: str,
+    lon_col: str,
+    ppm_col: str,
+    rel_alt_col: str | None = None,
+):
+    """Read lat/lon/ppm (and relative altitude, NaN when absent) as float arrays.
+
+    Rows without a usable lat, lon or ppm are dropped.
+    """
+    lats: list[float] = []
+    lons: list[float] = []
+    ppms: list[float] = []
+    alts: list[float] = []
+    nan = float("nan")
+    with path.open("r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        try:
+            i_lat, i_lon, i_ppm = header.index(lat_col), header.index(lon_col), header.index(ppm_col)
+        except ValueError:
+            return (np.empty(0),) * 4
+        i_alt = header.index(rel_alt_col) if rel_alt_col in header else None
+        for row in reader:
+            try:
+                lat_v = float(row[i_lat])
+                lon_v = float(row[i_lon])
+                ppm_v = float(row[i_ppm])
+            except (ValueError, IndexError):
+                continue
+            alt_v = nan
+            if i_alt is not None:
+                try:
+                    alt_v = float(row[i_alt])
+                except (ValueError, IndexError):
+                    pass
+            lats.append(lat_v)
+            lons.append(lon_v)
+            ppms.append(ppm_v)
+            alts.append(alt_v)
+    lat = np.asarray(lats, dtype=np.float64)
+    lon = np.asarray(lons, dtype=np.float64)
+    ppm = np.asarray(ppms, dtype=np.float64)
+    rel_alt = np.asarray(alts, dtype=np.float64)
+    ok = np.isfinite(lat) & np.isfinite(lon) & np.isfinite(ppm)
+    return lat[ok], lon[ok], ppm[ok], rel_alt[ok]
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """Vectorized great-circle distance in meters (inputs in degrees)."""
+    lat1, lon1, lat2, lon2 = (np.radians(a) for a in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def cluster_detections(lat, lon, ppm, rel_alt=None, radius_m: float = DEFAULT_HOTSPOT_RADIUS_M) -> list[Hotspot]:
+    """Group detections into hotspots with grid single-linkage.
+
+    Points are binned into square cells of `radius_m` on a local equirectangular
+    projection and occupied cells that touch (8-neighbourhood) are merged, so any
+    two detections within `radius_m` of each other always share a hotspot.
+    Everything is NumPy array work; only the cell graph is iterated.
+    """
+    n = int(lat.size)
+    if n == 0:
+        return []
+    if rel_alt is None:
+        rel_alt = np.full(n, np.nan)
+
+    lat0 = np.radians(float(lat.mean()))
+    x = EARTH_RADIUS_M * np.radians(lon) * np.cos(lat0)
+    y = EARTH_RADIUS_M * np.radians(lat)
+    cx = np.floor(x / radius_m).astype(np.int64)
+    cy = np.floor(y / radius_m).astype(np.int64)
+    cx -= cx.min() - 1
+    cy -= cy.min() - 1
+    width = int(cy.max()) + 2
+    keys = cx * width + cy
+    cells, point_cell = np.unique(keys, return_inverse=True)
+
+    cell_label = _connected_cells(cells, width)
+    _, point_label = np.unique(cell_label[point_cell], return_inverse=True)
+    k = int(point_label.max()) + 1
+
+    counts = np.bincount(point_label, minlength=k)
+    ppm_sum = np.bincount(point_label, weights=ppm, minlength=k)
+    mean_ppm = ppm_sum / counts
+
+    # Peak detection per hotspot: last entry of each label after sorting by (label, ppm).
+    order = np.lexsort((ppm, point_label))
+    last = np.r_[np.flatnonzero(np.diff(point_label[order])), n - 1]
+    peak = order[last]
+
+    weights = np.where(ppm > 0, ppm, 0.0)
+    w_sum = np.bincount(point_label, weights=weights, minlength=k)
+    safe_w = np.where(w_sum > 0, w_sum, 1.0)
+    c_lat = np.where(w_sum > 0, np.bincount(point_label, weights=lat * weights, minlength=k) / safe_w, lat[peak])
+    c_lon = np.where(w_sum > 0, np.bincount(point_label, weights=lon * weights, minlength=k) / safe_w, lon[peak])
+
+    dist = haversine_m(lat, lon, c_lat[point_label], c_lon[point_label])
+    radius = np.zeros(k)
+    np.maximum.at(radius, point_label, dist)
+
+    pac = _pac(ppm, rel_alt)
+    valid = ~np.isnan(pac)
+    pac_count = np.bincount(point_label, weights=valid.astype(np.float64), minlength=k)
+    pac_sum = np.bincount(point_label, weights=np.where(valid, pac, 0.0), minlength=k)
+    pac_max = np.full(k, -np.inf)
+    np.maximum.at(pac_max, point_label[valid], pac[valid])
+
+    # Materialize columns in output order as Python lists; per-element NumPy indexing is slow.
+    rank = np.argsort(-ppm[peak], kind="stable")
+    peak = peak[rank]
+    has_pac = (pac_count > 0)[rank]
+    mean_pac = np.round(pac_sum[rank] / np.where(has_pac, pac_count[rank], 1.0), 2)
+    columns = zip(
+        np.round(c_lat[rank], 7).tolist(),
+        np.round(c_lon[rank], 7).tolist(),
+        lat[peak].tolist(),
+        lon[peak].tolist(),
+        counts[rank].tolist(),
+        ppm[peak].tolist(),
+        np.round(mean_ppm[rank], 2).tolist(),
+        np.where(has_pac, pac_max[rank], np.nan).tolist(),
+        np.where(has_pac, mean_pac, np.nan).tolist(),
+        np.round(radius[rank], 1).tolist(),
+    )
+    hotspots: list[Hotspot] = []
+    for i, (c_la, c_lo, p_la, p_lo, count, max_p, mean_p, max_pac, mean_pac_v, rad) in enumerate(columns, 1):
+        hotspots.append(Hotspot(
+            hotspot_id=i,
+            latitude=c_la,
+            longitude=c_lo,
+            peak_latitude=p_la,
+            peak_longitude=p_lo,
+            detections=count,
+            max_ppm=max_p,
+            mean_ppm=mean_p,
+            max_pac=None if max_pac != max_pac else max_pac,  # NaN -> None
+            mean_pac=None if mean_pac_v != mean_pac_v else mean_pac_v,
+            radius_m=rad,
+        ))
+    return hotspots
+
+
+def _pac(ppm, rel_alt):
+    """Vectorized core.pac_calculator.calculate_pac; NaN where altitude is not > 0."""
+    valid = np.isfinite(rel_alt) & (rel_alt > 0)
+    return np.where(valid, np.round(ppm / np.where(valid, rel_alt, 1.0), 2), np.nan)
+
+
+def _connected_cells(cells, width: int):
+    """Component label (smallest member index) for each occupied cell."""
+    m = int(cells.size)
+    src: list = []
+    dst: list = []
+    for offset in (width, 1, width + 1, width - 1):  # E, N, NE, SE neighbours
+        pos = np.searchsorted(cells, cells + offset)
+        hit = pos < m
+        hit[hit] = cells[pos[hit]] == cells[hit] + offset
+        src.append(np.flatnonzero(hit))
+        dst.append(pos[hit])
+    a = np.concatenate(src)
+    b = np.concatenate(dst)
+
+    labels = np.arange(m)
+    if a.size == 0:
+        return labels
+    while True:
+        low = np.minimum(labels[a], labels[b])
+        new = labels.copy()
+        np.minimum.at(new, labels[a], low)
+        np.minimum.at(new, labels[b], low)
+        np.minimum.at(new, a, low)
+        np.minimum.at(new, b, low)
+        while True:  # pointer jumping
+            jumped = new[new]
+            if np.array_equal(jumped, new):
+                break
+            new = jumped
+        if np.array_equal(new, labels):
+            return labels
+        labels = new
+
+
+def write_hotspot_summary(summary: HotspotSummary, csv_path: Path, json_path: Path) -> None:
+    csv_path.parent.mkdir(parents=True, exist_ok=True)
+    with csv_path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=HOTSPOT_CSV_FIELDS)
+        writer.writeheader()
+        for h in summary.hotspots:
+            row = asdict(h)
+            writer.writerow({k: "" if row[k] is None else row[k] for k in HOTSPOT_CSV_FIELDS})
+    payload = asdict(summary)
+    payload["source_csv"] = str(summary.source_csv)
+    json_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
@@ -1,19 +1,41 @@
 from __future__ import annotations
 
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from pathlib import Path
 import csv
+import io
+import os
+import threading
 import zipfile
-import xml.etree.ElementTree as ET
-from typing import Iterable
-
+from typing import IO, Callable, Iterable, Iterator
+from xml.sax.saxutils import escape as xml_escape
+
+from purway_geotagger.ops.geo_exports import write_geo_exports
+from purway_geotagger.ops.methane_hotspots import (
+    Hotspot,
+    HotspotsUnavailable,
+    analyze_hotspots,
+    hotspot_csv_path,
+    hotspot_json_path,
+)
 from purway_geotagger.parsers.purway_csv import (
     PPM_COL_CANDIDATES,
     LAT_COL_CANDIDATES,
     LON_COL_CANDIDATES,
     PHOTO_COL_CANDIDATES,
+    REL_ALT_COL_CANDIDATES,
 )
 
+# folder -> (lowercase JPG names, lowercase JPG stems)
+PhotoNameIndex = dict[Path, tuple[frozenset[str], frozenset[str]]]
+
+# Per-CSV work is file I/O plus the C csv parser; threads overlap it well and
+# avoid process spawning inside the frozen (PyInstaller) app.
+DEFAULT_MAX_WORKERS = min(8, os.cpu_count() or 1)
+
 
 @dataclass
 class MethaneCsvResult:
@@ -29,6 +51,46 @@ class MethaneCsvResult:
     kmz_status: str = "skipped"  # success|failed|skipped
     kmz_rows: int = 0
     kmz_error: str = ""
+    exports: dict[str, Path] = field(default_factory=dict)  # format -> path (see ops.geo_exports)
+    export_errors: dict[str, str] = field(default_factory=dict)
+    export_skipped: dict[str, str] = field(default_factory=dict)
+    hotspot_status: str = "skipped"  # success|failed|skipped
+    hotspot_count: int = 0
+    hotspot_csv: Path | None = None
+    hotspot_json: Path | None = None
+    hotspot_error: str = ""
+
+
+class _FolderListings:
+    """JPG listings of folders the PhotoNameIndex does not cover, for one call.
+
+    CSVs in the same folder share one listing; nothing is kept between
+    generate_methane_outputs calls, so a listing never outlives the run.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._listings: dict[Path, tuple[frozenset[str], frozenset[str]]] = {}
+
+    def get(self, folder: Path) -> tuple[frozenset[str], frozenset[str]]:
+        with self._lock:
+            listing = self._listings.get(folder)
+        if listing is None:
+            listing = _collect_jpg_names(folder)
+            with self._lock:
+                listing = self._listings.setdefault(folder, listing)
+        return listing
+
+
+@dataclass(frozen=True)
+class _CsvOptions:
+    threshold: int
+    generate_kmz: bool
+    ppm_bin_edges: list[int] | None = None
+    photo_index: PhotoNameIndex | None = None
+    export_formats: tuple[str, ...] = ()
+    hotspot_radius_m: float | None = None
+    listings: _FolderListings = field(default_factory=_FolderListings, compare=False)
 
 
 @dataclass
@@ -49,64 +111,198 @@ def kmz_path_for_cleaned(cleaned_csv: Path) -> Path:
     return cleaned_csv.with_suffix(".kmz")
 
 
+def build_photo_name_index(
+    photos: Iterable[Path],
+    folders: Iterable[Path] = (),
+    roots: Iterable[Path] | None = None,
+) -> PhotoNameIndex:
+    """Group already-scanned JPG paths by folder as lowercase (names, stems).
+
+    `folders` marks extra directories (typically CSV parents) as covered even
+    when they hold no photos, so they are not listed again. `roots` limits
+    the index to folders inside these directories, i.e. the ones a scan
+    enumerated completely; folders reached only through file inputs are left
+    out and listed from disk when a CSV needs them.
+    """
+    root_list = None if roots is None else [Path(r) for r in roots]
+
+    def covered(folder: Path) -> bool:
+        return root_list is None or any(folder == r or r in folder.parents for r in root_list)
+
+    names: dict[Path, set[str]] = {Path(f): set() for f in folders if covered(Path(f))}
+    stems: dict[Path, set[str]] = {Path(f): set() for f in folders if covered(Path(f))}
+    for photo in photos:
+        parent = photo.parent
+        if not covered(parent):
+            continue
+        names.setdefault(parent, set()).add(photo.name.lower())
+        stems.setdefault(parent, set()).add(photo.stem.lower())
+    return {folder: (frozenset(names[folder]), frozenset(stems[folder])) for folder in names}
+
+
 def generate_methane_outputs(
     csv_paths: Iterable[Path],
     threshold: int,
     generate_kmz: bool,
+    max_workers: int | None = None,
+    progress_cb: Callable[[int, int], None] | None = None,
+    ppm_bin_edges: list[int] | None = None,
+    photo_index: PhotoNameIndex | None = None,
+    export_formats: Iterable[str] = (),
+    hotspot_radius_m: float | None = None,
 ) -> list[MethaneCsvResult]:
-    results: list[MethaneCsvResult] = []
-
-    for csv_path in csv_paths:
-        result = MethaneCsvResult(
-            source_csv=csv_path,
-            cleaned_csv=None,
-            cleaned_status="skipped",
-            kmz=None,
-            kmz_status="skipped",
-        )
+    """Write cleaned CSV (and optional KMZ) outputs for each methane CSV.
+
+    CSVs are processed on a thread pool; results keep the input order.
+    `progress_cb(done, total)` is called from the calling thread as each CSV
+    finishes. `ppm_bin_edges` drives KMZ icon colours (DEFAULT_KMZ_BIN_EDGES if
+    omitted). `photo_index` (see `build_photo_name_index`) supplies the JPG
+    names used for photo-association filtering; folders it does not cover are
+    listed from disk once per call. `export_formats` requests extra geospatial outputs
+    (see `ops.geo_exports.GEO_EXPORT_FORMATS`) named after each cleaned CSV.
+    `hotspot_radius_m` enables hotspot clustering (see `ops.methane_hotspots`);
+    hotspots are written as summary CSV/JSON and added to the KMZ.
+    """
+    paths = list(csv_paths)
+    options = _CsvOptions(
+        threshold=threshold,
+        generate_kmz=generate_kmz,
+        ppm_bin_edges=ppm_bin_edges,
+        photo_index=photo_index,
+        export_formats=tuple(export_formats),
+        hotspot_radius_m=hotspot_radius_m,
+    )
+    total = len(paths)
+    if not paths:
+        return []
+
+    workers = max_workers or min(total, DEFAULT_MAX_WORKERS)
+    if workers <= 1 or total == 1:
+        results: list[MethaneCsvResult] = []
+        for done, csv_path in enumerate(paths, start=1):
+            results.append(_process_csv(csv_path, options))
+            if progress_cb:
+                progress_cb(done, total)
+        return results
+
+    slots: list[MethaneCsvResult | None] = [None] * total
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="methane-out") as pool:
+        futures = {pool.submit(_process_csv, csv_path, options): i for i, csv_path in enumerate(paths)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            slots[futures[future]] = future.result()
+            if progress_cb:
+                progress_cb(done, total)
+    return [r for r in slots if r is not None]
+
+
+def _process_csv(csv_path: Path, options: _CsvOptions) -> MethaneCsvResult:
+    result = MethaneCsvResult(
+        source_csv=csv_path,
+        cleaned_csv=None,
+        cleaned_status="skipped",
+        kmz=None,
+        kmz_status="skipped",
+    )
 
-        try:
-            info = _write_cleaned_csv(csv_path, threshold)
-            if info.fieldnames is None:
-                result.cleaned_status = "skipped"
-                result.cleaned_error = "No PPM column found."
-                results.append(result)
-                continue
-
-            cleaned_csv = cleaned_csv_path(csv_path, threshold)
-            result.cleaned_csv = cleaned_csv
-            result.cleaned_rows = info.kept_rows
-            result.cleaned_status = "success"
-            result.missing_photo_rows = info.missing_photo_rows
-            result.missing_photo_names = info.missing_photo_names
-            result.photo_col_missing = not info.used_photo_filter
-
-            if generate_kmz:
-                lat_col = _pick_col(info.fieldnames, LAT_COL_CANDIDATES)
-                lon_col = _pick_col(info.fieldnames, LON_COL_CANDIDATES)
-                ppm_col = _pick_col(info.fieldnames, PPM_COL_CANDIDATES)
-                if not lat_col or not lon_col or not ppm_col:
-                    result.kmz_status = "failed"
-                    result.kmz_error = "KMZ requires latitude, longitude, and PPM columns."
-                else:
-                    kmz_path = kmz_path_for_cleaned(cleaned_csv)
-                    result.kmz = kmz_path
-                    placemark_count = _write_kmz(cleaned_csv, kmz_path, lat_col, lon_col, ppm_col)
-                    result.kmz_rows = placemark_count
-                    result.kmz_status = "success"
-        except UnicodeDecodeError:
-            result.cleaned_status = "failed"
-            result.cleaned_error = "CSV is not UTF-8 encoded."
-        except Exception as exc:  # pragma: no cover - safety net
-            result.cleaned_status = "failed"
-            result.cleaned_error = str(exc)
-
-        results.append(result)
-
-    return results
-
-
-def _write_cleaned_csv(csv_path: Path, threshold: int) -> CleanedCsvInfo:
+    try:
+        info = _write_cleaned_csv(csv_path, options.threshold, options.photo_index, options.listings)
+        if info.fieldnames is None:
+            result.cleaned_status = "skipped"
+            result.cleaned_error = "No PPM column found."
+            return result
+
+        cleaned_csv = cleaned_csv_path(csv_path, options.threshold)
+        result.cleaned_csv = cleaned_csv
+        result.cleaned_rows = info.kept_rows
+        result.cleaned_status = "success"
+        result.missing_photo_rows = info.missing_photo_rows
+        result.missing_photo_names = info.missing_photo_names
+        result.photo_col_missing = not info.used_photo_filter
+
+        lat_col = _pick_col(info.fieldnames, LAT_COL_CANDIDATES)
+        lon_col = _pick_col(info.fieldnames, LON_COL_CANDIDATES)
+        ppm_col = _pick_col(info.fieldnames, PPM_COL_CANDIDATES)
+        if options.export_formats:
+            if not lat_col or not lon_col:
+                result.export_errors = {
+                    fmt: "Geo exports require latitude and longitude columns." for fmt in options.export_formats
+                }
+            else:
+                exports = write_geo_exports(cleaned_csv, lat_col, lon_col, options.export_formats)
+                result.exports = exports.outputs
+                result.export_errors = exports.errors
+                result.export_skipped = exports.skipped
+
+        hotspots: list[Hotspot] = []
+        if options.hotspot_radius_m:
+            if not lat_col or not lon_col or not ppm_col:
+                result.hotspot_status = "failed"
+                result.hotspot_error = "Hotspots require latitude, longitude, and PPM columns."
+            else:
+                hotspots = _write_hotspots(result, cleaned_csv, info.fieldnames, lat_col, lon_col, ppm_col,
+                                           options.hotspot_radius_m)
+
+        if options.generate_kmz:
+            if not lat_col or not lon_col or not ppm_col:
+                result.kmz_status = "failed"
+                result.kmz_error = "KMZ requires latitude, longitude, and PPM columns."
+            else:
+                kmz_path = kmz_path_for_cleaned(cleaned_csv)
+                result.kmz = kmz_path
+                placemark_count = _write_kmz(
+                    cleaned_csv,
+                    kmz_path,
+                    lat_col,
+                    lon_col,
+                    ppm_col,
+                    bin_edges=options.ppm_bin_edges,
+                    row_hint=info.kept_rows,
+                    hotspots=hotspots,
+                )
+                result.kmz_rows = placemark_count
+                result.kmz_status = "success"
+    except UnicodeDecodeError:
+        result.cleaned_status = "failed"
+        result.cleaned_error = "CSV is not UTF-8 encoded."
+    except Exception as exc:  # pragma: no cover - safety net
+        result.cleaned_status = "failed"
+        result.cleaned_error = str(exc)
+
+    return result
+
+
+def _write_hotspots(
+    result: MethaneCsvResult,
+    cleaned_csv: Path,
+    fieldnames: list[str],
+    lat_col: str,
+    lon_col: str,
+    ppm_col: str,
+    radius_m: float,
+) -> list[Hotspot]:
+    rel_alt_col = _pick_col(fieldnames, REL_ALT_COL_CANDIDATES)
+    try:
+        summary = analyze_hotspots(cleaned_csv, lat_col, lon_col, ppm_col, rel_alt_col, radius_m)
+    except HotspotsUnavailable as exc:
+        result.hotspot_error = str(exc)
+        return []
+    except Exception as exc:
+        result.hotspot_status = "failed"
+        result.hotspot_error = str(exc)
+        return []
+    result.hotspot_status = "success"
+    result.hotspot_count = len(summary.hotspots)
+    result.hotspot_csv = hotspot_csv_path(cleaned_csv)
+    result.hotspot_json = hotspot_json_path(cleaned_csv)
+    return summary.hotspots
+
+
+def _write_cleaned_csv(
+    csv_path: Path,
+    threshold: int,
+    photo_index: PhotoNameIndex | None = None,
+    listings: _FolderListings | None = None,
+) -> CleanedCsvInfo:
     with csv_path.open("r", encoding="utf-8-sig", newline="") as f:
         reader = csv.DictReader(f)
         fieldnames = reader.fieldnames
@@ -118,10 +314,13 @@ def _write_cleaned_csv(csv_path: Path, threshold: int) -> CleanedCsvInfo:
 
         photo_col = _pick_col(fieldnames, PHOTO_COL_CANDIDATES)
         use_photo_filter = bool(photo_col)
-        jpg_names: set[str] = set()
-        jpg_stems: set[str] = set()
+        jpg_names: frozenset[str] = frozenset()
+        jpg_stems: frozenset[str] = frozenset()
         if use_photo_filter:
-            jpg_names, jpg_stems = _collect_jpg_names(csv_path.parent)
+            listing = photo_index.get(csv_path.parent) if photo_index is not None else None
+            if listing is None:  # an empty listing is still a complete one
+                listing = (listings or _FolderListings()).get(csv_path.parent)
+            jpg_names, jpg_stems = listing
 
         cleaned_path = cleaned_csv_path(csv_path, threshold)
         cleaned_path.parent.mkdir(parents=True, exist_ok=True)
@@ -154,43 +353,286 @@ def _write_cleaned_csv(csv_path: Path, threshold: int) -> CleanedCsvInfo:
             )
 
 
+KML_NS = "http://www.opengis.net/kml/2.2"
+KMZ_ICON_HREF = "http://maps.google.com/mapfiles/kml/shapes/placemark_circle.png"
+KMZ_HOTSPOT_ICON_HREF = "http://maps.google.com/mapfiles/kml/shapes/caution.png"
+DEFAULT_KMZ_BIN_EDGES = [1000, 2500, 5000, 10000]  # ppm, used when no edges are given
+KMZ_TILE_MAX_PLACEMARKS = 1000  # placemarks per KML file before tiling kicks in
+KMZ_TILE_MAX_DEPTH = 8
+KMZ_LOD_MIN_PIXELS = 128
+_MIN_TILE_SPAN_DEG = 1e-5  # keeps regions of co-located points from collapsing to zero size
+
+
+@dataclass(frozen=True)
+class _Bbox:
+    north: float
+    south: float
+    east: float
+    west: float
+
+    def padded(self) -> "_Bbox":
+        pad_lat = max(0.0, _MIN_TILE_SPAN_DEG - (self.north - self.south)) / 2
+        pad_lon = max(0.0, _MIN_TILE_SPAN_DEG - (self.east - self.west)) / 2
+        return _Bbox(self.north + pad_lat, self.south - pad_lat, self.east + pad_lon, self.west - pad_lon)
+
+
+@dataclass
+class _KmzTile:
+    key: str
+    bbox: _Bbox
+    points: list[int]  # indices drawn in this tile, highest PPM first
+    children: list["_KmzTile"] = field(default_factory=list)
+
+
+class _KmlStreamWriter:
+    """Minimal incremental KML serializer over a text stream.
+
+    Elements are written as soon as they are produced, so memory use does not
+    grow with the number of placemarks.
+    """
+
+    def __init__(self, out: IO[str]) -> None:
+        self._out = out
+
+    def begin_document(self, name: str) -> None:
+        self._out.write("<?xml version='1.0' encoding='utf-8'?>\n")
+        self._out.write(f'<kml xmlns="{KML_NS}"><Document><name>{xml_escape(name)}</name>')
+
+    def bin_styles(self, edges: list[int]) -> None:
+        """Write one Style pair + StyleMap per PPM bin (see `_ppm_bin`)."""
+        count = len(edges) + 1
+        for i in range(count):
+            color = _bin_color(i, count)
+            for variant, icon_scale, label_scale in (("n", 0.8, 0.7), ("h", 1.1, 1.0)):
+                self._out.write(
+                    f'<Style id="ppm{i}_{variant}">'
+                    f"<IconStyle><color>{color}</color><scale>{icon_scale}</scale>"
+                    f"<Icon><href>{KMZ_ICON_HREF}</href></Icon></IconStyle>"
+                    f"<LabelStyle><scale>{label_scale}</scale></LabelStyle></Style>"
+                )
+            self._out.write(
+                f'<StyleMap id="ppm{i}">'
+                f"<Pair><key>normal</key><styleUrl>#ppm{i}_n</styleUrl></Pair>"
+                f"<Pair><key>highlight</key><styleUrl>#ppm{i}_h</styleUrl></Pair></StyleMap>"
+            )
+
+    def placemark(self, label: str, lat: float, lon: float, style_id: str | None = None) -> None:
+        style = f"<styleUrl>#{style_id}</styleUrl>" if style_id else ""
+        self._out.write(
+            f"<Placemark><name>{xml_escape(label)}</name>{style}"
+            f"<Point><coordinates>{lon},{lat},0</coordinates></Point></Placemark>"
+        )
+
+    def hotspot_folder(self, hotspots: list[Hotspot]) -> None:
+        """Write a Hotspots folder with one placemark per hotspot centroid."""
+        self._out.write(
+            '<Style id="hotspot"><IconStyle><color>ff0000ff</color><scale>1.4</scale>'
+            f"<Icon><href>{KMZ_HOTSPOT_ICON_HREF}</href></Icon></IconStyle></Style>"
+            "<Folder><name>Hotspots</name>"
+        )
+        for h in hotspots:
+            pac = f"<br/>Max PAC: {h.max_pac:g}" if h.max_pac is not None else ""
+            desc = (
+                f"Detections: {h.detections}<br/>Max PPM: {h.max_ppm:g}<br/>"
+                f"Mean PPM: {h.mean_ppm:g}{pac}<br/>Radius: {h.radius_m:g} m"
+            )
+            self._out.write(
+                f"<Placemark><name>H{h.hotspot_id} ({h.max_ppm:g} ppm)</name>"
+                f"<description>{xml_escape(desc)}</description><styleUrl>#hotspot</styleUrl>"
+                f"<Point><coordinates>{h.longitude},{h.latitude},0</coordinates></Point></Placemark>"
+            )
+        self._out.write("</Folder>")
+
+    def network_link(self, name: str, href: str, bbox: _Bbox, min_lod_pixels: int) -> None:
+        self._out.write(
+            f"<NetworkLink><name>{xml_escape(name)}</name>"
+            f"{_region_xml(bbox, min_lod_pixels)}"
+            f"<Link><href>{xml_escape(href)}</href><viewRefreshMode>onRegion</viewRefreshMode></Link>"
+            f"</NetworkLink>"
+        )
+
+    def end_document(self) -> None:
+        self._out.write("</Document></kml>")
+
+
 def _write_kmz(
     cleaned_csv: Path,
     kmz_path: Path,
     lat_col: str,
     lon_col: str,
     ppm_col: str,
+    bin_edges: list[int] | None = None,
+    row_hint: int | None = None,
+    hotspots: list[Hotspot] | None = None,
 ) -> int:
-    placemarks = []
-    with cleaned_csv.open("r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            lat = _safe_float(row.get(lat_col))
-            lon = _safe_float(row.get(lon_col))
-            if lat is None or lon is None:
-                continue
-            ppm_val = row.get(ppm_col)
-            label = str(ppm_val).strip() if ppm_val is not None else ""
-            placemarks.append((lat, lon, label))
-
-    kml = ET.Element("kml", xmlns="http://www.opengis.net/kml/2.2")
-    doc = ET.SubElement(kml, "Document")
-    name = ET.SubElement(doc, "name")
-    name.text = cleaned_csv.stem
-    for lat, lon, label in placemarks:
-        pm = ET.SubElement(doc, "Placemark")
-        pm_name = ET.SubElement(pm, "name")
-        pm_name.text = label
-        point = ET.SubElement(pm, "Point")
-        coords = ET.SubElement(point, "coordinates")
-        coords.text = f"{lon},{lat},0"
-
-    kml_bytes = ET.tostring(kml, encoding="utf-8", xml_declaration=True)
+    """Write a styled KMZ for the cleaned CSV.
+
+    Placemarks use shared per-bin StyleMaps coloured by PPM. Small files
+    (`row_hint` at or below KMZ_TILE_MAX_PLACEMARKS) are streamed straight into
+    doc.kml. Larger files are split into a quadtree of tiles/*.kml documents
+    linked through Region-gated NetworkLinks, so Google Earth only loads the
+    detail for the area in view; each tile shows its highest-PPM points first.
+    `hotspots` are added to the root doc.kml as a separate Hotspots folder.
+
+    The archive is written beside the target and moved into place once
+    complete, so a failed run never leaves a truncated KMZ behind.
+    """
+    edges = sorted(bin_edges) if bin_edges else list(DEFAULT_KMZ_BIN_EDGES)
     kmz_path.parent.mkdir(parents=True, exist_ok=True)
-    with zipfile.ZipFile(kmz_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-        zf.writestr("doc.kml", kml_bytes)
+    tmp_path = kmz_path.with_name(kmz_path.name + ".partial")
+    try:
+        with cleaned_csv.open("r", encoding="utf-8-sig", newline="") as f, \
+                zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            rows = _kmz_rows(csv.DictReader(f), lat_col, lon_col, ppm_col)
+            if row_hint is not None and row_hint <= KMZ_TILE_MAX_PLACEMARKS:
+                count = _write_flat_kml(zf, cleaned_csv.stem, rows, edges, hotspots)
+            else:
+                count = _write_tiled_kml(zf, cleaned_csv.stem, rows, edges, hotspots)
+        os.replace(tmp_path, kmz_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    return count
+
+
+def _kmz_rows(
+    reader: csv.DictReader,
+    lat_col: str,
+    lon_col: str,
+    ppm_col: str,
+) -> Iterator[tuple[str, float, float, float | None]]:
+    for row in reader:
+        lat = _safe_float(row.get(lat_col))
+        lon = _safe_float(row.get(lon_col))
+        if lat is None or lon is None:
+            continue
+        ppm_val = row.get(ppm_col)
+        label = str(ppm_val).strip() if ppm_val is not None else ""
+        yield label, lat, lon, _safe_float(ppm_val)
+
+
+def _write_flat_kml(
+    zf: zipfile.ZipFile,
+    name: str,
+    rows: Iterable[tuple[str, float, float, float | None]],
+    edges: list[int],
+    hotspots: list[Hotspot] | None = None,
+) -> int:
+    count = 0
+    with zf.open("doc.kml", "w") as entry, io.TextIOWrapper(entry, encoding="utf-8") as out:
+        kml = _KmlStreamWriter(out)
+        kml.begin_document(name)
+        kml.bin_styles(edges)
+        if hotspots:
+            kml.hotspot_folder(hotspots)
+        for label, lat, lon, ppm in rows:
+            kml.placemark(label, lat, lon, f"ppm{_ppm_bin(ppm, edges)}")
+            count += 1
+        kml.end_document()
+    return count
+
+
+def _write_tiled_kml(
+    zf: zipfile.ZipFile,
+    name: str,
+    rows: Iterable[tuple[str, float, float, float | None]],
+    edges: list[int],
+    hotspots: list[Hotspot] | None = None,
+) -> int:
+    labels: list[str] = []
+    lats = array("d")
+    lons = array("d")
+    ppms = array("d")
+    for label, lat, lon, ppm in rows:
+        labels.append(label)
+        lats.append(lat)
+        lons.append(lon)
+        ppms.append(float("-inf") if ppm is None else ppm)  # sorts last, lands in bin 0
+    if not labels:
+        return _write_flat_kml(zf, name, [], edges, hotspots)
+
+    bbox = _Bbox(max(lats), min(lats), max(lons), min(lons)).padded()
+    root = _build_tile(list(range(len(labels))), bbox, "", lats, lons, ppms)
+
+    stack = [root]
+    while stack:
+        tile = stack.pop()
+        entry_name = "doc.kml" if not tile.key else f"tiles/{tile.key}.kml"
+        with zf.open(entry_name, "w") as entry, io.TextIOWrapper(entry, encoding="utf-8") as out:
+            kml = _KmlStreamWriter(out)
+            kml.begin_document(name if not tile.key else f"{name} [{tile.key}]")
+            kml.bin_styles(edges)
+            if hotspots and not tile.key:
+                kml.hotspot_folder(hotspots)
+            for i in tile.points:
+                kml.placemark(labels[i], lats[i], lons[i], f"ppm{_ppm_bin(ppms[i], edges)}")
+            for child in tile.children:
+                # Hrefs resolve relative to the referencing file inside the KMZ.
+                href = f"tiles/{child.key}.kml" if not tile.key else f"{child.key}.kml"
+                kml.network_link(child.key, href, child.bbox, KMZ_LOD_MIN_PIXELS)
+            kml.end_document()
+        stack.extend(tile.children)
+    return len(labels)
+
+
+def _build_tile(
+    indices: list[int],
+    bbox: _Bbox,
+    key: str,
+    lats: array,
+    lons: array,
+    ppms: array,
+) -> _KmzTile:
+    indices.sort(key=lambda i: ppms[i], reverse=True)
+    if len(indices) <= KMZ_TILE_MAX_PLACEMARKS or len(key) >= KMZ_TILE_MAX_DEPTH:
+        return _KmzTile(key=key, bbox=bbox, points=indices)
+
+    tile = _KmzTile(key=key, bbox=bbox, points=indices[:KMZ_TILE_MAX_PLACEMARKS])
+    mid_lat = (bbox.north + bbox.south) / 2
+    mid_lon = (bbox.east + bbox.west) / 2
+    quadrants: list[list[int]] = [[], [], [], []]
+    for i in indices[KMZ_TILE_MAX_PLACEMARKS:]:
+        q = (0 if lats[i] >= mid_lat else 2) + (0 if lons[i] < mid_lon else 1)
+        quadrants[q].append(i)
+    child_boxes = [
+        _Bbox(bbox.north, mid_lat, mid_lon, bbox.west),
+        _Bbox(bbox.north, mid_lat, bbox.east, mid_lon),
+        _Bbox(mid_lat, bbox.south, mid_lon, bbox.west),
+        _Bbox(mid_lat, bbox.south, bbox.east, mid_lon),
+    ]
+    for q, members in enumerate(quadrants):
+        if members:
+            tile.children.append(
+                _build_tile(members, child_boxes[q], f"{key}{q}", lats, lons, ppms)
+            )
+    return tile
+
+
+def _ppm_bin(ppm: float | None, edges: list[int]) -> int:
+    """Bin index for a PPM value: 0 is below edges[0], len(edges) is >= edges[-1]."""
+    if ppm is None:
+        return 0
+    return bisect_right(edges, ppm)
+
+
+def _bin_color(index: int, count: int) -> str:
+    """KML aabbggrr colour on a green -> yellow -> red ramp."""
+    t = index / (count - 1) if count > 1 else 1.0
+    red = 255 if t >= 0.5 else int(round(510 * t))
+    green = 255 if t <= 0.5 else int(round(510 * (1 - t)))
+    return f"ff00{green:02x}{red:02x}"
+
 
-    return len(placemarks)
+def _region_xml(bbox: _Bbox, min_lod_pixels: int) -> str:
+    return (
+        "<Region><LatLonAltBox>"
+        f"<north>{bbox.north}</north><south>{bbox.south}</south>"
+        f"<east>{bbox.east}</east><west>{bbox.west}</west>"
+        "</LatLonAltBox>"
+        f"<Lod><minLodPixels>{min_lod_pixels}</minLodPixels><maxLodPixels>-1</maxLodPixels></Lod>"
+        "</Region>"
+    )
 
 
 def _pick_col(cols: list[str], candidates: list[str]) -> str | None:
@@ -214,7 +656,8 @@ def _safe_float(value: object) -> float | None:
         return None
 
 
-def _collect_jpg_names(folder: Path) -> tuple[set[str], set[str]]:
+def _collect_jpg_names(folder: Path) -> tuple[frozenset[str], frozenset[str]]:
+    """List lowercase JPG names and stems in a folder."""
     names: set[str] = set()
     stems: set[str] = set()
     for child in folder.iterdir():
@@ -226,10 +669,10 @@ def _collect_jpg_names(folder: Path) -> tuple[set[str], set[str]]:
         name = child.name.lower()
         names.add(name)
         stems.add(child.stem.lower())
-    return names, stems
+    return frozenset(names), frozenset(stems)
 
 
-def _row_matches_photo(value: object, jpg_names: set[str], jpg_stems: set[str]) -> bool:
+def _row_matches_photo(value: object, jpg_names: frozenset[str], jpg_stems: frozenset[str]) -> bool:
     if value is None:
         return False
     text = str(value).strip()
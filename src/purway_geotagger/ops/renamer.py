@@ -3,12 +3,36 @@ from __future__ import annotations
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
+from dataclasses import dataclass, field
+import json
+import os
 
 from purway_geotagger.core.job import Job
 from purway_geotagger.core.photo_task import PhotoTask
-from purway_geotagger.templates.template_manager import render_filename
+from purway_geotagger.templates.models import RenameTemplate
+from purway_geotagger.templates.template_manager import compile_template
 from purway_geotagger.util.timeparse import parse_photo_timestamp_from_name
 
+RENAME_JOURNAL_NAME = "rename_journal.jsonl"
+
+
+@dataclass(frozen=True)
+class RenameOp:
+    task: PhotoTask
+    src: Path
+    dst: Path
+    staged: bool = False  # dst is currently occupied by another op's src
+
+
+@dataclass
+class RenamePlan:
+    ops: list[RenameOp] = field(default_factory=list)
+
+    @property
+    def staged_count(self) -> int:
+        return sum(1 for op in self.ops if op.staged)
+
+
 def maybe_rename(job: Job, tasks: list[PhotoTask]) -> None:
     """Rename output photos in-place according to job template settings.
 
@@ -18,63 +42,189 @@ def maybe_rename(job: Job, tasks: list[PhotoTask]) -> None:
     if not opts.enable_renaming or not opts.rename_template:
         return
 
+    plan = plan_renames(tasks, opts.rename_template, opts.start_index)
+    journal = job.run_folder / RENAME_JOURNAL_NAME if job.run_folder else None
+    execute_rename_plan(plan, journal)
+
+
+def plan_renames(
+    tasks: list[PhotoTask],
+    template: RenameTemplate,
+    start_index: int,
+    now: datetime | None = None,
+) -> RenamePlan:
+    """Build the full rename plan in memory without touching any files.
+
+    Collisions are resolved against a single listing of each target folder plus
+    the names already claimed by the plan. Names vacated by other ops count as
+    free; ops that land on such a name are marked `staged` so execution can
+    move them through a temporary name (this also covers swaps and cycles).
+    """
     ordered = _chronological_tasks(tasks)
-    index = opts.start_index
+
+    occupied: dict[Path, set[str]] = {}
+    sources: set[tuple[Path, str]] = set()
     for t in ordered:
-        new_base = render_filename(
-            template=opts.rename_template,
-            index=index,
-            ppm=t.ppm or 0.0,
-            lat=t.lat or 0.0,
-            lon=t.lon or 0.0,
-            orig=t.output_path.stem,
-        )
-        index += 1
-        new_path = t.output_path.with_name(new_base + t.output_path.suffix.lower())
-        new_path = _collision_safe(new_path)
-        t.output_path.rename(new_path)
-        t.output_path = new_path
+        parent = t.output_path.parent
+        if parent not in occupied:
+            occupied[parent] = _list_names(parent)
+        key = t.output_path.name.casefold()
+        occupied[parent].discard(key)
+        sources.add((parent, key))
+
+    names = compile_template(template).render_batch(ordered, start_index, now=now)
+    pending: list[tuple[PhotoTask, Path]] = []
+    for t, new_base in zip(ordered, names):
+        parent = t.output_path.parent
+        dst = _claim_name(parent / (new_base + t.output_path.suffix.lower()), occupied[parent])
+        pending.append((t, dst))
+
+    plan = RenamePlan()
+    for t, dst in pending:
+        if dst == t.output_path:
+            continue
+        staged = (dst.parent, dst.name.casefold()) in sources
+        plan.ops.append(RenameOp(task=t, src=t.output_path, dst=dst, staged=staged))
+    return plan
+
+
+def execute_rename_plan(plan: RenamePlan, journal_path: Path | None = None) -> None:
+    """Apply a rename plan, journaling each completed rename.
+
+    Direct ops run first. Staged ops are moved to a temporary name in the same
+    folder, then to their final name once every source has been vacated. If any
+    rename fails, completed renames are reverted in reverse order and the error
+    is re-raised. Task output paths are only updated after the whole batch
+    succeeds.
+    """
+    if not plan.ops:
+        return
+
+    done: list[tuple[Path, Path]] = []
+    journal = None
+    if journal_path is not None:
+        journal_path.parent.mkdir(parents=True, exist_ok=True)
+        journal = journal_path.open("a", encoding="utf-8")
+
+    def _do(src: Path, dst: Path) -> None:
+        os.rename(src, dst)
+        done.append((src, dst))
+        if journal is not None:
+            journal.write(json.dumps({"op": "rename", "src": str(src), "dst": str(dst)}) + "\n")
+            journal.flush()
+
+    try:
+        staged: list[tuple[RenameOp, Path]] = []
+        for i, op in enumerate(plan.ops):
+            if op.staged:
+                tmp = op.src.with_name(f".{op.src.name}.renaming-{i}")
+                _do(op.src, tmp)
+                staged.append((op, tmp))
+            else:
+                _do(op.src, op.dst)
+        for op, tmp in staged:
+            _do(tmp, op.dst)
+    except OSError:
+        _revert(done, journal)
+        if journal is not None:
+            journal.close()
+        raise
+
+    if journal is not None:
+        journal.write(json.dumps({"op": "commit", "count": len(plan.ops)}) + "\n")
+        journal.close()
+    for op in plan.ops:
+        op.task.output_path = op.dst
+
+
+def rollback_renames(journal_path: Path) -> int:
+    """Undo the renames recorded in a rename journal.
+
+    Returns the number of renames reverted. Entries whose destination no longer
+    exists are skipped.
+    """
+    if not journal_path.exists():
+        return 0
+    done: list[tuple[Path, Path]] = []
+    with journal_path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                break  # torn final line after a crash
+            if entry.get("op") == "rename":
+                done.append((Path(entry["src"]), Path(entry["dst"])))
+            elif entry.get("op") == "rollback":
+                done.clear()
+    with journal_path.open("a", encoding="utf-8") as journal:
+        return _revert(done, journal)
+
+
+def _revert(done: list[tuple[Path, Path]], journal) -> int:
+    reverted = 0
+    for src, dst in reversed(done):
+        if not dst.exists() or src.exists():
+            continue
+        os.rename(dst, src)
+        reverted += 1
+    if journal is not None:
+        journal.write(json.dumps({"op": "rollback", "count": reverted}) + "\n")
+        journal.flush()
+    done.clear()
+    return reverted
 
 
 def _chronological_tasks(tasks: list[PhotoTask]) -> list[PhotoTask]:
-    groups: dict[Path, list[PhotoTask]] = defaultdict(list)
+    groups: dict[Path, list[tuple[datetime | None, PhotoTask]]] = defaultdict(list)
     for t in tasks:
         if t.status != "SUCCESS":
             continue
-        groups[t.src_path.parent].append(t)
+        groups[t.src_path.parent].append((_task_time(t), t))
 
-    def task_time(task: PhotoTask) -> datetime | None:
-        if task.datetime_original:
-            try:
-                return datetime.strptime(task.datetime_original, "%Y:%m:%d %H:%M:%S")
-            except ValueError:
-                pass
-        return parse_photo_timestamp_from_name(task.src_path.stem)
-
-    def group_key(item: tuple[Path, list[PhotoTask]]):
-        group = item[1]
-        times = [task_time(t) for t in group]
-        times = [t for t in times if t is not None]
+    def group_key(item: tuple[Path, list[tuple[datetime | None, PhotoTask]]]):
+        times = [ts for ts, _ in item[1] if ts is not None]
         earliest = min(times) if times else datetime.max
         return (earliest, str(item[0]).lower())
 
+    def sort_key(entry: tuple[datetime | None, PhotoTask]):
+        ts, t = entry
+        return (ts is None, ts or datetime.max, t.src_path.name.lower())
+
     ordered: list[PhotoTask] = []
     for _, group in sorted(groups.items(), key=group_key):
-        def sort_key(t: PhotoTask):
-            ts = task_time(t)
-            return (ts is None, ts or datetime.max, t.src_path.name.lower())
-        ordered.extend(sorted(group, key=sort_key))
+        ordered.extend(t for _, t in sorted(group, key=sort_key))
     return ordered
 
-def _collision_safe(path: Path) -> Path:
-    if not path.exists():
-        return path
-    stem = path.stem
-    suf = path.suffix
-    parent = path.parent
+
+def _task_time(task: PhotoTask) -> datetime | None:
+    if task.datetime_original:
+        try:
+            return datetime.strptime(task.datetime_original, "%Y:%m:%d %H:%M:%S")
+        except ValueError:
+            pass
+    return parse_photo_timestamp_from_name(task.src_path.stem)
+
+
+def _list_names(folder: Path) -> set[str]:
+    try:
+        with os.scandir(folder) as it:
+            return {entry.name.casefold() for entry in it}
+    except OSError:
+        return set()
+
+
+def _claim_name(path: Path, occupied: set[str]) -> Path:
+    """Return a collision-safe variant of path and mark it as taken.
+
+    Names compare case-insensitively so plans stay safe on macOS volumes.
+    """
+    cand = path
     i = 1
-    while True:
-        cand = parent / f"{stem}_dup{i}{suf}"
-        if not cand.exists():
-            return cand
+    while cand.name.casefold() in occupied:
+        cand = path.parent / f"{path.stem}_dup{i}{path.suffix}"
         i += 1
+    occupied.add(cand.name.casefold())
+    return cand
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
 import csv
 import logging
+import threading
 from typing import Optional
 
 from purway_geotagger.util.timeparse import parse_csv_timestamp, parse_photo_timestamp_from_name, format_exif_datetime
@@ -67,7 +69,7 @@ class PurwayRecord:
     camera_zoom: float | None = None
     timestamp_raw: str | None = None
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PhotoMatch:
     csv_path: str
     lat: float
@@ -154,6 +156,48 @@ class PurwayCSVIndex:
 
         return _to_match(best, join_method="TIMESTAMP")
 
+class CSVIndexCache:
+    """LRU cache of parsed CSV records shared by jobs in a long-lived process.
+
+    Entries are keyed by (path, mtime, size), so an edited CSV is parsed again.
+    Parsed records are never mutated, so indexes built from the cache can be
+    used from several job threads at once.
+    """
+
+    def __init__(self, max_files: int = 256) -> None:
+        self.max_files = max_files
+        self._lock = threading.Lock()
+        self._records: OrderedDict[tuple[str, int, int], list[PurwayRecord]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, csv_files: list[Path]) -> PurwayCSVIndex:
+        records: list[PurwayRecord] = []
+        for p in csv_files:
+            records.extend(self._file_records(p))
+        return PurwayCSVIndex(records=records)
+
+    def _file_records(self, path: Path) -> list[PurwayRecord]:
+        try:
+            st = path.stat()
+        except OSError:
+            return _parse_single_csv(path)
+        key = (str(path.resolve()), st.st_mtime_ns, st.st_size)
+        with self._lock:
+            cached = self._records.get(key)
+            if cached is not None:
+                self._records.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+        recs = _parse_single_csv(path)
+        with self._lock:
+            self._records[key] = recs
+            while len(self._records) > self.max_files:
+                self._records.popitem(last=False)
+        return recs
+
+
 def _to_match(r: PurwayRecord, join_method: str) -> PhotoMatch:
     dto = format_exif_datetime(r.timestamp) if r.timestamp else None
     ppm_int = int(round(r.ppm))
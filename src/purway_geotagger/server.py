@@ -0,0 +1,571 @@
+"""Local job server for automation (stdlib asyncio, no Qt).
+
+Run:
+    python -m purway_geotagger serve --port 8765
+    python -m purway_geotagger serve --unix /tmp/purway.sock
+
+Speaks plain HTTP/1.1 (one request per connection) on 127.0.0.1 or a Unix
+socket. Every start writes a fresh token to a 0600 file (server_token_path(),
+or --token-file); clients send it as `Authorization: Bearer <token>`. TCP
+requests must also name a loopback Host, cross-site Origins are refused and
+POST bodies must be `Content-Type: application/json` (so browsers cannot
+send them without a preflight, which the server never answers). Do not bind
+it to a public address.
+
+    GET    /health                  server status and cache statistics
+    POST   /jobs                    {"mode", "inputs", "options", "priority"} -> 202
+    POST   /jobs/resume             {"run_folder", "priority"} -> 202
+    GET    /jobs                    all jobs
+    GET    /jobs/{id}               one job
+    GET    /jobs/{id}/events        progress as Server-Sent Events
+    DELETE /jobs/{id}               cancel a queued or running job
+    GET    /jobs/{id}/manifest      task rows from run.sqlite (?status=FAILED)
+    GET    /jobs/{id}/summary       run_summary.json once the job has finished
+
+Jobs run on worker threads under the same JobScheduler limits as the GUI.
+The server keeps one warm ExifTool process and a cache of parsed CSVs for
+all jobs, so back-to-back requests skip that startup work.
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import hmac
+import json
+import os
+from pathlib import Path
+import re
+import secrets
+import threading
+import time
+from typing import Any
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from appdirs import user_config_dir
+
+from purway_geotagger.cli import build_job
+from purway_geotagger.core.job import Job
+from purway_geotagger.core.pipeline import load_run_config, run_job
+from purway_geotagger.core.run_db import query_tasks, run_db_path
+from purway_geotagger.core.scheduler import JobScheduler, ResourceLimits, default_max_jobs
+from purway_geotagger.core.settings import AppSettings
+from purway_geotagger.exif.exiftool_writer import ExifToolSession, set_max_exiftool_processes
+from purway_geotagger.parsers.purway_csv import CSVIndexCache
+from purway_geotagger.util.errors import UserCancelledError
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 1 << 20
+SSE_KEEPALIVE_SECONDS = 15.0
+LOOPBACK_HOSTS = ("localhost", "127.0.0.1", "::1")
+SHUTDOWN_TIMEOUT_SECONDS = 60.0  # how long close() waits for cancelled jobs to wind down
+
+_TERMINAL = ("done", "failed", "cancelled")
+_REASONS = {
+    200: "OK",
+    202: "Accepted",
+    400: "Bad Request",
+    401: "Unauthorized",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    415: "Unsupported Media Type",
+    500: "Internal Server Error",
+}
+_JOB_ROUTE = re.compile(r"^/jobs/([^/]+)(?:/(events|manifest|summary))?$")
+
+
+class _HTTPError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class _ServerJob:
+    job: Job
+    resume: bool
+    priority: int
+    created: float = field(default_factory=time.time)
+    status: str = "queued"
+    error: str = ""
+    cancel: threading.Event = field(default_factory=threading.Event)
+    history: list[tuple[str, dict[str, Any]]] = field(default_factory=list)
+    last_progress: dict[str, Any] | None = None
+    subscribers: set[asyncio.Queue] = field(default_factory=set)
+
+    def info(self) -> dict[str, Any]:
+        job, s = self.job, self.job.state
+        return {
+            "id": job.id,
+            "name": job.name,
+            "mode": job.options.run_mode.value if job.options.run_mode else None,
+            "status": self.status,
+            "resume": self.resume,
+            "priority": self.priority,
+            "inputs": [str(p) for p in job.inputs],
+            "run_folder": str(job.run_folder) if job.run_folder else None,
+            "stage": s.stage,
+            "progress": s.progress,
+            "message": s.message,
+            "scanned_photos": s.scanned_photos,
+            "scanned_csvs": s.scanned_csvs,
+            "matched": s.matched,
+            "success": s.success,
+            "failed": s.failed,
+            "error": self.error,
+            "created": self.created,
+        }
+
+
+class JobServer:
+    """Accepts jobs over HTTP and runs them through a JobScheduler.
+
+    All scheduler and job-table access happens on the event loop thread;
+    worker threads hand progress and results back with call_soon_threadsafe.
+    """
+
+    def __init__(
+        self,
+        settings: AppSettings | None = None,
+        max_jobs: int | None = None,
+        token_path: Path | None = None,
+    ) -> None:
+        self.settings = settings or AppSettings.load()
+        limits = ResourceLimits(
+            max_jobs=max(1, max_jobs or self.settings.max_concurrent_jobs or default_max_jobs()),
+            max_exiftool_processes=self.settings.max_exiftool_processes,
+            io_jobs_per_device=self.settings.io_jobs_per_device,
+        )
+        set_max_exiftool_processes(limits.max_exiftool_processes)
+        self.scheduler = JobScheduler(limits)
+        self.jobs: dict[str, _ServerJob] = {}
+        self.csv_cache = CSVIndexCache()
+        self.exiftool = ExifToolSession()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._server: asyncio.AbstractServer | None = None
+        self._started = time.time()
+        self._unix = False
+        self._closing = False
+        self._threads: set[threading.Thread] = set()
+        self.token = secrets.token_urlsafe(32)
+        self.token_path = token_path or server_token_path()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_path: Path | None = None) -> str:
+        """Start listening; returns the address ("http://host:port" or "unix:PATH")."""
+        self._loop = asyncio.get_running_loop()
+        _write_token(self.token_path, self.token)
+        if unix_path is not None:
+            self._unix = True
+            unix_path.unlink(missing_ok=True)
+            self._server = await asyncio.start_unix_server(self._handle, path=str(unix_path))
+            os.chmod(unix_path, 0o600)
+            return f"unix:{unix_path}"
+        self._server = await asyncio.start_server(self._handle, host=host, port=port)
+        bound = self._server.sockets[0].getsockname()
+        return f"http://{bound[0]}:{bound[1]}"
+
+    async def serve_forever(self) -> None:
+        assert self._server is not None
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop accepting requests, cancel jobs and stop ExifTool.
+
+        Running jobs get up to SHUTDOWN_TIMEOUT_SECONDS to stop at their next
+        cancel check and write their manifest, summary and checkpoint before
+        the shared ExifTool session goes away.
+        """
+        self._closing = True
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for sj in self.jobs.values():
+            self.cancel(sj)
+        await asyncio.to_thread(self._join_workers, SHUTDOWN_TIMEOUT_SECONDS)
+        await asyncio.to_thread(self.exiftool.close)
+        self.token_path.unlink(missing_ok=True)
+
+    # -- jobs -----------------------------------------------------------------
+
+    def submit(self, job: Job, priority: int = 0, resume: bool = False) -> _ServerJob:
+        job.state.stage = "QUEUED"
+        job.state.message = "Queued"
+        sj = _ServerJob(job=job, resume=resume, priority=priority)
+        self.jobs[job.id] = sj
+        self.scheduler.submit(job, priority)
+        self._publish(sj, "queued", sj.info())
+        self._dispatch()
+        return sj
+
+    def cancel(self, sj: _ServerJob) -> None:
+        if sj.status in _TERMINAL:
+            return
+        sj.cancel.set()
+        if self.scheduler.remove(sj.job):
+            sj.job.state.stage = "CANCELLED"
+            sj.job.state.message = "Cancelled before start."
+            self._finish(sj, "cancelled", "Cancelled before start.")
+
+    def _join_workers(self, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        for thread in list(self._threads):
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+    def _dispatch(self) -> None:
+        if self._closing:
+            return
+        for job in self.scheduler.next_ready():
+            sj = self.jobs[job.id]
+            sj.status = "running"
+            job.state.stage = "PENDING"
+            job.state.message = "Starting..."
+            self._publish(sj, "started", sj.info())
+            # Not a daemon: interpreter exit waits for a job to stop cleanly.
+            thread = threading.Thread(target=self._work, args=(sj,), name=f"server-job-{job.id[:8]}")
+            self._threads.add(thread)
+            thread.start()
+
+    def _work(self, sj: _ServerJob) -> None:
+        loop = self._loop
+        assert loop is not None
+        job = sj.job
+
+        def _post(callback, *args) -> None:
+            try:
+                loop.call_soon_threadsafe(callback, *args)
+            except RuntimeError:
+                pass  # loop already closed after a timed-out shutdown
+
+        def _progress(pct: int, msg: str) -> None:
+            job.state.progress = int(pct)
+            job.state.message = msg
+            _post(self._progress, sj, int(pct), msg)
+
+        status, error = "done", ""
+        try:
+            run_job(
+                job,
+                progress_cb=_progress,
+                cancel_cb=sj.cancel.is_set,
+                resume=sj.resume,
+                exiftool_session=None if job.options.dry_run else self.exiftool,
+                csv_cache=self.csv_cache,
+            )
+        except UserCancelledError:
+            status, error = "cancelled", "Cancelled by user."
+        except Exception as exc:
+            status, error = "failed", str(exc) or type(exc).__name__
+        finally:
+            self._threads.discard(threading.current_thread())
+        _post(self._finish, sj, status, error)
+
+    def _progress(self, sj: _ServerJob, pct: int, msg: str) -> None:
+        data = {"id": sj.job.id, "progress": pct, "message": msg}
+        if sj.last_progress == data:
+            return
+        sj.last_progress = data
+        for q in sj.subscribers:
+            q.put_nowait(("progress", data))
+
+    def _finish(self, sj: _ServerJob, status: str, error: str) -> None:
+        sj.status = status
+        sj.error = error
+        if status == "done":
+            sj.job.state.stage = "DONE"
+        elif status == "failed":
+            sj.job.state.stage = "FAILED"
+            sj.job.state.message = error
+        self.scheduler.finish(sj.job)
+        self._publish(sj, status, sj.info())
+        for q in sj.subscribers:
+            q.put_nowait(None)
+        sj.subscribers.clear()
+        self._dispatch()
+
+    def _publish(self, sj: _ServerJob, kind: str, data: dict[str, Any]) -> None:
+        """Record a lifecycle event and send it to live subscribers."""
+        sj.history.append((kind, data))
+        for q in sj.subscribers:
+            q.put_nowait((kind, data))
+
+    # -- HTTP -----------------------------------------------------------------
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                request = await _read_request(reader)
+                if request is None:
+                    return
+                method, path, query, headers, body = request
+                self._check_request(method, headers)
+                m = _JOB_ROUTE.match(path)
+                if method == "GET" and m and m.group(2) == "events":
+                    await self._stream_events(self._job(path), writer)
+                    return
+                status, payload = await self._route(method, path, query, body)
+            except _HTTPError as e:
+                status, payload = e.status, {"error": str(e)}
+            except Exception as e:  # pragma: no cover - keep the server up
+                status, payload = 500, {"error": str(e) or type(e).__name__}
+            await _send_json(writer, status, payload)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _check_request(self, method: str, headers: dict[str, str]) -> None:
+        """Refuse requests a web page could forge (DNS rebinding, cross-site POSTs)."""
+        if not self._unix and _host_name(headers.get("host", "")) not in LOOPBACK_HOSTS:
+            raise _HTTPError(403, "Host must be localhost or 127.0.0.1.")
+        origin = headers.get("origin")
+        if origin is not None and _host_name(urlsplit(origin).netloc) not in LOOPBACK_HOSTS:
+            raise _HTTPError(403, "Cross-origin requests are not allowed.")
+        scheme, _, supplied = headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(supplied.strip().encode(), self.token.encode()):
+            raise _HTTPError(401, f"Send the token from {self.token_path} as 'Authorization: Bearer <token>'.")
+        if method == "POST":
+            content_type = headers.get("content-type", "").split(";", 1)[0].strip().lower()
+            if content_type != "application/json":
+                raise _HTTPError(415, "POST bodies must be Content-Type: application/json.")
+
+    async def _route(self, method: str, path: str, query: dict[str, str], body: bytes) -> tuple[int, Any]:
+        if path == "/health":
+            _allow(method, "GET")
+            return 200, self._health()
+        if path == "/jobs":
+            _allow(method, "GET", "POST")
+            if method == "GET":
+                return 200, {"jobs": [sj.info() for sj in self.jobs.values()]}
+            return 202, await self._create(_json_body(body))
+        if path == "/jobs/resume":
+            _allow(method, "POST")
+            return 202, await self._resume(_json_body(body))
+
+        m = _JOB_ROUTE.match(path)
+        if not m:
+            raise _HTTPError(404, f"No route for {path}")
+        sj = self._job(path)
+        action = m.group(2)
+        if action is None:
+            _allow(method, "GET", "DELETE")
+            if method == "DELETE":
+                self.cancel(sj)
+            return 200, sj.info()
+        _allow(method, "GET")
+        if action == "manifest":
+            return 200, await self._manifest(sj, query.get("status"))
+        return 200, await self._summary(sj)
+
+    def _job(self, path: str) -> _ServerJob:
+        m = _JOB_ROUTE.match(path)
+        sj = self.jobs.get(unquote(m.group(1))) if m else None
+        if sj is None:
+            raise _HTTPError(404, "Unknown job.")
+        return sj
+
+    def _health(self) -> dict[str, Any]:
+        counts: dict[str, int] = {}
+        for sj in self.jobs.values():
+            counts[sj.status] = counts.get(sj.status, 0) + 1
+        return {
+            "status": "ok",
+            "uptime_s": round(time.time() - self._started, 1),
+            "jobs": counts,
+            "max_jobs": self.scheduler.limits.max_jobs,
+            "csv_cache": {"hits": self.csv_cache.hits, "misses": self.csv_cache.misses},
+        }
+
+    async def _create(self, body: dict[str, Any]) -> dict[str, Any]:
+        inputs = body.get("inputs")
+        if not isinstance(inputs, list) or not all(isinstance(p, str) for p in inputs):
+            raise _HTTPError(400, '"inputs" must be a list of paths.')
+        options = body.get("options") or {}
+        if not isinstance(options, dict):
+            raise _HTTPError(400, '"options" must be an object.')
+        try:
+            job = await asyncio.to_thread(
+                build_job, str(body.get("mode", "")), [Path(p) for p in inputs], options, self.settings
+            )
+        except ValueError as e:
+            raise _HTTPError(400, str(e)) from e
+        return self.submit(job, _priority(body)).info()
+
+    async def _resume(self, body: dict[str, Any]) -> dict[str, Any]:
+        folder = body.get("run_folder")
+        if not isinstance(folder, str) or not folder:
+            raise _HTTPError(400, '"run_folder" is required.')
+        run_folder = Path(folder)
+        active = [sj for sj in self.jobs.values() if sj.job.run_folder == run_folder and sj.status not in _TERMINAL]
+        if active:
+            raise _HTTPError(409, f"Run folder is in use by job {active[0].job.id}.")
+        try:
+            job = await asyncio.to_thread(load_run_config, run_folder)
+        except (OSError, ValueError, TypeError) as e:
+            raise _HTTPError(400, f"Cannot resume {run_folder}: {e}") from e
+        return self.submit(job, _priority(body), resume=True).info()
+
+    async def _manifest(self, sj: _ServerJob, status: str | None) -> dict[str, Any]:
+        db = run_db_path(sj.job.run_folder) if sj.job.run_folder else None
+        if db is None or not db.exists():
+            raise _HTTPError(404, "No manifest yet.")
+        rows = await asyncio.to_thread(query_tasks, db, status or None)
+        return {"id": sj.job.id, "status": sj.status, "count": len(rows), "rows": rows}
+
+    async def _summary(self, sj: _ServerJob) -> Any:
+        path = sj.job.run_folder / "run_summary.json" if sj.job.run_folder else None
+        if sj.status not in _TERMINAL or path is None or not path.exists():
+            raise _HTTPError(404, "No run summary yet.")
+        return json.loads(await asyncio.to_thread(path.read_text, encoding="utf-8"))
+
+    async def _stream_events(self, sj: _ServerJob, writer: asyncio.StreamWriter) -> None:
+        """Send past lifecycle events and the latest progress, then follow live events."""
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Connection: close\r\n\r\n"
+        )
+        for kind, data in sj.history:
+            writer.write(_sse(kind, data))
+        if sj.status in _TERMINAL:
+            await writer.drain()
+            return
+        if sj.last_progress is not None:
+            writer.write(_sse("progress", sj.last_progress))
+        q: asyncio.Queue = asyncio.Queue()
+        sj.subscribers.add(q)  # before the first await, so no event is missed
+        try:
+            await writer.drain()
+            while True:
+                try:
+                    item = await asyncio.wait_for(q.get(), SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    writer.write(b": keepalive\n\n")
+                    await writer.drain()
+                    continue
+                if item is None:
+                    break
+                writer.write(_sse(*item))
+                await writer.drain()
+        finally:
+            sj.subscribers.discard(q)
+
+
+def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    unix_path: Path | None = None,
+    max_jobs: int | None = None,
+    settings: AppSettings | None = None,
+    token_path: Path | None = None,
+) -> None:
+    """Run a JobServer until interrupted (used by `purway-geotagger serve`)."""
+
+    async def _main() -> None:
+        server = JobServer(settings, max_jobs=max_jobs, token_path=token_path)
+        address = await server.start(host, port, unix_path)
+        print(f"Purway Geotagger job server listening on {address}", flush=True)
+        print(f"Access token written to {server.token_path}", flush=True)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+            if unix_path is not None:
+                unix_path.unlink(missing_ok=True)
+
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        pass
+
+
+def server_token_path() -> Path:
+    """Default token file, next to settings.json."""
+    return Path(user_config_dir(appname="PurwayGeotagger", appauthor=False)) / "server.token"
+
+
+def _write_token(path: Path, token: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)  # a fresh file, so an existing wider mode is not kept
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token + "\n")
+
+
+def _host_name(netloc: str) -> str:
+    """Host part of a Host header or Origin netloc, without port or brackets."""
+    host = netloc.strip().lower()
+    if host.startswith("["):
+        return host[1:].partition("]")[0]
+    return host.rsplit(":", 1)[0] if host.count(":") == 1 else host
+
+
+async def _read_request(
+    reader: asyncio.StreamReader,
+) -> tuple[str, str, dict[str, str], dict[str, str], bytes] | None:
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    try:
+        method, target, _version = line.decode("latin-1").split()
+    except ValueError as e:
+        raise _HTTPError(400, "Malformed request line.") from e
+    headers: dict[str, str] = {}
+    while True:
+        raw = await reader.readline()
+        if raw in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = raw.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError as e:
+        raise _HTTPError(400, "Invalid Content-Length.") from e
+    if length > MAX_BODY_BYTES:
+        raise _HTTPError(413, "Request body too large.")
+    body = await reader.readexactly(length) if length else b""
+    url = urlsplit(target)
+    query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+    return method.upper(), url.path.rstrip("/") or "/", query, headers, body
+
+
+async def _send_json(writer: asyncio.StreamWriter, status: int, payload: Any) -> None:
+    body = json.dumps(payload, default=str).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
+    await writer.drain()
+
+
+def _sse(kind: str, data: dict[str, Any]) -> bytes:
+    return f"event: {kind}\ndata: {json.dumps(data, default=str)}\n\n".encode("utf-8")
+
+
+def _json_body(body: bytes) -> dict[str, Any]:
+    try:
+        payload = json.loads(body or b"{}")
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise _HTTPError(400, f"Invalid JSON body: {e}") from e
+    if not isinstance(payload, dict):
+        raise _HTTPError(400, "Request body must be a JSON object.")
+    return payload
+
+
+def _priority(body: dict[str, Any]) -> int:
+    try:
+        return int(body.get("priority", 0))
+    except (TypeError, ValueError) as e:
+        raise _HTTPError(400, '"priority" must be an integer.') from e
+
+
+def _allow(method: str, *allowed: str) -> None:
+    if method not in allowed:
+        raise _HTTPError(405, f"{method} not allowed; use {', '.join(allowed)}.")
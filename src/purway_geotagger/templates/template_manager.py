@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import json
+import string
 from dataclasses import asdict
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
+from purway_geotagger.core.photo_task import PhotoTask
 from purway_geotagger.templates.models import RenameTemplate
 from purway_geotagger.util.paths import resource_path
 try:
@@ -89,27 +93,153 @@ class TemplateManager:
         }
         self.user_templates_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
 
-def render_filename(template: RenameTemplate, index: int, ppm: float, lat: float, lon: float, orig: str) -> str:
+SUPPORTED_TOKENS = frozenset({"client", "date", "time", "index", "ppm", "lat", "lon", "orig"})
+_RUN_TOKENS = frozenset({"client", "date", "time"})
+_FORMATTER = string.Formatter()
+
+
+class CompiledTemplate:
+    """A RenameTemplate pattern validated once and split for fast rendering.
+
+    Run-level tokens ({client} {date} {time}) are folded into the format string
+    when the template is bound to a run timestamp; per-file tokens are the only
+    values computed for each photo.
+    """
+
+    __slots__ = ("template", "_parts", "_file_tokens")
+
+    def __init__(self, template: RenameTemplate) -> None:
+        self.template = template
+        try:
+            parts = list(_FORMATTER.parse(template.pattern))
+        except ValueError as e:
+            raise ValueError(f"Template format error: {e}") from e
+        tokens: set[str] = set()
+        for _literal, field_name, spec, _conv in parts:
+            if field_name is None:
+                continue
+            if field_name not in SUPPORTED_TOKENS:
+                token = "{" + field_name + "}" if field_name else "{}"
+                raise ValueError(f"Template format error: unsupported token {token}")
+            if spec and "{" in spec:
+                raise ValueError(f"Template format error: nested fields in {{{field_name}:{spec}}}")
+            tokens.add(field_name)
+        self._parts = parts
+        self._file_tokens = frozenset(tokens - _RUN_TOKENS)
+        # Surface bad format specs (e.g. {orig:05d}) before any file is touched.
+        self.render(index=1, ppm=0.0, lat=0.0, lon=0.0, orig="IMG_0001")
+
+    @property
+    def tokens(self) -> frozenset[str]:
+        return frozenset(p[1] for p in self._parts if p[1] is not None)
+
+    def bind(self, now: datetime | None = None) -> str:
+        """Return a format string with run-level tokens already substituted."""
+        now = now or datetime.now()
+        run_ctx = {
+            "client": self.template.client,
+            "date": now.strftime("%Y%m%d"),
+            "time": now.strftime("%H%M%S"),
+        }
+        out: list[str] = []
+        try:
+            for literal, field_name, spec, conv in self._parts:
+                out.append(_escape(literal))
+                if field_name is None:
+                    continue
+                if field_name in _RUN_TOKENS:
+                    value = _FORMATTER.convert_field(run_ctx[field_name], conv)
+                    out.append(_escape(format(value, spec)))
+                else:
+                    conv_text = f"!{conv}" if conv else ""
+                    spec_text = f":{spec}" if spec else ""
+                    out.append(f"{{{field_name}{conv_text}{spec_text}}}")
+        except Exception as e:
+            raise ValueError(f"Template format error: {e}") from e
+        return "".join(out)
+
+    def render(
+        self,
+        index: int,
+        ppm: float,
+        lat: float,
+        lon: float,
+        orig: str,
+        now: datetime | None = None,
+    ) -> str:
+        return self._render_bound(self.bind(now), index, ppm, lat, lon, orig)
+
+    def render_batch(
+        self,
+        tasks: Iterable[PhotoTask],
+        start_index: int,
+        now: datetime | None = None,
+    ) -> list[str]:
+        """Render base names for an ordered task list with consecutive indexes.
+
+        {date}/{time} are captured once for the whole batch and {orig} is taken
+        from each task's current output name.
+        """
+        fmt = self.bind(now)
+        return [
+            self._render_bound(
+                fmt,
+                start_index + i,
+                t.ppm or 0.0,
+                t.lat or 0.0,
+                t.lon or 0.0,
+                t.output_path.stem,
+            )
+            for i, t in enumerate(tasks)
+        ]
+
+    def _render_bound(self, fmt: str, index: int, ppm: float, lat: float, lon: float, orig: str) -> str:
+        tokens = self._file_tokens
+        ctx: dict[str, Any] = {}
+        if "index" in tokens:
+            ctx["index"] = index
+        if "ppm" in tokens:
+            ctx["ppm"] = int(round(ppm))
+        if "lat" in tokens:
+            ctx["lat"] = f"{lat:.6f}"
+        if "lon" in tokens:
+            ctx["lon"] = f"{lon:.6f}"
+        if "orig" in tokens:
+            ctx["orig"] = orig
+        try:
+            return fmt.format_map(ctx)
+        except Exception as e:
+            raise ValueError(f"Template format error: {e}") from e
+
+
+@lru_cache(maxsize=64)
+def compile_template(template: RenameTemplate) -> CompiledTemplate:
+    """Validate and compile a template; results are cached per template value.
+
+    Raises ValueError for malformed patterns or unsupported tokens.
+    """
+    return CompiledTemplate(template)
+
+
+def _escape(text: str) -> str:
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+def render_filename(
+    template: RenameTemplate,
+    index: int,
+    ppm: float,
+    lat: float,
+    lon: float,
+    orig: str,
+    now: datetime | None = None,
+) -> str:
     """Render a filename (without extension) from template tokens.
 
     Supported tokens:
       {client} {date} {time} {index} {index:05d} {ppm} {lat} {lon} {orig}
+
+    Pass `now` to pin {date}/{time} for a whole batch. For many files prefer
+    `compile_template(template).render_batch(...)`.
     """
-    from datetime import datetime
-
-    now = datetime.now()
-    ctx: dict[str, Any] = {
-        "client": template.client,
-        "date": now.strftime("%Y%m%d"),
-        "time": now.strftime("%H%M%S"),
-        "index": index,
-        "ppm": int(round(ppm)),
-        "lat": f"{lat:.6f}",
-        "lon": f"{lon:.6f}",
-        "orig": orig,
-    }
-    try:
-        return template.pattern.format(**ctx)
-    except Exception as e:
-        # In production, surface this to GUI as a validation error.
-        raise ValueError(f"Template format error: {e}") from e
+    return compile_template(template).render(index, ppm, lat, lon, orig, now=now)
@@ -11,3 +11,6 @@ class ExifToolError(PurwayGeotaggerError):
 
 class CorrelationError(PurwayGeotaggerError):
     """Raised when a photo cannot be reliably correlated to a CSV row."""
+
+class ResumeError(PurwayGeotaggerError):
+    """Raised when an interrupted run cannot be resumed from its checkpoint."""
@@ -0,0 +1,56 @@
+"""Compare two benchmark result files written by the benchmark suite.
+
+    python tests/benchmarks/compare.py BASE.json NEW.json [--tolerance 0.15]
+
+Prints the median time of every benchmark in both files and exits with
+status 1 if any got slower than BASE by more than the tolerance.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+
+
+def compare(base: dict, new: dict, tolerance: float) -> tuple[list[str], list[str]]:
+    """Report lines and the names of benchmarks that regressed beyond `tolerance`."""
+    lines = [f"{'benchmark':<44} {'base ms':>10} {'new ms':>10} {'change':>8}"]
+    regressed: list[str] = []
+    base_runs = base.get("benchmarks", {})
+    new_runs = new.get("benchmarks", {})
+    for name in sorted(set(base_runs) | set(new_runs)):
+        if name not in base_runs or name not in new_runs:
+            where = "new" if name in new_runs else "base"
+            lines.append(f"{name:<44} only in {where}")
+            continue
+        old_ms = base_runs[name]["median"] * 1000
+        new_ms = new_runs[name]["median"] * 1000
+        change = (new_ms - old_ms) / old_ms if old_ms > 0 else 0.0
+        flag = ""
+        if change > tolerance:
+            regressed.append(name)
+            flag = "  SLOWER"
+        lines.append(f"{name:<44} {old_ms:10.1f} {new_ms:10.1f} {change:+8.1%}{flag}")
+    return lines, regressed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("base", type=Path)
+    parser.add_argument("new", type=Path)
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown as a fraction (default 0.15)")
+    args = parser.parse_args(argv)
+
+    base = json.loads(args.base.read_text(encoding="utf-8"))
+    new = json.loads(args.new.read_text(encoding="utf-8"))
+    if base.get("scale") != new.get("scale"):
+        print(f"warning: comparing scale {base.get('scale')!r} with {new.get('scale')!r}", file=sys.stderr)
+    print(f"base {base.get('commit', '')[:12]}  new {new.get('commit', '')[:12]}  scale {new.get('scale')}")
+    lines, regressed = compare(base, new, args.tolerance)
+    print("\n".join(lines))
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,143 @@
+"""Timing harness for the benchmark suite.
+
+Benchmarks are skipped unless PURWAY_BENCH names a dataset scale
+(small, medium or large; "1" means small):
+
+    PURWAY_BENCH=medium python -m pytest -q tests/benchmarks
+
+Each benchmark's timings are written to one JSON file per session,
+`.benchmarks/<scale>-<commit>.json` or the path in PURWAY_BENCH_OUT; compare
+two files with `python tests/benchmarks/compare.py BASE.json NEW.json`.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict
+from datetime import datetime, timezone
+import json
+import os
+from pathlib import Path
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Iterator
+
+import pytest
+
+from synthetic_raw_data import SCALES, RawDataSpec, RawDataTree, generate_raw_data
+
+BENCH_ENV = "PURWAY_BENCH"
+BENCH_OUT_ENV = "PURWAY_BENCH_OUT"
+RESULTS_SCHEMA = 1
+ROUNDS = {"small": 5, "medium": 3, "large": 1}
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def bench_scale() -> str | None:
+    value = os.environ.get(BENCH_ENV, "").strip().lower()
+    if value in ("", "0"):
+        return None
+    return "small" if value == "1" else value
+
+
+class BenchSession:
+    """Collects per-benchmark timings and writes them as JSON at session end."""
+
+    def __init__(self, scale: str, spec: RawDataSpec) -> None:
+        self.scale = scale
+        self.spec = spec
+        self.rounds = ROUNDS.get(scale, 1)
+        self.results: dict[str, dict[str, Any]] = {}
+
+    def record(self, name: str, timings: list[float], items: int | None) -> None:
+        median = statistics.median(timings)
+        self.results[name] = {
+            "rounds": len(timings),
+            "min": min(timings),
+            "median": median,
+            "mean": statistics.fmean(timings),
+            "max": max(timings),
+            "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+            "items": items,
+            "items_per_second": items / median if items and median > 0 else None,
+        }
+
+    def to_json(self) -> dict[str, Any]:
+        commit, dirty = _git_state()
+        return {
+            "schema": RESULTS_SCHEMA,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": commit,
+            "dirty": dirty,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scale": self.scale,
+            "spec": {k: str(v) if isinstance(v, datetime) else v for k, v in asdict(self.spec).items()},
+            "benchmarks": self.results,
+        }
+
+    def write(self) -> Path:
+        commit = self.to_json()["commit"] or "nogit"
+        out = Path(os.environ.get(BENCH_OUT_ENV) or REPO_ROOT / ".benchmarks" / f"{self.scale}-{commit[:12]}.json")
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(self.to_json(), indent=2) + "\n", encoding="utf-8")
+        return out
+
+
+def _git_state() -> tuple[str, bool]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, timeout=10,
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=REPO_ROOT, capture_output=True, text=True, timeout=30,
+        ).stdout.strip())
+    except (OSError, subprocess.SubprocessError):
+        return "", False
+    return commit, dirty
+
+
+@pytest.fixture(scope="session")
+def bench_session() -> Iterator[BenchSession]:
+    scale = bench_scale()
+    if scale is None:
+        pytest.skip(f"benchmarks run only with {BENCH_ENV}=small|medium|large")
+    if scale not in SCALES:
+        pytest.fail(f"unknown {BENCH_ENV} scale {scale!r}; expected one of {sorted(SCALES)}")
+    session = BenchSession(scale, SCALES[scale])
+    yield session
+    if session.results:
+        path = session.write()
+        print(f"\nbenchmark results: {path}", file=sys.stderr)
+
+
+@pytest.fixture(scope="session")
+def raw_data(bench_session: BenchSession, tmp_path_factory: pytest.TempPathFactory) -> RawDataTree:
+    """A read-only synthetic tree shared by benchmarks that do not write next to the inputs."""
+    return generate_raw_data(tmp_path_factory.mktemp("raw_data"), bench_session.spec)
+
+
+@pytest.fixture
+def bench(request: pytest.FixtureRequest, bench_session: BenchSession) -> Callable[..., Any]:
+    """Time `fn(*setup())` for the session's number of rounds and record the result.
+
+    `setup` runs untimed before every round (e.g. to make a fresh output
+    folder); `items` is the number of photos/rows/files one round handles.
+    Returns the last round's result.
+    """
+
+    def run(fn: Callable[..., Any], *, setup: Callable[[], tuple] | None = None, items: int | None = None) -> Any:
+        timings: list[float] = []
+        result = None
+        for _ in range(bench_session.rounds):
+            args = setup() if setup is not None else ()
+            t0 = time.perf_counter()
+            result = fn(*args)
+            timings.append(time.perf_counter() - t0)
+        bench_session.record(request.node.name, timings, items)
+        return result
+
+    return run
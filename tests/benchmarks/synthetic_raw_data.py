@@ -0,0 +1,229 @@
+"""Deterministic synthetic pilot "Raw Data" trees for the benchmark suite.
+
+The layout follows PILOT_RAW_DATA_CONTEXT_AND_PLAN.md: project folders hold
+flight folders named `YYYYMMDDhhmmss_<Project>_Flight_<NN>`, each with
+`YYYYMMDD_HHMMSS.jpg` photos, a raw `methane<stamp>.csv`, a filtered
+`methane<stamp> copy.csv`, a `track<stamp>.csv` and a macOS `._` artifact.
+The same spec always produces byte-identical files.
+"""
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+import random
+import struct
+
+METHANE_FIELDS = (
+    "time", "methane_concentration", "light_intensity", "longitude", "latitude", "altitude",
+    "relative_altitude", "uav_pitch", "uav_roll", "uav_yaw", "gimbal_pitch", "gimbal_roll",
+    "gimbal_yaw", "camera_focal_length", "camera_zoom", "file_name",
+)
+TRACK_FIELDS = ("time", "longitude", "latitude", "altitude")
+PROJECTS = ("KDB 20-IN", "Marathon 12-IN", "PETTUS Loop", "Texana 6-IN", "Gregory Portland 10in")
+
+PLUME_PPM_THRESHOLD = 1000  # rows at or above this go to the "copy" CSV
+METHANE_MS_OFFSET = 149  # methane rows start .149 s past the flight stamp, as in pilot data
+TRACK_MS_OFFSET = 620
+
+
+@dataclass(frozen=True)
+class RawDataSpec:
+    projects: int = 2
+    flights_per_project: int = 2
+    photos_per_flight: int = 25
+    photo_interval_seconds: int = 4
+    csv_rows_per_second: float = 10.0  # methane CSV row rate; track CSVs are 1 Hz
+    file_name_fraction: float = 0.8  # photos named in the methane CSV; the rest join by timestamp
+    empty_flight_every: int = 4  # every Nth flight has CSVs but no JPGs (0 = never)
+    photo_padding_bytes: int = 0  # COM-segment filler per JPG, to model real file sizes
+    seed: int = 0
+    start: datetime = datetime(2026, 1, 28, 23, 57, 19)
+
+
+SCALES: dict[str, RawDataSpec] = {
+    "small": RawDataSpec(),
+    "medium": RawDataSpec(projects=3, flights_per_project=4, photos_per_flight=100, photo_padding_bytes=64 * 1024),
+    "large": RawDataSpec(projects=5, flights_per_project=4, photos_per_flight=200, photo_padding_bytes=256 * 1024),
+}
+
+
+@dataclass
+class RawDataTree:
+    root: Path
+    spec: RawDataSpec
+    photos: list[Path] = field(default_factory=list)
+    methane_csvs: list[Path] = field(default_factory=list)  # raw and "copy" CSVs
+    track_csvs: list[Path] = field(default_factory=list)
+    methane_rows: int = 0
+
+    @property
+    def csvs(self) -> list[Path]:
+        return sorted(self.methane_csvs + self.track_csvs)
+
+
+def generate_raw_data(root: Path, spec: RawDataSpec = RawDataSpec()) -> RawDataTree:
+    """Write a `Raw Data` tree under `root` and describe what was written."""
+    tree = RawDataTree(root=root / "Raw Data", spec=spec)
+    tree.root.mkdir(parents=True, exist_ok=True)
+    flight_start = spec.start
+    flight_no = 0
+    for p in range(spec.projects):
+        project = PROJECTS[p % len(PROJECTS)] + (f" {p // len(PROJECTS) + 1}" if p >= len(PROJECTS) else "")
+        short = project.split()[0]
+        for f in range(spec.flights_per_project):
+            flight_no += 1
+            rng = random.Random(spec.seed * 1_000_003 + flight_no)
+            stamp = flight_start.strftime("%Y%m%d%H%M%S")
+            folder = tree.root / project / f"{stamp}_{short}_Flight_{f + 1:02d}"
+            folder.mkdir(parents=True, exist_ok=True)
+            with_photos = not (spec.empty_flight_every and flight_no % spec.empty_flight_every == 0)
+            duration = _write_flight(tree, folder, stamp, flight_start, with_photos, rng, base=(28.9 + 0.05 * p, -97.6 - 0.05 * f))
+            flight_start += timedelta(seconds=duration + 600)
+    tree.photos.sort()
+    return tree
+
+
+def _write_flight(
+    tree: RawDataTree,
+    folder: Path,
+    stamp: str,
+    start: datetime,
+    with_photos: bool,
+    rng: random.Random,
+    base: tuple[float, float],
+) -> int:
+    spec = tree.spec
+    duration = spec.photos_per_flight * spec.photo_interval_seconds + 10
+    photo_times = [start + timedelta(seconds=5 + i * spec.photo_interval_seconds) for i in range(spec.photos_per_flight)]
+
+    step = 1.0 / spec.csv_rows_per_second
+    first = start + timedelta(milliseconds=METHANE_MS_OFFSET)
+    row_count = int(duration * spec.csv_rows_per_second)
+    named: dict[int, str] = {}
+    if with_photos:
+        for taken in photo_times:
+            photo = folder / f"{taken:%Y%m%d_%H%M%S}.jpg"
+            photo.write_bytes(jpeg_stub(taken, spec.photo_padding_bytes))
+            tree.photos.append(photo)
+            if rng.random() < spec.file_name_fraction:
+                named[round((taken - first).total_seconds() / step)] = photo.name
+
+    lat, lon = base
+    plume_left = 0
+    rows: list[dict[str, str]] = []
+    for i in range(row_count):
+        lat += 0.000004 + rng.uniform(-0.000001, 0.000001)
+        lon += 0.000003 + rng.uniform(-0.000001, 0.000001)
+        if plume_left == 0 and rng.random() < 0.01:
+            plume_left = rng.randint(5, 40)
+        if plume_left:
+            plume_left -= 1
+            ppm = rng.uniform(PLUME_PPM_THRESHOLD, 6000)
+        else:
+            ppm = max(0.0, rng.gauss(35, 12))
+        rows.append({
+            "time": _purway_time(first + timedelta(seconds=i * step)),
+            "methane_concentration": f"{ppm:.1f}",
+            "light_intensity": str(rng.randint(400, 900)),
+            "longitude": f"{lon:.7f}",
+            "latitude": f"{lat:.7f}",
+            "altitude": f"{120 + rng.uniform(-2, 2):.2f}",
+            "relative_altitude": f"{30 + rng.uniform(-1, 1):.2f}",
+            "uav_pitch": f"{rng.uniform(-5, 5):.1f}",
+            "uav_roll": f"{rng.uniform(-5, 5):.1f}",
+            "uav_yaw": f"{rng.uniform(0, 360):.1f}",
+            "gimbal_pitch": "-90.0",
+            "gimbal_roll": "0.0",
+            "gimbal_yaw": f"{rng.uniform(0, 360):.1f}",
+            "camera_focal_length": "4.5",
+            "camera_zoom": "1.0",
+            "file_name": named.get(i, ""),
+        })
+
+    methane = folder / f"methane{stamp}.csv"
+    _write_csv(methane, METHANE_FIELDS, rows)
+    copy = folder / f"methane{stamp} copy.csv"
+    _write_csv(copy, METHANE_FIELDS, [r for r in rows if float(r["methane_concentration"]) >= PLUME_PPM_THRESHOLD])
+    tree.methane_csvs += [methane, copy]
+    tree.methane_rows += len(rows)
+
+    track = folder / f"track{stamp}.csv"
+    t0 = start + timedelta(milliseconds=TRACK_MS_OFFSET)
+    _write_csv(track, TRACK_FIELDS, [
+        {
+            "time": _purway_time(t0 + timedelta(seconds=s)),
+            "longitude": rows[min(int(s * spec.csv_rows_per_second), row_count - 1)]["longitude"],
+            "latitude": rows[min(int(s * spec.csv_rows_per_second), row_count - 1)]["latitude"],
+            "altitude": "120.00",
+        }
+        for s in range(duration)
+    ])
+    tree.track_csvs.append(track)
+
+    # macOS AppleDouble resource fork: binary, not UTF-8; the scanner must skip it.
+    (folder / f"._methane{stamp} copy.csv").write_bytes(b"\x00\x05\x16\x07\x00\x02\x00\x00Mac OS X        \xff\xfe")
+    return duration
+
+
+def _write_csv(path: Path, fields: tuple[str, ...], rows: list[dict[str, str]]) -> None:
+    with path.open("w", encoding="utf-8", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=fields)
+        w.writeheader()
+        w.writerows(rows)
+
+
+def _purway_time(dt: datetime) -> str:
+    """Purway's `YYYY-MM-DD_HH:MM:SS:ms` timestamp."""
+    return f"{dt:%Y-%m-%d_%H:%M:%S}:{dt.microsecond // 1000:03d}"
+
+
+def jpeg_stub(taken: datetime, padding_bytes: int = 0) -> bytes:
+    """A decodable 8x8 grey baseline JPEG with an Exif APP1 carrying `taken`.
+
+    The Exif block has the usual IFD0 -> Exif IFD layout (Make, Model,
+    DateTimeOriginal, CreateDate), so ExifTool can read and rewrite it.
+    `padding_bytes` of COM segments pad the file to a realistic size.
+    """
+    exif_time = taken.strftime("%Y:%m:%d %H:%M:%S").encode("ascii") + b"\x00"
+    ifd0 = [(0x010F, 2, b"Purway\x00"), (0x0110, 2, b"CH4 Model III\x00"), (0x8769, 4, b"")]
+    exif_ifd = [(0x9003, 2, exif_time), (0x9004, 2, exif_time)]
+    ifd0_len = len(_tiff_ifd(ifd0, 8))
+    ifd0[2] = (0x8769, 4, struct.pack("<I", 8 + ifd0_len))
+    tiff = b"II*\x00" + struct.pack("<I", 8) + _tiff_ifd(ifd0, 8) + _tiff_ifd(exif_ifd, 8 + ifd0_len)
+
+    out = bytearray(b"\xff\xd8")
+    out += _segment(0xE1, b"Exif\x00\x00" + tiff)
+    while padding_bytes > 0:
+        chunk = min(padding_bytes, 65533)
+        out += _segment(0xFE, b"\x00" * chunk)
+        padding_bytes -= chunk
+    out += _segment(0xDB, b"\x00" + b"\x01" * 64)  # quantization table 0, all ones
+    out += _segment(0xC0, b"\x08\x00\x08\x00\x08\x01\x01\x11\x00")  # 8x8, one component
+    one_code = b"\x01" + b"\x00" * 15 + b"\x00"  # a single 1-bit code for symbol 0
+    out += _segment(0xC4, b"\x00" + one_code)  # DC table 0
+    out += _segment(0xC4, b"\x10" + one_code)  # AC table 0 (symbol 0 = EOB)
+    out += _segment(0xDA, b"\x01\x01\x00\x00\x3f\x00")
+    out += b"\x3f"  # DC diff 0, EOB, padded with ones
+    out += b"\xff\xd9"
+    return bytes(out)
+
+
+def _segment(marker: int, payload: bytes) -> bytes:
+    return bytes((0xFF, marker)) + struct.pack(">H", len(payload) + 2) + payload
+
+
+def _tiff_ifd(entries: list[tuple[int, int, bytes]], offset: int) -> bytes:
+    """One little-endian IFD at `offset` (from the TIFF header), values > 4 bytes after it."""
+    head = struct.pack("<H", len(entries))
+    data = b""
+    data_at = offset + 2 + 12 * len(entries) + 4
+    for tag, kind, value in entries:
+        count = len(value) if kind == 2 else 1
+        if len(value) <= 4:
+            head += struct.pack("<HHI", tag, kind, count) + value.ljust(4, b"\x00")
+        else:
+            head += struct.pack("<HHII", tag, kind, count, data_at + len(data))
+            data += value + (b"\x00" if len(value) % 2 else b"")
+    return head + struct.pack("<I", 0) + data
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import csv
+from itertools import count
+from pathlib import Path
+import shutil
+import subprocess
+
+import pytest
+
+from purway_geotagger.core.job import Job, JobOptions
+from purway_geotagger.core.modes import RunMode
+from purway_geotagger.core.pipeline import run_job
+from purway_geotagger.core.scanner import scan_inputs
+from purway_geotagger.ops.copier import ensure_target_photos
+from purway_geotagger.ops.methane_outputs import build_photo_name_index, generate_methane_outputs
+from purway_geotagger.parsers.purway_csv import PurwayCSVIndex
+from purway_geotagger.templates.models import RenameTemplate
+from purway_geotagger.util.errors import CorrelationError
+
+from synthetic_raw_data import RawDataTree, generate_raw_data
+
+_runs = count(1)
+
+
+class StubExifTool:
+    """In-process stand-in for ExifToolSession.
+
+    Records the GPS values of each import CSV and answers the verification
+    read-back from them, so run_job is timed without a Perl process.
+    """
+
+    def __init__(self) -> None:
+        self.gps: dict[str, dict[str, str]] = {}
+
+    def execute(self, args: list[str]) -> subprocess.CompletedProcess[str]:
+        import_csv = next((a[len("-csv="):] for a in args if a.startswith("-csv=")), None)
+        if import_csv is not None:
+            with open(import_csv, encoding="utf-8", newline="") as f:
+                for row in csv.DictReader(f):
+                    self.gps[row["SourceFile"]] = row
+            return subprocess.CompletedProcess(args, 0, "", "")
+        fields = ["SourceFile", "GPSLatitude", "GPSLongitude", "GPSLatitudeRef", "GPSLongitudeRef"]
+        lines = [",".join(fields)]
+        for src in (a for a in args if not a.startswith("-")):
+            row = self.gps.get(src, {})
+            lines.append(",".join([src, *(row.get(k, "") for k in fields[1:])]))
+        return subprocess.CompletedProcess(args, 0, "\n".join(lines) + "\n", "")
+
+
+def _fresh(tmp_path: Path, name: str) -> Path:
+    path = tmp_path / f"{name}_{next(_runs)}"
+    path.mkdir()
+    return path
+
+
+def test_scan_inputs(bench, raw_data: RawDataTree) -> None:
+    scan = bench(lambda: scan_inputs([raw_data.root]), items=len(raw_data.photos) + len(raw_data.csvs))
+    assert len(scan.photos) == len(raw_data.photos)
+    assert scan.csvs == raw_data.csvs  # the `._` artifacts are skipped
+
+
+def test_csv_index_from_csv_files(bench, raw_data: RawDataTree) -> None:
+    index = bench(lambda: PurwayCSVIndex.from_csv_files(raw_data.csvs), items=len(raw_data.csvs))
+    assert len(index.records) >= raw_data.methane_rows
+
+
+def test_match_photo(bench, raw_data: RawDataTree) -> None:
+    index = PurwayCSVIndex.from_csv_files(raw_data.csvs)
+
+    def match_all() -> int:
+        matched = 0
+        for photo in raw_data.photos:
+            try:
+                index.match_photo(photo, max_join_delta_seconds=3)
+                matched += 1
+            except CorrelationError:
+                pass
+        return matched
+
+    assert bench(match_all, items=len(raw_data.photos)) > 0
+
+
+def test_generate_methane_outputs(bench, bench_session, tmp_path: Path) -> None:
+    tree = generate_raw_data(tmp_path, bench_session.spec)
+    photo_index = build_photo_name_index(tree.photos, folders=[c.parent for c in tree.methane_csvs])
+    results = bench(
+        lambda: generate_methane_outputs(
+            tree.methane_csvs, threshold=1000, generate_kmz=True, photo_index=photo_index,
+        ),
+        items=len(tree.methane_csvs),
+    )
+    assert len(results) == len(tree.methane_csvs)
+
+
+def test_ensure_target_photos(bench, raw_data: RawDataTree, tmp_path: Path) -> None:
+    mapping = bench(
+        lambda run_folder: ensure_target_photos(
+            raw_data.photos, run_folder, overwrite=False, create_backup_on_overwrite=False,
+        ),
+        setup=lambda: (_fresh(tmp_path, "run"),),
+        items=len(raw_data.photos),
+    )
+    assert len(mapping) == len(raw_data.photos)
+
+
+@pytest.mark.parametrize("pipelined", [False, True], ids=["staged", "pipelined"])
+def test_run_job_end_to_end(bench, bench_session, tmp_path: Path, pipelined: bool) -> None:
+    pristine = generate_raw_data(tmp_path / "pristine", bench_session.spec)
+    template = RenameTemplate(
+        id="bench", name="bench", client="ACME", pattern="{client}_{index:04d}_{ppm}ppm", description="",
+    )
+
+    def setup() -> tuple[Job]:
+        work = _fresh(tmp_path, "job")
+        inputs = work / "Raw Data"
+        shutil.copytree(pristine.root, inputs)
+        opts = JobOptions(
+            output_root=work / "PurwayGeotagger_BENCH",
+            overwrite_originals=True,
+            create_backup_on_overwrite=True,
+            flatten=False,
+            cleanup_empty_dirs=False,
+            sort_by_ppm=False,
+            ppm_bin_edges=[0, 1000, 2000],
+            write_xmp=True,
+            dry_run=False,
+            max_join_delta_seconds=3,
+            purway_payload="",
+            enable_renaming=True,
+            rename_template=template,
+            start_index=1,
+            run_mode=RunMode.COMBINED,
+            output_photos_root=work / "Encroachment",
+            pipelined=pipelined,
+        )
+        return (Job(id="bench", name="bench", inputs=[inputs], options=opts),)
+
+    def run(job: Job) -> Job:
+        run_job(job, progress_cb=lambda *_: None, cancel_cb=lambda: False, exiftool_session=StubExifTool())
+        return job
+
+    job = bench(run, setup=setup, items=len(pristine.photos))
+    assert job.state.scanned_photos == len(pristine.photos)
+    assert job.state.success > 0
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+import struct
+
+from purway_geotagger.core.scanner import scan_inputs
+from purway_geotagger.parsers.purway_csv import PurwayCSVIndex
+
+from compare import compare
+from synthetic_raw_data import RawDataSpec, generate_raw_data, jpeg_stub
+
+
+def _exif_tags(jpeg: bytes) -> dict[int, bytes]:
+    """ASCII tags of IFD0 and the Exif IFD of a little-endian Exif APP1."""
+    assert jpeg[:2] == b"\xff\xd8"
+    assert jpeg[2:4] == b"\xff\xe1"
+    assert jpeg[6:12] == b"Exif\x00\x00"
+    tiff = jpeg[12:]
+    assert tiff[:4] == b"II*\x00"
+    tags: dict[int, bytes] = {}
+    ifds = [struct.unpack_from("<I", tiff, 4)[0]]
+    while ifds:
+        at = ifds.pop()
+        for i in range(struct.unpack_from("<H", tiff, at)[0]):
+            tag, kind, n, value = struct.unpack_from("<HHII", tiff, at + 2 + 12 * i)
+            if tag == 0x8769:
+                ifds.append(value)
+            elif kind == 2:
+                tags[tag] = tiff[value:value + n] if n > 4 else tiff[at + 10 + 12 * i:at + 10 + 12 * i + n]
+    return tags
+
+
+def test_jpeg_stub_carries_exif_datetime_and_padding() -> None:
+    taken = datetime(2026, 1, 28, 23, 57, 25)
+    stub = jpeg_stub(taken)
+    assert stub.endswith(b"\xff\xd9")
+    tags = _exif_tags(stub)
+    assert tags[0x9003] == b"2026:01:28 23:57:25\x00"
+    assert tags[0x010F] == b"Purway\x00"
+    assert len(jpeg_stub(taken, padding_bytes=100_000)) >= len(stub) + 100_000
+
+
+def test_generated_tree_is_deterministic_and_parseable(tmp_path: Path) -> None:
+    spec = RawDataSpec(projects=1, flights_per_project=2, photos_per_flight=5, empty_flight_every=2)
+    a = generate_raw_data(tmp_path / "a", spec)
+    b = generate_raw_data(tmp_path / "b", spec)
+    for x, y in zip(a.photos + a.csvs, b.photos + b.csvs):
+        assert x.relative_to(a.root) == y.relative_to(b.root)
+        assert x.read_bytes() == y.read_bytes()
+
+    assert len(a.photos) == 5  # the second flight has CSVs only
+    assert a.photos[0].parent.name.endswith("_KDB_Flight_01")
+    assert a.photos[0].name == "20260128_235724.jpg"
+    scan = scan_inputs([a.root])
+    assert scan.csvs == a.csvs
+    assert len(list(a.root.rglob("._*"))) == 2
+
+    index = PurwayCSVIndex.from_csv_files(a.methane_csvs)
+    assert len(index.records) >= a.methane_rows
+    assert index.records[0].timestamp_raw == "2026-01-28_23:57:19:149"
+    named = [p for p in a.photos if p.name in index.by_photo]
+    assert named
+    assert index.match_photo(named[0], max_join_delta_seconds=3).join_method == "FILENAME"
+
+
+def test_compare_flags_regressions() -> None:
+    base = {"benchmarks": {"a": {"median": 1.0}, "b": {"median": 1.0}, "gone": {"median": 1.0}}}
+    new = {"benchmarks": {"a": {"median": 1.1}, "b": {"median": 1.5}, "added": {"median": 1.0}}}
+    lines, regressed = compare(base, new, tolerance=0.15)
+    assert regressed == ["b"]
+    assert any("only in base" in line for line in lines)
+    assert any("only in new" in line for line in lines)
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from pathlib import Path
+import csv
+
+import pytest
+
+from purway_geotagger.core import pipelined
+from purway_geotagger.core.checkpoint import CHECKPOINT_NAME, CheckpointJournal, load_checkpoint
+from purway_geotagger.core.job import Job, JobOptions
+from purway_geotagger.core.photo_task import PhotoTask
+from purway_geotagger.core.pipeline import resume_job, run_job
+from purway_geotagger.ops import copier
+from purway_geotagger.util.errors import ResumeError, UserCancelledError
+
+
+def _make_inputs(root: Path, photos: int) -> Path:
+    input_dir = root / "input"
+    input_dir.mkdir()
+    lines = ["Latitude,Longitude,PPM,Photo"]
+    for i in range(photos):
+        (input_dir / f"IMG_{i:04d}.jpg").write_text("x" * (100 + i), encoding="utf-8")
+        if i % 5:  # every fifth photo has no CSV row
+            lines.append(f"1.{i},2.{i},{1000 + i},IMG_{i:04d}.jpg")
+    (input_dir / "data.csv").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return input_dir
+
+
+def _job(input_dir: Path, run_folder: Path, pipelined_mode: bool = True) -> Job:
+    opts = JobOptions(
+        output_root=run_folder,
+        overwrite_originals=False,
+        create_backup_on_overwrite=True,
+        flatten=False,
+        cleanup_empty_dirs=False,
+        sort_by_ppm=False,
+        ppm_bin_edges=[0, 1000],
+        write_xmp=True,
+        dry_run=True,
+        max_join_delta_seconds=3,
+        purway_payload="",
+        enable_renaming=False,
+        rename_template=None,
+        start_index=1,
+        pipelined=pipelined_mode,
+    )
+    return Job(id="job-1", name="Job 1", inputs=[input_dir], options=opts)
+
+
+def _manifest(run_folder: Path) -> list[tuple[str, str, str]]:
+    with (run_folder / "manifest.csv").open(encoding="utf-8", newline="") as f:
+        return sorted((Path(r["source_path"]).name, Path(r["output_path"]).name, r["status"]) for r in csv.DictReader(f))
+
+
+def _cancel_after_batches(batches: int):
+    seen = {"n": 0}
+
+    def _progress(_pct: int, msg: str) -> None:
+        if "overlapped" in msg:
+            seen["n"] += 1
+
+    return _progress, lambda: seen["n"] >= batches
+
+
+def test_resume_finishes_cancelled_run_without_redoing_work(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(pipelined, "WRITE_BATCH_SIZE", 4)
+    input_dir = _make_inputs(tmp_path, 30)
+
+    reference = tmp_path / "reference"
+    run_job(_job(input_dir, reference), progress_cb=lambda *_: None, cancel_cb=lambda: False)
+
+    run_folder = tmp_path / "run"
+    progress, cancel = _cancel_after_batches(2)
+    with pytest.raises(UserCancelledError):
+        run_job(_job(input_dir, run_folder), progress_cb=progress, cancel_cb=cancel)
+    done_before = len(load_checkpoint(run_folder / CHECKPOINT_NAME).done)
+    assert 0 < done_before < 30
+
+    job = resume_job(run_folder, progress_cb=lambda *_: None, cancel_cb=lambda: False)
+
+    assert job.state.stage == "DONE"
+    assert (job.state.success, job.state.failed) == (24, 6)
+    assert _manifest(run_folder) == _manifest(reference)
+    assert not list((run_folder / "GEOTAGGED").glob("*_dup*"))
+    log = (run_folder / "run_log.txt").read_text(encoding="utf-8")
+    assert "Job resumed from checkpoint." in log
+    assert f"Checkpoint: {done_before} photos done" in log
+
+
+def test_resume_recopies_damaged_partial_copy(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(pipelined, "WRITE_BATCH_SIZE", 4)
+    input_dir = _make_inputs(tmp_path, 12)
+    run_folder = tmp_path / "run"
+    progress, cancel = _cancel_after_batches(1)
+    with pytest.raises(UserCancelledError):
+        run_job(_job(input_dir, run_folder), progress_cb=progress, cancel_cb=cancel)
+
+    state = load_checkpoint(run_folder / CHECKPOINT_NAME)
+    src, rec = next(iter(state.done.items()))
+    Path(rec["task"]["output_path"]).write_text("x", encoding="utf-8")  # truncated copy
+
+    resume_job(run_folder, progress_cb=lambda *_: None, cancel_cb=lambda: False)
+
+    copy = run_folder / "GEOTAGGED" / Path(src).name
+    assert copy.read_bytes() == Path(src).read_bytes()
+    assert not list((run_folder / "GEOTAGGED").glob("*_dup*"))
+
+
+class _Killed(BaseException):
+    """Stands in for the process being killed; not caught like an Exception."""
+
+
+def test_copy_killed_midway_leaves_no_truncated_target(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    input_dir = _make_inputs(tmp_path, 6)
+    run_folder = tmp_path / "run"
+    real_copy2 = copier.shutil.copy2
+    calls = {"n": 0}
+
+    def _dying_copy2(src: Path, dst: Path) -> None:
+        calls["n"] += 1
+        if calls["n"] == 4:
+            Path(dst).write_bytes(Path(src).read_bytes()[:10])
+            raise _Killed
+        real_copy2(src, dst)
+
+    monkeypatch.setattr(copier.shutil, "copy2", _dying_copy2)
+    with pytest.raises(_Killed):
+        run_job(_job(input_dir, run_folder, pipelined_mode=False), progress_cb=lambda *_: None, cancel_cb=lambda: False)
+    monkeypatch.setattr(copier.shutil, "copy2", real_copy2)
+
+    geotagged = run_folder / "GEOTAGGED"
+    assert len(load_checkpoint(run_folder / CHECKPOINT_NAME).prepared) == 3
+    assert sorted(p.name for p in geotagged.iterdir()) == ["IMG_0000.jpg", "IMG_0001.jpg", "IMG_0002.jpg"]
+
+    resume_job(run_folder, progress_cb=lambda *_: None, cancel_cb=lambda: False)
+
+    assert sorted(p.name for p in geotagged.iterdir()) == [f"IMG_{i:04d}.jpg" for i in range(6)]
+    for copy in geotagged.iterdir():
+        assert copy.read_bytes() == (input_dir / copy.name).read_bytes()
+
+
+def test_resume_sequential_run_and_reject_finished_run(tmp_path: Path) -> None:
+    input_dir = _make_inputs(tmp_path, 6)
+    run_folder = tmp_path / "run"
+    calls = {"n": 0}
+
+    def _cancel() -> bool:
+        calls["n"] += 1
+        return calls["n"] > 4  # during MATCH, after the copies are journaled
+
+    with pytest.raises(UserCancelledError):
+        run_job(_job(input_dir, run_folder, pipelined_mode=False), progress_cb=lambda *_: None, cancel_cb=_cancel)
+    assert len(load_checkpoint(run_folder / CHECKPOINT_NAME).prepared) == 6
+
+    job = resume_job(run_folder, progress_cb=lambda *_: None, cancel_cb=lambda: False)
+    assert (job.state.success, job.state.failed) == (4, 2)
+    assert len(list((run_folder / "GEOTAGGED").iterdir())) == 6
+
+    with pytest.raises(ResumeError, match="already finished"):
+        resume_job(run_folder, progress_cb=lambda *_: None, cancel_cb=lambda: False)
+
+
+def test_load_checkpoint_ignores_truncated_last_line(tmp_path: Path) -> None:
+    path = tmp_path / CHECKPOINT_NAME
+    journal = CheckpointJournal(path)
+    journal.stage_done("SCAN")
+    task = PhotoTask(src_path=tmp_path / "a.jpg", work_path=tmp_path / "a.jpg", output_path=tmp_path / "a.jpg")
+    task.status = "SUCCESS"
+    task.matched = True
+    task.lat = 1.5
+    journal.photos_done([task])
+    journal.close()
+    with path.open("a", encoding="utf-8") as f:
+        f.write('{"type": "done", "task": {"src_pa')
+
+    state = load_checkpoint(path)
+    assert state.completed == {"SCAN"}
+    assert list(state.done) == [str(tmp_path / "a.jpg")]
+    assert state.done[str(tmp_path / "a.jpg")]["task"]["lat"] == 1.5
+
+
+def test_load_checkpoint_missing_journal(tmp_path: Path) -> None:
+    with pytest.raises(ResumeError):
+        load_checkpoint(tmp_path / CHECKPOINT_NAME)
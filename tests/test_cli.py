@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("appdirs")
+
+from purway_geotagger import cli
+from purway_geotagger.core.settings import AppSettings
+
+
+@pytest.fixture(autouse=True)
+def default_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(AppSettings, "load", classmethod(lambda cls: cls()))
+
+
+def _make_inputs(root: Path, name: str, photos: int = 4) -> Path:
+    input_dir = root / name
+    input_dir.mkdir(parents=True)
+    lines = ["Latitude,Longitude,PPM,Photo"]
+    for i in range(photos):
+        (input_dir / f"{name}_{i}.jpg").write_text("x", encoding="utf-8")
+        if i:
+            lines.append(f"1.{i},2.{i},{1000 + i},{name}_{i}.jpg")
+    (input_dir / "data.csv").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return input_dir
+
+
+def _events(text: str) -> list[dict]:
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def test_import_does_not_load_qt_or_pipeline() -> None:
+    repo_root = Path(__file__).resolve().parents[1]
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(repo_root / "src")
+    code = (
+        "import sys, purway_geotagger.cli; "
+        "print(sorted(m for m in sys.modules if m.startswith(('PySide6', 'numpy', 'purway_geotagger.core'))))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+def test_encroachment_per_input_runs_each_root(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    a = _make_inputs(tmp_path, "A")
+    b = _make_inputs(tmp_path, "B")
+    out_dir = tmp_path / "out"
+
+    code = cli.main([
+        "encroachment", str(a), str(b), "--per-input", "--jobs", "2",
+        "--out", str(out_dir), "--dry-run", "--json",
+    ])
+
+    assert code == cli.EXIT_OK
+    events = _events(capsys.readouterr().out)
+    done = [e for e in events if e["event"] == "done"]
+    assert sorted(e["name"] for e in done) == ["A", "B"]
+    assert all((e["success"], e["failed"]) == (3, 1) for e in done)
+    assert len({e["run_folder"] for e in done}) == 2
+    for e in done:
+        assert (Path(e["run_folder"]) / "manifest.csv").exists()
+    assert any(e["event"] == "progress" for e in events)
+
+
+def test_per_input_validates_every_root_before_creating_run_folders(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    a = _make_inputs(tmp_path, "A")
+    out_dir = tmp_path / "out"
+
+    code = cli.main(["encroachment", str(a), str(tmp_path / "missing"), "--per-input", "--out", str(out_dir)])
+
+    assert code == cli.EXIT_USAGE
+    assert "Input not found" in capsys.readouterr().err
+    assert not list(out_dir.rglob("PurwayGeotagger_*"))
+
+
+def test_text_output_and_failed_exit_code(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    a = _make_inputs(tmp_path, "A")
+    code = cli.main(["encroachment", str(a), "--out", str(tmp_path / "out"), "--dry-run", "--template", "nope"])
+    assert code == cli.EXIT_USAGE
+    assert "Unknown rename template" in capsys.readouterr().err
+
+    code = cli.main(["encroachment", str(a), "--out", str(tmp_path / "out"), "--dry-run", "--client", "AB"])
+    text = capsys.readouterr().out
+    assert code == cli.EXIT_OK
+    assert "[A] done: 3 written, 1 failed ->" in text
+
+
+def test_preview_json(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    a = _make_inputs(tmp_path, "A")
+    assert cli.main(["preview", str(a), "--json"]) == cli.EXIT_OK
+    events = _events(capsys.readouterr().out)
+    assert [e["status"] for e in events if e["event"] == "preview_row"].count("MATCHED") == 3
+    assert events[-1] == {"event": "preview", "photos": 4, "csvs": 1, "rows": 4, "matched": 3}
+
+
+def test_resume_reports_unresumable_runs(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    a = _make_inputs(tmp_path, "A")
+    assert cli.main(["encroachment", str(a), "--out", str(tmp_path / "out"), "--dry-run", "--json"]) == cli.EXIT_OK
+    run_folder = Path(next(e for e in _events(capsys.readouterr().out) if e["event"] == "done")["run_folder"])
+
+    code = cli.main(["resume", str(run_folder), str(tmp_path / "missing"), "--json"])
+
+    assert code == cli.EXIT_FAILED
+    events = [e for e in _events(capsys.readouterr().out) if e["event"] == "failed"]
+    assert len(events) == 2
+    assert any("already finished" in e["error"] for e in events)
+
+
+def test_wind_rejects_bad_row(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    code = cli.main([
+        "wind", "--client", "Acme", "--system", "S1", "--date", "2025-06-01",
+        "--start", "10:00,SW,5", "--end", "11:00,SW,5,10,75", "--out", str(tmp_path),
+    ])
+    assert code == cli.EXIT_USAGE
+    assert "--start must be TIME,DIRECTION,SPEED,GUST,TEMP" in capsys.readouterr().err
@@ -28,7 +28,7 @@ from PySide6.QtWidgets import QApplication
 from purway_geotagger.core.settings import AppSettings
 from purway_geotagger.core.modes import RunMode
 from purway_geotagger.gui.controllers import JobController
-from purway_geotagger.gui.mode_state import ModeState
+from purway_geotagger.core.mode_state import ModeState
 import purway_geotagger.gui.pages.methane_page as methane_mod
 
 app = QApplication([])
@@ -108,7 +108,7 @@ from PySide6.QtWidgets import QApplication
 from purway_geotagger.core.settings import AppSettings
 from purway_geotagger.core.modes import RunMode
 from purway_geotagger.gui.controllers import JobController
-from purway_geotagger.gui.mode_state import ModeState
+from purway_geotagger.core.mode_state import ModeState
 import purway_geotagger.gui.pages.combined_wizard as combined_mod
 
 app = QApplication([])
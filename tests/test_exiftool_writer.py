@@ -2,11 +2,13 @@ from __future__ import annotations
 
 from pathlib import Path
 import csv
+import sys
 
 import pytest
 
 from purway_geotagger.core.photo_task import PhotoTask
 from purway_geotagger.exif.exiftool_writer import (
+    ExifToolSession,
     ExifToolWriter,
     ExifWriteResult,
     _gps_lat_ref,
@@ -171,3 +173,70 @@ def test_resolve_exiftool_path_prefers_pyinstaller_resource_bin(
 
     resolved = _resolve_exiftool_path()
     assert resolved == str(bundled)
+
+
+_FAKE_STAY_OPEN = """
+import sys
+args = []
+for line in sys.stdin:
+    arg = line.rstrip("\\n")
+    if arg == "False" and args == ["-stay_open"]:
+        break
+    if not arg.startswith("-execute"):
+        args.append(arg)
+        continue
+    marker = args[args.index("-echo4") + 1]
+    work = [a for a in args if a not in ("-echo4", marker)]
+    if "-fail" in work:
+        print("Error: boom", file=sys.stderr)
+    else:
+        print("ran", *work)
+    print(marker, file=sys.stderr, flush=True)
+    print("{ready%s}" % arg[len("-execute"):], flush=True)
+    args = []
+"""
+
+
+def test_session_reuses_one_stay_open_process(tmp_path: Path) -> None:
+    fake = tmp_path / "exiftool"
+    fake.write_text(f"#!{sys.executable}\n{_FAKE_STAY_OPEN}", encoding="utf-8")
+    fake.chmod(0o755)
+
+    with ExifToolSession(str(fake)) as session:
+        first = session.execute(["-ver"])
+        pid = session._proc.pid
+        second = session.execute(["-csv", "a.jpg"])
+        failed = session.execute(["-fail"])
+        assert session._proc.pid == pid
+        proc = session._proc
+
+    assert (first.returncode, first.stdout) == (0, "ran -ver\n")
+    assert second.stdout == "ran -csv a.jpg\n"
+    assert (failed.returncode, failed.stderr) == (1, "Error: boom\n")
+    assert proc.poll() == 0
+
+
+def test_writer_uses_session_instead_of_subprocess(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    photo = tmp_path / "a.jpg"
+    photo.write_bytes(b"x")
+    task = PhotoTask(src_path=photo, work_path=photo, output_path=photo, matched=True)
+    task.lat, task.lon = 1.0, 2.0
+    calls: list[list[str]] = []
+
+    class _Session:
+        def execute(self, args: list[str]) -> _Proc:
+            calls.append(args)
+            if args[0] == "-csv":
+                return _Proc(stdout=f"SourceFile,GPSLatitude,GPSLongitude,GPSLatitudeRef,GPSLongitudeRef\n{photo.resolve()},1,2,N,E\n")
+            return _Proc()
+
+    def fail_run(*_args, **_kwargs):
+        raise AssertionError("subprocess.run should not be called with a session")
+
+    monkeypatch.setattr("purway_geotagger.exif.exiftool_writer.subprocess.run", fail_run)
+    writer = ExifToolWriter(write_xmp=False, dry_run=False, session=_Session())
+    results = writer.write_tasks([task], tmp_path, progress_cb=lambda _d, _t: None, cancel_cb=lambda: False)
+
+    assert results[photo].success
+    assert calls[0][0] == "-overwrite_original"
+    assert "-config" not in calls[0]
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from pathlib import Path
+import csv
+import json
+import sqlite3
+
+from purway_geotagger.ops.geo_exports import geo_export_path
+from purway_geotagger.ops.methane_outputs import cleaned_csv_path, generate_methane_outputs
+
+
+def _write_csv(path: Path) -> None:
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["latitude", "longitude", "ppm", "note"])
+        writer.writerow(["30.5", "-97.25", "1200", "a"])
+        writer.writerow(["30.75", "-97.5", "1500", ""])
+        writer.writerow(["bad", "-97.5", "1600", "no coords"])
+        writer.writerow(["30.0", "-97.0", "500", "below threshold"])
+
+
+def test_geojson_outputs_follow_cleaned_csv_name(tmp_path: Path) -> None:
+    src = tmp_path / "flight.csv"
+    _write_csv(src)
+
+    res = generate_methane_outputs(
+        [src], threshold=1000, generate_kmz=False, export_formats=["geojson", "geojsonl"]
+    )[0]
+    cleaned = cleaned_csv_path(src, 1000)
+    assert res.exports == {
+        "geojson": geo_export_path(cleaned, "geojson"),
+        "geojsonl": geo_export_path(cleaned, "geojsonl"),
+    }
+    assert res.exports["geojson"].name == "flight_Cleaned_1000-PPM.geojson"
+
+    collection = json.loads(res.exports["geojson"].read_text(encoding="utf-8"))
+    assert collection["type"] == "FeatureCollection"
+    assert [f["geometry"]["coordinates"] for f in collection["features"]] == [[-97.25, 30.5], [-97.5, 30.75]]
+    assert collection["features"][0]["properties"] == {"ppm": 1200.0, "note": "a"}
+
+    lines = res.exports["geojsonl"].read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["properties"]["ppm"] for line in lines] == [1200.0, 1500.0]
+
+
+def test_geopackage_has_contents_and_rtree(tmp_path: Path) -> None:
+    src = tmp_path / "flight.csv"
+    _write_csv(src)
+
+    res = generate_methane_outputs([src], threshold=1000, generate_kmz=False, export_formats=["gpkg"])[0]
+    gpkg = res.exports["gpkg"]
+    assert not res.export_errors
+
+    conn = sqlite3.connect(str(gpkg))
+    try:
+        assert conn.execute("PRAGMA application_id").fetchone()[0] == 0x47504B47
+        contents = conn.execute("SELECT table_name, data_type, srs_id, min_x, max_y FROM gpkg_contents").fetchall()
+        assert contents == [("detections", "features", 4326, -97.5, 30.75)]
+        ext = conn.execute("SELECT extension_name FROM gpkg_extensions").fetchall()
+        assert ext == [("gpkg_rtree_index",)]
+        rows = conn.execute(
+            "SELECT d.ppm, d.note FROM detections d JOIN rtree_detections_geom r ON r.id = d.fid "
+            "WHERE r.minx >= -97.3 AND r.maxx <= -97.2"
+        ).fetchall()
+        assert rows == [(1200.0, "a")]
+        blob = conn.execute("SELECT geom FROM detections ORDER BY fid LIMIT 1").fetchone()[0]
+        assert blob[:2] == b"GP"
+    finally:
+        conn.close()
+
+
+def test_geoparquet_skipped_or_written(tmp_path: Path) -> None:
+    src = tmp_path / "flight.csv"
+    _write_csv(src)
+
+    res = generate_methane_outputs([src], threshold=1000, generate_kmz=False, export_formats=["geoparquet"])[0]
+    assert not res.export_errors
+    try:
+        import pyarrow.parquet as pq
+    except ModuleNotFoundError:
+        assert "geoparquet" in res.export_skipped
+        return
+
+    table = pq.read_table(res.exports["geoparquet"])
+    assert table.column_names == ["ppm", "note", "geometry"]
+    assert table.num_rows == 2
+    geo = json.loads(table.schema.metadata[b"geo"])
+    assert geo["primary_column"] == "geometry"
+    assert geo["columns"]["geometry"]["encoding"] == "WKB"
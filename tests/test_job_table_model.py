@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+
+def test_job_table_updates_rows_incrementally_and_coalesces_progress(tmp_path: Path) -> None:
+    repo_root = Path(__file__).resolve().parents[1]
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(repo_root / "src")
+    env["QT_QPA_PLATFORM"] = "offscreen"
+
+    script = f"""
+import time
+from pathlib import Path
+from PySide6.QtWidgets import QApplication
+from purway_geotagger.core.job import JobOptions
+from purway_geotagger.core.progress import ProgressEvent
+from purway_geotagger.core.settings import AppSettings
+from purway_geotagger.gui.controllers import JobController, UPDATE_INTERVAL_MS
+from purway_geotagger.gui.models.job_table_model import JobTableModel, STATE_COLUMNS
+from purway_geotagger.gui.models.jobs_filter_proxy_model import JobsFilterProxyModel
+
+app = QApplication([])
+controller = JobController(AppSettings())
+controller._dispatch = lambda: None  # keep jobs queued; no worker threads
+model = JobTableModel(controller)
+proxy = JobsFilterProxyModel()
+proxy.setSourceModel(model)
+proxy.set_recent_limit(2)
+
+events = {{"inserted": [], "changed": [], "layout": 0, "updated": 0}}
+model.rowsInserted.connect(lambda _p, first, last: events["inserted"].append((first, last)))
+model.dataChanged.connect(lambda a, b, _r: events["changed"].append((a.row(), a.column(), b.column())))
+model.layoutChanged.connect(lambda: events.__setitem__("layout", events["layout"] + 1))
+controller.job_updated.connect(lambda _job: events.__setitem__("updated", events["updated"] + 1))
+
+def options(i):
+    return JobOptions(
+        output_root=Path(r"{tmp_path}") / f"run{{i}}", overwrite_originals=False, create_backup_on_overwrite=True,
+        flatten=False, cleanup_empty_dirs=False, sort_by_ppm=False, ppm_bin_edges=[0], write_xmp=True,
+        dry_run=True, max_join_delta_seconds=3, purway_payload="", enable_renaming=False,
+        rename_template=None, start_index=1,
+    )
+
+jobs = [controller._enqueue_job(options(i), [], None) for i in range(3)]
+assert events["inserted"] == [(0, 0), (1, 1), (2, 2)], events
+assert model.rowCount() == 3 and proxy.rowCount() == 2
+
+for pct in range(50):
+    controller._on_progress(jobs[1], ProgressEvent(pct, f"step {{pct}}", "MATCH"), None)
+assert events["updated"] == 0
+deadline = time.monotonic() + 2
+while events["updated"] == 0 and time.monotonic() < deadline:
+    app.processEvents()
+    time.sleep(UPDATE_INTERVAL_MS / 5000)
+assert events["updated"] == 1, events
+assert events["changed"] == [(1, STATE_COLUMNS[0], STATE_COLUMNS[1])], events
+assert model.data(model.index(1, 12)) == "step 49"
+
+controller.cancel_job(jobs[2])
+assert events["updated"] == 2 and events["changed"][-1][0] == 2
+assert events["layout"] == 0
+print("job_table_ok")
+"""
+    completed = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=repo_root,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+    assert completed.returncode == 0, completed.stderr or completed.stdout
+    assert "job_table_ok" in completed.stdout
@@ -36,3 +36,58 @@ def test_kmz_generation_from_cleaned_csv(tmp_path: Path) -> None:
     names = [pm.find("k:name", ns).text for pm in placemarks]
     assert "1200" in names
     assert "1500" in names
+
+
+def test_streamed_kml_escapes_text_and_leaves_no_partial(tmp_path: Path) -> None:
+    src = tmp_path / "A&B <flight>.csv"
+    _write_csv(src)
+
+    res = generate_methane_outputs([src], threshold=1000, generate_kmz=True)[0]
+    assert res.kmz_status == "success"
+    assert res.kmz_rows == 2
+    assert not list(tmp_path.glob("*.partial"))
+
+    with zipfile.ZipFile(res.kmz, "r") as zf:
+        root = ET.fromstring(zf.read("doc.kml"))
+    ns = {"k": "http://www.opengis.net/kml/2.2"}
+    assert root.find("k:Document/k:name", ns).text == res.kmz.stem
+    coords = [c.text for c in root.findall(".//k:coordinates", ns)]
+    assert coords == ["2.0,1.0,0", "4.0,3.0,0"]
+
+
+def test_large_kmz_is_tiled_with_regions_and_styles(tmp_path: Path, monkeypatch) -> None:
+    from purway_geotagger.ops import methane_outputs
+
+    monkeypatch.setattr(methane_outputs, "KMZ_TILE_MAX_PLACEMARKS", 10)
+    src = tmp_path / "big.csv"
+    with src.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["latitude", "longitude", "ppm"])
+        for i in range(100):
+            writer.writerow([f"{30 + (i % 10) * 0.01}", f"{-97 + (i // 10) * 0.01}", str(1000 + i * 100)])
+
+    res = generate_methane_outputs([src], threshold=1000, generate_kmz=True, ppm_bin_edges=[1000, 5000])[0]
+    assert res.kmz_status == "success"
+    assert res.kmz_rows == 100
+
+    ns = {"k": "http://www.opengis.net/kml/2.2"}
+    with zipfile.ZipFile(res.kmz, "r") as zf:
+        names = zf.namelist()
+        docs = {n: ET.fromstring(zf.read(n)) for n in names}
+
+    assert "doc.kml" in names
+    assert any(n.startswith("tiles/") for n in names)
+    root = docs["doc.kml"]
+    assert {s.get("id") for s in root.findall(".//k:StyleMap", ns)} == {"ppm0", "ppm1", "ppm2"}
+    links = root.findall(".//k:NetworkLink", ns)
+    assert links
+    assert all(link.find("k:Region/k:Lod/k:minLodPixels", ns) is not None for link in links)
+
+    placemarks = [pm for doc in docs.values() for pm in doc.findall(".//k:Placemark", ns)]
+    assert len(placemarks) == 100
+    assert all(len(doc.findall(".//k:Placemark", ns)) <= 10 for doc in docs.values())
+    # The overview tile carries the hottest detections.
+    top = sorted(float(pm.find("k:name", ns).text) for pm in root.findall(".//k:Placemark", ns))
+    assert top[0] == 1000 + 90 * 100
+    styles = {pm.find("k:styleUrl", ns).text for pm in root.findall(".//k:Placemark", ns)}
+    assert styles == {"#ppm2"}
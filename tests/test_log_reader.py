@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+from purway_geotagger.core.log_reader import LogReader
+
+
+def _write(path: Path, text: str, mode: str = "w") -> None:
+    with path.open(mode, encoding="utf-8", newline="") as f:
+        f.write(text)
+
+
+def test_refresh_indexes_only_complete_appended_lines(tmp_path: Path) -> None:
+    log = tmp_path / "run_log.txt"
+    _write(log, "one\ntwo\nthr")
+    reader = LogReader(log, chunk_bytes=4)
+
+    assert reader.refresh() == 2
+    assert reader.read_lines(0, 10) == ["one", "two"]
+
+    _write(log, "ee\nfour\n", "a")
+    assert reader.refresh() == 2
+    assert reader.refresh() == 0
+    assert reader.line_count == 4
+    assert reader.read_lines(2, 4) == ["three", "four"]
+    assert reader.line_at(reader.indexed_bytes - 1) == 3
+
+
+def test_refresh_starts_over_when_file_is_truncated(tmp_path: Path) -> None:
+    log = tmp_path / "run_log.txt"
+    _write(log, "".join(f"line {i}\n" for i in range(50)))
+    reader = LogReader(log)
+    reader.refresh()
+
+    _write(log, "fresh\n")
+    reader.refresh()
+    assert reader.line_count == 1
+    assert reader.read_lines(0, 1) == ["fresh"]
+
+
+def test_search_crosses_chunk_boundaries_in_both_directions(tmp_path: Path) -> None:
+    log = tmp_path / "run_log.txt"
+    lines = [f"[INFO] photo {i:04d} ok" for i in range(200)]
+    lines[17] = "[ERROR] photo 0017 NEEDLE missing"
+    lines[150] = "[ERROR] photo 0150 needle missing"
+    _write(log, "\n".join(lines) + "\n")
+    reader = LogReader(log, chunk_bytes=7)  # smaller than the needle
+    reader.refresh()
+
+    assert reader.search("needle") == 17
+    assert reader.search("needle", 18) == 150
+    assert reader.search("needle", 151) is None
+    assert reader.search("Needle", 199, backward=True) == 150
+    assert reader.search("needle", 149, backward=True) == 17
+    assert reader.search("needle", 16, backward=True) is None
+    assert reader.search("") is None
+
+
+def test_log_viewer_dialog_shows_tail_pages_back_and_follows(tmp_path: Path) -> None:
+    repo_root = Path(__file__).resolve().parents[1]
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(repo_root / "src")
+    env["QT_QPA_PLATFORM"] = "offscreen"
+    log = tmp_path / "run_log.txt"
+    _write(log, "".join(f"line {i}\n" for i in range(5000)))
+
+    script = f"""
+from pathlib import Path
+from PySide6.QtWidgets import QApplication
+from purway_geotagger.gui.widgets.log_viewer import LogViewerDialog, TAIL_LINES
+
+app = QApplication([])
+log = Path(r"{log}")
+dlg = LogViewerDialog(log)
+view = dlg.view
+doc = view.text.document()
+assert doc.blockCount() == TAIL_LINES, doc.blockCount()
+assert view.first_line == 5000 - TAIL_LINES
+assert doc.lastBlock().text() == "line 4999"
+
+view.search_edit.setText("LINE 12")
+assert view.find(backward=True) == 1299
+assert view.first_line <= 1299
+assert view.text.textCursor().selectedText() == "line 12"
+assert view.find(backward=True) == 1298
+assert view.find() == 1299
+assert view.find() is None
+
+with log.open("a", encoding="utf-8") as f:
+    f.write("appended\\n")
+view._on_file_changed()
+assert doc.lastBlock().text() == "appended"
+print("log_viewer_ok")
+"""
+    completed = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=repo_root,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+    assert completed.returncode == 0, completed.stderr or completed.stdout
+    assert "log_viewer_ok" in completed.stdout
+
+
+def test_lines_split_only_on_newline_and_search_folds_unicode(tmp_path: Path) -> None:
+    log = tmp_path / "run_log.txt"
+    _write(log, "a\rb\x0cc d\r\nÉTAPE Straße\nlast\n")
+    reader = LogReader(log, chunk_bytes=5)
+    reader.refresh()
+
+    assert reader.line_count == 3
+    assert reader.read_lines(0, 3) == ["a\rb\x0cc d", "ÉTAPE Straße", "last"]
+    assert reader.search("étape") == 1
+    assert reader.search("STRASSE") == 1
+    assert reader.search("LAST", 2, backward=True) == 2
+    assert reader.search("étape", 0, backward=True) is None
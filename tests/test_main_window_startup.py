@@ -167,3 +167,55 @@ page.close()
     )
     assert completed.returncode == 0, completed.stderr or completed.stdout
     assert "home_mode_reflow 2 2" in completed.stdout
+
+
+def test_main_window_builds_pages_on_first_navigation() -> None:
+    repo_root = Path(__file__).resolve().parents[1]
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(repo_root / "src")
+    env["QT_QPA_PLATFORM"] = "offscreen"
+    env["PURWAY_PROFILE_STARTUP"] = "1"
+
+    script = """
+import sys
+from PySide6.QtWidgets import QApplication
+from purway_geotagger.core.modes import RunMode
+from purway_geotagger.core.settings import AppSettings
+from purway_geotagger.core.startup_profile import startup_profiler
+from purway_geotagger.gui.main_window import MainWindow
+
+app = QApplication([])
+win = MainWindow(AppSettings())
+deferred = [
+    "purway_geotagger.core.pipeline",
+    "purway_geotagger.core.wind_weather_autofill",
+    "purway_geotagger.gui.pages.methane_page",
+    "purway_geotagger.gui.pages.wind_data_page",
+    "purway_geotagger.gui.pages.help_page",
+    "purway_geotagger.gui.widgets.settings_dialog",
+]
+loaded = [m for m in deferred if m in sys.modules]
+assert not loaded, loaded
+assert win.wind_data_page is None and win.help_page is None
+
+win._show_mode(RunMode.METHANE)
+assert win.run_stack.currentWidget() is win._mode_pages[RunMode.METHANE]
+win.btn_help.click()
+assert win.help_page is not None and win.wind_data_page is None
+win._open_wind_data_tab()
+assert win.wind_data_page is not None and win.main_stack.currentIndex() == 3
+
+built = [t.component for t in startup_profiler().timings if t.kind == "construct"]
+print("lazy_pages_ok", built)
+win.close()
+"""
+    completed = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=repo_root,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=20,
+    )
+    assert completed.returncode == 0, completed.stderr or completed.stdout
+    assert "lazy_pages_ok ['MethanePage', 'HelpPage', 'WindDataPage']" in completed.stdout
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from pathlib import Path
+import csv
+
+from purway_geotagger.core.manifest import MANIFEST_FIELDS, ManifestRow, ManifestWriter
+
+
+def _row(name: str) -> ManifestRow:
+    return ManifestRow(
+        source_path=name,
+        output_path=name,
+        status="SUCCESS",
+        reason="",
+        lat="1.0",
+        lon="2.0",
+        ppm="1500",
+        csv_path="a.csv",
+        join_method="FILENAME",
+        exif_written="YES",
+    )
+
+
+def test_rows_are_on_disk_before_close(tmp_path: Path) -> None:
+    path = tmp_path / "manifest.csv"
+    writer = ManifestWriter(path, flush_every=2, flush_interval_s=3600)
+    assert path.read_text(encoding="utf-8").splitlines() == [",".join(MANIFEST_FIELDS)]
+
+    writer.add(_row("a.jpg"))
+    writer.add(_row("b.jpg"))
+    # Not closed: simulates a crash after the flush cadence was reached.
+    rows = list(csv.DictReader(path.read_text(encoding="utf-8").splitlines()))
+    assert [r["source_path"] for r in rows] == ["a.jpg", "b.jpg"]
+    assert rows[0]["capture_time"] == ""
+
+    writer.add(_row("c.jpg"))
+    writer.close()
+    rows = list(csv.DictReader(path.read_text(encoding="utf-8").splitlines()))
+    assert len(rows) == 3
+    assert writer.rows_written == 3
+
+
+def test_manifest_row_has_no_instance_dict() -> None:
+    assert not hasattr(_row("a.jpg"), "__dict__")
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from pathlib import Path
+import csv
+import json
+import time
+import zipfile
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from purway_geotagger.ops.methane_hotspots import cluster_detections, haversine_m
+from purway_geotagger.ops.methane_outputs import generate_methane_outputs
+
+
+def _write_csv(path: Path) -> None:
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["latitude", "longitude", "ppm", "relative_altitude"])
+        # Cluster A: three points a few meters apart.
+        writer.writerow(["30.00000", "-97.00000", "1200", "20"])
+        writer.writerow(["30.00005", "-97.00000", "3000", "30"])
+        writer.writerow(["30.00010", "-97.00005", "1500", "0"])
+        # Cluster B: ~1 km north.
+        writer.writerow(["30.01000", "-97.00000", "5000", "25"])
+
+
+def test_cluster_detections_groups_nearby_points() -> None:
+    lat = np.array([30.0, 30.00005, 30.0001, 30.01])
+    lon = np.array([-97.0, -97.0, -97.00005, -97.0])
+    ppm = np.array([1200.0, 3000.0, 1500.0, 5000.0])
+    rel_alt = np.array([20.0, 30.0, 0.0, 25.0])
+
+    hotspots = cluster_detections(lat, lon, ppm, rel_alt, radius_m=25.0)
+
+    assert [h.detections for h in hotspots] == [1, 3]
+    top, second = hotspots
+    assert (top.hotspot_id, top.max_ppm, top.max_pac) == (1, 5000.0, 200.0)
+    assert second.max_ppm == 3000.0
+    assert second.mean_ppm == 1900.0
+    # Zero altitude is excluded from PAC, as in core.pac_calculator.
+    assert second.max_pac == 100.0
+    assert second.mean_pac == 80.0
+    assert (second.peak_latitude, second.peak_longitude) == (30.00005, -97.0)
+    assert 0 < second.radius_m < 25
+
+
+def test_points_within_radius_always_share_a_hotspot() -> None:
+    # A chain of points 20 m apart crosses many grid cells but is one cluster.
+    lat = 30.0 + np.arange(50) * (20.0 / 111_195.0)
+    lon = np.full(50, -97.0)
+    ppm = np.full(50, 1000.0)
+    assert np.all(haversine_m(lat[:-1], lon[:-1], lat[1:], lon[1:]) < 25.0)
+
+    hotspots = cluster_detections(lat, lon, ppm, radius_m=25.0)
+    assert len(hotspots) == 1
+    assert hotspots[0].detections == 50
+    assert hotspots[0].max_pac is None
+
+
+def test_hotspot_outputs_and_kmz_layer(tmp_path: Path) -> None:
+    src = tmp_path / "flight.csv"
+    _write_csv(src)
+
+    res = generate_methane_outputs([src], threshold=1000, generate_kmz=True, hotspot_radius_m=25.0)[0]
+    assert res.hotspot_status == "success"
+    assert res.hotspot_count == 2
+    assert res.hotspot_csv.name == "flight_Cleaned_1000-PPM_Hotspots.csv"
+
+    with res.hotspot_csv.open(encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [r["detections"] for r in rows] == ["1", "3"]
+
+    payload = json.loads(res.hotspot_json.read_text(encoding="utf-8"))
+    assert payload["detections"] == 4
+    assert payload["max_ppm"] == 5000.0
+    assert payload["max_pac"] == 200.0
+    assert len(payload["hotspots"]) == 2
+
+    with zipfile.ZipFile(res.kmz) as zf:
+        kml = zf.read("doc.kml").decode("utf-8")
+    assert "<Folder><name>Hotspots</name>" in kml
+    assert "H1 (5000 ppm)" in kml
+
+
+def test_hotspots_disabled_by_default(tmp_path: Path) -> None:
+    src = tmp_path / "flight.csv"
+    _write_csv(src)
+
+    res = generate_methane_outputs([src], threshold=1000, generate_kmz=False)[0]
+    assert res.hotspot_status == "skipped"
+    assert res.hotspot_csv is None
+
+
+def test_hotspots_are_opt_in() -> None:
+    from dataclasses import fields
+
+    from purway_geotagger.core.job import JobOptions
+    from purway_geotagger.core.settings import AppSettings
+
+    default = next(f.default for f in fields(JobOptions) if f.name == "methane_hotspots")
+    assert default is False
+    assert AppSettings().methane_hotspots is default
+
+
+def test_hotspot_failure_is_a_warning_not_a_job_failure(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from purway_geotagger.core.job import Job, JobOptions
+    from purway_geotagger.core.modes import RunMode
+    from purway_geotagger.core.pipeline import run_job
+    from purway_geotagger.ops import methane_outputs
+
+    def _boom(*_args, **_kwargs):
+        raise RuntimeError("clustering exploded")
+
+    monkeypatch.setattr(methane_outputs, "analyze_hotspots", _boom)
+    flight = tmp_path / "flight"
+    flight.mkdir()
+    _write_csv(flight / "flight.csv")
+    run_folder = tmp_path / "run"
+    opts = JobOptions(
+        output_root=run_folder,
+        overwrite_originals=True,
+        create_backup_on_overwrite=False,
+        flatten=False,
+        cleanup_empty_dirs=False,
+        sort_by_ppm=False,
+        ppm_bin_edges=[0, 1000],
+        write_xmp=False,
+        dry_run=True,
+        max_join_delta_seconds=3,
+        purway_payload="",
+        enable_renaming=False,
+        rename_template=None,
+        start_index=1,
+        run_mode=RunMode.METHANE,
+        methane_hotspots=True,
+    )
+    job = Job(id="1", name="hotspots", inputs=[flight], options=opts)
+
+    run_job(job, lambda *_: None, lambda: False)
+
+    assert job.state.stage == "DONE"
+    assert (flight / "flight_Cleaned_1000-PPM.csv").exists()
+    assert (flight / "flight_Cleaned_1000-PPM.kmz").exists()
+    log = (run_folder / "run_log.txt").read_text(encoding="utf-8")
+    assert "Warning: hotspots failed for" in log
+    assert "clustering exploded" in log
+    summary = json.loads((run_folder / "run_summary.json").read_text(encoding="utf-8"))
+    (output,) = summary["methane_outputs"]
+    assert (output["hotspot_status"], output["hotspot_error"]) == ("failed", "clustering exploded")
+
+
+def test_clustering_one_million_points_is_fast() -> None:
+    rng = np.random.default_rng(7)
+    n = 1_000_000
+    lat = 30.0 + rng.random(n) * 0.05
+    lon = -97.0 + rng.random(n) * 0.05
+    ppm = 1000.0 + rng.random(n) * 9000.0
+    rel_alt = 10.0 + rng.random(n) * 40.0
+
+    start = time.perf_counter()
+    hotspots = cluster_detections(lat, lon, ppm, rel_alt, radius_m=25.0)
+    elapsed = time.perf_counter() - start
+
+    assert sum(h.detections for h in hotspots) == n
+    assert elapsed < 10.0
@@ -52,3 +52,25 @@ def test_cleaned_csv_skips_when_no_ppm(tmp_path: Path) -> None:
     res = results[0]
     assert res.cleaned_status == "skipped"
     assert res.cleaned_csv is None
+
+
+def test_parallel_outputs_keep_input_order(tmp_path: Path) -> None:
+    sources = []
+    for i in range(6):
+        src = tmp_path / f"flight_{i:02d}.csv"
+        _write_csv(src, ["latitude", "longitude", "ppm"], [["1.0", "2.0", str(1000 + i)]] * (i + 1))
+        sources.append(src)
+
+    ticks: list[tuple[int, int]] = []
+    results = generate_methane_outputs(
+        sources,
+        threshold=1000,
+        generate_kmz=True,
+        max_workers=4,
+        progress_cb=lambda done, total: ticks.append((done, total)),
+    )
+
+    assert [r.source_csv for r in results] == sources
+    assert [r.cleaned_rows for r in results] == [1, 2, 3, 4, 5, 6]
+    assert all(r.kmz_status == "success" for r in results)
+    assert ticks == [(i, 6) for i in range(1, 7)]
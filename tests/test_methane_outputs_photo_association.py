@@ -68,3 +68,127 @@ def test_fallback_when_photo_column_missing(tmp_path: Path) -> None:
     assert result.cleaned_rows == 1
     assert result.photo_col_missing is True
     assert result.missing_photo_rows == 0
+
+
+def test_photo_index_replaces_directory_listing(tmp_path: Path, monkeypatch) -> None:
+    from purway_geotagger.ops import methane_outputs
+    from purway_geotagger.ops.methane_outputs import build_photo_name_index
+
+    (tmp_path / "A.JPG").write_bytes(b"")
+    csv_paths = []
+    for name in ("one.csv", "two.csv"):
+        csv_path = tmp_path / name
+        _write_csv(
+            csv_path,
+            ["time", "methane_concentration", "latitude", "longitude", "file_name"],
+            [
+                {"time": "t1", "methane_concentration": "1500", "latitude": "1", "longitude": "2", "file_name": "a.jpg"},
+                {"time": "t2", "methane_concentration": "1500", "latitude": "1", "longitude": "2", "file_name": "b"},
+            ],
+        )
+        csv_paths.append(csv_path)
+
+    def fail_listing(folder: Path):
+        raise AssertionError(f"unexpected listing of {folder}")
+
+    monkeypatch.setattr(methane_outputs, "_collect_jpg_names", fail_listing)
+    index = build_photo_name_index([tmp_path / "A.JPG", tmp_path / "sub" / "b.jpg"], folders=[tmp_path])
+    results = generate_methane_outputs(csv_paths, threshold=1000, generate_kmz=False, photo_index=index)
+
+    assert [r.cleaned_rows for r in results] == [1, 1]
+    assert [r.missing_photo_names for r in results] == [["b"], ["b"]]
+
+
+def test_listing_is_shared_within_a_call_but_not_across_calls(tmp_path: Path, monkeypatch) -> None:
+    from purway_geotagger.ops import methane_outputs
+
+    (tmp_path / "a.jpg").write_bytes(b"")
+    fields = ["time", "methane_concentration", "latitude", "longitude", "file_name"]
+    csv_paths = []
+    for name in ("one.csv", "two.csv"):
+        csv_paths.append(tmp_path / name)
+        _write_csv(csv_paths[-1], fields, [
+            {"time": "t1", "methane_concentration": "1500", "latitude": "1", "longitude": "2", "file_name": "a.jpg"},
+            {"time": "t2", "methane_concentration": "1500", "latitude": "1", "longitude": "2", "file_name": "b.jpg"},
+        ])
+    listed: list[Path] = []
+    real = methane_outputs._collect_jpg_names
+
+    def counting(folder: Path):
+        listed.append(folder)
+        return real(folder)
+
+    monkeypatch.setattr(methane_outputs, "_collect_jpg_names", counting)
+    first = generate_methane_outputs(csv_paths, threshold=1000, generate_kmz=False, max_workers=2)
+    assert [r.cleaned_rows for r in first] == [1, 1]
+    assert listed == [tmp_path]
+
+    # A photo added between runs is seen even if the folder mtime did not move.
+    (tmp_path / "b.jpg").write_bytes(b"")
+    second = generate_methane_outputs(csv_paths[:1], threshold=1000, generate_kmz=False)
+    assert second[0].cleaned_rows == 2
+
+
+def test_index_leaves_out_folders_reached_through_file_inputs(tmp_path: Path) -> None:
+    from purway_geotagger.ops.methane_outputs import build_photo_name_index
+
+    flight = tmp_path / "flight"
+    flight.mkdir()
+    (flight / "a.jpg").write_bytes(b"")
+    csv_path = flight / "data.csv"
+    _write_csv(
+        csv_path,
+        ["time", "methane_concentration", "latitude", "longitude", "file_name"],
+        [{"time": "t1", "methane_concentration": "1500", "latitude": "1", "longitude": "2", "file_name": "a.jpg"}],
+    )
+
+    # CSV passed as a file: its folder was never enumerated, so it is not indexed.
+    index = build_photo_name_index([], folders=[flight], roots=[])
+    assert index == {}
+    result = generate_methane_outputs([csv_path], threshold=1000, generate_kmz=False, photo_index=index)[0]
+    assert (result.cleaned_rows, result.missing_photo_rows) == (1, 0)
+
+    # A photo passed as a file does not stand for its whole folder either.
+    other = tmp_path / "other"
+    other.mkdir()
+    index = build_photo_name_index([flight / "a.jpg", other / "x.jpg"], folders=[flight], roots=[other])
+    assert set(index) == {other}
+
+
+def test_methane_run_with_file_inputs_keeps_rows_for_unscanned_photos(tmp_path: Path) -> None:
+    from purway_geotagger.core.job import Job, JobOptions
+    from purway_geotagger.core.modes import RunMode
+    from purway_geotagger.core.pipeline import run_job
+
+    flight = tmp_path / "flight"
+    flight.mkdir()
+    (flight / "a.jpg").write_bytes(b"x")
+    csv_path = flight / "data.csv"
+    _write_csv(
+        csv_path,
+        ["time", "methane_concentration", "latitude", "longitude", "file_name"],
+        [{"time": "t1", "methane_concentration": "1500", "latitude": "1", "longitude": "2", "file_name": "a.jpg"}],
+    )
+    opts = JobOptions(
+        output_root=tmp_path / "run",
+        overwrite_originals=True,
+        create_backup_on_overwrite=False,
+        flatten=False,
+        cleanup_empty_dirs=False,
+        sort_by_ppm=False,
+        ppm_bin_edges=[0, 1000],
+        write_xmp=False,
+        dry_run=True,
+        max_join_delta_seconds=3,
+        purway_payload="",
+        enable_renaming=False,
+        rename_template=None,
+        start_index=1,
+        run_mode=RunMode.METHANE,
+        methane_generate_kmz=False,
+    )
+    run_job(Job(id="1", name="csv only", inputs=[csv_path], options=opts), lambda *_: None, lambda: False)
+
+    cleaned = flight / "data_Cleaned_1000-PPM.csv"
+    rows = list(csv.DictReader(cleaned.read_text(encoding="utf-8").splitlines()))
+    assert [r["file_name"] for r in rows] == ["a.jpg"]
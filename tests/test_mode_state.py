@@ -3,7 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 
 from purway_geotagger.core.modes import common_parent, default_methane_log_base, default_encroachment_base
-from purway_geotagger.gui.mode_state import ModeState
+from purway_geotagger.core.mode_state import ModeState
 
 
 def test_common_parent_with_shared_root(tmp_path: Path) -> None:
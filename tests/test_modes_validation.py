@@ -3,7 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 
 from purway_geotagger.core.modes import RunMode
-from purway_geotagger.gui.mode_state import ModeState, validate_mode_state
+from purway_geotagger.core.mode_state import ModeState, validate_mode_state
 
 
 def _tmp_input(tmp_path: Path) -> Path:
@@ -2,9 +2,11 @@ from __future__ import annotations
 
 from pathlib import Path
 import csv
+import json
 
 from purway_geotagger.core.job import Job, JobOptions
 from purway_geotagger.core.pipeline import run_job
+from purway_geotagger.core.run_db import query_stage_timings, query_tasks, run_db_path
 from purway_geotagger.templates.models import RenameTemplate
 
 
@@ -73,3 +75,16 @@ def test_dry_run_pipeline_copy_rename_sort_flatten(tmp_path: Path) -> None:
     assert row["status"] == "SUCCESS"
     assert row["exif_written"] == "NO"
     assert "JPG_FLAT" in row["output_path"]
+
+    db = run_db_path(run_folder)
+    assert query_tasks(db, "SUCCESS", ("output_path",)) == [{"output_path": row["output_path"]}]
+    assert query_tasks(db, "FAILED") == []
+    stages = [stage for stage, _seconds in query_stage_timings(db)]
+    assert stages[:2] == ["SCAN", "PARSE"]
+    assert stages[-1] == "FLATTEN"
+
+    perf = json.loads((run_folder / "run_summary.json").read_text(encoding="utf-8"))["performance"]
+    assert [s["stage"] for s in perf["stages"]] == stages
+    match = next(s for s in perf["stages"] if s["stage"] == "MATCH")
+    assert match["items"] == 1
+    assert perf["wall_seconds"] >= sum(s["wall_seconds"] for s in perf["stages"]) - 0.01
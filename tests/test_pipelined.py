@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+from pathlib import Path
+import csv
+import threading
+
+import pytest
+
+from purway_geotagger.core import pipelined
+from purway_geotagger.core.job import Job, JobOptions
+from purway_geotagger.core.photo_task import PhotoTask
+from purway_geotagger.core.pipeline import run_job
+from purway_geotagger.core.run_db import query_tasks, run_db_path
+from purway_geotagger.parsers.purway_csv import PurwayCSVIndex
+from purway_geotagger.util.errors import UserCancelledError
+
+
+def _make_inputs(root: Path, photos: int) -> Path:
+    input_dir = root / "input"
+    input_dir.mkdir()
+    lines = ["Latitude,Longitude,PPM,Photo"]
+    for i in range(photos):
+        (input_dir / f"IMG_{i:04d}.jpg").write_text("x", encoding="utf-8")
+        if i % 5:  # every fifth photo has no CSV row
+            lines.append(f"1.{i},2.{i},{1000 + i},IMG_{i:04d}.jpg")
+    (input_dir / "data.csv").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return input_dir
+
+
+def _options(run_folder: Path, pipelined_mode: bool) -> JobOptions:
+    return JobOptions(
+        output_root=run_folder,
+        overwrite_originals=False,
+        create_backup_on_overwrite=True,
+        flatten=False,
+        cleanup_empty_dirs=False,
+        sort_by_ppm=False,
+        ppm_bin_edges=[0, 1000],
+        write_xmp=True,
+        dry_run=True,
+        max_join_delta_seconds=3,
+        purway_payload="",
+        enable_renaming=False,
+        rename_template=None,
+        start_index=1,
+        pipelined=pipelined_mode,
+    )
+
+
+def _manifest(run_folder: Path) -> list[tuple[str, str, str, str]]:
+    with (run_folder / "manifest.csv").open(encoding="utf-8", newline="") as f:
+        return sorted(
+            (Path(r["source_path"]).name, Path(r["output_path"]).name, r["status"], r["ppm"])
+            for r in csv.DictReader(f)
+        )
+
+
+def test_pipelined_matches_sequential_results(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(pipelined, "WRITE_BATCH_SIZE", 4)
+    input_dir = _make_inputs(tmp_path, 23)
+
+    jobs = {}
+    for mode in (False, True):
+        run_folder = tmp_path / f"run_{mode}"
+        job = Job(id=str(mode), name="job", inputs=[input_dir], options=_options(run_folder, mode))
+        run_job(job, progress_cb=lambda *_: None, cancel_cb=lambda: False)
+        jobs[mode] = job
+
+    assert _manifest(tmp_path / "run_True") == _manifest(tmp_path / "run_False")
+    seq, pipe = jobs[False].state, jobs[True].state
+    assert (pipe.matched, pipe.success, pipe.failed) == (seq.matched, seq.success, seq.failed) == (18, 18, 5)
+
+
+def test_pipelined_cancel_stops_worker_threads(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(pipelined, "WRITE_BATCH_SIZE", 2)
+    input_dir = _make_inputs(tmp_path, 20)
+    run_folder = tmp_path / "run"
+    job = Job(id="c", name="job", inputs=[input_dir], options=_options(run_folder, True))
+
+    progress = {"calls": 0}
+
+    def _progress(_pct: int, msg: str) -> None:
+        if "overlapped" in msg:
+            progress["calls"] += 1
+
+    with pytest.raises(UserCancelledError):
+        run_job(job, progress_cb=_progress, cancel_cb=lambda: progress["calls"] >= 2)
+
+    assert not [t for t in threading.enumerate() if t.name.startswith("pipeline-")]
+    # The copier may have prepared every photo, but only two batches were processed.
+    assert job.state.success + job.state.failed < 20
+    rows = list(csv.DictReader((run_folder / "manifest.csv").read_text(encoding="utf-8").splitlines()))
+    assert rows
+
+
+def test_match_record_is_shared_by_clones(tmp_path: Path) -> None:
+    input_dir = _make_inputs(tmp_path, 2)
+    photo = input_dir / "IMG_0001.jpg"
+    opts = _options(tmp_path / "run", False)
+    opts.purway_payload = "P1"
+    task = PhotoTask(src_path=photo, work_path=photo, output_path=photo)
+
+    assert pipelined.match_task(task, PurwayCSVIndex.from_csv_files([input_dir / "data.csv"]), opts)
+    assert (task.join_method, task.lat, task.ppm) == ("FILENAME", 1.1, 1001)
+    assert task.image_description.endswith("; purway_payload=P1")
+
+    copy = tmp_path / "copy.jpg"
+    clone = task.clone_to(copy)
+    assert clone.match is task.match
+    assert (clone.output_path, clone.src_path, clone.matched) == (copy, photo, True)
+    assert not hasattr(clone, "__dict__")
+
+    clone.ppm = 5.0  # assigning replaces only the clone's record
+    assert (clone.ppm, task.ppm) == (5.0, 1001)
+
+
+@pytest.mark.parametrize("pipelined_mode", [False, True], ids=["staged", "pipelined"])
+def test_manifest_rows_are_on_disk_before_photos_move(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, pipelined_mode: bool
+) -> None:
+    from purway_geotagger.core import pipeline
+
+    monkeypatch.setattr(pipelined, "WRITE_BATCH_SIZE", 4)
+    input_dir = _make_inputs(tmp_path, 10)
+    run_folder = tmp_path / "run"
+    opts = _options(run_folder, pipelined_mode)
+    opts.flatten = True
+    seen: dict[str, list[tuple[str, str, str, str]]] = {}
+    real_flatten = pipeline.maybe_flatten
+
+    def _flatten(job: Job, tasks: list[PhotoTask]) -> None:
+        seen["before"] = _manifest(run_folder)  # what a crash here would leave
+        real_flatten(job, tasks)
+
+    monkeypatch.setattr(pipeline, "maybe_flatten", _flatten)
+    run_job(Job(id="f", name="job", inputs=[input_dir], options=opts), progress_cb=lambda *_: None, cancel_cb=lambda: False)
+
+    after = _manifest(run_folder)
+    assert [r[0] for r in seen["before"]] == [r[0] for r in after] == [f"IMG_{i:04d}.jpg" for i in range(10)]
+    assert [r[2] for r in seen["before"]] == [r[2] for r in after]
+    with (run_folder / "manifest.csv").open(encoding="utf-8", newline="") as f:
+        moved = {Path(r["output_path"]).parent.name for r in csv.DictReader(f) if r["status"] == "SUCCESS"}
+    assert moved == {"JPG_FLAT"}
+    db_rows = query_tasks(run_db_path(run_folder), "SUCCESS", columns=("output_path",))
+    assert {Path(r["output_path"]).parent.name for r in db_rows} == {"JPG_FLAT"}
+    assert sorted(p.name for p in (run_folder / "JPG_FLAT").iterdir()) == [r[1] for r in after if r[2] == "SUCCESS"]
+
+
+def test_pipelined_mode_is_opt_in() -> None:
+    from dataclasses import fields
+
+    from purway_geotagger.core.settings import AppSettings
+
+    default = next(f.default for f in fields(JobOptions) if f.name == "pipelined")
+    assert default is False
+    assert AppSettings().pipelined_execution is default
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from purway_geotagger.core.preview import build_preview
+from purway_geotagger.core.preview import PreviewResult, PreviewStore, build_preview
 
 
 def test_build_preview_rows_and_schema(tmp_path: Path) -> None:
@@ -25,3 +25,57 @@ def test_build_preview_rows_and_schema(tmp_path: Path) -> None:
     assert len(result.schemas) == 1
     schema = result.schemas[0]
     assert schema.photo_col is not None
+
+
+def _write_inputs(tmp_path: Path, photos: int) -> Path:
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    lines = ["Latitude,Longitude,PPM,Photo"]
+    for i in range(photos):
+        (input_dir / f"IMG_{i:04d}.jpg").write_text("x", encoding="utf-8")
+        if i % 3:
+            lines.append(f"1.{i},2.{i},{i},IMG_{i:04d}.jpg")
+    (input_dir / "data.csv").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return input_dir
+
+
+def test_build_preview_streams_batches_without_keeping_rows(tmp_path: Path) -> None:
+    input_dir = _write_inputs(tmp_path, 25)
+    scanned: list[PreviewResult] = []
+    batches: list[PreviewStore] = []
+
+    result = build_preview(
+        [input_dir], None, 3, on_batch=batches.append, on_scanned=scanned.append, batch_size=10,
+    )
+    assert scanned == [result]
+    assert len(result.rows) == 0
+    assert [len(b) for b in batches] == [10, 10, 5]
+
+    store = PreviewStore()
+    for b in batches:
+        store.extend(b)
+    assert len(store) == 25
+    assert len(store.rows_where(status="FAILED")) == 9
+    assert store.rows_where(join_method="FILENAME") == store.rows_where(status="MATCHED")
+    row = store[1]
+    assert (row.status, row.join_method, row.lat, row.ppm) == ("MATCHED", "FILENAME", "1.1", "1.0")
+    assert store[0].lat == "" and store[0].reason
+
+
+def test_build_preview_stops_when_cancelled(tmp_path: Path) -> None:
+    input_dir = _write_inputs(tmp_path, 25)
+    batches: list[PreviewStore] = []
+    build_preview([input_dir], None, 3, on_batch=batches.append, cancel_cb=lambda: len(batches) >= 1, batch_size=10)
+    assert [len(b) for b in batches] == [10]
+
+
+def test_preview_store_sorts_numbers_numerically_with_blanks_last(tmp_path: Path) -> None:
+    input_dir = _write_inputs(tmp_path, 12)
+    store = build_preview([input_dir], None, 3).rows
+    rows = list(range(len(store)))
+    ppms = [store.value(i, "ppm") for i in store.sort_rows(rows, "ppm")]
+    assert ppms[:3] == ["1.0", "2.0", "4.0"]
+    assert ppms[-4:] == ["", "", "", ""]
+    ppms = [store.value(i, "ppm") for i in store.sort_rows(rows, "ppm", descending=True)]
+    assert ppms[0] == "11.0" and ppms[-4:] == ["", "", "", ""]
+    assert store.sort_rows(rows, "status")[:8] == store.rows_where(status="MATCHED")
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+
+def test_preview_model_streams_sorts_and_filters_without_resets(tmp_path: Path) -> None:
+    repo_root = Path(__file__).resolve().parents[1]
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(repo_root / "src")
+    env["QT_QPA_PLATFORM"] = "offscreen"
+
+    script = """
+from pathlib import Path
+from PySide6.QtCore import QPersistentModelIndex, Qt
+from PySide6.QtWidgets import QApplication
+from purway_geotagger.core.preview import PreviewStore
+from purway_geotagger.gui.models.preview_table_model import PreviewTableModel
+from purway_geotagger.gui.widgets.preview_dialog import PreviewDialog
+from purway_geotagger.parsers.purway_csv import PhotoMatch
+from purway_geotagger.util.errors import CorrelationError
+
+app = QApplication([])
+
+def batch(start, count):
+    store = PreviewStore()
+    for i in range(start, start + count):
+        photo = Path(f"/in/IMG_{i:05d}.jpg")
+        if i % 4 == 0:
+            store.add_failure(photo, "no CSV row")
+        else:
+            join = "FILENAME" if i % 2 else "TIMESTAMP"
+            store.add_match(photo, PhotoMatch(f"/in/d{i % 3}.csv", 40.0 + i / 1e5, -105.0, float(i % 97), None, "", join))
+    return store
+
+model = PreviewTableModel()
+events = {"inserted": 0, "reset": 0, "layout": 0}
+model.rowsInserted.connect(lambda *_a: events.__setitem__("inserted", events["inserted"] + 1))
+model.modelReset.connect(lambda: events.__setitem__("reset", events["reset"] + 1))
+model.layoutChanged.connect(lambda *_a: events.__setitem__("layout", events["layout"] + 1))
+
+for start in range(0, 50_000, 500):
+    model.append_rows(batch(start, 500))
+assert model.rowCount() == 50_000 and events["inserted"] == 100 and events["reset"] == 0
+assert model.data(model.index(3, 2)) == "/in/IMG_00003.jpg"
+assert model.data(model.index(4, 0)) == "FAILED"
+
+selected = QPersistentModelIndex(model.index(7, 2))
+model.sort(6, Qt.DescendingOrder)
+assert events["layout"] == 1
+assert model.data(model.index(0, 6)) == "96.0"
+assert model.data(model.index(model.rowCount() - 1, 0)) == "FAILED"
+assert model.data(model.index(selected.row(), 2)) == "/in/IMG_00007.jpg"
+
+model.append_rows(batch(50_000, 10))
+assert model.rowCount() == 50_010 and events["layout"] == 2
+
+model.set_filters(status="MATCHED", join_method="TIMESTAMP")
+rows = model.rowCount()
+assert rows and all(model.data(model.index(r, 1)) == "TIMESTAMP" for r in range(0, rows, 997))
+assert len(model.store) == 50_010
+
+dlg = PreviewDialog()
+dlg.add_rows(batch(0, 8))
+dlg.join_filter.setCurrentIndex(dlg.join_filter.findData("FILENAME"))
+assert dlg.model.rowCount() == 4
+print("preview_model_ok")
+"""
+    completed = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=repo_root,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert completed.returncode == 0, completed.stderr or completed.stdout
+    assert "preview_model_ok" in completed.stdout
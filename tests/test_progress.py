@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from purway_geotagger.core import progress as progress_mod
+from purway_geotagger.core.job import Job, JobOptions
+from purway_geotagger.core.progress import ProgressAggregator, ProgressEvent
+
+
+def _job() -> Job:
+    opts = JobOptions(
+        output_root=Path("/tmp/run"),
+        overwrite_originals=False,
+        create_backup_on_overwrite=True,
+        flatten=False,
+        cleanup_empty_dirs=False,
+        sort_by_ppm=False,
+        ppm_bin_edges=[0],
+        write_xmp=True,
+        dry_run=True,
+        max_join_delta_seconds=3,
+        purway_payload="",
+        enable_renaming=False,
+        rename_template=None,
+        start_index=1,
+    )
+    return Job(id="j", name="job", inputs=[], options=opts)
+
+
+def test_aggregator_throttles_within_a_stage_and_keeps_the_latest(monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = {"now": 100.0}
+    monkeypatch.setattr(progress_mod.time, "monotonic", lambda: clock["now"])
+    job = _job()
+    events: list[ProgressEvent] = []
+    agg = ProgressAggregator(job, events.append, interval_s=0.1)
+
+    job.state.stage = "MATCH"
+    for i in range(1, 51):
+        job.state.matched = i
+        agg(20 + i // 5, f"Matched {i}/50 photos...")
+    assert [e.message for e in events] == ["Matched 1/50 photos..."]
+
+    clock["now"] += 0.2
+    job.state.stage = "WRITE"  # a new stage is always delivered at once
+    agg(55, "Writing EXIF/XMP via ExifTool...")
+    assert events[-1] == ProgressEvent(55, "Writing EXIF/XMP via ExifTool...", "WRITE", matched=50)
+
+    agg(60, "Writing metadata 1/50...")
+    agg(61, "Writing metadata 2/50...")
+    assert len(events) == 2
+    agg.flush()
+    assert events[-1].message == "Writing metadata 2/50..."
+    agg.flush()
+    assert len(events) == 3
+
+    agg(100, "Done.")
+    assert events[-1].percent == 100
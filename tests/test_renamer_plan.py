@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from purway_geotagger.core.photo_task import PhotoTask
+from purway_geotagger.ops import renamer
+from purway_geotagger.ops.renamer import execute_rename_plan, plan_renames, rollback_renames
+from purway_geotagger.templates.models import RenameTemplate
+
+
+def _template(pattern: str) -> RenameTemplate:
+    return RenameTemplate(id="t", name="t", client="C", pattern=pattern, description="")
+
+
+def _task(path: Path, dto: str) -> PhotoTask:
+    path.write_text(path.name, encoding="utf-8")
+    t = PhotoTask(src_path=path, work_path=path, output_path=path, matched=True, status="SUCCESS")
+    t.datetime_original = dto
+    return t
+
+
+def test_plan_handles_swap_cycle(tmp_path: Path) -> None:
+    # Chronological order is b then a, so X01/X02 swap the two existing names.
+    a = _task(tmp_path / "X02.jpg", "2026:01:01 10:00:01")
+    b = _task(tmp_path / "X01.jpg", "2026:01:01 10:00:00")
+    a_payload = a.output_path.read_text(encoding="utf-8")
+
+    plan = plan_renames([a, b], _template("X{index:02d}"), start_index=1)
+    assert plan.ops == []  # both already carry their final names
+
+    plan = plan_renames([a, b], _template("X{index:02d}"), start_index=2)
+    assert plan.staged_count == 1
+    execute_rename_plan(plan, tmp_path / "journal.jsonl")
+
+    assert b.output_path.name == "X02.jpg"
+    assert a.output_path.name == "X03.jpg"
+    assert a.output_path.read_text(encoding="utf-8") == a_payload
+    assert sorted(p.name for p in tmp_path.glob("*.jpg")) == ["X02.jpg", "X03.jpg"]
+
+
+def test_plan_avoids_existing_files(tmp_path: Path) -> None:
+    (tmp_path / "SAME.jpg").write_text("keep", encoding="utf-8")
+    t = _task(tmp_path / "a.jpg", "2026:01:01 10:00:00")
+
+    plan = plan_renames([t], _template("SAME"), start_index=1)
+    execute_rename_plan(plan)
+
+    assert t.output_path.name == "SAME_dup1.jpg"
+    assert (tmp_path / "SAME.jpg").read_text(encoding="utf-8") == "keep"
+
+
+def test_failed_batch_rolls_back(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    t1 = _task(tmp_path / "a.jpg", "2026:01:01 10:00:00")
+    t2 = _task(tmp_path / "b.jpg", "2026:01:01 10:00:01")
+    plan = plan_renames([t1, t2], _template("N{index}"), start_index=1)
+
+    real_rename = renamer.os.rename
+    calls = {"n": 0}
+
+    def flaky_rename(src, dst):
+        calls["n"] += 1
+        if calls["n"] == 2:
+            raise OSError("disk gone")
+        real_rename(src, dst)
+
+    monkeypatch.setattr(renamer.os, "rename", flaky_rename)
+    journal = tmp_path / "journal.jsonl"
+    with pytest.raises(OSError):
+        execute_rename_plan(plan, journal)
+
+    assert (tmp_path / "a.jpg").exists()
+    assert (tmp_path / "b.jpg").exists()
+    assert t1.output_path.name == "a.jpg"
+    ops = [json.loads(line)["op"] for line in journal.read_text(encoding="utf-8").splitlines()]
+    assert ops == ["rename", "rollback"]
+
+
+def test_rollback_from_journal(tmp_path: Path) -> None:
+    t = _task(tmp_path / "a.jpg", "2026:01:01 10:00:00")
+    journal = tmp_path / "journal.jsonl"
+    execute_rename_plan(plan_renames([t], _template("R{index}"), start_index=1), journal)
+    assert t.output_path.name == "R1.jpg"
+
+    assert rollback_renames(journal) == 1
+    assert (tmp_path / "a.jpg").exists()
+    assert not (tmp_path / "R1.jpg").exists()
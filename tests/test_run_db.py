@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from contextlib import closing
+from pathlib import Path
+import sqlite3
+
+from purway_geotagger.core.manifest import ManifestRow, ManifestWriter
+from purway_geotagger.core.run_db import RunDatabase, query_tasks, run_db_path
+from purway_geotagger.gui.widgets.run_report_view import load_run_failures, load_run_outputs
+
+
+def _row(name: str, status: str, reason: str = "") -> ManifestRow:
+    return ManifestRow(
+        source_path=f"/in/{name}",
+        output_path=f"/out/{name}",
+        status=status,
+        reason=reason,
+        lat="",
+        lon="",
+        ppm="",
+        csv_path="/in/a.csv",
+        join_method="NONE",
+        exif_written="NO",
+    )
+
+
+def test_report_reads_run_db_before_manifest(tmp_path: Path) -> None:
+    db = RunDatabase(run_db_path(tmp_path), commit_every=1)
+    db.add_task(_row("a.jpg", "SUCCESS"))
+    db.add_task(_row("b.jpg", "FAILED", "no match"))
+    # Committed rows are visible before the writer is closed.
+    assert [r["source_path"] for r in query_tasks(run_db_path(tmp_path), "FAILED")] == ["/in/b.jpg"]
+    db.close()
+    # Rollback journal, not WAL, which is unsafe on network shares.
+    with closing(sqlite3.connect(run_db_path(tmp_path))) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone() == ("delete",)
+
+    failures = load_run_failures(tmp_path)
+    assert failures == [{
+        "source_path": "/in/b.jpg",
+        "output_path": "/out/b.jpg",
+        "reason": "no match",
+        "csv_path": "/in/a.csv",
+        "join_method": "NONE",
+    }]
+    assert load_run_outputs(tmp_path) == [Path("/out/a.jpg")]
+
+
+def test_report_falls_back_to_manifest(tmp_path: Path) -> None:
+    with ManifestWriter(tmp_path / "manifest.csv") as manifest:
+        manifest.add(_row("c.jpg", "FAILED", "bad exif"))
+
+    assert [f["reason"] for f in load_run_failures(tmp_path)] == ["bad exif"]
+    assert load_run_outputs(tmp_path) == []
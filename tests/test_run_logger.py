@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from pathlib import Path
+import json
+import re
+
+from purway_geotagger.core.run_logger import RunLogger
+
+
+def test_lines_keep_format_and_drain_on_close(tmp_path: Path) -> None:
+    path = tmp_path / "run_log.txt"
+    logger = RunLogger(path)
+    for i in range(1000):
+        logger.log(f"message {i}")
+    logger.close()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1000
+    assert re.fullmatch(r"\[\d{4}-\d\d-\d\d \d\d:\d\d:\d\d\] message 0", lines[0])
+    assert lines[-1].endswith("] message 999")
+
+
+def test_flush_on_stage_boundary_and_jsonl(tmp_path: Path) -> None:
+    path = tmp_path / "run_log.txt"
+    jsonl = tmp_path / "run_log.jsonl"
+    logger = RunLogger(path, jsonl_path=jsonl)
+    logger.log("Scanned", photos=3)
+    logger.set_stage("MATCH")
+    assert path.read_text(encoding="utf-8").endswith("] Scanned\n")
+    logger.log("Matching")
+    logger.close()
+    logger.log("after close")
+
+    records = [json.loads(line) for line in jsonl.read_text(encoding="utf-8").splitlines()]
+    assert [(r["stage"], r["message"]) for r in records] == [("", "Scanned"), ("MATCH", "Matching")]
+    assert records[0]["photos"] == 3
+    assert path.read_text(encoding="utf-8").splitlines()[-1].endswith("] after close")
+
+
+def test_unencodable_message_does_not_stop_the_writer(tmp_path: Path) -> None:
+    path = tmp_path / "run_log.txt"
+    logger = RunLogger(path, jsonl_path=tmp_path / "run_log.jsonl")
+    logger.log("Skipped /photos/bad \udcff name.jpg")
+    logger.set_stage("MATCH")  # must not hang in flush()
+    logger.log("still logging")
+    logger.flush()
+    assert logger._thread.is_alive()
+    logger.close()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines[0].endswith("] Skipped /photos/bad \\udcff name.jpg")
+    assert lines[-1].endswith("] still logging")
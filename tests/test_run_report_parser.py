@@ -6,6 +6,7 @@ import csv
 from purway_geotagger.gui.widgets.run_report_view import (
     parse_manifest_failures,
     collect_output_files,
+    performance_rows,
 )
 
 
@@ -138,3 +139,24 @@ def test_collect_output_files_encroachment(tmp_path: Path) -> None:
     outputs = collect_output_files(summary, tmp_path)
     paths = [item["path"] for item in outputs]
     assert str(jpg) in paths
+
+
+def test_performance_rows() -> None:
+    summary = {
+        "performance": {
+            "wall_seconds": 3.5,
+            "cpu_seconds": 2.0,
+            "peak_rss_mb": 120.4,
+            "stages": [
+                {"stage": "MATCH", "wall_seconds": 1.25, "cpu_seconds": 1.0, "items": 10,
+                 "items_per_second": 8.0, "peak_rss_mb": 110.0},
+                {"stage": "SORT", "wall_seconds": 0.1, "cpu_seconds": 0.0, "items": None,
+                 "items_per_second": None, "peak_rss_mb": None},
+            ],
+        }
+    }
+    rows = performance_rows(summary)
+    assert rows[0] == ["MATCH", "1.25", "1.00", "10", "8.0", "110.0"]
+    assert rows[1] == ["SORT", "0.10", "0.00", "", "", ""]
+    assert rows[-1] == ["Total", "3.50", "2.00", "", "", "120.4"]
+    assert performance_rows({}) == []
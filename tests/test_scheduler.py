@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from purway_geotagger.core import scheduler as scheduler_mod
+from purway_geotagger.core.job import Job, JobOptions
+from purway_geotagger.core.scheduler import JobScheduler, ResourceLimits, device_id, job_devices
+
+
+def _job(job_id: str, root: Path) -> Job:
+    opts = JobOptions(
+        output_root=root / "out",
+        overwrite_originals=False,
+        create_backup_on_overwrite=True,
+        flatten=False,
+        cleanup_empty_dirs=False,
+        sort_by_ppm=False,
+        ppm_bin_edges=[0, 1000],
+        write_xmp=True,
+        dry_run=True,
+        max_join_delta_seconds=3,
+        purway_payload="",
+        enable_renaming=False,
+        rename_template=None,
+        start_index=1,
+    )
+    return Job(id=job_id, name=job_id, inputs=[root / "in"], options=opts)
+
+
+@pytest.fixture
+def fake_devices(monkeypatch: pytest.MonkeyPatch):
+    """Map the first path component under a root ("diskA", "diskB", ...) to a device id."""
+    def _device(path: Path) -> int:
+        return hash(next(p for p in path.parts if p.startswith("disk")))
+    monkeypatch.setattr(scheduler_mod, "device_id", _device)
+
+
+def test_device_id_uses_nearest_existing_ancestor(tmp_path: Path) -> None:
+    assert device_id(tmp_path / "not" / "yet" / "created") == tmp_path.stat().st_dev
+    job = _job("a", tmp_path)
+    assert job_devices(job) == frozenset({tmp_path.stat().st_dev})
+
+
+def test_jobs_on_different_disks_run_concurrently(fake_devices) -> None:
+    sched = JobScheduler(ResourceLimits(max_jobs=4, io_jobs_per_device=1))
+    a1, a2, b1 = _job("a1", Path("/diskA")), _job("a2", Path("/diskA")), _job("b1", Path("/diskB"))
+    for job in (a1, a2, b1):
+        sched.submit(job)
+
+    assert sched.next_ready() == [a1, b1]
+    assert sched.queued == [a2]
+    assert sched.next_ready() == []
+
+    sched.finish(a1)
+    assert sched.next_ready() == [a2]
+
+
+def test_global_job_limit_and_priorities(fake_devices) -> None:
+    sched = JobScheduler(ResourceLimits(max_jobs=1, io_jobs_per_device=4))
+    low, high = _job("low", Path("/diskA")), _job("high", Path("/diskB"))
+    sched.submit(low)
+    sched.submit(high, priority=5)
+
+    assert sched.next_ready() == [high]
+    sched.finish(high)
+    assert sched.next_ready() == [low]
+
+
+def test_blocked_job_is_not_starved(fake_devices) -> None:
+    sched = JobScheduler(ResourceLimits(max_jobs=8, io_jobs_per_device=1), max_bypass=2)
+    running = _job("running", Path("/diskA"))
+    sched.submit(running)
+    assert sched.next_ready() == [running]
+
+    waiting = _job("waiting", Path("/diskA"))
+    sched.submit(waiting)
+    overtakers = []
+    for i in range(3):
+        job = _job(f"c{i}", Path(f"/diskC{i}"))
+        overtakers.append(job)
+        sched.submit(job)
+        sched.next_ready()
+
+    # Two jobs may overtake; the third waits behind the starving job.
+    assert [j.id for j in sched.running] == ["running", "c0", "c1"]
+    sched.finish(running)
+    assert sched.next_ready() == [waiting, overtakers[2]]
+
+
+def test_remove_and_reprioritize_queued(fake_devices) -> None:
+    sched = JobScheduler(ResourceLimits(max_jobs=1))
+    first, second, third = (_job(n, Path(f"/disk{n}")) for n in ("A", "B", "C"))
+    for job in (first, second, third):
+        sched.submit(job)
+    assert sched.remove(second)
+    assert not sched.remove(second)
+    sched.set_priority(third, 1)
+    assert sched.queued == [third, first]
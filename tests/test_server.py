@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+import socket
+
+import pytest
+
+pytest.importorskip("appdirs")
+
+from purway_geotagger.core.settings import AppSettings
+from purway_geotagger.server import JobServer
+
+
+def _make_inputs(root: Path, name: str, photos: int = 4) -> Path:
+    input_dir = root / name
+    input_dir.mkdir(parents=True)
+    lines = ["Latitude,Longitude,PPM,Photo"]
+    for i in range(photos):
+        (input_dir / f"{name}_{i}.jpg").write_text("x", encoding="utf-8")
+        if i:
+            lines.append(f"1.{i},2.{i},{1000 + i},{name}_{i}.jpg")
+    (input_dir / "data.csv").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return input_dir
+
+
+async def _open(address: str):
+    if address.startswith("unix:"):
+        return await asyncio.open_unix_connection(address[len("unix:"):])
+    host, port = address[len("http://"):].rsplit(":", 1)
+    return await asyncio.open_connection(host, int(port))
+
+
+_TOKEN: dict[str, str] = {}
+
+
+async def _request(
+    address: str,
+    method: str,
+    path: str,
+    body: dict | None = None,
+    headers: dict[str, str] | None = None,
+) -> tuple[int, dict]:
+    reader, writer = await _open(address)
+    data = json.dumps(body).encode() if body is not None else b""
+    sent = {"Host": "127.0.0.1", "Authorization": f"Bearer {_TOKEN[address]}", "Content-Length": str(len(data))}
+    if method == "POST":
+        sent["Content-Type"] = "application/json"
+    sent.update(headers or {})
+    head = "".join(f"{k}: {v}\r\n" for k, v in sent.items() if v is not None)
+    writer.write(f"{method} {path} HTTP/1.1\r\n{head}\r\n".encode() + data)
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, payload = raw.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+
+async def _events(address: str, job_id: str) -> list[tuple[str, dict]]:
+    reader, writer = await _open(address)
+    writer.write(f"GET /jobs/{job_id}/events HTTP/1.1\r\nHost: localhost\r\nAuthorization: Bearer {_TOKEN[address]}\r\n\r\n".encode())
+    await writer.drain()
+    raw = (await asyncio.wait_for(reader.read(), 30)).decode()
+    writer.close()
+    assert "text/event-stream" in raw.split("\r\n\r\n", 1)[0]
+    events = []
+    for block in raw.split("\r\n\r\n", 1)[1].split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def _serve(test, tmp_path: Path):
+    async def run() -> None:
+        server = JobServer(AppSettings(), max_jobs=2, token_path=tmp_path / "server.token")
+        address = await server.start(port=0)
+        _TOKEN[address] = server.token
+        try:
+            await test(server, address)
+        finally:
+            await server.close()
+
+    asyncio.run(run())
+
+
+def test_job_lifecycle_events_manifest_and_summary(tmp_path: Path) -> None:
+    inputs = _make_inputs(tmp_path, "A")
+
+    async def test(server: JobServer, address: str) -> None:
+        body = {
+            "mode": "encroachment",
+            "inputs": [str(inputs)],
+            "options": {"dry_run": True, "encroachment_output_base": str(tmp_path / "out")},
+        }
+        status, job = await _request(address, "POST", "/jobs", body)
+        assert status == 202
+        assert job["status"] in ("queued", "running")
+
+        events = await _events(address, job["id"])
+        kinds = [k for k, _ in events]
+        assert kinds[0] == "queued" and kinds[-1] == "done"
+        assert "started" in kinds
+        assert (events[-1][1]["success"], events[-1][1]["failed"]) == (3, 1)
+
+        status, failed = await _request(address, "GET", f"/jobs/{job['id']}/manifest?status=FAILED")
+        assert status == 200
+        assert failed["count"] == 1
+        assert failed["rows"][0]["source_path"].endswith("A_0.jpg")
+        _, everything = await _request(address, "GET", f"/jobs/{job['id']}/manifest")
+        assert everything["count"] == 4
+
+        status, summary = await _request(address, "GET", f"/jobs/{job['id']}/summary")
+        assert status == 200
+        assert summary["exif"]["success"] == 3
+
+        # A second job over the same CSV reuses the parsed index.
+        _, second = await _request(address, "POST", "/jobs", body)
+        assert [k for k, _ in await _events(address, second["id"])][-1] == "done"
+        _, health = await _request(address, "GET", "/health")
+        assert health["jobs"] == {"done": 2}
+        assert health["csv_cache"] == {"hits": 1, "misses": 1}
+        _, listing = await _request(address, "GET", "/jobs")
+        assert {j["id"] for j in listing["jobs"]} == {job["id"], second["id"]}
+
+    _serve(test, tmp_path)
+
+
+def test_request_errors(tmp_path: Path) -> None:
+    async def test(server: JobServer, address: str) -> None:
+        status, body = await _request(address, "POST", "/jobs", {"mode": "encroachment", "inputs": [str(tmp_path / "nope")]})
+        assert status == 400 and "Input not found" in body["error"]
+        status, _ = await _request(address, "POST", "/jobs", {"mode": "bogus", "inputs": [str(tmp_path)]})
+        assert status == 400
+        status, _ = await _request(address, "GET", "/jobs/unknown")
+        assert status == 404
+        status, _ = await _request(address, "PUT", "/health")
+        assert status == 405
+        status, _ = await _request(address, "POST", "/jobs/resume", {"run_folder": str(tmp_path)})
+        assert status == 400
+
+    _serve(test, tmp_path)
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets not available")
+def test_unix_socket(tmp_path: Path) -> None:
+    sock = tmp_path / "purway.sock"
+
+    async def run() -> None:
+        server = JobServer(AppSettings(), max_jobs=1, token_path=tmp_path / "server.token")
+        address = await server.start(unix_path=sock)
+        _TOKEN[address] = server.token
+        try:
+            assert address == f"unix:{sock}"
+            assert oct(sock.stat().st_mode & 0o777) == "0o600"
+            status, health = await _request(address, "GET", "/health", headers={"Host": "anything"})
+            assert status == 200 and health["status"] == "ok"
+        finally:
+            await server.close()
+
+    asyncio.run(run())
+
+
+def test_rejects_forged_cross_site_and_unauthenticated_requests(tmp_path: Path) -> None:
+    inputs = _make_inputs(tmp_path, "A")
+    body = {"mode": "encroachment", "inputs": [str(inputs)], "options": {"dry_run": True}}
+
+    async def test(server: JobServer, address: str) -> None:
+        token_file = tmp_path / "server.token"
+        assert token_file.read_text(encoding="utf-8").strip() == server.token
+        assert oct(token_file.stat().st_mode & 0o777) == "0o600"
+
+        status, _ = await _request(address, "POST", "/jobs", body, headers={"Host": "attacker.example"})
+        assert status == 403
+        status, _ = await _request(address, "GET", "/health", headers={"Origin": "http://attacker.example"})
+        assert status == 403
+        status, _ = await _request(address, "POST", "/jobs", body, headers={"Content-Type": "text/plain"})
+        assert status == 415
+        status, _ = await _request(address, "GET", "/jobs", headers={"Authorization": None})
+        assert status == 401
+        status, _ = await _request(address, "GET", "/jobs", headers={"Authorization": "Bearer wrong"})
+        assert status == 401
+        assert server.jobs == {}
+
+        status, _ = await _request(
+            address, "GET", "/health", headers={"Host": "localhost:1234", "Origin": "http://127.0.0.1:1234"},
+        )
+        assert status == 200
+
+    _serve(test, tmp_path)
+    assert not (tmp_path / "server.token").exists()
+
+
+def test_close_waits_for_cancelled_jobs_to_finish(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import threading
+    import time
+
+    from purway_geotagger.util.errors import UserCancelledError
+
+    started = threading.Event()
+    wound_down: list[str] = []
+
+    def slow_job(job, progress_cb, cancel_cb, **_kwargs) -> None:
+        started.set()
+        while not cancel_cb():
+            time.sleep(0.01)
+        time.sleep(0.2)  # writing the manifest and summary
+        wound_down.append(job.id)
+        raise UserCancelledError()
+
+    monkeypatch.setattr("purway_geotagger.server.run_job", slow_job)
+    inputs = _make_inputs(tmp_path, "A")
+
+    async def run() -> None:
+        server = JobServer(AppSettings(), max_jobs=1, token_path=tmp_path / "server.token")
+        address = await server.start(port=0)
+        _TOKEN[address] = server.token
+        body = {"mode": "encroachment", "inputs": [str(inputs)], "options": {"dry_run": True}}
+        _, running = await _request(address, "POST", "/jobs", body)
+        _, queued = await _request(address, "POST", "/jobs", body)
+        await asyncio.to_thread(started.wait, 10)
+        threads = set(server._threads)
+        await server.close()
+        assert wound_down == [running["id"]]
+        assert not any(t.is_alive() or t.daemon for t in threads)
+        assert server.jobs[queued["id"]].status == "cancelled"
+
+    asyncio.run(run())
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from purway_geotagger.core.stage_profiler import StageProfiler
+
+
+def _burn(seconds: float) -> None:
+    end = time.thread_time() + seconds
+    while time.thread_time() < end:
+        pass
+
+
+def test_cpu_is_the_job_threads_only() -> None:
+    profiler = StageProfiler()
+    profiler.enter("WRITE")
+    other_job = threading.Thread(target=_burn, args=(0.3,))
+    other_job.start()
+    other_job.join()
+    quiet = profiler.enter("MATCH")
+    profiler.add_cpu(1.5)  # e.g. the pipelined copier/matcher threads
+    busy = profiler.end()
+
+    assert quiet is not None and busy is not None
+    assert quiet.cpu_seconds < 0.2
+    assert busy.cpu_seconds >= 1.5
+    assert profiler.summary().cpu_seconds >= 1.5
+    assert [s.stage for s in profiler.summary().stages] == ["WRITE", "MATCH"]
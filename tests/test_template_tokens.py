@@ -1,7 +1,38 @@
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from purway_geotagger.core.photo_task import PhotoTask
 from purway_geotagger.templates.models import RenameTemplate
-from purway_geotagger.templates.template_manager import render_filename
+from purway_geotagger.templates.template_manager import compile_template, render_filename
 
 def test_render_filename():
     t = RenameTemplate(id="t", name="t", client="ACME", pattern="{client}_{index:03d}_{ppm}ppm_{orig}")
     out = render_filename(t, index=7, ppm=12.3, lat=1.0, lon=2.0, orig="IMG_0001")
     assert out.startswith("ACME_007_12ppm_IMG_0001")
+
+
+def test_compile_template_rejects_unknown_tokens():
+    for pattern in ("{client}_{foo}", "{client}_{", "{orig:05d}", "{}"):
+        t = RenameTemplate(id="t", name="t", client="ACME", pattern=pattern)
+        with pytest.raises(ValueError, match="Template format error"):
+            compile_template(t)
+
+
+def test_render_batch_uses_one_timestamp():
+    t = RenameTemplate(id="t", name="t", client="AC{ME}", pattern="{client}_{date}_{time}_{index:02d}_{lat}_{orig}")
+    tasks = [
+        PhotoTask(src_path=Path(f"/x/IMG_{i}.jpg"), work_path=Path(f"/x/IMG_{i}.jpg"), output_path=Path(f"/x/IMG_{i}.JPG"))
+        for i in range(3)
+    ]
+    for task in tasks:
+        task.lat = 1.5
+    now = datetime(2026, 2, 3, 4, 5, 6)
+    names = compile_template(t).render_batch(tasks, start_index=9, now=now)
+    assert names == [
+        "AC{ME}_20260203_040506_09_1.500000_IMG_0",
+        "AC{ME}_20260203_040506_10_1.500000_IMG_1",
+        "AC{ME}_20260203_040506_11_1.500000_IMG_2",
+    ]
+    assert names[0] == render_filename(t, index=9, ppm=0.0, lat=1.5, lon=0.0, orig="IMG_0", now=now)
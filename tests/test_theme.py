@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+from purway_geotagger.gui.theme import scope_stylesheet
+
+
+def test_scope_stylesheet_scopes_each_selector_and_drops_comments() -> None:
+    qss = """
+/* Buttons, inputs */
+QPushButton, QLabel#Title { color: red; }
+QComboBox::drop-down:hover { border: none; }
+QFrame[cssClass="card"] > QLabel:disabled { color: gray; }
+"""
+    scoped = scope_stylesheet(qss, "dark")
+    assert "/*" not in scoped
+    assert '*[theme="dark"] QPushButton' in scoped
+    assert 'QPushButton[theme="dark"]' in scoped
+    assert 'QLabel#Title[theme="dark"] {' in scoped
+    assert 'QComboBox[theme="dark"]::drop-down:hover' in scoped
+    assert 'QFrame[cssClass="card"] > QLabel[theme="dark"]:disabled' in scoped
+    assert scoped.count("{") == 3
+
+
+def test_theme_toggle_repolishes_without_replacing_app_stylesheet(tmp_path: Path) -> None:
+    repo_root = Path(__file__).resolve().parents[1]
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(repo_root / "src")
+    env["QT_QPA_PLATFORM"] = "offscreen"
+    env["XDG_CACHE_HOME"] = str(tmp_path)
+
+    script = """
+from PySide6.QtWidgets import QApplication, QLabel, QVBoxLayout, QWidget
+from purway_geotagger.gui import theme
+
+app = QApplication([])
+path = theme.stylesheet_cache_path()
+assert not path.exists()
+theme.apply_theme(app, "light")
+assert path.exists()
+sheet = app.styleSheet()
+assert path.read_text(encoding="utf-8") == sheet
+
+win = QWidget()
+layout = QVBoxLayout(win)
+label = QLabel("text")
+layout.addWidget(label)
+theme.apply_theme(app, "light")  # tags the new window
+win.show()
+app.processEvents()
+light = label.palette().color(label.foregroundRole()).name()
+
+theme.apply_theme(app, "dark")
+assert app.styleSheet() == sheet
+assert app.property("darkMode") is True
+assert win.property("theme") == "dark"
+dark = label.palette().color(label.foregroundRole()).name()
+assert dark != light, (light, dark)
+
+theme.apply_theme(app, "light")
+assert label.palette().color(label.foregroundRole()).name() == light
+
+path.write_text(sheet + "\\n/* cached */", encoding="utf-8")
+assert theme.themed_stylesheet().endswith("/* cached */")
+print("theme_ok")
+"""
+    completed = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=repo_root,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+    assert completed.returncode == 0, completed.stderr or completed.stdout
+    assert "theme_ok" in completed.stdout